@@ -0,0 +1,47 @@
+"""
+Deferred loading of the any_agent stack.
+
+Importing any_agent pulls in LangChain, agno and the provider SDKs, which is
+a large share of process startup. Agents call load_any_agent() when they are
+first created instead of importing any_agent at module import time, so the
+app can start serving before the agent stack is loaded.
+
+Before any_agent is imported, any_llm is monkeypatched so any-agent
+frameworks use our custom any_llm_adapter (custom providers, model listing).
+"""
+import logging
+import threading
+from types import ModuleType
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_any_agent: Optional[ModuleType] = None
+_lock = threading.Lock()
+
+
+def load_any_agent() -> ModuleType:
+    """
+    Patch any_llm and import any_agent, once per process.
+
+    Returns:
+        ModuleType: The any_agent module
+    """
+    global _any_agent
+    if _any_agent is not None:
+        return _any_agent
+
+    with _lock:
+        if _any_agent is None:
+            # Monkeypatch any_llm module BEFORE importing any_agent
+            import any_llm
+            from lib.any_llm import any_llm_adapter
+
+            any_llm.acompletion = any_llm_adapter.acompletion
+            any_llm.alist_models = any_llm_adapter.alist_models
+
+            import any_agent
+            _any_agent = any_agent
+            logger.info("Loaded any_agent stack")
+
+    return _any_agent
@@ -1,16 +1,9 @@
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
 
-# Monkeypatch any_llm module BEFORE importing any_agent
-# This ensures any-agent frameworks use our custom any_llm_adapter
-import any_llm
-from lib.any_llm import any_llm_adapter
+from agents.any_agent_loader import load_any_agent
 
-# Replace any_llm's functions with our custom versions
-any_llm.acompletion = any_llm_adapter.acompletion
-any_llm.alist_models = any_llm_adapter.alist_models
-
-# Now import any_agent - it will use our patched any_llm
-from any_agent import AgentConfig, AnyAgent, AgentFramework, AgentTrace
+if TYPE_CHECKING:
+    from any_agent import AnyAgent, AgentTrace
 
 
 class ChatAgent:
@@ -21,7 +14,7 @@ class ChatAgent:
     Message formatting and conversation history management is handled by the calling service.
     """
     
-    def __init__(self, agent: AnyAgent):
+    def __init__(self, agent: "AnyAgent"):
         """
         Initialize ChatAgent with a pre-created agent.
         
@@ -55,7 +48,8 @@ class ChatAgent:
             ChatAgent instance
         """
         # Build AgentConfig - uses our monkeypatched any_llm which supports custom providers
-        config = AgentConfig(
+        any_agent = load_any_agent()
+        config = any_agent.AgentConfig(
             model_id=model_id,
             api_key=api_key,
             api_base=api_base,
@@ -65,14 +59,14 @@ class ChatAgent:
         )
         
         # Create agent using AGNO framework asynchronously
-        agent = await AnyAgent.create_async(
-            AgentFramework.LANGCHAIN,
+        agent = await any_agent.AnyAgent.create_async(
+            any_agent.AgentFramework.LANGCHAIN,
             agent_config=config,
         )
         
         return cls(agent)
 
-    async def run(self, prompt: str) -> AgentTrace:
+    async def run(self, prompt: str) -> "AgentTrace":
         """
         Run the agent with a prompt asynchronously.
         
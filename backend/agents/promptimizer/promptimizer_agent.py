@@ -4,19 +4,12 @@ PromptOptimizer Agent for enhancing system prompts.
 This agent uses the any_agent framework with LANGCHAIN to generate
 optimized prompts based on user ideas and provider-specific best practices.
 """
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
 
-# Monkeypatch any_llm module BEFORE importing any_agent
-# This ensures any-agent frameworks use our custom any_llm_adapter
-import any_llm
-from lib.any_llm import any_llm_adapter
+from agents.any_agent_loader import load_any_agent
 
-# Replace any_llm's functions with our custom versions
-any_llm.acompletion = any_llm_adapter.acompletion
-any_llm.alist_models = any_llm_adapter.alist_models
-
-# Now import any_agent - it will use our patched any_llm
-from any_agent import AgentConfig, AnyAgent, AgentFramework, AgentTrace
+if TYPE_CHECKING:
+    from any_agent import AnyAgent, AgentTrace
 
 
 class PromptOptimizerAgent:
@@ -27,7 +20,7 @@ class PromptOptimizerAgent:
     well-structured, provider-optimized system prompts from user ideas.
     """
 
-    def __init__(self, agent: AnyAgent):
+    def __init__(self, agent: "AnyAgent"):
         """
         Initialize PromptOptimizerAgent with a pre-created agent.
 
@@ -58,7 +51,8 @@ class PromptOptimizerAgent:
         Returns:
             PromptOptimizerAgent instance
         """
-        config = AgentConfig(
+        any_agent = load_any_agent()
+        config = any_agent.AgentConfig(
             model_id=model_id,
             api_key=api_key,
             api_base=api_base,
@@ -67,14 +61,14 @@ class PromptOptimizerAgent:
             tools=[],
         )
 
-        agent = await AnyAgent.create_async(
-            AgentFramework.LANGCHAIN,
+        agent = await any_agent.AnyAgent.create_async(
+            any_agent.AgentFramework.LANGCHAIN,
             agent_config=config,
         )
 
         return cls(agent)
 
-    async def run(self, prompt: str) -> AgentTrace:
+    async def run(self, prompt: str) -> "AgentTrace":
         """
         Run the agent with a prompt asynchronously.
 
@@ -5,9 +5,11 @@ Common dependencies used across API endpoints following FastAPI best practices.
 This module provides centralized dependency injection for all services.
 We use function-based dependencies as recommended by FastAPI documentation.
 """
-from typing import Generator, Annotated, Optional
+from typing import AsyncGenerator, Generator, Annotated, Iterator, Optional
+from contextlib import contextmanager
 from fastapi import Depends, Header, Cookie, Request
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pathlib import Path
 import logging
 from database.models.user_sessions import UserSessions
@@ -17,7 +19,7 @@ from utils.cookie import get_session_from_cookie
 # Set up logger
 logger = logging.getLogger(__name__)
 
-from database.core import get_session
+from database.core import get_session, get_async_session
 from services.auth.auth_service import AuthService
 from services.auth.session_service import SessionService
 from services.config.config_service import ConfigService
@@ -28,12 +30,15 @@ from services.local_repo.git_service import GitService
 from services.local_repo.local_repo_service import LocalRepoService
 from services.remote_repo.remote_repo_service import RemoteRepoService
 from services.artifacts.prompt.prompt_meta_service import PromptMetaService
+from services.artifacts.diff import ArtifactDiffService
 from services.file_operations.file_operations_service import FileOperationsService
 from services.artifacts.tool import ToolMetaService, ToolExecutionService
 from services.artifacts.evals.eval_meta_service import EvalMetaService
 from services.artifacts.evals.eval_execution_meta_service import EvalExecutionMetaService
 from services.artifacts.evals.eval_execution_service import EvalExecutionService
-from lib.deepeval.deepeval_adapter import DeepEvalAdapter
+from services.artifacts.evals.eval_job_queue import EvalJobQueue, get_eval_job_queue as get_shared_eval_job_queue
+from services.artifacts.evals.sharding import EvalShardRunner, get_eval_shard_queue
+from lib.deepeval.deepeval_adapter import DeepEvalAdapter, get_deepeval_adapter as get_shared_deepeval_adapter
 from services.shared_chat import SharedChatService
 from database.daos.shared_chat import SharedChatDAO
 from services.conversational.conversation_simulator_service import ConversationSimulatorService
@@ -94,6 +99,34 @@ def get_db() -> Generator[Session, None, None]:
 DBSession = Annotated[Session, Depends(get_db)]
 
 
+async def get_async_db() -> AsyncGenerator[Optional[AsyncSession], None]:
+    """
+    Asyncio database session dependency with proper cleanup.
+
+    Used on hot request paths (session validation, shared chat reads) so that
+    a slow query yields the event loop instead of stalling other requests.
+    The session is closed by the adapter's context manager; on errors the
+    transaction is rolled back before the exception propagates. Yields None
+    when the database's async driver is not installed, in which case the DAOs
+    fall back to the sync session.
+    """
+    async for session in get_async_session():
+        try:
+            yield session
+        except Exception as e:
+            if session is None:
+                raise
+            try:
+                await session.rollback()
+                logger.warning(f"Rolled back async database transaction due to error: {type(e).__name__}")
+            except Exception as rollback_error:
+                logger.error(f"Error during async rollback: {rollback_error}")
+            raise
+
+
+AsyncDBSession = Annotated[Optional[AsyncSession], Depends(get_async_db)]
+
+
 # ==============================================================================
 # Configuration Service
 # ==============================================================================
@@ -127,6 +160,18 @@ def get_session_service(db: DBSession) -> SessionService:
 SessionServiceDep = Annotated[SessionService, Depends(get_session_service)]
 
 
+def get_session_validation_service(db: DBSession, async_db: AsyncDBSession) -> SessionService:
+    """
+    Session service dependency for the authentication dependencies.
+
+    Validates the session of every authenticated request through the async session.
+    """
+    return SessionService(db, async_db)
+
+
+SessionValidationServiceDep = Annotated[SessionService, Depends(get_session_validation_service)]
+
+
 # ==============================================================================
 # Authentication Service
 # ==============================================================================
@@ -283,6 +328,27 @@ def get_prompt_service(
 PromptServiceDep = Annotated[PromptMetaService, Depends(get_prompt_service)]
 
 
+# ==============================================================================
+# Artifact Diff Service
+# ==============================================================================
+
+def get_artifact_diff_service(
+    local_repo_service: LocalRepoServiceDep
+) -> ArtifactDiffService:
+    """
+    Artifact diff service dependency.
+    
+    Creates an ArtifactDiffService for comparing artifact versions across
+    commit history. Computed diffs are shared through the process-wide cache.
+    """
+    return ArtifactDiffService(
+        local_repo_service=local_repo_service
+    )
+
+
+ArtifactDiffServiceDep = Annotated[ArtifactDiffService, Depends(get_artifact_diff_service)]
+
+
 # ==============================================================================
 # Tool Service
 # ==============================================================================
@@ -389,10 +455,10 @@ def get_deepeval_adapter() -> DeepEvalAdapter:
     """
     DeepEval adapter dependency (singleton).
     
-    Returns a shared instance of DeepEvalAdapter for metric evaluation.
-    This is a stateless utility service that doesn't need per-request instances.
+    Returns the process-wide DeepEvalAdapter for metric evaluation.
+    DeepEval itself is only imported once a metric is first created.
     """
-    return DeepEvalAdapter()
+    return get_shared_deepeval_adapter()
 
 
 DeepEvalAdapterDep = Annotated[DeepEvalAdapter, Depends(get_deepeval_adapter)]
@@ -428,20 +494,90 @@ def get_eval_execution_service(
 EvalExecutionServiceDep = Annotated[EvalExecutionService, Depends(get_eval_execution_service)]
 
 
+@contextmanager
+def eval_execution_service_scope() -> Iterator[EvalExecutionService]:
+    """
+    Build an EvalExecutionService outside of a request.
+    
+    Used by background eval jobs, which outlive the request that submitted
+    them. The service graph is assembled like the request dependencies above,
+    on its own database session that is closed when the scope exits.
+    """
+    session_generator = get_session()
+    db = next(session_generator)
+    try:
+        config_service = get_config_service(db)
+        local_repo_service = get_local_repo_service(config_service, db, get_remote_repo_service(db))
+        prompt_service = get_prompt_service(local_repo_service)
+        eval_execution_meta_service = get_eval_execution_meta_service(local_repo_service)
+        tool_execution_service = get_tool_execution_service(get_tool_meta_service(local_repo_service))
+        yield get_eval_execution_service(
+            eval_meta_service=get_eval_service(local_repo_service, eval_execution_meta_service),
+            eval_execution_meta_service=eval_execution_meta_service,
+            prompt_service=prompt_service,
+            deepeval_adapter=get_deepeval_adapter(),
+            chat_completion_service=get_chat_completion_service(config_service, tool_execution_service, prompt_service),
+            config_service=config_service,
+        )
+    finally:
+        try:
+            next(session_generator)
+        except StopIteration:
+            pass
+
+
+# ==============================================================================
+# Eval Job Queue
+# ==============================================================================
+
+def get_eval_job_queue() -> EvalJobQueue:
+    """
+    Eval job queue dependency (singleton).
+    
+    Returns the process-wide queue running background eval jobs. It is
+    started and stopped with the application.
+    """
+    return get_shared_eval_job_queue()
+
+
+EvalJobQueueDep = Annotated[EvalJobQueue, Depends(get_eval_job_queue)]
+
+
+# ==============================================================================
+# Eval Shard Runner
+# ==============================================================================
+
+def get_eval_shard_runner(
+    eval_execution_service: EvalExecutionServiceDep
+) -> EvalShardRunner:
+    """
+    Eval shard runner dependency.
+    
+    Creates an EvalShardRunner distributing the shards of an eval through
+    the process-wide shard queue.
+    """
+    return EvalShardRunner(eval_execution_service, get_eval_shard_queue())
+
+
+EvalShardRunnerDep = Annotated[EvalShardRunner, Depends(get_eval_shard_runner)]
+
+
 # ==============================================================================
 # Shared Chat Service
 # ==============================================================================
 
 def get_shared_chat_service(
     db: DBSession,
+    async_db: AsyncDBSession,
     config_service: ConfigServiceDep
 ) -> SharedChatService:
     """
     Shared chat service dependency.
 
     Creates a SharedChatService for managing shared chat links.
+    Reads go through the async session; writes use the sync session.
     """
-    dao = SharedChatDAO(db)
+    dao = SharedChatDAO(db, async_db)
     # Get base URL from config if available, otherwise use empty string
     base_url = ""
     try:
@@ -512,7 +648,7 @@ INDIVIDUAL_USER_ID = "individual-user"
 
 
 async def get_current_user(
-    session_service: SessionServiceDep,
+    session_service: SessionValidationServiceDep,
     config_service: ConfigServiceDep,
     session_id: SessionCookieDep
 ) -> str:
@@ -536,7 +672,7 @@ async def get_current_user(
     except Exception as e:
         logger.warning(f"Failed to get hosting type: {e}")
     
-    user_session = session_service.is_session_valid(session_id)
+    user_session = await session_service.ais_session_valid(session_id)
     if not user_session:
         raise AuthenticationException(
             message="Authentication Required",
@@ -573,7 +709,7 @@ async def get_current_session(
 
 
 async def get_optional_user(
-    session_service: SessionServiceDep,
+    session_service: SessionValidationServiceDep,
     config_service: ConfigServiceDep,
     request: Request
 ) -> Optional[str]:
@@ -599,12 +735,8 @@ async def get_optional_user(
     if not session_id:
         return None
     
-    # Validate session
-    if not session_service.is_session_valid(session_id):
-        return None
-    
-    # Get session and user
-    user_session = session_service.get_session_by_id(session_id)
+    # Validate session (returns the session itself when valid)
+    user_session = await session_service.ais_session_valid(session_id)
     if not user_session:
         return None
     
@@ -14,6 +14,7 @@ from api.deps import (
     ConversationSimulatorServiceDep,
 )
 from middlewares.rest.responses import StandardResponse
+from services.llm.completion_cache import CompletionCacheMode
 from services.conversational.models import (
     SimulateConversationRequest,
     SimulateConversationResponse,
@@ -66,6 +67,10 @@ class SimulateConversationApiRequest(BaseModel):
         default=None,
         description="LLM model for simulation (uses prompt's config if not provided)"
     )
+    cache_mode: Optional[CompletionCacheMode] = Field(
+        default=None,
+        description="Completion cache mode (off, read_write, record, replay). If None, the server default is used."
+    )
 
 
 # ==============================================================================
@@ -120,6 +125,7 @@ async def simulate_conversation(
         request=service_request,
         user_id=user_id,
         repo_name=body.repo_name,
+        cache_mode=body.cache_mode,
     )
 
     return StandardResponse(data=result)
@@ -4,11 +4,12 @@ Eval API endpoints for DeepEval eval management and execution.
 This module provides REST API endpoints for:
 - Eval evals CRUD operations
 - Eval execution and history
+- Background eval jobs with streamed progress
 - Metrics metadata
 """
 
 from fastapi import APIRouter
-from . import evals, execution, metrics
+from . import evals, execution, jobs, metrics
 
 router = APIRouter()
 
@@ -26,6 +27,13 @@ router.include_router(
     tags=["Eval Execution"]
 )
 
+# Include background eval job endpoints
+router.include_router(
+    jobs.router,
+    prefix="/jobs",
+    tags=["Eval Jobs"]
+)
+
 # Include evals endpoints (generic parameterized routes should be last)
 router.include_router(
     evals.router,
@@ -3,7 +3,7 @@ Eval CRUD endpoints with standardized responses.
 """
 import logging
 import base64
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Request, status, Body, Query, Path
 
 from services.artifacts.evals.models import EvalData, EvalMeta
@@ -146,10 +146,11 @@ async def get(
     eval_service: EvalMetaServiceDep,
     user_id: CurrentUserDep,
     repo_name: str = Path(..., description="Base64-encoded repository name"),
-    file_path: str = Path(..., description="Base64-encoded eval file path")
+    file_path: str = Path(..., description="Base64-encoded eval file path"),
+    ref: Optional[str] = Query(None, description="Branch, tag or commit SHA to read the eval at (default: working copy)")
 ) -> StandardResponse[EvalMeta]:
     """
-    Get specific eval definition.
+    Get specific eval definition, optionally as it exists at a git ref.
     
     Returns:
         StandardResponse[EvalMeta]: Eval metadata
@@ -170,7 +171,7 @@ async def get(
             extra={"request_id": request_id, "user_id": user_id, "file_path": decoded_file_path}
         )
         
-        eval_meta = await eval_service.get(user_id=user_id, repo_name=decoded_repo_name, file_path=decoded_file_path)
+        eval_meta = await eval_service.get(user_id=user_id, repo_name=decoded_repo_name, file_path=decoded_file_path, ref=ref)
         
         if not eval_meta:
             raise NotFoundException(
@@ -11,7 +11,8 @@ from services.artifacts.evals.models import (
     TestExecutionResult,
     EvalExecutionResult
 )
-from api.deps import EvalExecutionServiceDep, CurrentUserDep
+from services.llm.completion_cache import CompletionCacheMode
+from api.deps import EvalExecutionServiceDep, EvalShardRunnerDep, CurrentUserDep
 from middlewares.rest import (
     StandardResponse,
     success_response,
@@ -30,6 +31,14 @@ class ExecuteTestsRequest(BaseModel):
         default=None,
         description="List of test names to execute. If None, all tests are executed."
     )
+    cache_mode: Optional[CompletionCacheMode] = Field(
+        default=None,
+        description="Completion cache mode (off, read_write, record, replay). If None, the server default is used."
+    )
+    sharded: bool = Field(
+        default=False,
+        description="Split the tests into shards executed by parallel worker processes. Intended for large evals."
+    )
 
 
 @router.post(
@@ -70,6 +79,7 @@ class ExecuteTestsRequest(BaseModel):
 async def execute_eval(
     request: Request,
     eval_execution_service: EvalExecutionServiceDep,
+    eval_shard_runner: EvalShardRunnerDep,
     user_id: CurrentUserDep,
     repo_name: str = Path(..., description="Base64-encoded repository name"),
     file_path: str = Path(..., description="Base64-encoded eval file path"),
@@ -105,9 +115,16 @@ async def execute_eval(
                 extra={"request_id": request_id, "user_id": user_id}
             )
 
-        execution_result = await eval_execution_service.execute_eval(
-            user_id, decoded_repo_name, decoded_file_path, test_names
-        )
+        if request_body.sharded:
+            execution_result = await eval_shard_runner.run(
+                user_id, decoded_repo_name, decoded_file_path, test_names,
+                cache_mode=request_body.cache_mode
+            )
+        else:
+            execution_result = await eval_execution_service.execute_eval(
+                user_id, decoded_repo_name, decoded_file_path, test_names,
+                cache_mode=request_body.cache_mode
+            )
 
         logger.info(
             f"Eval execution completed: {execution_result.passed_tests}/{execution_result.total_tests} passed",
@@ -181,7 +198,11 @@ async def execute_single_test(
     user_id: CurrentUserDep,
     repo_name: str = Path(..., description="Base64-encoded repository name"),
     file_path: str = Path(..., description="Base64-encoded eval file path"),
-    test_name: str = Path(..., description="Test name")
+    test_name: str = Path(..., description="Test name"),
+    cache_mode: Optional[CompletionCacheMode] = Query(
+        default=None,
+        description="Completion cache mode (off, read_write, record, replay). If None, the server default is used."
+    )
 ) -> StandardResponse[TestExecutionResult]:
     """
     Execute single test.
@@ -206,7 +227,8 @@ async def execute_single_test(
         )
 
         execution_result = await eval_execution_service.execute_single_test(
-            user_id, decoded_repo_name, decoded_file_path, test_name
+            user_id, decoded_repo_name, decoded_file_path, test_name,
+            cache_mode=cache_mode
         )
 
         logger.info(
@@ -0,0 +1,262 @@
+"""
+Background eval job endpoints.
+
+Evals submitted here run on the server's eval job queue instead of inside
+the request: the response returns a job ID right away, progress is streamed
+over Server-Sent Events, and a cancelled or interrupted job can be resumed
+without executing its completed tests again.
+"""
+import logging
+from typing import List, Optional
+from fastapi import APIRouter, Request, status, Query, Body, Path, Header
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from services.artifacts.evals.models import EvalJob
+from services.llm.completion_cache import CompletionCacheMode
+from api.deps import EvalJobQueueDep, EvalMetaServiceDep, CurrentUserDep
+from middlewares.rest import (
+    StandardResponse,
+    success_response,
+    NotFoundException
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Seconds between SSE keep-alive comments, so idle streams survive proxy timeouts
+SSE_HEARTBEAT_SECONDS = 15.0
+
+
+class SubmitEvalJobRequest(BaseModel):
+    """Request body for submitting an eval job"""
+    repo_name: str = Field(description="Repository name")
+    file_path: str = Field(description="Eval file path within the repository")
+    test_names: Optional[List[str]] = Field(
+        default=None,
+        description="List of test names to execute. If None, all tests are executed."
+    )
+    cache_mode: Optional[CompletionCacheMode] = Field(
+        default=None,
+        description="Completion cache mode (off, read_write, record, replay). If None, the server default is used."
+    )
+
+
+@router.post(
+    "",
+    response_model=StandardResponse[EvalJob],
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit eval job",
+    description="Queue an eval execution as a background job. Follow its progress at /jobs/{job_id}/events.",
+)
+async def submit_eval_job(
+    request: Request,
+    eval_job_queue: EvalJobQueueDep,
+    eval_meta_service: EvalMetaServiceDep,
+    user_id: CurrentUserDep,
+    request_body: SubmitEvalJobRequest = Body(...)
+) -> StandardResponse[EvalJob]:
+    """
+    Submit an eval execution job.
+
+    Returns:
+        StandardResponse[EvalJob]: The queued job
+
+    Raises:
+        NotFoundException: When the eval doesn't exist
+    """
+    request_id = request.state.request_id
+
+    eval_meta = await eval_meta_service.get(user_id, request_body.repo_name, request_body.file_path)
+    if not eval_meta:
+        raise NotFoundException(
+            resource="Eval",
+            identifier=request_body.file_path
+        )
+
+    job = await eval_job_queue.submit(
+        user_id,
+        request_body.repo_name,
+        request_body.file_path,
+        test_names=request_body.test_names,
+        cache_mode=request_body.cache_mode
+    )
+
+    logger.info(
+        f"Submitted eval job {job.id} for {request_body.file_path}",
+        extra={"request_id": request_id, "user_id": user_id}
+    )
+
+    return success_response(
+        data=job,
+        message="Eval job queued",
+        meta={"request_id": request_id}
+    )
+
+
+@router.get(
+    "",
+    response_model=StandardResponse[List[EvalJob]],
+    status_code=status.HTTP_200_OK,
+    summary="List eval jobs",
+    description="List the current user's eval jobs, most recently updated first.",
+)
+async def list_eval_jobs(
+    request: Request,
+    eval_job_queue: EvalJobQueueDep,
+    user_id: CurrentUserDep,
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of jobs to return")
+) -> StandardResponse[List[EvalJob]]:
+    """
+    List eval jobs.
+
+    Returns:
+        StandardResponse[List[EvalJob]]: The user's jobs
+    """
+    jobs = await eval_job_queue.list_jobs(user_id, limit=limit)
+    return success_response(
+        data=jobs,
+        message=f"Found {len(jobs)} eval jobs",
+        meta={"request_id": request.state.request_id}
+    )
+
+
+@router.get(
+    "/{job_id}",
+    response_model=StandardResponse[EvalJob],
+    status_code=status.HTTP_200_OK,
+    summary="Get eval job",
+    description="Get an eval job's status and progress, and its execution result once completed.",
+)
+async def get_eval_job(
+    request: Request,
+    eval_job_queue: EvalJobQueueDep,
+    user_id: CurrentUserDep,
+    job_id: str = Path(..., description="Job ID")
+) -> StandardResponse[EvalJob]:
+    """
+    Get an eval job.
+
+    Returns:
+        StandardResponse[EvalJob]: The job
+
+    Raises:
+        NotFoundException: When the job doesn't exist
+    """
+    job = await eval_job_queue.get(job_id, user_id)
+    return success_response(
+        data=job,
+        message=f"Eval job is {job.status.value}",
+        meta={"request_id": request.state.request_id}
+    )
+
+
+@router.get(
+    "/{job_id}/events",
+    status_code=status.HTTP_200_OK,
+    summary="Stream eval job progress",
+    description=(
+        "Server-Sent Events stream of an eval job's progress: status changes and a test_completed event "
+        "with the result of each completed test. The stream ends once the job finishes. Reconnecting "
+        "clients send Last-Event-ID (or the after query parameter) to receive only newer events."
+    ),
+    response_class=StreamingResponse,
+)
+async def stream_eval_job_events(
+    eval_job_queue: EvalJobQueueDep,
+    user_id: CurrentUserDep,
+    job_id: str = Path(..., description="Job ID"),
+    after: int = Query(0, ge=0, description="Sequence number of the last event already received"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+) -> StreamingResponse:
+    """
+    Stream eval job events.
+
+    Returns:
+        StreamingResponse: text/event-stream of EvalJobEvent payloads
+
+    Raises:
+        NotFoundException: When the job doesn't exist
+    """
+    if last_event_id and last_event_id.isdigit():
+        after = max(after, int(last_event_id))
+
+    # Fail with 404 before the stream starts
+    await eval_job_queue.get(job_id, user_id)
+
+    async def event_stream():
+        async for event in eval_job_queue.events(
+            job_id, user_id, after=after, heartbeat_seconds=SSE_HEARTBEAT_SECONDS
+        ):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {event.sequence}\nevent: {event.type.value}\ndata: {event.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post(
+    "/{job_id}/cancel",
+    response_model=StandardResponse[EvalJob],
+    status_code=status.HTTP_200_OK,
+    summary="Cancel eval job",
+    description="Cancel a queued or running eval job. Completed tests stay checkpointed, so the job can be resumed.",
+)
+async def cancel_eval_job(
+    request: Request,
+    eval_job_queue: EvalJobQueueDep,
+    user_id: CurrentUserDep,
+    job_id: str = Path(..., description="Job ID")
+) -> StandardResponse[EvalJob]:
+    """
+    Cancel an eval job.
+
+    Returns:
+        StandardResponse[EvalJob]: The job after cancellation
+
+    Raises:
+        NotFoundException: When the job doesn't exist
+    """
+    job = await eval_job_queue.cancel(job_id, user_id)
+    return success_response(
+        data=job,
+        message=f"Eval job is {job.status.value}",
+        meta={"request_id": request.state.request_id}
+    )
+
+
+@router.post(
+    "/{job_id}/resume",
+    response_model=StandardResponse[EvalJob],
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Resume eval job",
+    description="Queue a cancelled, failed or interrupted eval job again. Tests completed before are not executed again.",
+)
+async def resume_eval_job(
+    request: Request,
+    eval_job_queue: EvalJobQueueDep,
+    user_id: CurrentUserDep,
+    job_id: str = Path(..., description="Job ID")
+) -> StandardResponse[EvalJob]:
+    """
+    Resume an eval job.
+
+    Returns:
+        StandardResponse[EvalJob]: The queued job
+
+    Raises:
+        NotFoundException: When the job doesn't exist
+        ConflictException: When the job is queued, running or completed
+    """
+    job = await eval_job_queue.resume(job_id, user_id)
+    return success_response(
+        data=job,
+        message="Eval job queued",
+        meta={"request_id": request.state.request_id}
+    )
@@ -1,10 +1,11 @@
 """
 API information endpoints.
 """
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, status
 from pydantic import BaseModel
 
 from middlewares.rest.responses import StandardResponse, success_response
+from utils.startup import StartupProfile, get_startup_profiler
 
 router = APIRouter()
 
@@ -49,4 +50,27 @@ async def get_api_info() -> StandardResponse[APIInfo]:
     return success_response(
         data=api_info,
         message="Welcome to PromptRepo API"
-    )
\ No newline at end of file
+    )
+
+
+@router.get(
+    "/info/startup",
+    response_model=StandardResponse[StartupProfile],
+    status_code=status.HTTP_200_OK,
+    tags=["monitoring"],
+    summary="Startup profile",
+    description=(
+        "Boot phase durations of this worker and, when started with "
+        "STARTUP_PROFILE_IMPORTS=1, the slowest module imports"
+    ),
+)
+async def get_startup_profile(
+    top: int = Query(default=25, ge=1, le=500, description="Number of modules to include")
+) -> StandardResponse[StartupProfile]:
+    """
+    Report how long this worker took to start and which imports dominated.
+    """
+    return success_response(
+        data=get_startup_profiler().report(top=top),
+        message="Startup profile retrieved successfully"
+    )
@@ -23,6 +23,7 @@ class FetchModelsRequest(BaseModel):
     """Request model for fetching models from a provider"""
     api_key: str
     api_base: str = ""
+    refresh: bool = False  # Bypass the cached model list
 
 class ModelsResponse(BaseModel):
     """Response for database.models endpoint"""
@@ -111,7 +112,8 @@ async def fetch_models_by_provider(
         models = await provider_service.fetch_models_by_provider(
             provider_id=provider_id,
             api_key=req_body.api_key,
-            api_base=req_body.api_base
+            api_base=req_body.api_base,
+            force_refresh=req_body.refresh
         )
         
         logger.info(
@@ -4,6 +4,8 @@ CRUD operations for prompts.
 Handles create, read, update, delete operations for individual prompts.
 """
 
+from typing import Optional
+
 from fastapi import APIRouter, Query, Request, status, Path
 import logging
 import base64
@@ -62,12 +64,15 @@ async def get_prompt(
     user_id: CurrentUserDep,
     prompt_service: PromptServiceDep,
     repo_name: str = Path(..., description="Base64-encoded repository name"),
-    file_path: str = Path(..., description="Base64-encoded file path")
+    file_path: str = Path(..., description="Base64-encoded file path"),
+    ref: Optional[str] = Query(None, description="Branch, tag or commit SHA to read the prompt at (default: working copy)")
 ) -> StandardResponse[PromptMeta]:
     """
     Get a specific prompt by repository name and file path.
     
-    Checks user permissions based on hosting type.
+    Checks user permissions based on hosting type. With a ref, the prompt is
+    read from git as it exists at that branch or commit, without switching
+    the working copy.
     
     Returns:
         StandardResponse[PromptMeta]: Standardized response containing the prompt
@@ -91,7 +96,8 @@ async def get_prompt(
         prompt = await prompt_service.get(
             user_id=user_id,
             repo_name=decoded_repo_name,
-            file_path=decoded_file_path
+            file_path=decoded_file_path,
+            ref=ref
         )
         
         if not prompt:
@@ -8,6 +8,8 @@ from .get_repos_available import router as available_router
 from .get_configured import router as configured_router
 from .get_branches import router as branches_router
 from .get_latest import router as get_latest_router
+from .fetch_latest import router as fetch_latest_router
+from .get_artifact_diff import router as artifact_diff_router
 
 # Create main repos router
 router = APIRouter()
@@ -16,4 +18,6 @@ router = APIRouter()
 router.include_router(available_router)
 router.include_router(configured_router)
 router.include_router(branches_router)
-router.include_router(get_latest_router)
\ No newline at end of file
+router.include_router(get_latest_router)
+router.include_router(fetch_latest_router)
+router.include_router(artifact_diff_router)
\ No newline at end of file
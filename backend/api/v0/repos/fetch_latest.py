@@ -0,0 +1,101 @@
+"""
+Fetch Latest Base Branch Endpoint
+
+This endpoint fetches the latest base branch from the remote without touching
+the working copy, so the latest version of an artifact can be read at the
+returned ref while the user's branch and local changes stay as they are.
+"""
+
+from fastapi import APIRouter, Query, Request, status
+import logging
+
+from api.deps import CurrentUserDep, LocalRepoServiceDep, CurrentSessionDep
+from middlewares.rest import (
+    StandardResponse,
+    success_response,
+    AppException,
+    NotFoundException
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.post(
+    "/fetch_latest",
+    response_model=StandardResponse[dict],
+    status_code=status.HTTP_200_OK,
+    responses={
+        500: {
+            "description": "Internal server error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "status": "error",
+                        "type": "/errors/internal-server-error",
+                        "title": "Internal Server Error",
+                        "detail": "Failed to fetch latest base branch"
+                    }
+                }
+            }
+        }
+    },
+    summary="Fetch latest base branch without switching branches",
+    description="Fetch the configured base branch from the remote repository without switching branches or discarding local changes. Returns the ref (e.g. origin/main) at which prompts, tools and evals can then be read.",
+)
+async def fetch_latest_base_branch(
+    request: Request,
+    user_id: CurrentUserDep,
+    local_repo_service: LocalRepoServiceDep,
+    user_session: CurrentSessionDep,
+    repo_name: str = Query(...)
+) -> StandardResponse[dict]:
+    """
+    Fetch the latest base branch into a remote-tracking ref.
+    
+    Returns:
+        StandardResponse[dict]: The fetched ref and its commit hash
+    
+    Raises:
+        AppException: When fetching the base branch fails
+    """
+    request_id = request.state.request_id
+    
+    try:
+        logger.info(
+            f"Fetching latest base branch of {repo_name}",
+            extra={"request_id": request_id, "user_id": user_id}
+        )
+        
+        result = await local_repo_service.fetch_base_branch(
+            user_id=user_id,
+            repo_name=repo_name,
+            oauth_token=user_session.oauth_token
+        )
+        
+        if not result.get("success", False):
+            raise AppException(
+                message="Failed to fetch latest base branch",
+                detail=result.get("message", "Unknown error"),
+                context={"repo_name": repo_name}
+            )
+        
+        return success_response(
+            data=result,
+            message="Latest base branch fetched successfully",
+            meta={"request_id": request_id}
+        )
+        
+    except (NotFoundException, AppException):
+        # These will be handled by the global exception handlers
+        raise
+    except Exception as e:
+        logger.error(
+            f"Failed to fetch latest base branch of {repo_name}: {str(e)}",
+            exc_info=True,
+            extra={"request_id": request_id, "user_id": user_id}
+        )
+        raise AppException(
+            message="Failed to fetch latest base branch",
+            detail=str(e)
+        )
@@ -0,0 +1,108 @@
+"""
+Artifact Diff Endpoint
+
+This endpoint compares a prompt, tool or eval file between two revisions of the
+repository, e.g. two commits from an artifact's commit history, and returns the
+changed fields (prompt text, model parameters, tools, tests, metrics).
+"""
+
+from fastapi import APIRouter, Query, Request, status
+import logging
+
+from api.deps import CurrentUserDep, ArtifactDiffServiceDep
+from middlewares.rest import (
+    StandardResponse,
+    success_response,
+    AppException,
+    NotFoundException
+)
+from services.artifacts.diff import ArtifactDiff
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get(
+    "/diff",
+    response_model=StandardResponse[ArtifactDiff],
+    status_code=status.HTTP_200_OK,
+    responses={
+        404: {
+            "description": "Repository, ref or artifact not found",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "status": "error",
+                        "type": "/errors/not-found",
+                        "title": "Not Found",
+                        "detail": "Git ref 'xxx' not found"
+                    }
+                }
+            }
+        },
+        500: {
+            "description": "Internal server error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "status": "error",
+                        "type": "/errors/internal-server-error",
+                        "title": "Internal Server Error",
+                        "detail": "Failed to compare artifact versions"
+                    }
+                }
+            }
+        }
+    },
+    summary="Compare two versions of an artifact",
+    description="Compare a prompt, tool or eval file between two branches, tags or commits. Returns a field-aware diff covering prompt text, model parameters, tools and tests; diffs are cached per pair of file versions.",
+)
+async def get_artifact_diff(
+    request: Request,
+    user_id: CurrentUserDep,
+    artifact_diff_service: ArtifactDiffServiceDep,
+    repo_name: str = Query(..., description="Repository name"),
+    file_path: str = Query(..., description="Artifact file path relative to the repository root"),
+    base: str = Query(..., description="Branch, tag or commit SHA to compare from"),
+    head: str = Query(..., description="Branch, tag or commit SHA to compare to")
+) -> StandardResponse[ArtifactDiff]:
+    """
+    Compare an artifact file between two revisions.
+    
+    Returns:
+        StandardResponse[ArtifactDiff]: Changed fields between the two versions
+    
+    Raises:
+        NotFoundException: When the repository, a ref or the artifact is not found
+        AppException: When comparing fails
+    """
+    request_id = request.state.request_id
+    
+    try:
+        artifact_diff = await artifact_diff_service.diff(
+            user_id=user_id,
+            repo_name=repo_name,
+            file_path=file_path,
+            base_ref=base,
+            head_ref=head
+        )
+        
+        return success_response(
+            data=artifact_diff,
+            message=f"Found {len(artifact_diff.changes)} changed fields",
+            meta={"request_id": request_id}
+        )
+        
+    except (NotFoundException, AppException):
+        # These will be handled by the global exception handlers
+        raise
+    except Exception as e:
+        logger.error(
+            f"Failed to diff {file_path} in {repo_name}: {str(e)}",
+            exc_info=True,
+            extra={"request_id": request_id, "user_id": user_id}
+        )
+        raise AppException(
+            message="Failed to compare artifact versions",
+            detail=str(e)
+        )
@@ -84,7 +84,8 @@ async def get_repository_branches(
     remote_repo_service: RemoteRepoServiceDep,
     user_session: CurrentSessionDep,
     owner: str = Query(..., description="Repository owner/organization"),
-    repo: str = Query(..., description="Repository name")
+    repo: str = Query(..., description="Repository name"),
+    refresh: bool = Query(False, description="Bypass the cached branch listing")
 ) -> StandardResponse[RepositoryBranchesResponse]:
     """
     Get branches for a specific repository.
@@ -92,6 +93,7 @@ async def get_repository_branches(
     Args:
         owner: Repository owner/organization
         repo: Repository name
+        refresh: Bypass the cached branch listing
     
     Returns:
         StandardResponse[RepositoryBranchesResponse]: Standardized response containing branches
@@ -114,7 +116,8 @@ async def get_repository_branches(
         branches_data = await remote_repo_service.get_repository_branches(
             user_session=user_session,
             owner=owner,
-            repo=repo
+            repo=repo,
+            force_refresh=refresh
         )
         
         logger.info(
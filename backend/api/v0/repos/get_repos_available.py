@@ -2,7 +2,7 @@
 Get available repositories endpoint with standardized responses.
 """
 import logging
-from fastapi import APIRouter, Request, status
+from fastapi import APIRouter, Request, status, Query
 
 from middlewares.rest import (
     StandardResponse,
@@ -57,10 +57,14 @@ async def get_available_repositories(
     request: Request,
     remote_repo_service: RemoteRepoServiceDep,
     user_session: CurrentSessionDep,
+    refresh: bool = Query(False, description="Bypass the cached repository listing"),
 ) -> StandardResponse[RepositoryList]:
     """
     Get available repositories.
     
+    Args:
+        refresh: Bypass the cached repository listing
+    
     Returns:
         StandardResponse[RepositoryList]: Standardized response containing repos
         
@@ -80,6 +84,7 @@ async def get_available_repositories(
         
         repo_list: RepositoryList = await remote_repo_service.get_repositories(
             user_session=user_session,
+            force_refresh=refresh,
         )
         
         logger.info(
@@ -2,11 +2,13 @@
 Get shared chat endpoint (public).
 """
 import logging
-from fastapi import APIRouter, Request, status
+from fastapi import APIRouter, Request, Response, status
 
 from schemas.shared_chat import SharedChatResponse
 from api.deps import SharedChatServiceDep
-from middlewares.rest import StandardResponse, success_response, AppException, NotFoundException
+from services.shared_chat.shared_chat_cache import etag_matches
+from middlewares.rest import StandardResponse, AppException, NotFoundException
+from settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +20,12 @@ router = APIRouter()
     response_model=StandardResponse[SharedChatResponse],
     status_code=status.HTTP_200_OK,
     summary="Get shared chat",
-    description="Retrieve a shared chat by its share ID (public endpoint)",
+    description=(
+        "Retrieve a shared chat by its share ID (public endpoint). "
+        "Responses carry a strong ETag and are cacheable; send If-None-Match to revalidate."
+    ),
     responses={
+        304: {"description": "Not modified; the cached copy matching If-None-Match is current"},
         404: {
             "description": "Shared chat not found",
             "content": {
@@ -52,11 +58,13 @@ async def get_shared_chat(
     request: Request,
     share_id: str,
     service: SharedChatServiceDep
-) -> StandardResponse[SharedChatResponse]:
+) -> Response:
     """
     Get a shared chat by its share ID.
 
-    This is a public endpoint - no authentication required.
+    This is a public endpoint - no authentication required. Shared chats are
+    immutable, so the pre-serialized response is served from the in-memory
+    cache and can be cached by browsers and CDNs.
 
     Args:
         request: FastAPI request
@@ -64,7 +72,7 @@ async def get_shared_chat(
         service: SharedChatService dependency
 
     Returns:
-        StandardResponse containing shared chat data
+        StandardResponse containing shared chat data, or an empty 304
     """
     request_id = request.state.request_id
 
@@ -74,18 +82,25 @@ async def get_shared_chat(
             extra={"request_id": request_id, "share_id": share_id}
         )
 
-        result = service.get_shared_chat(share_id)
+        cached = await service.aget_shared_chat_cached(share_id)
+        headers = {
+            "ETag": cached.etag,
+            "Cache-Control": f"public, max-age={settings.shared_chat_cache_max_age}",
+        }
+
+        if etag_matches(request.headers.get("if-none-match"), cached.etag):
+            logger.info(
+                "Shared chat not modified",
+                extra={"request_id": request_id, "share_id": share_id}
+            )
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
         logger.info(
             "Shared chat retrieved successfully",
             extra={"request_id": request_id, "share_id": share_id}
         )
 
-        return success_response(
-            data=result,
-            message="Shared chat retrieved successfully",
-            meta={"request_id": request_id}
-        )
+        return Response(content=cached.body, media_type="application/json", headers=headers)
 
     except NotFoundException:
         raise
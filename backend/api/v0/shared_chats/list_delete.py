@@ -2,7 +2,7 @@
 List and delete shared chats endpoints.
 """
 import logging
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Request, status, Query
 
 from schemas.shared_chat import SharedChatListItem
@@ -19,7 +19,10 @@ router = APIRouter()
     response_model=StandardResponse[List[SharedChatListItem]],
     status_code=status.HTTP_200_OK,
     summary="List user's shared chats",
-    description="List all shared chats created by the current user",
+    description=(
+        "List the shared chats created by the current user, newest first. "
+        "Pass the meta.next_cursor of a page as cursor to fetch the next one."
+    ),
     responses={
         401: {
             "description": "Unauthorized",
@@ -54,7 +57,8 @@ async def list_shared_chats(
     service: SharedChatServiceDep,
     current_user: CurrentUserDep,
     limit: int = Query(default=50, ge=1, le=100, description="Max results"),
-    offset: int = Query(default=0, ge=0, description="Offset for pagination")
+    offset: int = Query(default=0, ge=0, description="Offset for pagination (ignored when cursor is set)"),
+    cursor: Optional[str] = Query(default=None, description="Cursor from the previous page's meta.next_cursor")
 ) -> StandardResponse[List[SharedChatListItem]]:
     """
     List all shared chats created by the current user.
@@ -65,6 +69,7 @@ async def list_shared_chats(
         current_user: Current authenticated user ID
         limit: Maximum number of results
         offset: Pagination offset
+        cursor: Keyset cursor of the previous page
 
     Returns:
         StandardResponse containing list of shared chats
@@ -78,15 +83,18 @@ async def list_shared_chats(
                 "request_id": request_id,
                 "user_id": current_user,
                 "limit": limit,
-                "offset": offset
+                "offset": offset,
+                "has_cursor": cursor is not None
             }
         )
 
-        result = service.list_user_shared_chats(
+        page = await service.alist_user_shared_chats(
             user_id=current_user,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
+        result = page.items
 
         logger.info(
             "Shared chats listed successfully",
@@ -100,7 +108,7 @@ async def list_shared_chats(
         return success_response(
             data=result,
             message="Shared chats retrieved successfully",
-            meta={"request_id": request_id, "count": len(result)}
+            meta={"request_id": request_id, "count": len(result), "next_cursor": page.next_cursor}
         )
 
     except AppException:
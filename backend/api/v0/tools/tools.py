@@ -4,7 +4,7 @@ Follows standardized response patterns with proper exception handling.
 """
 import logging
 import base64
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Request, Query, status, Path
 
 from api.deps import ToolMetaServiceDep, CurrentUserDep, CurrentSessionDep
@@ -136,10 +136,11 @@ async def get(
     tool_meta_service: ToolMetaServiceDep,
     user_id: CurrentUserDep,
     repo_name: str = Path(..., description="Base64-encoded Repository name"),
-    file_path: str = Path(..., description="Base64-encoded Tool file path")
+    file_path: str = Path(..., description="Base64-encoded Tool file path"),
+    ref: Optional[str] = Query(None, description="Branch, tag or commit SHA to read the tool at (default: working copy)")
 ) -> StandardResponse[ToolMeta]:
     """
-    Get a specific tool definition.
+    Get a specific tool definition, optionally as it exists at a git ref.
     
     Returns:
         StandardResponse[ToolMeta]: Tool metadata
@@ -160,7 +161,7 @@ async def get(
             extra={"request_id": request_id, "user_id": user_id, "file_path": decoded_file_path, "repo_name": repo_name}
         )
         
-        tool_meta = await tool_meta_service.get(user_id=user_id, repo_name=decoded_repo_name, file_path=decoded_file_path)
+        tool_meta = await tool_meta_service.get(user_id=user_id, repo_name=decoded_repo_name, file_path=decoded_file_path, ref=ref)
         
         if not tool_meta:
             raise NotFoundException(
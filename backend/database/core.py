@@ -2,8 +2,9 @@
 Core database module that initializes the database connection
 using the adapter pattern based on the DATABASE_URL
 """
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 from sqlmodel import Session as SQLSession
+from sqlmodel.ext.asyncio.session import AsyncSession
 import logging
 from .database_factory import DatabaseManager
 from settings import settings
@@ -14,7 +15,8 @@ logger = logging.getLogger(__name__)
 # Initialize the database manager singleton with settings
 db_manager = DatabaseManager(
     database_url=settings.database_url,
-    echo=settings.database_echo
+    echo=settings.database_echo,
+    sqlite_production_profile=settings.sqlite_production_profile
 )
 
 def get_session() -> Generator[SQLSession, None, None]:
@@ -24,6 +26,14 @@ def get_session() -> Generator[SQLSession, None, None]:
     """
     return db_manager.get_session()
 
+def get_async_session() -> AsyncGenerator[Optional[AsyncSession], None]:
+    """
+    Dependency to get an asyncio database session.
+    Used by async endpoints on hot request paths so queries do not block the event loop.
+    Yields None when the async driver is not installed; callers then use the sync session.
+    """
+    return db_manager.get_async_session()
+
 def create_db_and_tables() -> None:
     """
     Create all database tables.
@@ -42,10 +52,19 @@ def get_engine():
     """
     return db_manager.engine
 
+async def dispose_engines() -> None:
+    """
+    Close pooled database connections.
+    Should be called on application shutdown.
+    """
+    await db_manager.dispose()
+
 # Re-export for convenience
 __all__ = [
     'db_manager',
     'get_session',
+    'get_async_session',
     'create_db_and_tables',
-    'get_engine'
+    'get_engine',
+    'dispose_engines'
 ]
\ No newline at end of file
@@ -2,9 +2,12 @@
 Data Access Object for shared chat operations.
 Handles database operations for the shared_chats table.
 """
+from datetime import datetime
+from sqlalchemy import Row, and_, or_
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from database.models.shared_chats import SharedChats
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import logging
 import secrets
 import string
@@ -15,14 +18,16 @@ logger = logging.getLogger(__name__)
 class SharedChatDAO:
     """DAO for managing shared chat records."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, async_db: Optional[AsyncSession] = None):
         """
         Initialize SharedChatDAO with database session.
 
         Args:
             db: Database session
+            async_db: Optional asyncio database session used by the async methods
         """
         self.db = db
+        self.async_db = async_db
 
     @staticmethod
     def generate_share_id(length: int = 12) -> str:
@@ -82,6 +87,32 @@ class SharedChatDAO:
             logger.error(f"Failed to get shared chat {share_id}: {e}")
             return None
 
+    async def aget_by_share_id(self, share_id: str) -> Optional[SharedChats]:
+        """
+        Get shared chat by share_id without blocking the event loop.
+
+        Falls back to the synchronous query when no async session is configured.
+
+        Args:
+            share_id: The share identifier
+
+        Returns:
+            SharedChats object if found, None otherwise
+        """
+        if self.async_db is None:
+            return self.get_by_share_id(share_id)
+
+        try:
+            statement = select(SharedChats).where(
+                SharedChats.share_id == share_id,
+                SharedChats.is_active == True
+            )
+            return (await self.async_db.exec(statement)).first()
+
+        except Exception as e:
+            logger.error(f"Failed to get shared chat {share_id}: {e}")
+            return None
+
     def get_by_id(self, id: str) -> Optional[SharedChats]:
         """
         Get shared chat by primary key ID.
@@ -103,40 +134,120 @@ class SharedChatDAO:
             logger.error(f"Failed to get shared chat by id {id}: {e}")
             return None
 
-    def get_by_user(
+    @staticmethod
+    def _summaries_statement(
+        user_id: str,
+        limit: int,
+        offset: int,
+        after: Optional[Tuple[datetime, str]]
+    ):
+        """
+        Build the listing query for a user's shared chats.
+
+        Only the summary columns are selected so the JSON blobs (messages,
+        model config, prompt meta) are never read. Rows are ordered newest
+        first on (created_at, id), which the listing index covers.
+
+        Args:
+            user_id: User ID
+            limit: Maximum number of records to return
+            offset: Number of records to skip (ignored when after is given)
+            after: (created_at, id) of the last row of the previous page
+
+        Returns:
+            Select statement yielding summary rows
+        """
+        statement = (
+            select(
+                SharedChats.id,
+                SharedChats.share_id,
+                SharedChats.title,
+                SharedChats.total_tokens,
+                SharedChats.total_cost,
+                SharedChats.message_count,
+                SharedChats.created_at,
+            )
+            .where(
+                SharedChats.created_by == user_id,
+                SharedChats.is_active == True
+            )
+            .order_by(SharedChats.created_at.desc(), SharedChats.id.desc())
+            .limit(limit)
+        )
+
+        if after is not None:
+            created_at, chat_id = after
+            statement = statement.where(
+                or_(
+                    SharedChats.created_at < created_at,
+                    and_(SharedChats.created_at == created_at, SharedChats.id < chat_id)
+                )
+            )
+        elif offset:
+            statement = statement.offset(offset)
+
+        return statement
+
+    def get_summaries_by_user(
         self,
         user_id: str,
         limit: int = 50,
-        offset: int = 0
-    ) -> List[SharedChats]:
+        offset: int = 0,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Row]:
         """
-        Get all shared chats created by a user.
+        Get summary rows of the shared chats created by a user.
 
         Args:
             user_id: User ID
             limit: Maximum number of records to return
-            offset: Number of records to skip
+            offset: Number of records to skip (ignored when after is given)
+            after: (created_at, id) keyset cursor of the previous page
 
         Returns:
-            List of SharedChats objects
+            List of rows with id, share_id, title, total_tokens, total_cost,
+            message_count and created_at
         """
         try:
-            statement = (
-                select(SharedChats)
-                .where(
-                    SharedChats.created_by == user_id,
-                    SharedChats.is_active == True
-                )
-                .order_by(SharedChats.created_at.desc())
-                .offset(offset)
-                .limit(limit)
-            )
+            statement = self._summaries_statement(user_id, limit, offset, after)
             return list(self.db.exec(statement).all())
 
         except Exception as e:
             logger.error(f"Failed to get shared chats for user {user_id}: {e}")
             return []
 
+    async def aget_summaries_by_user(
+        self,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Row]:
+        """
+        Get summary rows of a user's shared chats without blocking the event loop.
+
+        Falls back to the synchronous query when no async session is configured.
+
+        Args:
+            user_id: User ID
+            limit: Maximum number of records to return
+            offset: Number of records to skip (ignored when after is given)
+            after: (created_at, id) keyset cursor of the previous page
+
+        Returns:
+            List of summary rows
+        """
+        if self.async_db is None:
+            return self.get_summaries_by_user(user_id, limit, offset, after)
+
+        try:
+            statement = self._summaries_statement(user_id, limit, offset, after)
+            return list((await self.async_db.exec(statement)).all())
+
+        except Exception as e:
+            logger.error(f"Failed to get shared chats for user {user_id}: {e}")
+            return []
+
     def delete(self, share_id: str, user_id: str) -> bool:
         """
         Soft delete a shared chat (only if owned by user).
@@ -3,6 +3,7 @@ Service for managing user sessions in the database.
 Handles data access operations for the user_sessions table.
 """
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from database.models.user_sessions import UserSessions
 from datetime import datetime, timedelta, UTC
 from typing import Optional, List
@@ -15,14 +16,16 @@ logger = logging.getLogger(__name__)
 class UserSessionDAO:
     """Service for managing user sessions."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, async_db: Optional[AsyncSession] = None):
         """
         Initialize UserSessionDAO with database session.
 
         Args:
             db: Database session
+            async_db: Optional asyncio database session used by the async methods
         """
         self.db = db
+        self.async_db = async_db
 
     @staticmethod
     def generate_session_key() -> str:
@@ -89,6 +92,29 @@ class UserSessionDAO:
             logger.error(f"Failed to get session {session_id}: {e}")
             return None
 
+    async def aget_session_by_id(self, session_id: str) -> Optional[UserSessions]:
+        """
+        Get user session by session_id without blocking the event loop.
+
+        Falls back to the synchronous query when no async session is configured.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            UserSessions object if found, None otherwise
+        """
+        if self.async_db is None:
+            return self.get_session_by_id(session_id)
+
+        try:
+            statement = select(UserSessions).where(UserSessions.session_id == session_id)
+            return (await self.async_db.exec(statement)).first()
+
+        except Exception as e:
+            logger.error(f"Failed to get session {session_id}: {e}")
+            return None
+
     def get_sessions_by_user_id(self, user_id: str) -> List[UserSessions]:
         """
         Get all active sessions for a user.
@@ -3,15 +3,69 @@ Database Adapter Interface and Implementations
 Following the Strategy Pattern and SOLID principles
 """
 from abc import ABC, abstractmethod
-from typing import Generator, Dict, Any, Optional
+from typing import AsyncGenerator, Generator, Dict, Any, Optional
 from sqlmodel import SQLModel, Session as SQLSession, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as SQLAlchemyTimeoutError
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+import importlib.util
 import os
+import threading
 from urllib.parse import urlparse
 import logging
 
+from lib.metrics import instrument_engine
+
 logger = logging.getLogger(__name__)
 
+# URL scheme of the async driver used for each sync scheme (and vice versa), so
+# one DATABASE_URL serves both the sync and the async engine
+ASYNC_DRIVER_SCHEMES = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql+mysqldb": "mysql+aiomysql",
+}
+SYNC_DRIVER_SCHEMES = {
+    "sqlite+aiosqlite": "sqlite",
+    "postgresql+asyncpg": "postgresql",
+    "mysql+aiomysql": "mysql+pymysql",
+}
+# Module of each async driver; without it installed the sync session is used instead
+ASYNC_DRIVER_MODULES = {
+    "sqlite+aiosqlite": "aiosqlite",
+    "postgresql+asyncpg": "asyncpg",
+    "mysql+aiomysql": "aiomysql",
+}
+
+
+# Pragmas of the SQLite production profile. WAL lets readers proceed while a
+# write is in progress; NORMAL synchronous is durable across application crashes
+# in WAL mode; busy_timeout makes cross-process writers wait instead of failing
+# with "database is locked".
+SQLITE_PERFORMANCE_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # negative = KiB, i.e. 64 MiB
+    "temp_store": "MEMORY",
+}
+
+
+def _replace_scheme(database_url: str, schemes: Dict[str, str]) -> str:
+    """Swap the URL scheme according to the mapping, leaving unknown schemes untouched."""
+    scheme, separator, rest = database_url.partition("://")
+    replacement = schemes.get(scheme.lower())
+    if not separator or replacement is None:
+        return database_url
+    return f"{replacement}://{rest}"
+
 
 class DatabaseAdapter(ABC):
     """
@@ -23,6 +77,32 @@ class DatabaseAdapter(ABC):
         self.database_url = database_url
         self.echo = echo
         self._engine: Optional[Engine] = None
+        self._async_engine: Optional[AsyncEngine] = None
+        self._async_driver_available: Optional[bool] = None
+
+    @property
+    def sync_database_url(self) -> str:
+        """Database URL using a synchronous driver"""
+        return _replace_scheme(self.database_url, SYNC_DRIVER_SCHEMES)
+
+    @property
+    def async_database_url(self) -> str:
+        """Database URL using an asyncio driver (aiosqlite, asyncpg, aiomysql)"""
+        return _replace_scheme(self.database_url, ASYNC_DRIVER_SCHEMES)
+
+    @property
+    def async_driver_available(self) -> bool:
+        """Whether the async driver of the database URL is installed"""
+        if self._async_driver_available is None:
+            scheme = self.async_database_url.partition("://")[0].lower()
+            module = ASYNC_DRIVER_MODULES.get(scheme)
+            self._async_driver_available = module is not None and importlib.util.find_spec(module) is not None
+            if not self._async_driver_available:
+                logger.warning(
+                    f"No async driver installed for '{scheme}' (expected {module or 'a known driver'}); "
+                    "request-path queries use the sync session"
+                )
+        return self._async_driver_available
     
     @abstractmethod
     def create_engine(self) -> Engine:
@@ -45,8 +125,30 @@ class DatabaseAdapter(ABC):
         if self._engine is None:
             self.prepare_database()
             self._engine = self.create_engine()
+            instrument_engine(self._engine)
         return self._engine
     
+    def get_async_engine_args(self) -> Dict[str, Any]:
+        """Get database-specific keyword arguments for the async engine"""
+        return {}
+
+    def create_async_engine(self) -> AsyncEngine:
+        """Create and return the asyncio engine with appropriate configuration"""
+        return create_async_engine(
+            self.async_database_url,
+            echo=self.echo,
+            **self.get_async_engine_args()
+        )
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        """Lazy initialization of the asyncio engine"""
+        if self._async_engine is None:
+            self.prepare_database()
+            self._async_engine = self.create_async_engine()
+            instrument_engine(self._async_engine.sync_engine)
+        return self._async_engine
+    
     def create_tables(self) -> None:
         """Create all database tables"""
         SQLModel.metadata.create_all(self.engine)
@@ -56,12 +158,131 @@ class DatabaseAdapter(ABC):
         with SQLSession(self.engine) as session:
             yield session
 
+    async def get_async_session(self) -> AsyncGenerator[Optional[AsyncSession], None]:
+        """Get asyncio database session; None when the async driver is not installed"""
+        if not self.async_driver_available:
+            yield None
+            return
+        # Objects stay usable after commit without an implicit (awaitable) refresh
+        async with AsyncSession(self.async_engine, expire_on_commit=False) as session:
+            yield session
+
+    async def dispose(self) -> None:
+        """Release pooled connections of both engines"""
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+            self._async_engine = None
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+
+
+class SQLiteSingleWriterSession(SQLSession):
+    """
+    Session that holds the adapter's writer lock from its first write until its
+    transaction ends.
+
+    All statements of the session run on one connection in one transaction, so
+    it reads its own uncommitted writes. The lock only makes writing
+    transactions of this process queue for each other instead of contending
+    for the database lock.
+    """
+
+    def __init__(self, bind: Engine, writer_lock: threading.Lock, lock_timeout: float, **kwargs: Any):
+        super().__init__(bind=bind, **kwargs)
+        self._writer_lock = writer_lock
+        self._lock_timeout = lock_timeout
+        self._holds_writer_lock = False
+
+    def acquire_writer_lock(self) -> None:
+        """Take the writer lock unless this session already holds it"""
+        if self._holds_writer_lock:
+            return
+        if not self._writer_lock.acquire(timeout=self._lock_timeout):
+            raise SQLAlchemyTimeoutError(
+                f"Timed out after {self._lock_timeout}s waiting for the SQLite writer lock"
+            )
+        self._holds_writer_lock = True
+
+    def release_writer_lock(self) -> None:
+        """Release the writer lock if this session holds it"""
+        if self._holds_writer_lock:
+            self._holds_writer_lock = False
+            self._writer_lock.release()
+
+
+@event.listens_for(SQLiteSingleWriterSession, "before_flush")
+def _lock_before_flush(session: SQLiteSingleWriterSession, flush_context: Any, instances: Any) -> None:
+    session.acquire_writer_lock()
+
+
+@event.listens_for(SQLiteSingleWriterSession, "do_orm_execute")
+def _lock_before_dml(orm_execute_state: Any) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.acquire_writer_lock()
+
+
+@event.listens_for(SQLiteSingleWriterSession, "after_transaction_end")
+def _unlock_after_transaction(session: SQLiteSingleWriterSession, transaction: Any) -> None:
+    if transaction.parent is None:
+        session.release_writer_lock()
+
 
 class SQLiteAdapter(DatabaseAdapter):
     """
     SQLite-specific database adapter implementation.
     Handles SQLite-specific configuration and file management.
+
+    The opt-in production profile (sqlite_production_profile) applies the
+    performance pragmas, including WAL, to every connection and serializes
+    writing sessions of file databases with a writer lock, so concurrent
+    writers in this process queue instead of contending for the database lock.
     """
+
+    def __init__(
+        self,
+        database_url: str,
+        echo: bool = False,
+        production_profile: bool = False,
+        pragmas: Optional[Dict[str, Any]] = None,
+        single_writer: Optional[bool] = None,
+        writer_lock_timeout: float = 60.0
+    ):
+        super().__init__(database_url, echo)
+        self.production_profile = production_profile
+        if pragmas is None:
+            pragmas = SQLITE_PERFORMANCE_PRAGMAS if production_profile else {}
+        self.pragmas = dict(pragmas)
+        self.single_writer = production_profile if single_writer is None else single_writer
+        self.writer_lock_timeout = writer_lock_timeout
+        self._writer_lock = threading.Lock()
+
+    @property
+    def is_memory_database(self) -> bool:
+        """Whether the URL points at an in-memory database (one per connection)"""
+        path = self.sync_database_url.replace('sqlite://', '', 1).lstrip('/')
+        return path in ("", ":memory:") or "mode=memory" in path
+
+    def get_pragmas(self) -> Dict[str, Any]:
+        """Pragmas applied on connect; WAL does not apply to in-memory databases"""
+        if self.is_memory_database:
+            return {name: value for name, value in self.pragmas.items() if name != "journal_mode"}
+        return self.pragmas
+
+    def _register_pragmas(self, engine: Engine) -> None:
+        """Apply the configured pragmas to every new DBAPI connection of engine"""
+        pragmas = self.get_pragmas()
+        if not pragmas:
+            return
+
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            finally:
+                cursor.close()
     
     def get_connection_args(self) -> Dict[str, Any]:
         """SQLite specific connection arguments"""
@@ -70,7 +291,7 @@ class SQLiteAdapter(DatabaseAdapter):
     def prepare_database(self) -> None:
         """Ensure SQLite database file and directory exist"""
         # Extract file path from SQLite URL
-        database_path = self.database_url.replace('sqlite:///', '')
+        database_path = self.sync_database_url.replace('sqlite:///', '')
         if not database_path:
             database_path = "promptrepo.db"
         
@@ -96,11 +317,34 @@ class SQLiteAdapter(DatabaseAdapter):
     
     def create_engine(self) -> Engine:
         """Create SQLite engine with appropriate configuration"""
-        return create_engine(
-            self.database_url,
+        engine = create_engine(
+            self.sync_database_url,
             echo=self.echo,
             connect_args=self.get_connection_args()
         )
+        self._register_pragmas(engine)
+        return engine
+
+    @property
+    def uses_writer_queue(self) -> bool:
+        """Writing sessions are serialized for file databases only"""
+        return self.single_writer and not self.is_memory_database
+
+    def create_async_engine(self) -> AsyncEngine:
+        """Create the asyncio (aiosqlite) engine with the same pragmas"""
+        engine = super().create_async_engine()
+        self._register_pragmas(engine.sync_engine)
+        return engine
+
+    def get_session(self) -> Generator[SQLSession, None, None]:
+        """Get database session, serializing writing sessions in the production profile"""
+        if not self.uses_writer_queue:
+            yield from super().get_session()
+            return
+        with SQLiteSingleWriterSession(
+            self.engine, writer_lock=self._writer_lock, lock_timeout=self.writer_lock_timeout
+        ) as session:
+            yield session
 
 
 class PostgreSQLAdapter(DatabaseAdapter):
@@ -125,11 +369,15 @@ class PostgreSQLAdapter(DatabaseAdapter):
         """
         pass
     
+    def get_async_engine_args(self) -> Dict[str, Any]:
+        """PostgreSQL (asyncpg) pool settings, mirroring the sync engine"""
+        return self.get_connection_args()
+
     def create_engine(self) -> Engine:
         """Create PostgreSQL engine with appropriate configuration"""
         # For PostgreSQL, we pass pool settings directly to create_engine
         return create_engine(
-            self.database_url,
+            self.sync_database_url,
             echo=self.echo,
             pool_size=10,
             max_overflow=20,
@@ -157,10 +405,14 @@ class MySQLAdapter(DatabaseAdapter):
         """MySQL preparation logic"""
         pass
     
+    def get_async_engine_args(self) -> Dict[str, Any]:
+        """MySQL (aiomysql) pool settings, mirroring the sync engine"""
+        return self.get_connection_args()
+
     def create_engine(self) -> Engine:
         """Create MySQL engine with appropriate configuration"""
         return create_engine(
-            self.database_url,
+            self.sync_database_url,
             echo=self.echo,
             pool_size=10,
             max_overflow=20,
@@ -22,13 +22,18 @@ class DatabaseFactory:
     """
     
     @staticmethod
-    def create_adapter(database_url: str, echo: bool = False) -> DatabaseAdapter:
+    def create_adapter(
+        database_url: str,
+        echo: bool = False,
+        sqlite_production_profile: bool = False
+    ) -> DatabaseAdapter:
         """
         Create and return appropriate database adapter based on the database URL scheme.
         
         Args:
             database_url: Database connection URL
             echo: Whether to echo SQL statements
+            sqlite_production_profile: Use WAL, tuned pragmas and a writer lock for SQLite
             
         Returns:
             DatabaseAdapter: Appropriate adapter instance for the database type
@@ -42,6 +47,7 @@ class DatabaseFactory:
         # Map database schemes to their respective adapters
         adapters_map = {
             'sqlite': SQLiteAdapter,
+            'sqlite+aiosqlite': SQLiteAdapter,
             'postgresql': PostgreSQLAdapter,
             'postgresql+psycopg2': PostgreSQLAdapter,
             'postgresql+asyncpg': PostgreSQLAdapter,
@@ -49,6 +55,7 @@ class DatabaseFactory:
             'mysql': MySQLAdapter,
             'mysql+pymysql': MySQLAdapter,
             'mysql+mysqldb': MySQLAdapter,
+            'mysql+aiomysql': MySQLAdapter,
         }
         
         # Get the appropriate adapter class
@@ -62,7 +69,10 @@ class DatabaseFactory:
             )
         
         # Create and return the adapter instance
-        adapter = adapter_class(database_url, echo)
+        if adapter_class is SQLiteAdapter:
+            adapter = SQLiteAdapter(database_url, echo, production_profile=sqlite_production_profile)
+        else:
+            adapter = adapter_class(database_url, echo)
         logger.info(f"Created {adapter_class.__name__} for database: {scheme}")
         
         return adapter
@@ -76,7 +86,7 @@ class DatabaseManager:
     _instance: Optional['DatabaseManager'] = None
     _adapter: Optional[DatabaseAdapter] = None
     
-    def __new__(cls, database_url: Optional[str] = None, echo: bool = False):
+    def __new__(cls, database_url: Optional[str] = None, echo: bool = False, **adapter_options: bool):
         """
         Singleton pattern implementation.
         """
@@ -84,13 +94,18 @@ class DatabaseManager:
             cls._instance = super().__new__(cls)
         return cls._instance
     
-    def __init__(self, database_url: Optional[str] = None, echo: bool = False):
+    def __init__(self, database_url: Optional[str] = None, echo: bool = False, **adapter_options: bool):
         """
         Initialize the database manager with an adapter.
         Only initializes on first creation due to singleton pattern.
+
+        Args:
+            database_url: Database connection URL
+            echo: Whether to echo SQL statements
+            **adapter_options: Options passed to DatabaseFactory.create_adapter
         """
         if self._adapter is None and database_url:
-            self._adapter = DatabaseFactory.create_adapter(database_url, echo)
+            self._adapter = DatabaseFactory.create_adapter(database_url, echo, **adapter_options)
     
     @property
     def adapter(self) -> DatabaseAdapter:
@@ -116,11 +131,25 @@ class DatabaseManager:
     def get_session(self):
         """Get database session."""
         return self.adapter.get_session()
+
+    def get_async_session(self):
+        """Get asyncio database session."""
+        return self.adapter.get_async_session()
     
     @property
     def engine(self):
         """Get database engine."""
         return self.adapter.engine
+
+    @property
+    def async_engine(self):
+        """Get asyncio database engine."""
+        return self.adapter.async_engine
+
+    async def dispose(self) -> None:
+        """Close pooled connections of the current adapter."""
+        if self._adapter is not None:
+            await self._adapter.dispose()
     
     def reset(self) -> None:
         """
@@ -0,0 +1,80 @@
+# backend/migrations/versions/add_shared_chats_listing_index.py
+"""Add shared_chats listing index and message_count
+
+Revision ID: add_shared_chats_listing_index
+Revises: add_user_repos_table
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_shared_chats_listing_index'
+down_revision: Union[str, Sequence[str], None] = 'add_user_repos_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_shared_chats_created_by_listing'
+
+
+def upgrade() -> None:
+    """Add message_count and the composite index used by the keyset listing."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    # shared_chats may not exist yet on databases that have never created it;
+    # create_all will then build it with the column and index from the model.
+    if 'shared_chats' not in inspector.get_table_names():
+        return
+
+    columns = {column['name'] for column in inspector.get_columns('shared_chats')}
+    if 'message_count' not in columns:
+        op.add_column(
+            'shared_chats',
+            sa.Column('message_count', sa.Integer(), nullable=False, server_default='0')
+        )
+
+        # Backfill from the stored messages blob
+        shared_chats = sa.table(
+            'shared_chats',
+            sa.column('id', sa.String()),
+            sa.column('messages', sa.JSON()),
+            sa.column('message_count', sa.Integer()),
+        )
+        rows = bind.execute(sa.select(shared_chats.c.id, shared_chats.c.messages)).all()
+        for chat_id, messages in rows:
+            count = len((messages or {}).get('messages', []))
+            if count:
+                bind.execute(
+                    shared_chats.update()
+                    .where(shared_chats.c.id == chat_id)
+                    .values(message_count=count)
+                )
+
+    indexes = {index['name'] for index in inspector.get_indexes('shared_chats')}
+    if INDEX_NAME not in indexes:
+        op.create_index(
+            INDEX_NAME,
+            'shared_chats',
+            ['created_by', 'is_active', 'created_at', 'id'],
+            unique=False
+        )
+
+
+def downgrade() -> None:
+    """Remove the listing index and message_count."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'shared_chats' not in inspector.get_table_names():
+        return
+
+    indexes = {index['name'] for index in inspector.get_indexes('shared_chats')}
+    if INDEX_NAME in indexes:
+        op.drop_index(INDEX_NAME, table_name='shared_chats')
+
+    columns = {column['name'] for column in inspector.get_columns('shared_chats')}
+    if 'message_count' in columns:
+        with op.batch_alter_table('shared_chats') as batch_op:
+            batch_op.drop_column('message_count')
@@ -3,7 +3,7 @@ Model for shared chat sessions.
 Stores chat sessions that users want to share via public links.
 """
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import DateTime, JSON, Text
+from sqlalchemy import DateTime, Index, JSON, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime, UTC
 from typing import Optional, Any
@@ -14,6 +14,13 @@ class SharedChats(SQLModel, table=True):
     """Database model for shared chat sessions."""
 
     __tablename__ = "shared_chats"
+    __table_args__ = (
+        # Serves the per-user listing: filter on owner/active, keyset on (created_at, id)
+        Index(
+            "ix_shared_chats_created_by_listing",
+            "created_by", "is_active", "created_at", "id"
+        ),
+    )
 
     # Primary key as UUID
     id: str = Field(
@@ -64,6 +71,12 @@ class SharedChats(SQLModel, table=True):
         description="Total cost of session"
     )
 
+    # Denormalized so listings don't need to read the messages blob
+    message_count: int = Field(
+        default=0,
+        description="Number of messages in the session"
+    )
+
     # Owner tracking (nullable for anonymous shares)
     created_by: Optional[str] = Field(
         default=None,
@@ -4,13 +4,18 @@ Provides unified interface for all providers including custom ones.
 """
 from __future__ import annotations
 
+import time
 from typing import TYPE_CHECKING, Any, Sequence, Union
 
+from any_llm.any_llm import AnyLLM
 from any_llm.api import acompletion as any_llm_acompletion
 from any_llm.api import alist_models as any_llm_alist_models
 from any_llm.constants import LLMProvider
 
 from lib.any_llm.litellm_provider import LiteLLMProvider
+from lib.metrics import observe_llm_call
+from lib.rate_limit import estimate_tokens, get_provider_rate_limiter
+from lib.tracing import get_tracer, set_span_attributes, traced
 from lib.any_llm.synthetics_new_provider import SyntheticsNewProvider
 from lib.any_llm.zai_provider import ZAIProvider
 
@@ -29,56 +34,121 @@ CUSTOM_PROVIDERS = {
 }
 
 
+def create_provider_client(
+    provider: str,
+    api_key: str | None = None,
+    api_base: str | None = None,
+) -> AnyLLM:
+    """
+    Create a reusable provider instance, including custom providers.
+
+    Unlike acompletion, which builds a provider (and its HTTP client) per call,
+    the returned instance can serve many completions over the same connections.
+    It must be used from a single event loop.
+
+    Args:
+        provider: Provider name (e.g. "openai", "zai")
+        api_key: API key for the provider
+        api_base: Base URL for the provider API
+
+    Returns:
+        AnyLLM provider instance
+    """
+    provider_class = CUSTOM_PROVIDERS.get(provider.lower())
+    if provider_class is not None:
+        return provider_class(api_key=api_key, api_base=api_base)
+    return AnyLLM.create(provider, api_key=api_key, api_base=api_base)
+
+
 async def acompletion(
     model: str,
     messages: Sequence[Union[dict[str, Any], "ChatCompletionMessage"]],
     api_key: str | None = None,
     api_base: str | None = None,
+    provider: str | None = None,
     **kwargs: Any,
 ) -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
     """
     Unified completion function that supports both any_llm providers and custom providers.
     
+    Every call is metered by the process-wide provider rate limiter and
+    retried after provider rate limits.
+    
     Args:
         model: Model ID in format "provider/model" or just "model"
         messages: List of message dictionaries
         api_key: API key for the provider
         api_base: Base URL for the provider API
+        provider: Provider name, required when model has no provider prefix
         **kwargs: Additional parameters (temperature, max_tokens, stream, etc.)
     
     Returns:
         ChatCompletion for non-streaming, AsyncIterator[ChatCompletionChunk] for streaming
     """
     # Extract provider from model string
-    provider = None
     model_id = model
     
-    if "/" in model:
+    if provider:
+        provider = str(provider)
+    elif "/" in model:
         provider, model_id = model.split("/", 1)
     elif ":" in model:
         provider, model_id = model.split(":", 1)
+    else:
+        # Calls are metered per provider, so the provider must be known
+        raise ValueError(f"Model '{model}' has no provider prefix; pass 'provider/model' or provider")
     
-    # Check if this is a custom provider
-    if provider and provider.lower() in CUSTOM_PROVIDERS:
-        provider_class = CUSTOM_PROVIDERS[provider.lower()]
-        provider_instance = provider_class(api_key=api_key, api_base=api_base)
+    span_attributes = {"gen_ai.system": provider, "gen_ai.request.model": model_id}
+
+    # One span per attempt; the gap to the enclosing span is rate-limiter wait
+    @traced("llm.provider_call", **span_attributes)
+    async def send() -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
+        started = time.perf_counter()
+        try:
+            response = await call_provider()
+        except Exception as e:
+            observe_llm_call(provider, model_id, time.perf_counter() - started, error=e)
+            raise
+        observe_llm_call(provider, model_id, time.perf_counter() - started, response=response)
+        usage = getattr(response, "usage", None)
+        set_span_attributes(**{
+            "gen_ai.usage.input_tokens": getattr(usage, "prompt_tokens", None),
+            "gen_ai.usage.output_tokens": getattr(usage, "completion_tokens", None),
+        })
+        return response
+
+    async def call_provider() -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
+        # Check if this is a custom provider
+        if provider.lower() in CUSTOM_PROVIDERS:
+            provider_class = CUSTOM_PROVIDERS[provider.lower()]
+            provider_instance = provider_class(api_key=api_key, api_base=api_base)
+            
+            # Use the provider's acompletion method directly with model and messages
+            # Convert Sequence to list for provider compatibility
+            return await provider_instance.acompletion(
+                model=model_id,
+                messages=list(messages),
+                **kwargs
+            )
         
-        # Use the provider's acompletion method directly with model and messages
-        # Convert Sequence to list for provider compatibility
-        return await provider_instance.acompletion(
+        # Use any_llm for built-in providers
+        return await any_llm_acompletion(
             model=model_id,
+            provider=provider,
             messages=list(messages),
-            **kwargs
+            api_key=api_key,
+            api_base=api_base,
+            **kwargs,
         )
     
-    # Use any_llm for built-in providers
-    return await any_llm_acompletion(
-        model=model,
-        messages=list(messages),
-        api_key=api_key,
-        api_base=api_base,
-        **kwargs,
-    )
+    with get_tracer().start_as_current_span("llm.completion", attributes=span_attributes):
+        return await get_provider_rate_limiter().call(
+            provider,
+            model_id,
+            send,
+            api_key=api_key,
+            tokens=estimate_tokens(messages, kwargs.get("max_tokens")),
+        )
 
 
 async def alist_models(
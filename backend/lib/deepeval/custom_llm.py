@@ -5,13 +5,12 @@ This module provides a custom LLM class that integrates with DeepEval's
 metric evaluation system using our existing any_llm infrastructure.
 """
 
-import asyncio
 import logging
 from typing import Optional
 
 from deepeval.models import DeepEvalBaseLLM
 
-from lib.any_llm.any_llm_adapter import acompletion
+from lib.deepeval.judge_runtime import get_judge_runtime
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +61,9 @@ class CustomDeepEvalLLM(DeepEvalBaseLLM):
         """
         Generate completion for the given prompt (synchronous).
 
+        The completion runs on the shared judge runtime loop, so no thread or
+        event loop is created per call and provider connections are reused.
+
         Args:
             prompt: The prompt to generate completion for
             schema: Optional JSON schema for structured output
@@ -69,23 +71,7 @@ class CustomDeepEvalLLM(DeepEvalBaseLLM):
         Returns:
             Generated text response
         """
-        # Run async method in sync context
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If we're in an async context, create a new loop
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(
-                        asyncio.run,
-                        self.a_generate(prompt, schema)
-                    )
-                    return future.result()
-            else:
-                return loop.run_until_complete(self.a_generate(prompt, schema))
-        except RuntimeError:
-            # No event loop exists, create one
-            return asyncio.run(self.a_generate(prompt, schema))
+        return get_judge_runtime().run(self.a_generate(prompt, schema))
 
     async def a_generate(self, prompt: str, schema: Optional[dict] = None) -> str:
         """
@@ -113,8 +99,9 @@ class CustomDeepEvalLLM(DeepEvalBaseLLM):
             }
 
         try:
-            response = await acompletion(
-                model=self._full_model_id,
+            response = await get_judge_runtime().complete(
+                provider=self.provider,
+                model=self.model_name,
                 messages=messages,
                 api_key=self.api_key,
                 api_base=self.api_base,
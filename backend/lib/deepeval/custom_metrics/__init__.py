@@ -3,26 +3,34 @@ Custom DeepEval metrics for specialized evaluations.
 
 This module contains custom metrics that extend DeepEval's functionality
 for specific evaluation needs like professionalism and conciseness.
+
+Metric classes are imported on first access, so resolving one metric does
+not import the others (or DeepEval's metric stack along with them).
 """
 
-from .professionalism_metric import ProfessionalismMetric
-from .conciseness_metric import ConcisenessMetric
-from .exact_match_metric import ExactMatchMetric
-from .tools_called_metric import ToolsCalledMetric
-from .json_schema_verification_metric import JsonSchemaVerificationMetric
-from .keyword_pattern_presence_metric import KeywordPatternPresenceMetric
-from .output_length_metric import OutputLengthMetric
-from .fuzzy_match_metric import FuzzyMatchMetric
-from .semantic_similarity_metric import SemanticSimilarityMetric
+import importlib
+from typing import Any
+
+# Submodule defining each exported metric class
+_METRIC_MODULES = {
+    "ProfessionalismMetric": "professionalism_metric",
+    "ConcisenessMetric": "conciseness_metric",
+    "ExactMatchMetric": "exact_match_metric",
+    "ToolsCalledMetric": "tools_called_metric",
+    "JsonSchemaVerificationMetric": "json_schema_verification_metric",
+    "KeywordPatternPresenceMetric": "keyword_pattern_presence_metric",
+    "OutputLengthMetric": "output_length_metric",
+    "FuzzyMatchMetric": "fuzzy_match_metric",
+    "SemanticSimilarityMetric": "semantic_similarity_metric",
+}
+
+__all__ = list(_METRIC_MODULES)
+
 
-__all__ = [
-    "ProfessionalismMetric",
-    "ConcisenessMetric",
-    "ExactMatchMetric",
-    "ToolsCalledMetric",
-    "JsonSchemaVerificationMetric",
-    "KeywordPatternPresenceMetric",
-    "OutputLengthMetric",
-    "FuzzyMatchMetric",
-    "SemanticSimilarityMetric",
-]
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    module_name = _METRIC_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    metric_class = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = metric_class
+    return metric_class
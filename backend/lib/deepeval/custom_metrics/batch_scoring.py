@@ -0,0 +1,24 @@
+"""
+Batch scoring support for the deterministic metrics.
+
+Deterministic metrics expose measure_batch(test_cases), scoring every test
+case of an eval run in one call instead of one metric instance per test:
+patterns are compiled once, each distinct output is normalized or tokenized
+once and repeated comparisons are scored once. Batch scores match measure()
+for the same test case; a test case that measure() would reject gets an
+error instead.
+"""
+
+from typing import NamedTuple, Optional
+
+
+class BatchMeasurement(NamedTuple):
+    """Score and reason measured for one test case of a batch."""
+    score: float
+    reason: str
+    error: Optional[str] = None
+
+    @classmethod
+    def failed(cls, error: str) -> "BatchMeasurement":
+        """Measurement of a test case that could not be scored."""
+        return cls(score=0.0, reason="", error=error)
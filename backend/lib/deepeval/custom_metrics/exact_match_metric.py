@@ -5,10 +5,31 @@ This deterministic metric compares the actual output exactly against
 the expected output to determine if they match precisely.
 """
 
-from typing import Optional
+from typing import List, Optional, Tuple
 from deepeval.metrics import BaseMetric
 from deepeval.test_case import LLMTestCase
 
+from .batch_scoring import BatchMeasurement
+
+
+def exact_match(expected_output: str, actual_output: str) -> Tuple[float, str]:
+    """
+    Compare outputs exactly, ignoring surrounding whitespace.
+
+    Args:
+        expected_output: Expected output
+        actual_output: Actual output
+
+    Returns:
+        (score, reason)
+    """
+    if actual_output.strip() == expected_output.strip():
+        return 1.0, "Actual output exactly matches the expected output"
+    return 0.0, (
+        f"Actual output does not match expected output. "
+        f"Expected: '{expected_output}', Got: '{actual_output}'"
+    )
+
 
 class ExactMatchMetric(BaseMetric):
     """
@@ -52,19 +73,7 @@ class ExactMatchMetric(BaseMetric):
                 self.error = "Actual output is required for exact match evaluation"
                 raise ValueError(self.error)
             
-            # Perform exact string comparison with None checks
-            actual = test_case.actual_output.strip()
-            expected = test_case.expected_output.strip()
-            is_exact_match = actual == expected
-            
-            # Set score based on exact match
-            self.score = 1.0 if is_exact_match else 0.0
-            
-            # Set reason
-            if is_exact_match:
-                self.reason = "Actual output exactly matches the expected output"
-            else:
-                self.reason = f"Actual output does not match expected output. Expected: '{test_case.expected_output}', Got: '{test_case.actual_output}'"
+            self.score, self.reason = exact_match(test_case.expected_output, test_case.actual_output)
             
             # For exact match, success is based on whether there was an exact match
             self.success = self.score == 1.0
@@ -88,6 +97,28 @@ class ExactMatchMetric(BaseMetric):
         """
         return self.measure(test_case)
     
+    def measure_batch(self, test_cases: List[LLMTestCase]) -> List[BatchMeasurement]:
+        """
+        Measure exact matches for many test cases at once.
+
+        Args:
+            test_cases: Test cases to score
+
+        Returns:
+            One BatchMeasurement per test case, in order
+        """
+        measurements: List[BatchMeasurement] = []
+        for test_case in test_cases:
+            if not test_case.expected_output:
+                measurements.append(BatchMeasurement.failed("Expected output is required for exact match evaluation"))
+            elif not test_case.actual_output:
+                measurements.append(BatchMeasurement.failed("Actual output is required for exact match evaluation"))
+            else:
+                measurements.append(BatchMeasurement(
+                    *exact_match(test_case.expected_output, test_case.actual_output)
+                ))
+        return measurements
+
     def is_successful(self) -> bool:
         """Check if the metric passed the threshold."""
         return self.success if self.success is not None else False
\ No newline at end of file
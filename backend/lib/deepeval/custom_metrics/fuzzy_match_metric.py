@@ -8,10 +8,50 @@ minor differences like whitespace, punctuation, or case variations.
 
 import json
 from difflib import SequenceMatcher
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from deepeval.metrics import BaseMetric
 from deepeval.test_case import LLMTestCase
 
+from .batch_scoring import BatchMeasurement
+
+
+def normalize_whitespace(text: str) -> str:
+    """Strip text and collapse runs of whitespace into single spaces."""
+    return ' '.join(text.strip().split())
+
+
+def similarity_reason(similarity_ratio: float) -> str:
+    """Describe a fuzzy similarity ratio."""
+    if similarity_ratio >= 0.95:
+        return f"Very high similarity ({similarity_ratio:.2f}) - outputs are essentially identical"
+    elif similarity_ratio >= 0.8:
+        return f"High similarity ({similarity_ratio:.2f}) - outputs are very similar with minor differences"
+    elif similarity_ratio >= 0.6:
+        return f"Moderate similarity ({similarity_ratio:.2f}) - outputs have some similarities but notable differences"
+    return f"Low similarity ({similarity_ratio:.2f}) - outputs are significantly different"
+
+
+def fuzzy_similarity(expected: str, actual: str, matcher: Optional[SequenceMatcher] = None) -> Tuple[float, str]:
+    """
+    Sequence-matching similarity of two normalized strings.
+
+    Args:
+        expected: Normalized expected text
+        actual: Normalized actual text
+        matcher: Optional matcher to reuse; its second sequence is cached between calls
+
+    Returns:
+        (ratio, reason)
+    """
+    if expected == actual:
+        # SequenceMatcher gives identical strings a ratio of 1.0; skip the matching
+        similarity_ratio = 1.0
+    else:
+        matcher = matcher or SequenceMatcher(None)
+        matcher.set_seqs(expected, actual)
+        similarity_ratio = matcher.ratio()
+    return similarity_ratio, similarity_reason(similarity_ratio)
+
 
 class FuzzyMatchMetric(BaseMetric):
     """
@@ -61,26 +101,9 @@ class FuzzyMatchMetric(BaseMetric):
             expected_text = self._extract_text_from_output(test_case.expected_output)
             actual_text = self._extract_text_from_output(test_case.actual_output)
             
-            # Normalize both strings (remove extra whitespace, normalize case)
-            expected_normalized = ' '.join(expected_text.strip().split())
-            actual_normalized = ' '.join(actual_text.strip().split())
-            
-            # Use SequenceMatcher for fuzzy matching
-            matcher = SequenceMatcher(None, expected_normalized, actual_normalized)
-            similarity_ratio = matcher.ratio()
-            
-            # Set score
-            self.score = similarity_ratio
-            
-            # Set reason based on similarity level
-            if similarity_ratio >= 0.95:
-                self.reason = f"Very high similarity ({similarity_ratio:.2f}) - outputs are essentially identical"
-            elif similarity_ratio >= 0.8:
-                self.reason = f"High similarity ({similarity_ratio:.2f}) - outputs are very similar with minor differences"
-            elif similarity_ratio >= 0.6:
-                self.reason = f"Moderate similarity ({similarity_ratio:.2f}) - outputs have some similarities but notable differences"
-            else:
-                self.reason = f"Low similarity ({similarity_ratio:.2f}) - outputs are significantly different"
+            self.score, self.reason = fuzzy_similarity(
+                normalize_whitespace(expected_text), normalize_whitespace(actual_text)
+            )
             
             # Success based on configured threshold
             self.success = self.score >= self.threshold
@@ -104,6 +127,52 @@ class FuzzyMatchMetric(BaseMetric):
         """
         return self.measure(test_case)
     
+    def measure_batch(self, test_cases: List[LLMTestCase]) -> List[BatchMeasurement]:
+        """
+        Measure fuzzy similarity for many test cases at once.
+
+        Test cases are grouped by actual output so the matcher's index of it is
+        built once, and repeated (expected, actual) pairs are scored once.
+
+        Args:
+            test_cases: Test cases to score
+
+        Returns:
+            One BatchMeasurement per test case, in order
+        """
+        measurements: List[Optional[BatchMeasurement]] = [None] * len(test_cases)
+        by_actual: Dict[str, List[Tuple[int, str]]] = {}
+        for index, test_case in enumerate(test_cases):
+            if not test_case.expected_output:
+                measurements[index] = BatchMeasurement.failed(
+                    "Expected output is required for fuzzy match evaluation"
+                )
+                continue
+            if not test_case.actual_output:
+                measurements[index] = BatchMeasurement.failed(
+                    "Actual output is required for fuzzy match evaluation"
+                )
+                continue
+            try:
+                expected_text = normalize_whitespace(self._extract_text_from_output(test_case.expected_output))
+                actual_text = normalize_whitespace(self._extract_text_from_output(test_case.actual_output))
+            except ValueError as e:
+                measurements[index] = BatchMeasurement.failed(str(e))
+                continue
+            by_actual.setdefault(actual_text, []).append((index, expected_text))
+
+        for actual_text, cases in by_actual.items():
+            matcher = SequenceMatcher(None)
+            matcher.set_seq2(actual_text)
+            scored: Dict[str, BatchMeasurement] = {}
+            for index, expected_text in cases:
+                measurement = scored.get(expected_text)
+                if measurement is None:
+                    measurement = BatchMeasurement(*fuzzy_similarity(expected_text, actual_text, matcher))
+                    scored[expected_text] = measurement
+                measurements[index] = measurement
+        return measurements
+
     def is_successful(self) -> bool:
         """Check if metric passed threshold."""
         return self.success if self.success is not None else False
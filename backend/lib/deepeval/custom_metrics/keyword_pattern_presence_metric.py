@@ -6,10 +6,63 @@ keywords or patterns in the output text.
 """
 
 import re
-from typing import List, Optional
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
 from deepeval.metrics import BaseMetric
 from deepeval.test_case import LLMTestCase
 
+from .batch_scoring import BatchMeasurement
+
+
+def compile_pattern(pattern: str) -> Optional[Pattern[str]]:
+    """
+    Compile an expected pattern for case-insensitive search.
+
+    Args:
+        pattern: Regular expression
+
+    Returns:
+        Compiled pattern, or None if the pattern is not a valid regex
+    """
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error:
+        return None
+
+
+def presence_score(
+    output: str,
+    keywords: Sequence[str],
+    patterns: Sequence[Optional[Pattern[str]]]
+) -> Tuple[float, str]:
+    """
+    Score the share of keywords and patterns present in an output.
+
+    Args:
+        output: Actual output
+        keywords: Keywords to find (case-insensitive)
+        patterns: Compiled patterns to search for; None (invalid regex) counts as not found
+
+    Returns:
+        (score, reason)
+    """
+    total_requirements = len(keywords) + len(patterns)
+    if total_requirements == 0:
+        return 1.0, "No keywords or patterns to check"
+
+    # Check for keyword matches (case-insensitive)
+    output_lower = output.lower()
+    matches_found = sum(1 for keyword in keywords if keyword.lower() in output_lower)
+
+    # Check for regex pattern matches
+    matches_found += sum(1 for pattern in patterns if pattern is not None and pattern.search(output))
+
+    # Calculate score based on percentage of matches
+    score = matches_found / total_requirements
+    if matches_found == total_requirements:
+        return score, f"All {total_requirements} keywords/patterns found in output"
+    missing = total_requirements - matches_found
+    return score, f"Missing {missing} of {total_requirements} keywords/patterns in output"
+
 
 class KeywordPatternPresenceMetric(BaseMetric):
     """
@@ -50,39 +103,11 @@ class KeywordPatternPresenceMetric(BaseMetric):
                 self.error = "Actual output is required for keyword pattern presence evaluation"
                 raise ValueError(self.error)
             
-            total_requirements = len(expected_keywords) + len(expected_patterns)
-            if total_requirements == 0:
-                self.score = 1.0
-                self.reason = "No keywords or patterns to check"
-                self.success = True
-                return self.score
-            
-            matches_found = 0
-            
-            # Check for keyword matches (case-insensitive)
-            output_lower = test_case.actual_output.lower()
-            for keyword in expected_keywords:
-                if keyword.lower() in output_lower:
-                    matches_found += 1
-            
-            # Check for regex pattern matches
-            for pattern in expected_patterns:
-                try:
-                    if re.search(pattern, test_case.actual_output, re.IGNORECASE):
-                        matches_found += 1
-                except re.error:
-                    # Invalid regex pattern, count as not found
-                    continue
-            
-            # Calculate score based on percentage of matches
-            self.score = matches_found / total_requirements
-            
-            # Set reason
-            if matches_found == total_requirements:
-                self.reason = f"All {total_requirements} keywords/patterns found in output"
-            else:
-                missing = total_requirements - matches_found
-                self.reason = f"Missing {missing} of {total_requirements} keywords/patterns in output"
+            self.score, self.reason = presence_score(
+                test_case.actual_output,
+                expected_keywords,
+                [compile_pattern(pattern) for pattern in expected_patterns]
+            )
             
             # Success based on all requirements being met
             self.success = self.score == 1.0
@@ -106,6 +131,44 @@ class KeywordPatternPresenceMetric(BaseMetric):
         """
         return self.measure(test_case)
     
+    def measure_batch(self, test_cases: List[LLMTestCase]) -> List[BatchMeasurement]:
+        """
+        Measure keyword and pattern presence for many test cases at once.
+
+        Each distinct pattern is compiled once for the whole batch.
+
+        Args:
+            test_cases: Test cases to score
+
+        Returns:
+            One BatchMeasurement per test case, in order
+        """
+        compiled: Dict[str, Optional[Pattern[str]]] = {}
+        measurements: List[BatchMeasurement] = []
+        for test_case in test_cases:
+            expected_keywords = getattr(test_case, 'expected_keywords', [])
+            expected_patterns = getattr(test_case, 'expected_patterns', [])
+            if not expected_keywords and not expected_patterns:
+                measurements.append(BatchMeasurement.failed(
+                    "Expected keywords or patterns are required for keyword pattern presence evaluation"
+                ))
+                continue
+            if not test_case.actual_output:
+                measurements.append(BatchMeasurement.failed(
+                    "Actual output is required for keyword pattern presence evaluation"
+                ))
+                continue
+
+            patterns = []
+            for pattern in expected_patterns:
+                if pattern not in compiled:
+                    compiled[pattern] = compile_pattern(pattern)
+                patterns.append(compiled[pattern])
+            measurements.append(BatchMeasurement(
+                *presence_score(test_case.actual_output, expected_keywords, patterns)
+            ))
+        return measurements
+
     def is_successful(self) -> bool:
         """Check if metric passed threshold."""
         return self.success if self.success is not None else False
\ No newline at end of file
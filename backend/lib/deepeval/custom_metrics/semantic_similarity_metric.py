@@ -4,13 +4,105 @@ Semantic Similarity metric for DeepEval.
 This deterministic metric evaluates semantic similarity between
 actual and expected output using word overlap and
 conceptual matching rather than exact string matching.
+
+With an embedding model configured it compares the outputs' embeddings
+instead (cosine similarity), which also recognises paraphrases. Vectors are
+cached persistently, so expected outputs are embedded once.
 """
 
+import asyncio
 import re
-from typing import Set, Optional
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from deepeval.metrics import BaseMetric
 from deepeval.test_case import LLMTestCase
 
+from lib.deepeval.embeddings import EmbeddingConfig, TextEmbedder, cosine_similarities
+from .batch_scoring import BatchMeasurement
+
+# Common English stop words to filter out
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
+    'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that',
+    'the', 'to', 'was', 'were', 'will', 'with', 'the', 'this', 'but',
+    'they', 'have', 'had', 'what', 'said', 'each', 'which', 'their',
+    'time', 'if', 'up', 'out', 'many', 'then', 'them', 'can',
+    'would', 'there', 'been', 'may', 'use', 'such', 'about', 'after'
+})
+
+# Whole words of at least 3 characters; shorter words are never significant
+_WORD_PATTERN = re.compile(r'\b\w{3,}\b')
+
+
+def extract_significant_words(text: str) -> List[str]:
+    """
+    Extract significant words from text, filtering out common stop words.
+
+    Args:
+        text: The text to extract words from
+
+    Returns:
+        List of significant words (lowercase, no punctuation)
+    """
+    # Extract words of 3+ characters, remove punctuation, convert to lowercase
+    words = _WORD_PATTERN.findall(text.lower())
+
+    # Filter out stop words
+    return [word for word in words if word not in STOP_WORDS]
+
+
+def similarity_from_counts(expected_count: int, actual_count: int, shared_count: int) -> Tuple[float, str]:
+    """
+    Score semantic similarity from significant word set sizes.
+
+    Args:
+        expected_count: Distinct significant words in the expected output
+        actual_count: Distinct significant words in the actual output
+        shared_count: Distinct significant words found in both
+
+    Returns:
+        (score, reason)
+    """
+    if not expected_count and not actual_count:
+        return 1.0, "Both outputs are empty - considered semantically identical"
+
+    if not expected_count or not actual_count:
+        return 0.0, "One output is empty while the other is not - no semantic similarity"
+
+    # Jaccard similarity: |A ∩ B| / |A ∪ B|
+    jaccard_similarity = shared_count / (expected_count + actual_count - shared_count)
+
+    # Bonus for exact word matches (weighted more heavily)
+    coverage_bonus = shared_count / expected_count
+
+    # Combined score: 70% Jaccard, 30% coverage
+    score = (jaccard_similarity * 0.7) + (coverage_bonus * 0.3)
+    return score, similarity_reason(score)
+
+
+def similarity_from_cosine(cosine: float) -> Tuple[float, str]:
+    """
+    Score semantic similarity from the cosine similarity of two embeddings.
+
+    Args:
+        cosine: Cosine similarity of the expected and actual output embeddings
+
+    Returns:
+        (score, reason), with negative similarities scored as 0.0
+    """
+    score = min(1.0, max(0.0, cosine))
+    return score, similarity_reason(score)
+
+
+def similarity_reason(score: float) -> str:
+    """Describe a semantic similarity score."""
+    if score >= 0.9:
+        return f"Very high semantic similarity ({score:.2f}) - outputs convey nearly identical meaning"
+    elif score >= 0.7:
+        return f"High semantic similarity ({score:.2f}) - outputs convey very similar meaning"
+    elif score >= 0.5:
+        return f"Moderate semantic similarity ({score:.2f}) - outputs share some meaning but differ significantly"
+    return f"Low semantic similarity ({score:.2f}) - outputs convey different meanings"
+
 
 class SemanticSimilarityMetric(BaseMetric):
     """
@@ -18,17 +110,21 @@ class SemanticSimilarityMetric(BaseMetric):
     
     This metric analyzes the semantic content by comparing word
     frequency, important terms, and conceptual overlap between
-    actual and expected outputs.
+    actual and expected outputs, or their embeddings when an
+    embedding model is configured.
     """
     
-    def __init__(self, threshold: float = 0.7):
+    def __init__(self, threshold: float = 0.7, embedding: Optional[EmbeddingConfig] = None):
         """
         Initialize SemanticSimilarityMetric.
         
         Args:
             threshold: Minimum semantic similarity score to pass evaluation (0.0 to 1.0)
+            embedding: Embedding model to compare outputs with; word overlap is used if None
         """
         self.threshold = threshold
+        self.embedding = embedding
+        self._embedder: Optional[TextEmbedder] = None
         self.score = 0.0
         self.reason = ""
         self.success = False
@@ -53,55 +149,24 @@ class SemanticSimilarityMetric(BaseMetric):
                 self.error = "Actual output is required for semantic similarity evaluation"
                 raise ValueError(self.error)
             
-            # Extract and normalize words from both texts
-            expected_words = self._extract_significant_words(test_case.expected_output)
-            actual_words = self._extract_significant_words(test_case.actual_output)
-            
-            if not expected_words and not actual_words:
-                self.score = 1.0
-                self.reason = "Both outputs are empty - considered semantically identical"
-                self.success = True
-                return self.score
-            
-            if not expected_words or not actual_words:
-                self.score = 0.0
-                self.reason = "One output is empty while the other is not - no semantic similarity"
-                self.success = False
-                return self.score
-            
-            # Calculate Jaccard similarity for word sets
-            expected_set = set(expected_words)
-            actual_set = set(actual_words)
-            
-            # Word overlap
-            intersection = expected_set & actual_set
-            union = expected_set | actual_set
-            
-            if not union:
-                self.score = 0.0
-                self.reason = "No significant words found in either output"
-            else:
-                # Jaccard similarity: |A ∩ B| / |A ∪ B|
-                jaccard_similarity = len(intersection) / len(union)
-                
-                # Bonus for exact word matches (weighted more heavily)
-                exact_matches = len(intersection)
-                expected_total = len(expected_set)
-                coverage_bonus = exact_matches / expected_total if expected_total > 0 else 0
-                
-                # Combined score: 70% Jaccard, 30% coverage
-                self.score = (jaccard_similarity * 0.7) + (coverage_bonus * 0.3)
-            
-            # Set reason based on similarity level
-            if self.score >= 0.9:
-                self.reason = f"Very high semantic similarity ({self.score:.2f}) - outputs convey nearly identical meaning"
-            elif self.score >= 0.7:
-                self.reason = f"High semantic similarity ({self.score:.2f}) - outputs convey very similar meaning"
-            elif self.score >= 0.5:
-                self.reason = f"Moderate semantic similarity ({self.score:.2f}) - outputs share some meaning but differ significantly"
+            if self.embedding is not None:
+                expected_vector, actual_vector = self.embedder.embed(
+                    [test_case.expected_output, test_case.actual_output]
+                )
+                self.score, self.reason = similarity_from_cosine(
+                    cosine_similarities([expected_vector], [actual_vector])[0]
+                )
             else:
-                self.reason = f"Low semantic similarity ({self.score:.2f}) - outputs convey different meanings"
-            
+                # Extract and normalize words from both texts
+                expected_words = self._extract_significant_words(test_case.expected_output)
+                actual_words = self._extract_significant_words(test_case.actual_output)
+
+                expected_set = set(expected_words)
+                actual_set = set(actual_words)
+                self.score, self.reason = similarity_from_counts(
+                    len(expected_set), len(actual_set), len(expected_set & actual_set)
+                )
+
             # Success based on configured threshold
             self.success = self.score >= self.threshold
             
@@ -112,6 +177,15 @@ class SemanticSimilarityMetric(BaseMetric):
             self.success = False
             raise
     
+    @property
+    def embedder(self) -> TextEmbedder:
+        """Embedder for the configured embedding model, created on first use."""
+        if self._embedder is None:
+            if self.embedding is None:
+                raise ValueError("No embedding model configured for semantic similarity")
+            self._embedder = TextEmbedder(self.embedding)
+        return self._embedder
+
     def _extract_significant_words(self, text: str) -> list:
         """
         Extract significant words from text, filtering out common stop words.
@@ -122,30 +196,77 @@ class SemanticSimilarityMetric(BaseMetric):
         Returns:
             List of significant words (lowercase, no punctuation)
         """
-        # Common English stop words to filter out
-        stop_words = {
-            'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
-            'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that',
-            'the', 'to', 'was', 'were', 'will', 'with', 'the', 'this', 'but',
-            'they', 'have', 'had', 'what', 'said', 'each', 'which', 'their',
-            'time', 'if', 'up', 'out', 'many', 'then', 'them', 'can',
-            'would', 'there', 'been', 'may', 'use', 'such', 'about', 'after'
-        }
-        
-        # Extract words, remove punctuation, convert to lowercase
-        words = re.findall(r'\b\w+\b', text.lower())
-        
-        # Filter out stop words and short words (< 3 chars)
-        significant_words = [
-            word for word in words 
-            if word not in stop_words and len(word) >= 3
-        ]
-        
-        return significant_words
-    
+        return extract_significant_words(text)
+
+    def measure_batch(self, test_cases: List[LLMTestCase]) -> List[BatchMeasurement]:
+        """
+        Measure semantic similarity for many test cases at once.
+
+        Each distinct output is tokenized into its set of significant words
+        once, however many test cases share it. In embedding mode all outputs
+        are embedded together (cached vectors are not requested again) and the
+        cosine similarities of all test cases are computed in one pass.
+
+        Args:
+            test_cases: Test cases to score
+
+        Returns:
+            One BatchMeasurement per test case, in order
+        """
+        measurements: List[Optional[BatchMeasurement]] = [None] * len(test_cases)
+        scored: List[int] = []
+        for index, test_case in enumerate(test_cases):
+            if not test_case.expected_output:
+                measurements[index] = BatchMeasurement.failed(
+                    "Expected output is required for semantic similarity evaluation"
+                )
+            elif not test_case.actual_output:
+                measurements[index] = BatchMeasurement.failed(
+                    "Actual output is required for semantic similarity evaluation"
+                )
+            else:
+                scored.append(index)
+
+        if self.embedding is not None:
+            scores = self._embedding_scores([test_cases[index] for index in scored])
+        else:
+            scores = self._word_overlap_scores([test_cases[index] for index in scored])
+        for index, (score, reason) in zip(scored, scores):
+            measurements[index] = BatchMeasurement(score, reason)
+        return measurements
+
+    def _word_overlap_scores(self, test_cases: List[LLMTestCase]) -> List[Tuple[float, str]]:
+        word_sets: Dict[str, FrozenSet[str]] = {}
+
+        def _significant_word_set(text: str) -> FrozenSet[str]:
+            words = word_sets.get(text)
+            if words is None:
+                words = word_sets[text] = frozenset(_WORD_PATTERN.findall(text.lower())) - STOP_WORDS
+            return words
+
+        scores = []
+        for test_case in test_cases:
+            expected_set = _significant_word_set(test_case.expected_output)
+            actual_set = _significant_word_set(test_case.actual_output)
+            scores.append(similarity_from_counts(len(expected_set), len(actual_set), len(expected_set & actual_set)))
+        return scores
+
+    def _embedding_scores(self, test_cases: List[LLMTestCase]) -> List[Tuple[float, str]]:
+        if not test_cases:
+            return []
+        vectors = self.embedder.embed(
+            [test_case.expected_output for test_case in test_cases]
+            + [test_case.actual_output for test_case in test_cases]
+        )
+        cosines = cosine_similarities(vectors[:len(test_cases)], vectors[len(test_cases):])
+        return [similarity_from_cosine(cosine) for cosine in cosines]
+
     async def a_measure(self, test_case: LLMTestCase) -> float:
         """
         Asynchronous version of measure method.
+
+        In embedding mode the outputs are embedded in a worker thread, since
+        embedding blocks on the judge runtime or a local model.
         
         Args:
             test_case: The test case to evaluate
@@ -153,6 +274,8 @@ class SemanticSimilarityMetric(BaseMetric):
         Returns:
             The semantic similarity score
         """
+        if self.embedding is not None:
+            return await asyncio.to_thread(self.measure, test_case)
         return self.measure(test_case)
     
     def is_successful(self) -> bool:
@@ -7,14 +7,46 @@ Wraps DeepEval library interactions to provide a clean interface for:
 - Evaluating metrics and handling errors
 """
 
+import asyncio
+import importlib
+import importlib.util
 import logging
-from typing import List, Optional, Any, Type, Dict
+import threading
+from typing import List, Optional, Any, Type, Dict, Tuple
 from pydantic import BaseModel
 
 from .models import MetricConfig, MetricResult, MetricType
 
 logger = logging.getLogger(__name__)
 
+_CUSTOM_METRICS = "lib.deepeval.custom_metrics"
+
+# (module, class) of the DeepEval metric implementing each metric type
+METRIC_CLASS_PATHS: Dict[MetricType, Tuple[str, str]] = {
+    MetricType.ANSWER_RELEVANCY: ("deepeval.metrics", "AnswerRelevancyMetric"),
+    MetricType.FAITHFULNESS: ("deepeval.metrics", "FaithfulnessMetric"),
+    MetricType.CONTEXTUAL_RELEVANCY: ("deepeval.metrics", "ContextualRelevancyMetric"),
+    MetricType.CONTEXTUAL_PRECISION: ("deepeval.metrics", "ContextualPrecisionMetric"),
+    MetricType.CONTEXTUAL_RECALL: ("deepeval.metrics", "ContextualRecallMetric"),
+    MetricType.HALLUCINATION: ("deepeval.metrics", "HallucinationMetric"),
+    MetricType.BIAS: ("deepeval.metrics", "BiasMetric"),
+    MetricType.TOXICITY: ("deepeval.metrics", "ToxicityMetric"),
+    MetricType.SUMMARIZATION: ("deepeval.metrics", "SummarizationMetric"),
+    MetricType.PROFESSIONALISM: (f"{_CUSTOM_METRICS}.professionalism_metric", "ProfessionalismMetric"),
+    MetricType.CONCISENESS: (f"{_CUSTOM_METRICS}.conciseness_metric", "ConcisenessMetric"),
+    MetricType.FUZZY_MATCH: (f"{_CUSTOM_METRICS}.fuzzy_match_metric", "FuzzyMatchMetric"),
+    MetricType.SEMANTIC_SIMILARITY: (f"{_CUSTOM_METRICS}.semantic_similarity_metric", "SemanticSimilarityMetric"),
+    MetricType.EXACT_MATCH: (f"{_CUSTOM_METRICS}.exact_match_metric", "ExactMatchMetric"),
+    MetricType.TOOLS_CALLED: (f"{_CUSTOM_METRICS}.tools_called_metric", "ToolsCalledMetric"),
+    MetricType.JSON_SCHEMA_VERIFICATION: (
+        f"{_CUSTOM_METRICS}.json_schema_verification_metric", "JsonSchemaVerificationMetric"
+    ),
+    MetricType.KEYWORD_PATTERN_PRESENCE: (
+        f"{_CUSTOM_METRICS}.keyword_pattern_presence_metric", "KeywordPatternPresenceMetric"
+    ),
+    MetricType.OUTPUT_LENGTH: (f"{_CUSTOM_METRICS}.output_length_metric", "OutputLengthMetric"),
+}
+
 
 class LLMConfig(BaseModel):
     """Configuration for LLM used in non-deterministic metrics."""
@@ -36,63 +68,76 @@ class DeepEvalAdapter:
     """
     
     def __init__(self):
-        """Initialize DeepEval adapter."""
-        # Import DeepEval modules here to avoid import errors if not installed
-        try:
-            from deepeval.metrics import (
-                AnswerRelevancyMetric,
-                FaithfulnessMetric,
-                ContextualRelevancyMetric,
-                ContextualPrecisionMetric,
-                ContextualRecallMetric,
-                HallucinationMetric,
-                BiasMetric,
-                ToxicityMetric,
-                SummarizationMetric
-            )
-            from deepeval.test_case import LLMTestCase
-            from .custom_metrics import (
-                ProfessionalismMetric,
-                ConcisenessMetric,
-                FuzzyMatchMetric,
-                SemanticSimilarityMetric,
-                ExactMatchMetric,
-                ToolsCalledMetric,
-                JsonSchemaVerificationMetric,
-                KeywordPatternPresenceMetric,
-                OutputLengthMetric
-            )
-            
-            self.metric_mapping: Dict[MetricType, Type[Any]] = {
-                MetricType.ANSWER_RELEVANCY: AnswerRelevancyMetric,
-                MetricType.FAITHFULNESS: FaithfulnessMetric,
-                MetricType.CONTEXTUAL_RELEVANCY: ContextualRelevancyMetric,
-                MetricType.CONTEXTUAL_PRECISION: ContextualPrecisionMetric,
-                MetricType.CONTEXTUAL_RECALL: ContextualRecallMetric,
-                MetricType.HALLUCINATION: HallucinationMetric,
-                MetricType.BIAS: BiasMetric,
-                MetricType.TOXICITY: ToxicityMetric,
-                MetricType.SUMMARIZATION: SummarizationMetric,
-                MetricType.PROFESSIONALISM: ProfessionalismMetric,
-                MetricType.CONCISENESS: ConcisenessMetric,
-                MetricType.FUZZY_MATCH: FuzzyMatchMetric,
-                MetricType.SEMANTIC_SIMILARITY: SemanticSimilarityMetric,
-                MetricType.EXACT_MATCH: ExactMatchMetric,
-                MetricType.TOOLS_CALLED: ToolsCalledMetric,
-                MetricType.JSON_SCHEMA_VERIFICATION: JsonSchemaVerificationMetric,
-                MetricType.KEYWORD_PATTERN_PRESENCE: KeywordPatternPresenceMetric,
-                MetricType.OUTPUT_LENGTH: OutputLengthMetric,
-            }
-            
-            self.LLMTestCase: Optional[Type[Any]] = LLMTestCase
-            self.deepeval_available = True
-            
-        except ImportError as e:
-            logger.warning(f"DeepEval not available: {e}")
-            self.deepeval_available = False
-            self.metric_mapping: Dict[MetricType, Type[Any]] = {}
-            self.LLMTestCase: Optional[Type[Any]] = None
-    
+        """
+        Initialize DeepEval adapter.
+
+        Nothing from DeepEval is imported here: importing deepeval pulls in a
+        large dependency tree, so metric classes and LLMTestCase are resolved
+        the first time they are needed. Only the package's presence is checked.
+        """
+        self.deepeval_available = importlib.util.find_spec("deepeval") is not None
+        if not self.deepeval_available:
+            logger.warning("DeepEval not available: package 'deepeval' is not installed")
+
+        # Metric classes resolved so far, filled lazily by get_metric_class
+        self.metric_mapping: Dict[MetricType, Type[Any]] = {}
+        self._llm_test_case: Optional[Type[Any]] = None
+        self._lock = threading.Lock()
+
+    def get_metric_class(self, metric_type: MetricType) -> Optional[Type[Any]]:
+        """
+        Return the DeepEval metric class for a metric type, importing it on first use.
+
+        Args:
+            metric_type: Metric type to resolve
+
+        Returns:
+            Metric class, or None if the metric type is not supported
+
+        Raises:
+            ImportError: If the metric's module cannot be imported
+        """
+        metric_class = self.metric_mapping.get(metric_type)
+        if metric_class is not None:
+            return metric_class
+
+        location = METRIC_CLASS_PATHS.get(metric_type)
+        if location is None:
+            return None
+
+        module_name, class_name = location
+        with self._lock:
+            metric_class = self.metric_mapping.get(metric_type)
+            if metric_class is None:
+                metric_class = getattr(importlib.import_module(module_name), class_name)
+                self.metric_mapping[metric_type] = metric_class
+        return metric_class
+
+    def preload_metric_classes(self) -> None:
+        """
+        Import every supported metric class now instead of on first use.
+
+        Raises:
+            ImportError: If DeepEval is not installed
+        """
+        if not self.deepeval_available:
+            raise ImportError("DeepEval is not installed. Install with: pip install deepeval")
+        for metric_type in METRIC_CLASS_PATHS:
+            self.get_metric_class(metric_type)
+        _ = self.LLMTestCase
+
+    @property
+    def LLMTestCase(self) -> Optional[Type[Any]]:
+        """DeepEval's LLMTestCase class, imported on first access."""
+        if self._llm_test_case is None and self.deepeval_available:
+            try:
+                from deepeval.test_case import LLMTestCase
+                self._llm_test_case = LLMTestCase
+            except ImportError as e:
+                logger.warning(f"DeepEval not available: {e}")
+                self.deepeval_available = False
+        return self._llm_test_case
+
     def create_metric(
         self,
         config: MetricConfig,
@@ -105,6 +150,8 @@ class DeepEvalAdapter:
             config: Metric configuration
             llm_config: Optional LLM configuration for non-deterministic metrics.
                         If provided, uses our custom LLM wrapper instead of DeepEval's default.
+                        For semantic similarity with a provider and model, supplies the
+                        embedding model's credentials.
 
         Returns:
             DeepEval metric instance
@@ -116,7 +163,7 @@ class DeepEvalAdapter:
         if not self.deepeval_available:
             raise ImportError("DeepEval is not installed. Install with: pip install deepeval")
 
-        metric_class = self.metric_mapping.get(config.type)
+        metric_class = self.get_metric_class(config.type)
         if not metric_class:
             raise ValueError(f"Unsupported metric type: {config.type}")
 
@@ -125,6 +172,18 @@ class DeepEvalAdapter:
             is_deterministic = MetricType.is_deterministic(config.type)
 
             if is_deterministic:
+                if config.type == MetricType.SEMANTIC_SIMILARITY and config.provider and config.model:
+                    # A provider/model on semantic similarity selects an embedding model
+                    from .embeddings import EmbeddingConfig
+                    embedding = EmbeddingConfig(
+                        provider=config.provider,
+                        model=config.model,
+                        api_key=llm_config.api_key if llm_config else None,
+                        api_base=llm_config.api_base if llm_config else None,
+                    )
+                    logger.info(f"Using embedding model for metric {config.type}: {embedding.model_id}")
+                    return metric_class(threshold=config.threshold or 0.7, embedding=embedding)
+
                 # Deterministic metrics don't need model/provider
                 # Just instantiate them directly
                 metric = metric_class()
@@ -210,6 +269,10 @@ class DeepEvalAdapter:
     ) -> List[MetricResult]:
         """
         Evaluate DeepEval metrics and return results.
+
+        LLM-judged metrics are measured with a_measure; deterministic metrics
+        are CPU-bound and measured in a worker thread, so neither blocks the
+        event loop.
         
         Args:
             test_case: DeepEval LLMTestCase
@@ -226,42 +289,150 @@ class DeepEvalAdapter:
         
         for metric, config in zip(metrics, metric_configs):
             try:
-                # Measure the metric
-                metric.measure(test_case)
-                
-                # Extract results
-                score = metric.score if hasattr(metric, 'score') else 0.0
-                reason = metric.reason if hasattr(metric, 'reason') and config.include_reason else None
-                
-                # Determine if passed based on threshold
-                threshold = config.threshold or 0.7
-                passed = score >= threshold
-                
-                result = MetricResult(
-                    type=config.type,
-                    score=score,
-                    passed=passed,
-                    threshold=threshold,
-                    reason=reason,
-                    error=None
-                )
-                
-                results.append(result)
-                
+                if MetricType.is_deterministic(config.type):
+                    await asyncio.to_thread(metric.measure, test_case)
+                else:
+                    await metric.a_measure(test_case)
+                results.append(self._to_metric_result(metric, config))
             except Exception as e:
                 logger.error(f"Failed to evaluate metric {config.type}: {e}")
-                
-                # Create error result
-                threshold = config.threshold or 0.7
-                error_result = MetricResult(
-                    type=config.type,
-                    score=0.0,
-                    passed=False,
-                    threshold=threshold,
-                    reason=None,
-                    error=str(e)
-                )
-                
-                results.append(error_result)
+                results.append(self._to_error_result(config, e))
         
-        return results
\ No newline at end of file
+        return results
+
+    async def evaluate_metric_batch(
+        self,
+        test_cases: List[Any],
+        metrics: List[Any],
+        config: MetricConfig,
+        max_concurrency: int = 16
+    ) -> List[MetricResult]:
+        """
+        Evaluate one metric over many test cases concurrently.
+
+        Each test case has its own metric instance (metrics keep their score
+        and reason as state). Metrics are measured with a_measure, so LLM-judged
+        metrics await their judge calls instead of blocking the event loop.
+
+        Args:
+            test_cases: DeepEval LLMTestCases
+            metrics: Metric instances, one per test case
+            config: Configuration shared by the metrics
+            max_concurrency: Maximum number of test cases measured at once
+
+        Returns:
+            List of MetricResult objects, in the order of test_cases
+        """
+        if not self.deepeval_available:
+            raise ImportError("DeepEval is not installed. Install with: pip install deepeval")
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _measure(test_case: Any, metric: Any) -> MetricResult:
+            async with semaphore:
+                try:
+                    await metric.a_measure(test_case)
+                    return self._to_metric_result(metric, config)
+                except Exception as e:
+                    logger.error(f"Failed to evaluate metric {config.type}: {e}")
+                    return self._to_error_result(config, e)
+
+        return list(await asyncio.gather(
+            *(_measure(test_case, metric) for test_case, metric in zip(test_cases, metrics))
+        ))
+
+    def evaluate_deterministic_batch(
+        self,
+        test_cases: List[Any],
+        metrics: List[Any],
+        config: MetricConfig
+    ) -> List[MetricResult]:
+        """
+        Evaluate one deterministic metric over many test cases in a single pass.
+
+        Metrics implementing measure_batch score every test case at once (the
+        instances share config, so the first one scores the batch); others are
+        measured one test case at a time. CPU-bound: callers on an event loop
+        should run it in a worker thread.
+
+        Args:
+            test_cases: DeepEval LLMTestCases
+            metrics: Metric instances, one per test case
+            config: Configuration shared by the metrics
+
+        Returns:
+            List of MetricResult objects, in the order of test_cases
+        """
+        if not test_cases:
+            return []
+
+        measure_batch = getattr(metrics[0], "measure_batch", None)
+        if measure_batch is None:
+            results = []
+            for test_case, metric in zip(test_cases, metrics):
+                try:
+                    metric.measure(test_case)
+                    results.append(self._to_metric_result(metric, config))
+                except Exception as e:
+                    logger.error(f"Failed to evaluate metric {config.type}: {e}")
+                    results.append(self._to_error_result(config, e))
+            return results
+
+        try:
+            measurements = measure_batch(test_cases)
+        except Exception as e:
+            logger.error(f"Failed to evaluate metric {config.type} in batch: {e}")
+            return [self._to_error_result(config, e) for _ in test_cases]
+
+        threshold = config.threshold or 0.7
+        return [
+            MetricResult(
+                type=config.type,
+                score=measurement.score,
+                passed=measurement.error is None and measurement.score >= threshold,
+                threshold=threshold,
+                reason=measurement.reason if config.include_reason and measurement.error is None else None,
+                error=measurement.error
+            )
+            for measurement in measurements
+        ]
+
+    @staticmethod
+    def _to_metric_result(metric: Any, config: MetricConfig) -> MetricResult:
+        """Convert a measured metric into a MetricResult."""
+        score = metric.score if hasattr(metric, 'score') else 0.0
+        reason = metric.reason if hasattr(metric, 'reason') and config.include_reason else None
+
+        # Determine if passed based on threshold
+        threshold = config.threshold or 0.7
+        return MetricResult(
+            type=config.type,
+            score=score,
+            passed=score >= threshold,
+            threshold=threshold,
+            reason=reason,
+            error=None
+        )
+
+    @staticmethod
+    def _to_error_result(config: MetricConfig, error: Exception) -> MetricResult:
+        """Create the failed MetricResult for a metric that raised."""
+        return MetricResult(
+            type=config.type,
+            score=0.0,
+            passed=False,
+            threshold=config.threshold or 0.7,
+            reason=None,
+            error=str(error)
+        )
+
+
+_deepeval_adapter: Optional[DeepEvalAdapter] = None
+
+
+def get_deepeval_adapter() -> DeepEvalAdapter:
+    """Return the process-wide DeepEval adapter."""
+    global _deepeval_adapter
+    if _deepeval_adapter is None:
+        _deepeval_adapter = DeepEvalAdapter()
+    return _deepeval_adapter
@@ -0,0 +1,309 @@
+"""
+Text embeddings for embedding-based metrics.
+
+TextEmbedder turns texts into vectors with either a provider embedding model
+(through any_llm, on the shared judge runtime) or a local CPU model
+(provider "local", via sentence-transformers when it is installed). Vectors
+are stored in a persistent, content-addressed cache keyed by a hash of the
+embedding model and the text, so an expected output is embedded once and
+then reused by every eval run that compares against it.
+"""
+import hashlib
+import importlib.util
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from pydantic import BaseModel
+
+from lib.metrics import record_cache_lookup
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Provider name selecting a local sentence-transformers model
+LOCAL_EMBEDDING_PROVIDER = "local"
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+
+class EmbeddingConfig(BaseModel):
+    """Embedding model used by an embedding-based metric."""
+    provider: str
+    model: str
+    api_key: Optional[str] = None
+    api_base: Optional[str] = None
+
+    @property
+    def model_id(self) -> str:
+        """Provider-qualified model identifier, e.g. "openai/text-embedding-3-small"."""
+        return f"{self.provider}/{self.model}"
+
+
+class EmbeddingCache:
+    """
+    Persistent, size-bounded LRU cache of embedding vectors in SQLite.
+
+    Vectors are stored as float32 blobs keyed by build_key(model_id, text).
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 200_000):
+        """
+        Initialize the cache; the database is opened on first use.
+
+        Args:
+            path: SQLite database file
+            max_entries: Maximum number of stored vectors
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build_key(model_id: str, text: str) -> str:
+        """
+        Build the content address of a text embedded with a model.
+
+        Args:
+            model_id: Provider-qualified embedding model
+            text: Embedded text
+
+        Returns:
+            str: Hex digest identifying the vector
+        """
+        return hashlib.sha256(f"{model_id}\0{text}".encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, model_id TEXT NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)")
+            self._connection = connection
+        return self._connection
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Look up vectors by key.
+
+        Args:
+            keys: Keys from build_key
+
+        Returns:
+            Dict of the keys found to their vectors
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            try:
+                connection = self._connect()
+                # Stay below SQLite's bound parameter limit
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = connection.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[key] = array("f", blob).tolist()
+                if found:
+                    now = time.time()
+                    connection.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key in found]
+                    )
+                    connection.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+        record_cache_lookup("embedding", hit=True, count=len(found))
+        record_cache_lookup("embedding", hit=False, count=len(keys) - len(found))
+        return found
+
+    def put_many(self, model_id: str, vectors: Dict[str, Sequence[float]]) -> None:
+        """
+        Store vectors, evicting least recently used ones if needed.
+
+        Args:
+            model_id: Embedding model the vectors were produced by
+            vectors: Dict of keys from build_key to vectors
+        """
+        if not vectors:
+            return
+        now = time.time()
+        rows = [(key, model_id, array("f", vector).tobytes(), now) for key, vector in vectors.items()]
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, model_id, vector, last_used) VALUES (?, ?, ?, ?)", rows
+                )
+                self._evict_if_needed(connection)
+                connection.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+
+    def _evict_if_needed(self, connection: sqlite3.Connection) -> None:
+        count = connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        # Evict down to 90% so a burst of writes does not evict on every put
+        excess = count - int(self.max_entries * 0.9)
+        connection.execute(
+            "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class TextEmbedder:
+    """Embeds texts with one embedding model, through the vector cache."""
+
+    def __init__(
+        self,
+        config: EmbeddingConfig,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: Optional[int] = None
+    ):
+        """
+        Initialize the embedder.
+
+        Args:
+            config: Embedding model and credentials
+            cache: Vector cache (the process-wide cache if None)
+            batch_size: Maximum texts per embedding request (the configured default if None)
+        """
+        self.config = config
+        self.cache = cache or get_embedding_cache()
+        self.batch_size = max(1, batch_size or settings.embedding_batch_size)
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Embed texts, requesting only those not already cached.
+
+        Blocks until the vectors are available; call it from a worker thread
+        when running on an event loop.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in order
+        """
+        keys = [EmbeddingCache.build_key(self.config.model_id, text) for text in texts]
+        vectors = self.cache.get_many(keys)
+
+        missing = list(dict.fromkeys(text for text, key in zip(texts, keys) if key not in vectors))
+        if missing:
+            fetched: Dict[str, List[float]] = {}
+            for start in range(0, len(missing), self.batch_size):
+                chunk = missing[start:start + self.batch_size]
+                for text, vector in zip(chunk, self._fetch(chunk)):
+                    fetched[EmbeddingCache.build_key(self.config.model_id, text)] = [float(x) for x in vector]
+            self.cache.put_many(self.config.model_id, fetched)
+            vectors.update(fetched)
+            logger.info(
+                f"Embedded {len(missing)} texts with {self.config.model_id} "
+                f"({len(set(keys)) - len(missing)} cached)"
+            )
+
+        return [vectors[key] for key in keys]
+
+    def _fetch(self, texts: List[str]) -> List[Sequence[float]]:
+        if self.config.provider == LOCAL_EMBEDDING_PROVIDER:
+            return _local_model(self.config.model).encode(texts)
+
+        from lib.deepeval.judge_runtime import get_judge_runtime
+        runtime = get_judge_runtime()
+        return runtime.run(runtime.embed(
+            self.config.provider,
+            self.config.model,
+            texts,
+            api_key=self.config.api_key,
+            api_base=self.config.api_base
+        ))
+
+
+_local_models: Dict[str, Any] = {}
+_local_models_lock = threading.Lock()
+
+
+def _local_model(model_name: str) -> Any:
+    """Load a sentence-transformers model once per process."""
+    model = _local_models.get(model_name)
+    if model is None:
+        with _local_models_lock:
+            model = _local_models.get(model_name)
+            if model is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError as e:
+                    raise ImportError(
+                        "Local embeddings need sentence-transformers. Install with: pip install sentence-transformers"
+                    ) from e
+                model = SentenceTransformer(model_name, device="cpu")
+                _local_models[model_name] = model
+    return model
+
+
+def cosine_similarities(left: Sequence[Sequence[float]], right: Sequence[Sequence[float]]) -> List[float]:
+    """
+    Cosine similarity of each pair of vectors.
+
+    Vectorized over all pairs with NumPy when it is installed.
+
+    Args:
+        left: First vector of each pair
+        right: Second vector of each pair, same length as left
+
+    Returns:
+        Similarity per pair; 0.0 when either vector is all zeros
+    """
+    if not left:
+        return []
+
+    if NUMPY_AVAILABLE:
+        import numpy as np
+
+        a = np.asarray(left, dtype=np.float64)
+        b = np.asarray(right, dtype=np.float64)
+        norms = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+        dots = np.einsum("ij,ij->i", a, b)
+        return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0).tolist()
+
+    similarities = []
+    for a, b in zip(left, right):
+        norm = (sum(x * x for x in a) ** 0.5) * (sum(y * y for y in b) ** 0.5)
+        similarities.append(sum(x * y for x, y in zip(a, b)) / norm if norm > 0 else 0.0)
+    return similarities
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Return the process-wide embedding cache configured from settings."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            path=Path(settings.embedding_cache_path),
+            max_entries=settings.embedding_cache_max_entries
+        )
+    return _embedding_cache
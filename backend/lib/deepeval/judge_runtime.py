@@ -0,0 +1,365 @@
+"""
+Shared runtime for LLM-judge calls made by DeepEval metrics.
+
+DeepEval calls CustomDeepEvalLLM.generate synchronously, several times per
+LLM-judged metric. Instead of a new thread and event loop per call, every
+judge completion runs on one background event loop owned by this module:
+- provider clients (and their HTTP connection pools) are created once per
+  (provider, credential, base URL) on that loop and reused; the least recently
+  used client is closed once more than max_clients are open,
+- a per-provider semaphore caps concurrent judge calls,
+- a rate-limited provider is paused for a backoff period and the call retried,
+- every call is also metered, at batch priority, by the process-wide provider
+  rate limiter, so judge load counts against the same RPM/TPM budgets as
+  chat and eval completions and a rate limit hit here holds those back too,
+- sync callers block on a future; async callers on other loops await it.
+Embedding requests of embedding-based metrics go through the same clients,
+caps and backoff.
+"""
+import asyncio
+import contextlib
+import hashlib
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from lib.metrics import observe_llm_call
+from lib.rate_limit import (
+    RequestPriority,
+    estimate_tokens,
+    get_provider_rate_limiter,
+    is_rate_limit_error,
+    retry_after_seconds,
+    usage_tokens,
+)
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ClientKey = Tuple[str, str, str]
+
+
+class JudgeRuntime:
+    """Background event loop thread serving LLM-judge completions."""
+
+    def __init__(
+        self,
+        max_concurrent_per_provider: int = 4,
+        max_rate_limit_retries: int = 3,
+        rate_limit_backoff_seconds: float = 2.0,
+        max_clients: int = 32
+    ):
+        """
+        Initialize the runtime; the loop thread starts on first use.
+
+        Args:
+            max_concurrent_per_provider: Maximum in-flight judge calls per provider
+            max_rate_limit_retries: Retries of a judge call rejected by a provider rate limit
+            rate_limit_backoff_seconds: Initial pause after a rate limit, doubled per retry
+            max_clients: Maximum provider clients kept open
+        """
+        self.max_concurrent_per_provider = max(1, max_concurrent_per_provider)
+        self.max_rate_limit_retries = max(0, max_rate_limit_retries)
+        self.rate_limit_backoff_seconds = rate_limit_backoff_seconds
+        self.max_clients = max(1, max_clients)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # Only touched from the runtime loop
+        self._clients: "OrderedDict[ClientKey, Any]" = OrderedDict()
+        # In-flight calls per client (by id), and evicted clients closed when their last call ends
+        self._client_users: Dict[int, int] = {}
+        self._evicted_clients: Dict[int, Any] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._paused_until: Dict[str, float] = {}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runtime event loop, started on first access."""
+        if self._loop is None:
+            with self._start_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    thread = threading.Thread(
+                        target=loop.run_forever, name="deepeval-judge-loop", daemon=True
+                    )
+                    thread.start()
+                    self._thread = thread
+                    self._loop = loop
+        return self._loop
+
+    def in_runtime_thread(self) -> bool:
+        """Whether the caller is running on the runtime loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the runtime loop and block until it completes.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Optional seconds to wait for the result
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the runtime loop itself (it would deadlock)
+        """
+        if self.in_runtime_thread():
+            coro.close()
+            raise RuntimeError("JudgeRuntime.run cannot block the judge loop; await submit() instead")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    async def submit(self, coro: Awaitable[T]) -> T:
+        """
+        Run a coroutine on the runtime loop from async code on any loop.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        if self.in_runtime_thread():
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    async def complete(
+        self,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        api_key: Optional[str] = None,
+        api_base: Optional[str] = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Send one judge completion through the provider's shared client.
+
+        Runs on the runtime loop (it is submitted there if needed).
+
+        Args:
+            provider: LLM provider
+            model: Model name without the provider prefix
+            messages: Chat messages
+            api_key: API key for the provider
+            api_base: Optional base URL for the provider API
+            **kwargs: Completion parameters (temperature, max_tokens, response_format, ...)
+
+        Returns:
+            The provider's ChatCompletion
+        """
+        if not self.in_runtime_thread():
+            return await self.submit(
+                self.complete(provider, model, messages, api_key=api_key, api_base=api_base, **kwargs)
+            )
+        return await self._call_provider(
+            provider, model, api_key, api_base,
+            lambda client: client.acompletion(model=model, messages=messages, **kwargs),
+            tokens=estimate_tokens(messages, kwargs.get("max_tokens"))
+        )
+
+    async def embed(
+        self,
+        provider: str,
+        model: str,
+        inputs: List[str],
+        api_key: Optional[str] = None,
+        api_base: Optional[str] = None
+    ) -> List[List[float]]:
+        """
+        Embed texts through the provider's shared client.
+
+        Shares the provider's concurrency cap and rate-limit backoff with
+        judge completions.
+
+        Args:
+            provider: LLM provider
+            model: Embedding model name without the provider prefix
+            inputs: Texts to embed
+            api_key: API key for the provider
+            api_base: Optional base URL for the provider API
+
+        Returns:
+            One embedding vector per input, in order
+        """
+        if not self.in_runtime_thread():
+            return await self.submit(self.embed(provider, model, inputs, api_key=api_key, api_base=api_base))
+        response = await self._call_provider(
+            provider, model, api_key, api_base,
+            lambda client: client.aembedding(model=model, inputs=inputs),
+            tokens=estimate_tokens(inputs)
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    def close(self) -> None:
+        """Close the provider clients and stop the runtime loop."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_clients(), loop).result(timeout=10)
+        except Exception as e:
+            logger.warning(f"Failed to close judge clients: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        loop.close()
+        self._loop = None
+        self._thread = None
+        self._clients.clear()
+        self._client_users.clear()
+        self._evicted_clients.clear()
+        self._semaphores.clear()
+        self._paused_until.clear()
+
+    def _provider_slot(self, provider: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent_per_provider)
+            self._semaphores[provider] = semaphore
+        return semaphore
+
+    async def _call_provider(
+        self,
+        provider: str,
+        model: str,
+        api_key: Optional[str],
+        api_base: Optional[str],
+        request: Callable[[Any], Awaitable[T]],
+        tokens: int = 0
+    ) -> T:
+        """Send one request with a provider slot held, retrying after rate limits."""
+        limiter = get_provider_rate_limiter()
+        attempt = 0
+        while True:
+            await self._wait_until_resumed(provider)
+            async with self._provider_slot(provider):
+                async with limiter.acquire(
+                    provider, model, api_key=api_key, tokens=tokens, priority=RequestPriority.BATCH
+                ) as lease:
+                    started = time.perf_counter()
+                    try:
+                        async with self._use_client(provider, api_key, api_base) as client:
+                            response = await request(client)
+                    except Exception as e:
+                        observe_llm_call(provider, model, time.perf_counter() - started, error=e)
+                        if not is_rate_limit_error(e) or attempt >= self.max_rate_limit_retries:
+                            raise
+                        delay = retry_after_seconds(e) or self.rate_limit_backoff_seconds * (2 ** attempt)
+                        attempt += 1
+                        self._pause(provider, delay)
+                        limiter.pause(provider, model, delay, api_key=api_key)
+                        logger.warning(
+                            f"Judge provider {provider} rate limited; pausing {delay:.1f}s "
+                            f"(retry {attempt}/{self.max_rate_limit_retries})"
+                        )
+                        continue
+                    observe_llm_call(provider, model, time.perf_counter() - started, response=response)
+                    lease.record_usage(usage_tokens(response))
+                    return response
+
+    def _pause(self, provider: str, delay: float) -> None:
+        resume_at = asyncio.get_running_loop().time() + delay
+        self._paused_until[provider] = max(self._paused_until.get(provider, 0.0), resume_at)
+
+    async def _wait_until_resumed(self, provider: str) -> None:
+        # Every call to a rate-limited provider waits out the pause, not just the one that hit it
+        while True:
+            remaining = self._paused_until.get(provider, 0.0) - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(remaining)
+
+    @contextlib.asynccontextmanager
+    async def _use_client(
+        self, provider: str, api_key: Optional[str], api_base: Optional[str]
+    ) -> AsyncIterator[Any]:
+        """Lend the client of a provider for one call, closing it afterwards if it was evicted meanwhile."""
+        client = await self._client_for(provider, api_key, api_base)
+        client_id = id(client)
+        self._client_users[client_id] = self._client_users.get(client_id, 0) + 1
+        try:
+            yield client
+        finally:
+            users = self._client_users.pop(client_id) - 1
+            if users:
+                self._client_users[client_id] = users
+            elif client_id in self._evicted_clients:
+                await _close_client(self._evicted_clients.pop(client_id))
+
+    async def _client_for(self, provider: str, api_key: Optional[str], api_base: Optional[str]) -> Any:
+        fingerprint = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+        key = (provider.lower(), (api_base or "").rstrip("/"), fingerprint)
+        client = self._clients.get(key)
+        if client is not None:
+            self._clients.move_to_end(key)
+            return client
+
+        from lib.any_llm.any_llm_adapter import create_provider_client
+        client = create_provider_client(provider, api_key=api_key, api_base=api_base)
+        self._clients[key] = client
+        logger.info(f"Created judge client for provider {provider}")
+        while len(self._clients) > self.max_clients:
+            _, evicted = self._clients.popitem(last=False)
+            if id(evicted) in self._client_users:
+                # Closed when its in-flight calls are done
+                self._evicted_clients[id(evicted)] = evicted
+            else:
+                await _close_client(evicted)
+        return client
+
+    async def _close_clients(self) -> None:
+        clients = list(self._clients.values()) + list(self._evicted_clients.values())
+        self._clients.clear()
+        self._evicted_clients.clear()
+        for client in clients:
+            await _close_client(client)
+
+
+async def _close_client(client: Any) -> None:
+    """Close the HTTP client of an any_llm provider instance."""
+    try:
+        if hasattr(type(client), "__aexit__"):
+            await client.__aexit__(None, None, None)
+            return
+        http_client = getattr(client, "client", None)
+        close = getattr(http_client, "aclose", None) or getattr(http_client, "close", None)
+        if close is not None:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+    except Exception as e:
+        logger.warning(f"Failed to close judge client {type(client).__name__}: {e}")
+
+
+_judge_runtime: Optional[JudgeRuntime] = None
+_judge_runtime_lock = threading.Lock()
+
+
+def get_judge_runtime() -> JudgeRuntime:
+    """Return the process-wide LLM-judge runtime."""
+    global _judge_runtime
+    if _judge_runtime is None:
+        with _judge_runtime_lock:
+            if _judge_runtime is None:
+                _judge_runtime = JudgeRuntime(
+                    max_concurrent_per_provider=settings.eval_max_concurrent_judge_calls_per_provider,
+                    max_clients=settings.eval_judge_max_clients
+                )
+    return _judge_runtime
+
+
+def shutdown_judge_runtime() -> None:
+    """Close the process-wide judge runtime, if it was started."""
+    global _judge_runtime
+    with _judge_runtime_lock:
+        runtime, _judge_runtime = _judge_runtime, None
+    if runtime is not None:
+        runtime.close()
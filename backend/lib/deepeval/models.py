@@ -121,11 +121,13 @@ class MetricConfig(BaseModel):
     # LLM configuration - required for non-deterministic metrics
     provider: Optional[str] = Field(
         default=None,
-        description="LLM provider for non-deterministic metrics (e.g., openai, anthropic)"
+        description="LLM provider for non-deterministic metrics (e.g., openai, anthropic); "
+                    "for semantic similarity, the embedding provider ('local' for an on-CPU model)"
     )
     model: Optional[str] = Field(
         default=None,
-        description="LLM model for non-deterministic metrics (e.g., gpt-4, claude-3-opus)"
+        description="LLM model for non-deterministic metrics (e.g., gpt-4, claude-3-opus); "
+                    "for semantic similarity, the embedding model (e.g., text-embedding-3-small)"
     )
     
     include_reason: bool = Field(default=True, description="Include reasoning in results")
@@ -0,0 +1,23 @@
+from lib.metrics.prometheus_metrics import (
+    instrument_engine,
+    metrics_request_authorized,
+    observe_http_request,
+    observe_llm_call,
+    record_cache_lookup,
+    record_llm_cost,
+    render_metrics,
+    time_eval_stage,
+    time_git_operation,
+)
+
+__all__ = [
+    "instrument_engine",
+    "metrics_request_authorized",
+    "observe_http_request",
+    "observe_llm_call",
+    "record_cache_lookup",
+    "record_llm_cost",
+    "render_metrics",
+    "time_eval_stage",
+    "time_git_operation",
+]
@@ -0,0 +1,245 @@
+"""
+Prometheus metrics of the backend, exposed at /metrics.
+
+Metrics are module-level collectors on the default registry, so any module
+records into them without passing a registry around:
+- HTTP request latency by method, route template and status,
+- provider call latency, tokens and completion cost by provider/model,
+- eval stage timings (completion, scoring, persistence),
+- git operation durations,
+- cache lookups by cache and result, for hit ratios,
+- database query durations by statement type.
+Processes other than the API server (e.g. eval shard workers) are included
+when PROMETHEUS_MULTIPROC_DIR is set for all of them.
+"""
+import hmac
+import os
+import time
+from typing import Any, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+
+# Buckets (seconds) for calls that take from milliseconds to minutes
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+# Buckets (seconds) for local operations
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "promptrepo_http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "promptrepo_llm_request_duration_seconds",
+    "Latency of provider calls",
+    ["provider", "model", "outcome"],
+    buckets=SLOW_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "promptrepo_llm_tokens",
+    "Tokens reported by providers",
+    ["provider", "model", "kind"]
+)
+LLM_COST = Counter(
+    "promptrepo_llm_cost_usd",
+    "Cost of completions",
+    ["provider", "model"]
+)
+EVAL_STAGE_SECONDS = Histogram(
+    "promptrepo_eval_stage_duration_seconds",
+    "Duration of eval stages",
+    ["stage"],
+    buckets=SLOW_BUCKETS
+)
+GIT_OPERATION_SECONDS = Histogram(
+    "promptrepo_git_operation_duration_seconds",
+    "Duration of git operations",
+    ["operation"],
+    buckets=FAST_BUCKETS + SLOW_BUCKETS[-6:]
+)
+CACHE_LOOKUPS = Counter(
+    "promptrepo_cache_lookups",
+    "Cache lookups",
+    ["cache", "result"]
+)
+DB_QUERY_SECONDS = Histogram(
+    "promptrepo_db_query_duration_seconds",
+    "Duration of database statements",
+    ["statement"],
+    buckets=FAST_BUCKETS
+)
+
+# Statement types reported individually; others are grouped as "other"
+_DB_STATEMENTS = {"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK", "PRAGMA"}
+
+
+def observe_http_request(method: str, route: str, status: int, seconds: float) -> None:
+    """
+    Record a served HTTP request.
+
+    Args:
+        method: HTTP method
+        route: Route template (e.g. /api/v0/prompts/{prompt_id}), never the raw path
+        status: Response status code
+        seconds: Request latency
+    """
+    HTTP_REQUEST_SECONDS.labels(method=method, route=route, status=str(status)).observe(seconds)
+
+
+def observe_llm_call(
+    provider: str,
+    model: str,
+    seconds: float,
+    response: Any = None,
+    error: Optional[BaseException] = None
+) -> None:
+    """
+    Record a provider call and the tokens its response reports.
+
+    Args:
+        provider: LLM provider
+        model: Model name without the provider prefix
+        seconds: Call latency
+        response: Provider response (ChatCompletion or embedding response), if any
+        error: Exception the call raised, if any
+    """
+    provider = provider or "unknown"
+    LLM_REQUEST_SECONDS.labels(
+        provider=provider, model=model, outcome="error" if error is not None else "ok"
+    ).observe(seconds)
+    usage = getattr(response, "usage", None)
+    for kind, field in (("input", "prompt_tokens"), ("output", "completion_tokens")):
+        tokens = getattr(usage, field, None)
+        if isinstance(tokens, int) and tokens > 0:
+            LLM_TOKENS.labels(provider=provider, model=model, kind=kind).inc(tokens)
+
+
+def record_llm_cost(provider: str, model: str, cost: Optional[float]) -> None:
+    """
+    Record the cost of a completion.
+
+    Args:
+        provider: LLM provider
+        model: Model name without the provider prefix
+        cost: Total cost in USD, if known
+    """
+    if cost:
+        LLM_COST.labels(provider=provider, model=model).inc(cost)
+
+
+def time_eval_stage(stage: str):
+    """
+    Time an eval stage; use as a context manager.
+
+    Args:
+        stage: completion, scoring or persistence
+
+    Returns:
+        Timer observing EVAL_STAGE_SECONDS on exit
+    """
+    return EVAL_STAGE_SECONDS.labels(stage=stage).time()
+
+
+def time_git_operation(operation: str):
+    """
+    Time a git operation; use as a decorator of synchronous functions or as a context manager.
+
+    Args:
+        operation: Operation name (e.g. commit_files)
+
+    Returns:
+        Timer observing GIT_OPERATION_SECONDS
+    """
+    return GIT_OPERATION_SECONDS.labels(operation=operation).time()
+
+
+def record_cache_lookup(cache: str, hit: bool, count: int = 1) -> None:
+    """
+    Record lookups of a cache.
+
+    Args:
+        cache: Cache name
+        hit: Whether the lookups were served from the cache
+        count: Number of lookups
+    """
+    if count > 0:
+        CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc(count)
+
+
+def _statement_type(statement: str) -> str:
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return verb if verb in _DB_STATEMENTS else "other"
+
+
+def instrument_engine(engine: Any) -> None:
+    """
+    Record the duration of every statement a SQLAlchemy engine executes.
+
+    Args:
+        engine: Sync Engine (pass AsyncEngine.sync_engine for asyncio engines)
+    """
+    from sqlalchemy import event
+
+    if getattr(engine, "_promptrepo_metrics", False):
+        return
+    engine._promptrepo_metrics = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("_query_started")
+        if started:
+            DB_QUERY_SECONDS.labels(statement=_statement_type(statement)).observe(
+                time.perf_counter() - started.pop()
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(exception_context):
+        connection = exception_context.connection
+        started = connection.info.get("_query_started") if connection is not None else None
+        if started:
+            started.pop()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        (body, content type)
+    """
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def metrics_request_authorized(authorization: Optional[str], token: str) -> bool:
+    """
+    Check the Authorization header of a /metrics request.
+
+    Args:
+        authorization: Authorization header of the request, if any
+        token: Bearer token required by metrics_bearer_token (empty allows every request)
+
+    Returns:
+        Whether the request may read the metrics
+    """
+    if not token:
+        return True
+    scheme, _, credentials = (authorization or "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(credentials.strip().encode(), token.encode())
@@ -0,0 +1,31 @@
+from lib.rate_limit.provider_rate_limiter import (
+    ProviderRateLimiter,
+    QueueWaitClock,
+    RateLimitBudget,
+    RateLimitLease,
+    RequestPriority,
+    current_request_priority,
+    estimate_tokens,
+    get_provider_rate_limiter,
+    is_rate_limit_error,
+    measure_queue_wait,
+    request_priority,
+    retry_after_seconds,
+    usage_tokens,
+)
+
+__all__ = [
+    "ProviderRateLimiter",
+    "QueueWaitClock",
+    "RateLimitBudget",
+    "RateLimitLease",
+    "RequestPriority",
+    "current_request_priority",
+    "estimate_tokens",
+    "get_provider_rate_limiter",
+    "is_rate_limit_error",
+    "measure_queue_wait",
+    "request_priority",
+    "retry_after_seconds",
+    "usage_tokens",
+]
@@ -0,0 +1,645 @@
+"""
+Process-wide rate limiter for LLM provider calls.
+
+The playground, eval execution, the conversation simulator, the promptimizer
+and LLM-judged metrics all reach providers through the any_llm adapter or the
+judge runtime, and both meter their calls here, so one feature's load is
+visible to the others:
+- calls are keyed by provider, API key and model, the granularity providers
+  enforce quotas at,
+- each key has a request bucket (RPM) and a token bucket (TPM) refilled
+  continuously, plus a cap on in-flight calls,
+- waiting calls are served by priority, then arrival: interactive calls go
+  before batch calls, and batch calls leave a share of each budget free so
+  an interactive call arriving during an eval does not queue behind it,
+- a rate-limited call pauses its key for Retry-After (or an exponential
+  backoff) and is retried; the pause holds back every caller of the key, and
+  the buckets then release them at the budget's pace instead of all at once.
+
+Budgets come from the rpm_limit and tpm_limit of the LLM configs in
+DEFAULT_LLM_CONFIGS, loaded when the limiter is built, falling back to
+llm_default_rpm_limit and llm_default_tpm_limit. The limiter serves
+coroutines on any event loop and thread (the judge runtime runs its own loop).
+"""
+import asyncio
+import email.utils
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, TypeVar
+
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# (provider, API key fingerprint, model)
+LimitKey = Tuple[str, str, str]
+
+
+class RequestPriority(IntEnum):
+    """Priority class of a provider call; lower values are served first"""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_request_priority: ContextVar[RequestPriority] = ContextVar(
+    "llm_request_priority", default=RequestPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """
+    Run provider calls made in this context, and tasks started from it, at a priority.
+
+    Args:
+        priority: Priority class of the calls
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def current_request_priority() -> RequestPriority:
+    """Return the priority of provider calls made in the current context."""
+    return _request_priority.get()
+
+
+class QueueWaitClock:
+    """Time provider calls of a context spent waiting for a slot. Safe to share between threads."""
+
+    def __init__(self):
+        self._waiting = 0
+        self._since = 0.0
+        self._total = 0.0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Record that a call started waiting."""
+        with self._lock:
+            if self._waiting == 0:
+                self._since = time.monotonic()
+            self._waiting += 1
+
+    def stop(self) -> None:
+        """Record that a waiting call was granted a slot or gave up."""
+        with self._lock:
+            self._waiting -= 1
+            if self._waiting == 0:
+                self._total += time.monotonic() - self._since
+
+    def seconds(self) -> float:
+        """Seconds during which at least one call was waiting, including a wait in progress."""
+        with self._lock:
+            return self._total + (time.monotonic() - self._since if self._waiting else 0.0)
+
+
+_queue_wait_clock: ContextVar[Optional[QueueWaitClock]] = ContextVar("llm_queue_wait_clock", default=None)
+
+
+@contextmanager
+def measure_queue_wait() -> Iterator[QueueWaitClock]:
+    """
+    Clock the time provider calls made in this context, and tasks started from it, wait for the limiter.
+
+    Yields:
+        QueueWaitClock: Clock of the waits
+    """
+    clock = QueueWaitClock()
+    token = _queue_wait_clock.set(clock)
+    try:
+        yield clock
+    finally:
+        _queue_wait_clock.reset(token)
+
+
+@dataclass(frozen=True)
+class RateLimitBudget:
+    """Per-minute quota of a provider, API key and model (None = unlimited)"""
+    rpm: Optional[int] = None
+    tpm: Optional[int] = None
+
+
+class _TokenBucket:
+    """Bucket refilled continuously at capacity per minute."""
+
+    def __init__(self, capacity: float, now: float):
+        self.capacity = capacity
+        self.rate = capacity / 60.0
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, reserve_ratio: float) -> float:
+        # A request larger than the bucket goes through once the bucket is full
+        target = min(self.capacity, amount + self.capacity * reserve_ratio)
+        deficit = target - self.tokens
+        return deficit / self.rate if deficit > 0 else 0.0
+
+
+@dataclass
+class _Waiter:
+    tokens: float
+    loop: asyncio.AbstractEventLoop
+    event: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def wake(self) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            # The waiter's loop is closed; it is no longer waiting
+            pass
+
+
+class _KeyState:
+    """Buckets, in-flight count, pause and waiters of one key."""
+
+    def __init__(self, budget: RateLimitBudget, now: float):
+        self.budget = budget
+        self.requests = _TokenBucket(budget.rpm, now) if budget.rpm else None
+        self.tokens = _TokenBucket(budget.tpm, now) if budget.tpm else None
+        self.in_flight = 0
+        self.paused_until = 0.0
+        # Heap of (priority, arrival, waiter)
+        self.waiters: List[Tuple[int, int, _Waiter]] = []
+
+    def wake_head(self) -> None:
+        if self.waiters:
+            self.waiters[0][2].wake()
+
+
+class RateLimitLease:
+    """A granted provider call; reports the tokens it actually used."""
+
+    def __init__(self, limiter: "ProviderRateLimiter", key: LimitKey, reserved_tokens: float):
+        self.limiter = limiter
+        self.key = key
+        self.reserved_tokens = reserved_tokens
+
+    def record_usage(self, total_tokens: Optional[int]) -> None:
+        """
+        Settle the token bucket with the call's actual usage.
+
+        Args:
+            total_tokens: Prompt and completion tokens reported by the provider (None keeps the estimate)
+        """
+        if total_tokens is None:
+            return
+        self.limiter._settle(self.key, total_tokens - self.reserved_tokens)
+        self.reserved_tokens = total_tokens
+
+
+class LeasedStream:
+    """
+    Streamed provider response holding its call slot until it is exhausted or closed.
+
+    Token usage reported by a chunk, usually the last one, settles the lease.
+    """
+
+    def __init__(self, stream: Any, lease: RateLimitLease, slot: AsyncExitStack):
+        self._stream = stream
+        self._lease = lease
+        self._slot: Optional[AsyncExitStack] = slot
+
+    def __aiter__(self) -> "LeasedStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            chunk = await self._stream.__anext__()
+        except BaseException:
+            await self.aclose()
+            raise
+        total_tokens = usage_tokens(chunk)
+        if total_tokens is not None:
+            self._lease.record_usage(total_tokens)
+        return chunk
+
+    async def aclose(self) -> None:
+        """Close the stream and release its call slot."""
+        if self._slot is None:
+            return
+        slot, self._slot = self._slot, None
+        try:
+            close = getattr(self._stream, "aclose", None)
+            if close is not None:
+                await close()
+        finally:
+            await slot.aclose()
+
+
+class ProviderRateLimiter:
+    """
+    Token-bucket limiter and concurrency governor for provider calls.
+
+    Safe to share between threads and event loops.
+    """
+
+    def __init__(
+        self,
+        default_budget: RateLimitBudget = RateLimitBudget(),
+        max_concurrent: int = 16,
+        interactive_reserve_ratio: float = 0.1,
+        processes: int = 1,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        enabled: bool = True
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            default_budget: Budget of keys without a configured one
+            max_concurrent: Maximum in-flight calls per key
+            interactive_reserve_ratio: Share of each budget batch calls leave free
+            processes: Processes sharing the quotas; budgets and the concurrency cap are split between them
+            max_retries: Retries of a call rejected by a rate limit
+            backoff_seconds: Pause after a rate limit without Retry-After, doubled per retry
+            enabled: Whether calls are metered at all
+        """
+        self.default_budget = default_budget
+        self.processes = max(1, processes)
+        self.max_concurrent = max(1, max_concurrent // self.processes)
+        self.interactive_reserve_ratio = min(max(interactive_reserve_ratio, 0.0), 0.9)
+        self.max_retries = max(0, max_retries)
+        self.backoff_seconds = backoff_seconds
+        self.enabled = enabled
+        self._budgets: Dict[LimitKey, RateLimitBudget] = {}
+        self._states: Dict[LimitKey, _KeyState] = {}
+        self._arrivals = itertools.count()
+        self._lock = threading.Lock()
+
+    def set_budget(self, provider: str, model: str, budget: RateLimitBudget, api_key: Optional[str] = None) -> None:
+        """
+        Configure the quota of a provider and model.
+
+        Args:
+            provider: LLM provider
+            model: Model name without the provider prefix
+            budget: Requests and tokens per minute
+            api_key: API key the quota belongs to (None applies it to every key)
+        """
+        key = limit_key(provider, model, api_key) if api_key else (provider.lower(), "*", model)
+        with self._lock:
+            if self._budgets.get(key) == budget:
+                return
+            self._budgets[key] = budget
+            # Idle keys are rebuilt with the new budget on next use
+            for state_key, state in list(self._states.items()):
+                affected = state_key == key or (key[1] == "*" and (state_key[0], state_key[2]) == (key[0], key[2]))
+                if affected and not state.waiters and not state.in_flight:
+                    del self._states[state_key]
+
+    def load_budgets(self, llm_configs: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Configure the quotas of LLM configs that set rpm_limit or tpm_limit.
+
+        Args:
+            llm_configs: LLM configs with provider, model, api_key, rpm_limit and tpm_limit
+        """
+        for config in llm_configs:
+            if not config.get("provider") or not config.get("model"):
+                continue
+            if config.get("rpm_limit") or config.get("tpm_limit"):
+                self.set_budget(
+                    config["provider"], config["model"],
+                    RateLimitBudget(rpm=config.get("rpm_limit"), tpm=config.get("tpm_limit")),
+                    api_key=config.get("api_key") or None
+                )
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        provider: str,
+        model: str,
+        api_key: Optional[str] = None,
+        tokens: float = 0,
+        priority: Optional[RequestPriority] = None
+    ) -> AsyncIterator[RateLimitLease]:
+        """
+        Wait for a call slot of the key and hold it for the duration of a call.
+
+        Args:
+            provider: LLM provider
+            model: Model name without the provider prefix
+            api_key: API key of the call
+            tokens: Estimated prompt and completion tokens
+            priority: Priority class (None uses the current context's)
+
+        Yields:
+            RateLimitLease: The granted call
+        """
+        key = limit_key(provider, model, api_key)
+        if not self.enabled:
+            yield RateLimitLease(self, key, 0)
+            return
+
+        priority = current_request_priority() if priority is None else priority
+        waiter = _Waiter(tokens=tokens, loop=asyncio.get_running_loop())
+        entry = (int(priority), next(self._arrivals), waiter)
+        clock = _queue_wait_clock.get()
+        waiting = False
+        with self._lock:
+            state = self._state(key)
+            heapq.heappush(state.waiters, entry)
+        try:
+            while True:
+                with self._lock:
+                    waiter.event.clear()
+                    delay = self._try_grant(state, entry, time.monotonic())
+                if delay is None:
+                    break
+                if clock is not None and not waiting:
+                    clock.start()
+                    waiting = True
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), timeout=None if math.isinf(delay) else delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            with self._lock:
+                if entry in state.waiters:
+                    state.waiters.remove(entry)
+                    heapq.heapify(state.waiters)
+                    state.wake_head()
+            raise
+        finally:
+            if waiting:
+                clock.stop()
+
+        try:
+            yield RateLimitLease(self, key, tokens)
+        finally:
+            with self._lock:
+                state.in_flight -= 1
+                state.wake_head()
+
+    def pause(self, provider: str, model: str, seconds: float, api_key: Optional[str] = None) -> None:
+        """
+        Hold back every call of a key, e.g. after the provider rejected one.
+
+        Args:
+            provider: LLM provider
+            model: Model name without the provider prefix
+            seconds: Length of the pause
+            api_key: API key of the rejected call
+        """
+        with self._lock:
+            state = self._state(limit_key(provider, model, api_key))
+            state.paused_until = max(state.paused_until, time.monotonic() + seconds)
+            # The head waiter re-evaluates its wait with the pause
+            state.wake_head()
+
+    async def call(
+        self,
+        provider: str,
+        model: str,
+        request: Callable[[], Awaitable[T]],
+        api_key: Optional[str] = None,
+        tokens: float = 0,
+        priority: Optional[RequestPriority] = None
+    ) -> T:
+        """
+        Send a provider call through the limiter, retrying after rate limits.
+
+        Args:
+            provider: LLM provider
+            model: Model name without the provider prefix
+            request: Sends the call
+            api_key: API key of the call
+            tokens: Estimated prompt and completion tokens
+            priority: Priority class (None uses the current context's)
+
+        Returns:
+            The call's response; a streamed response holds its slot until it is
+            exhausted or closed
+        """
+        attempt = 0
+        while True:
+            async with AsyncExitStack() as slot:
+                lease = await slot.enter_async_context(
+                    self.acquire(provider, model, api_key=api_key, tokens=tokens, priority=priority)
+                )
+                try:
+                    response = await request()
+                except Exception as e:
+                    if not self.enabled or not is_rate_limit_error(e) or attempt >= self.max_retries:
+                        raise
+                    delay = retry_after_seconds(e) or self.backoff_seconds * (2 ** attempt)
+                    attempt += 1
+                    self.pause(provider, model, delay, api_key=api_key)
+                    logger.warning(
+                        f"Provider {provider} rate limited {model}; pausing {delay:.1f}s "
+                        f"(retry {attempt}/{self.max_retries})"
+                    )
+                    continue
+                if hasattr(response, "__anext__"):
+                    return LeasedStream(response, lease, slot.pop_all())  # type: ignore[return-value]
+                lease.record_usage(usage_tokens(response))
+                return response
+
+    def _state(self, key: LimitKey) -> _KeyState:
+        state = self._states.get(key)
+        if state is None:
+            budget = self._budgets.get(key) or self._budgets.get((key[0], "*", key[2])) or self.default_budget
+            state = _KeyState(
+                RateLimitBudget(
+                    rpm=budget.rpm / self.processes if budget.rpm else None,
+                    tpm=budget.tpm / self.processes if budget.tpm else None
+                ),
+                time.monotonic()
+            )
+            self._states[key] = state
+        return state
+
+    def _try_grant(self, state: _KeyState, entry: Tuple[int, int, _Waiter], now: float) -> Optional[float]:
+        """Grant the call if it is next and fits the budget; otherwise return seconds to wait."""
+        if state.waiters[0] is not entry:
+            # Woken when it becomes the head of the queue
+            return math.inf
+        if now < state.paused_until:
+            return state.paused_until - now
+        if state.in_flight >= self.max_concurrent:
+            # Woken when a call finishes
+            return math.inf
+        reserve = self.interactive_reserve_ratio if entry[0] > RequestPriority.INTERACTIVE else 0.0
+        wait = 0.0
+        if state.requests is not None:
+            state.requests.refill(now)
+            wait = max(wait, state.requests.wait_time(1, reserve))
+        if state.tokens is not None:
+            state.tokens.refill(now)
+            wait = max(wait, state.tokens.wait_time(entry[2].tokens, reserve))
+        if wait > 0:
+            return wait
+        if state.requests is not None:
+            state.requests.tokens -= 1
+        if state.tokens is not None:
+            state.tokens.tokens -= entry[2].tokens
+        state.in_flight += 1
+        heapq.heappop(state.waiters)
+        state.wake_head()
+        return None
+
+    def _settle(self, key: LimitKey, extra_tokens: float) -> None:
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or state.tokens is None:
+                return
+            state.tokens.refill(time.monotonic())
+            state.tokens.tokens = min(state.tokens.capacity, state.tokens.tokens - extra_tokens)
+            if extra_tokens < 0:
+                state.wake_head()
+
+
+def limit_key(provider: str, model: str, api_key: Optional[str]) -> LimitKey:
+    """
+    Return the key a provider call is metered under.
+
+    Args:
+        provider: LLM provider
+        model: Model name without the provider prefix
+        api_key: API key of the call
+
+    Returns:
+        LimitKey: (provider, API key fingerprint, model)
+    """
+    fingerprint = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+    return provider.lower(), fingerprint, model
+
+
+def estimate_tokens(messages: Any, max_tokens: Optional[int] = None) -> int:
+    """
+    Estimate the tokens of a completion before sending it.
+
+    Roughly four characters per prompt token, plus the completion's max_tokens.
+    The estimate is settled with the provider-reported usage afterwards.
+
+    Args:
+        messages: Chat messages (dicts or message objects) or input texts
+        max_tokens: Completion token limit of the call
+
+    Returns:
+        int: Estimated tokens
+    """
+    characters = 0
+    for message in messages or []:
+        content = message.get("content") if isinstance(message, dict) else getattr(message, "content", message)
+        characters += len(str(content or ""))
+    return characters // 4 + (max_tokens or 0)
+
+
+def usage_tokens(response: Any) -> Optional[int]:
+    """Return the total tokens a provider response reports, if any."""
+    usage = getattr(response, "usage", None)
+    total = getattr(usage, "total_tokens", None)
+    return total if isinstance(total, int) else None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Whether an exception is a provider rate-limit rejection.
+
+    Provider SDKs and any_llm raise their own RateLimitError classes, so they
+    are recognised by name or by an HTTP 429 status code.
+
+    Args:
+        error: Exception raised by a provider call
+
+    Returns:
+        True if the provider rejected the call for exceeding its rate limit
+    """
+    if type(error).__name__ == "RateLimitError":
+        return True
+    return getattr(error, "status_code", None) == 429
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Return how long a rate-limited provider asked to wait.
+
+    Reads a retry_after attribute, or the Retry-After (seconds or HTTP date)
+    and retry-after-ms headers of the error's HTTP response.
+
+    Args:
+        error: Rate-limit exception
+
+    Returns:
+        Seconds to wait, or None if the provider did not say
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is None:
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            if headers.get("retry-after-ms") is not None:
+                return float(headers["retry-after-ms"]) / 1000.0
+        except (TypeError, ValueError, AttributeError):
+            return None
+        retry_after = headers.get("retry-after") if hasattr(headers, "get") else None
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(str(retry_after)).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Process-wide limiter shared by all features calling providers
+_provider_rate_limiter: Optional[ProviderRateLimiter] = None
+_provider_rate_limiter_lock = threading.Lock()
+
+
+def get_provider_rate_limiter() -> ProviderRateLimiter:
+    """Return the process-wide provider rate limiter configured from settings and DEFAULT_LLM_CONFIGS."""
+    global _provider_rate_limiter
+    if _provider_rate_limiter is None:
+        with _provider_rate_limiter_lock:
+            if _provider_rate_limiter is None:
+                limiter = ProviderRateLimiter(
+                    default_budget=RateLimitBudget(
+                        rpm=settings.llm_default_rpm_limit or None,
+                        tpm=settings.llm_default_tpm_limit or None
+                    ),
+                    max_concurrent=settings.llm_max_concurrent_requests,
+                    interactive_reserve_ratio=settings.llm_interactive_reserve_ratio,
+                    processes=settings.llm_rate_limit_processes,
+                    max_retries=settings.llm_rate_limit_max_retries,
+                    backoff_seconds=settings.llm_rate_limit_backoff_seconds,
+                    enabled=settings.llm_rate_limit_enabled
+                )
+                limiter.load_budgets(_default_llm_configs())
+                _provider_rate_limiter = limiter
+    return _provider_rate_limiter
+
+
+def _default_llm_configs() -> List[Dict[str, Any]]:
+    """Return the organization-wide LLM configs of DEFAULT_LLM_CONFIGS."""
+    try:
+        configs = json.loads(os.environ.get("DEFAULT_LLM_CONFIGS", "[]")) or []
+    except json.JSONDecodeError:
+        logger.warning("DEFAULT_LLM_CONFIGS is not valid JSON; using the default rate limits")
+        return []
+    if not isinstance(configs, list):
+        return []
+    return [config for config in configs if isinstance(config, dict)]
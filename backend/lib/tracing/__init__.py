@@ -0,0 +1,17 @@
+from lib.tracing.otel_tracing import (
+    configure_tracing,
+    get_tracer,
+    link_agent_trace,
+    set_span_attributes,
+    shutdown_tracing,
+    traced,
+)
+
+__all__ = [
+    "configure_tracing",
+    "get_tracer",
+    "link_agent_trace",
+    "set_span_attributes",
+    "shutdown_tracing",
+    "traced",
+]
@@ -0,0 +1,187 @@
+"""
+OpenTelemetry tracing across the API, service, git and LLM layers.
+
+Spans are created through the OpenTelemetry API and cost next to nothing
+until configure_tracing installs an SDK tracer provider (tracing_enabled):
+- the API layer opens a server span per request, continuing an incoming
+  W3C traceparent,
+- services, git operations, tool calls and provider calls open child spans
+  with the traced decorator or get_tracer().start_as_current_span,
+- any_agent creates its AgentTrace spans in the current context, so they join
+  the same trace when it shares the global provider; link_agent_trace links
+  the agent's root spans in any case.
+Spans go to an OTLP collector, to the console, and/or to a JSON-lines file
+for offline use (tracing_exporters).
+"""
+import functools
+import inspect
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, List, Optional, TypeVar
+
+from opentelemetry import trace
+
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+TRACER_NAME = "promptrepo"
+
+_configure_lock = threading.Lock()
+# SDK tracer provider spans are exported through, once configured
+_provider: Optional[Any] = None
+
+
+def get_tracer() -> trace.Tracer:
+    """Return the tracer of the backend; a no-op tracer until tracing is configured."""
+    return trace.get_tracer(TRACER_NAME)
+
+
+def traced(name: str, **attributes: Any) -> Callable[[F], F]:
+    """
+    Run a function in a span; works for synchronous and async functions.
+
+    Exceptions are recorded on the span and mark it as failed.
+
+    Args:
+        name: Span name (e.g. git.commit_files)
+        **attributes: Attributes set on every span of the function
+
+    Returns:
+        Decorator
+    """
+    span_attributes = {key: value for key, value in attributes.items() if value is not None} or None
+
+    def decorate(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with get_tracer().start_as_current_span(name, attributes=span_attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with get_tracer().start_as_current_span(name, attributes=span_attributes):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    """
+    Set attributes on the current span; None values are skipped.
+
+    Args:
+        **attributes: Attribute names and values
+    """
+    span = trace.get_current_span()
+    if not span.is_recording():
+        return
+    span.set_attributes({key: value for key, value in attributes.items() if value is not None})
+
+
+def link_agent_trace(agent_trace: Any) -> None:
+    """
+    Link the current span to the root spans of an any_agent AgentTrace.
+
+    Args:
+        agent_trace: AgentTrace returned by an agent run
+    """
+    span = trace.get_current_span()
+    if not span.is_recording():
+        return
+    agent_spans = getattr(agent_trace, "spans", None)
+    if not isinstance(agent_spans, list):
+        return
+    span_ids = {getattr(getattr(s, "context", None), "span_id", None) for s in agent_spans}
+    current_trace_id = span.get_span_context().trace_id
+    for agent_span in agent_spans:
+        context = getattr(agent_span, "context", None)
+        trace_id = getattr(context, "trace_id", None)
+        span_id = getattr(context, "span_id", None)
+        parent_id = getattr(getattr(agent_span, "parent", None), "span_id", None)
+        if not trace_id or not span_id or parent_id in span_ids:
+            continue
+        span.set_attribute("agent.trace_id", format(trace_id, "032x"))
+        if trace_id != current_trace_id:
+            # Spans of the same trace are already children of this one
+            span.add_link(trace.SpanContext(trace_id=trace_id, span_id=span_id, is_remote=False))
+
+
+def _create_exporters(names: str) -> List[Any]:
+    """Create the span exporters named in tracing_exporters."""
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    exporters: List[Any] = []
+    for name in (part.strip().lower() for part in names.split(",")):
+        if not name:
+            continue
+        if name == "otlp":
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            # Without an endpoint the exporter reads OTEL_EXPORTER_OTLP_* variables
+            exporters.append(OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint or None))
+        elif name == "console":
+            exporters.append(ConsoleSpanExporter())
+        elif name == "file":
+            path = Path(settings.tracing_file_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            exporters.append(ConsoleSpanExporter(
+                out=open(path, "a", encoding="utf-8"),
+                formatter=lambda span: span.to_json(indent=None) + os.linesep
+            ))
+        else:
+            raise ValueError(f"Unknown tracing exporter '{name}'; expected otlp, console or file")
+    return exporters
+
+
+def configure_tracing(service_name: Optional[str] = None) -> bool:
+    """
+    Install span exporters when tracing_enabled is set. Safe to call more than once.
+
+    An SDK tracer provider set by another library (e.g. any_agent) is reused,
+    so its spans are exported with the backend's.
+
+    Args:
+        service_name: service.name resource attribute (defaults to tracing_service_name)
+
+    Returns:
+        Whether spans are exported
+    """
+    global _provider
+    if not settings.tracing_enabled:
+        return False
+    with _configure_lock:
+        if _provider is not None:
+            return True
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+        provider = trace.get_tracer_provider()
+        if not isinstance(provider, TracerProvider):
+            provider = TracerProvider(
+                resource=Resource.create({"service.name": service_name or settings.tracing_service_name}),
+                sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio))
+            )
+            trace.set_tracer_provider(provider)
+        for exporter in _create_exporters(settings.tracing_exporters):
+            provider.add_span_processor(BatchSpanProcessor(exporter))
+        _provider = provider
+    logger.info(f"Tracing enabled; exporting spans to {settings.tracing_exporters}")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush and stop the span exporters installed by configure_tracing."""
+    global _provider
+    with _configure_lock:
+        provider, _provider = _provider, None
+    if provider is not None:
+        provider.shutdown()
@@ -1,26 +1,42 @@
 """
 FastAPI backend application for PromptRepo.
 """
-from fastapi import FastAPI, status
+# Start the startup profiler before anything heavy is imported
+from utils.startup import get_startup_profiler, warm_up_heavy_stacks
+startup_profiler = get_startup_profiler()
+
+from fastapi import FastAPI, Header, status
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 import os
+from typing import Optional
 
 # Import database setup from the new architecture
-from database.core import create_db_and_tables
+from database.core import create_db_and_tables, dispose_engines
 
 # Import middleware
 from middlewares import ContextMiddleware
 
 # Import core setup and components from middlewares
 from middlewares.rest.setup import setup_fastapi_app
+from middlewares.rest.exceptions import AuthenticationException
 from middlewares.rest.responses import StandardResponse, success_response
 from services import remote_repo
+from services.remote_repo.remote_repo_cache import get_remote_repo_cache
+from services.llm.model_provider_service import warm_up_model_lists
+from services.artifacts.evals.eval_job_queue import get_eval_job_queue
+from lib.deepeval.judge_runtime import shutdown_judge_runtime
+from settings import settings
+from lib.tracing import configure_tracing, shutdown_tracing
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Export spans before any request or background job is traced
+configure_tracing()
+
 # Import API routers
 from api.v0.auth import router as auth_router
 from api.v0.llm import router as llm_router
@@ -34,14 +50,36 @@ from api.v0.evals import router as evals_router
 from api.v0.promptimizer import router as promptimizer_router
 from api.v0.shared_chats import router as shared_chats_router
 from api.v0.conversational import router as conversational_router
+from api.deps import eval_execution_service_scope
+
+startup_profiler.mark("imports")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     create_db_and_tables()
+    await get_eval_job_queue().start(
+        service_factory=eval_execution_service_scope,
+        retention_seconds=settings.eval_job_retention_days * 86400
+    )
+    if settings.warm_model_lists_on_startup:
+        # Fire and forget: startup must not wait on provider APIs
+        app.state.model_list_warmup = asyncio.create_task(warm_up_model_lists())
+    if settings.warm_heavy_stacks_on_startup:
+        # Agent and eval libraries are otherwise imported on first use
+        app.state.heavy_stack_warmup = asyncio.create_task(asyncio.to_thread(warm_up_heavy_stacks))
+    startup_profiler.mark("lifespan_startup")
+    startup_profiler.stop_import_profiling()
+    startup_profiler.log_report()
     logger.info("PromptRepo API started successfully")
     yield
     # Shutdown (if needed)
+    await get_eval_job_queue().stop()
+    await get_remote_repo_cache().aclose()
+    # Blocks while the judge loop closes its clients, so keep it off the event loop
+    await asyncio.to_thread(shutdown_judge_runtime)
+    await dispose_engines()
+    shutdown_tracing()
     logger.info("PromptRepo API shutting down")
 
 # Create FastAPI app with lifespan
@@ -136,6 +174,25 @@ async def root_redirect():
     return RedirectResponse(url="/api/v0/info", status_code=status.HTTP_307_TEMPORARY_REDIRECT)
 
 
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics(authorization: Optional[str] = Header(default=None)):
+        """
+        Prometheus exposition of request, LLM, eval, git, cache and database metrics.
+
+        Requires metrics_bearer_token as a bearer token when it is set.
+        """
+        from fastapi.responses import Response
+        from lib.metrics import metrics_request_authorized, render_metrics
+        if not metrics_request_authorized(authorization, settings.metrics_bearer_token):
+            raise AuthenticationException(message="Metrics bearer token required")
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+
+startup_profiler.mark("app_setup")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8080)
\ No newline at end of file
@@ -10,12 +10,33 @@ from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from opentelemetry import propagate, trace
+
+from lib.metrics import observe_http_request
+from lib.tracing import get_tracer
+
 from .responses import error_response
 
 
 logger = logging.getLogger(__name__)
 
 
+def _route_template(request: Request) -> str:
+    """Route path template the request matched, keeping metric labels bounded."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _end_request_span(span: trace.Span, request: Request, status_code: int) -> None:
+    """Name the server span after the matched route and record the response status."""
+    route = _route_template(request)
+    span.update_name(f"{request.method} {route}")
+    span.set_attribute("http.route", route)
+    span.set_attribute("http.response.status_code", status_code)
+    if status_code >= 500:
+        span.set_status(trace.StatusCode.ERROR)
+
+
 class ResponseMiddleware(BaseHTTPMiddleware):
     """
     Middleware to standardize all responses and add metadata.
@@ -31,6 +52,29 @@ class ResponseMiddleware(BaseHTTPMiddleware):
         request.state.request_id = request_id
         request.state.correlation_id = correlation_id
         
+        # Server span of the request, continuing the caller's trace if it sent a traceparent
+        with get_tracer().start_as_current_span(
+            request.method,
+            context=propagate.extract(request.headers),
+            kind=trace.SpanKind.SERVER,
+            attributes={
+                "http.request.method": request.method,
+                "url.path": request.url.path,
+                "request_id": request_id,
+            },
+            record_exception=False,
+            set_status_on_exception=False
+        ) as span:
+            return await self._dispatch_in_span(request, call_next, span, request_id, correlation_id)
+
+    async def _dispatch_in_span(
+        self,
+        request: Request,
+        call_next: Callable,
+        span: trace.Span,
+        request_id: str,
+        correlation_id: str
+    ) -> Response:
         # Track request time
         start_time = time.time()
         
@@ -45,11 +89,18 @@ class ResponseMiddleware(BaseHTTPMiddleware):
             # Add timing header
             process_time = time.time() - start_time
             response.headers["X-Process-Time"] = str(process_time)
+            observe_http_request(request.method, _route_template(request), response.status_code, process_time)
+            _end_request_span(span, request, response.status_code)
+            if span.is_recording():
+                response.headers["X-Trace-ID"] = format(span.get_span_context().trace_id, "032x")
             
             return response
             
         except Exception as exc:
             process_time = time.time() - start_time
+            observe_http_request(request.method, _route_template(request), 500, process_time)
+            span.record_exception(exc)
+            _end_request_span(span, request, 500)
             logger.error(
                 f"Request {request_id} failed after {process_time:.3f}s",
                 exc_info=True,
@@ -35,6 +35,10 @@ class ResponseMeta(BaseModel):
         default=None,
         description="Correlation ID for distributed tracing"
     )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page of a cursor-paginated listing"
+    )
 
 
 class StandardResponse(BaseModel, Generic[T]):
@@ -134,3 +134,13 @@ class SharedChatListItem(BaseModel):
     message_count: int = Field(..., description="Number of messages")
 
     model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+
+class SharedChatListPage(BaseModel):
+    """One page of a user's shared chats."""
+
+    items: List[SharedChatListItem] = Field(default_factory=list, description="Shared chats on this page")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor for the next page, None on the last page"
+    )
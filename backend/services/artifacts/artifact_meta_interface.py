@@ -60,7 +60,8 @@ class ArtifactMetaInterface(ABC, Generic[ArtifactDataType, ArtifactMetaType]):
         self,
         user_id: str,
         repo_name: str,
-        file_path: str
+        file_path: str,
+        ref: Optional[str] = None
     ) -> Optional[ArtifactMetaType]:
         """
         Get a single artifact by file path.
@@ -69,6 +70,7 @@ class ArtifactMetaInterface(ABC, Generic[ArtifactDataType, ArtifactMetaType]):
             user_id: User ID
             repo_name: Repository name
             file_path: Relative path to artifact file from repo root
+            ref: Optional branch, tag or commit SHA to read the artifact at (default: working tree)
             
         Returns:
             Optional[ArtifactMetaType]: Artifact metadata if found, None otherwise
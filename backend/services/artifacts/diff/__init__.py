@@ -0,0 +1,22 @@
+"""
+Artifact Diff Package
+
+This package compares versions of prompt, tool and eval artifacts across
+their git history.
+"""
+
+from .models import ArtifactDiff, ChangeType, DiffSection, FieldChange
+from .artifact_diff import diff_artifacts
+from .diff_cache import ArtifactDiffCache, get_artifact_diff_cache
+from .artifact_diff_service import ArtifactDiffService
+
+__all__ = [
+    "ArtifactDiff",
+    "ArtifactDiffCache",
+    "ArtifactDiffService",
+    "ChangeType",
+    "DiffSection",
+    "FieldChange",
+    "diff_artifacts",
+    "get_artifact_diff_cache",
+]
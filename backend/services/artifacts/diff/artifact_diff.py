@@ -0,0 +1,159 @@
+"""
+Field-aware comparison of two parsed artifacts.
+
+Artifacts are compared as YAML documents rather than as text, so a change is
+reported against the field it touches:
+- mappings are compared key by key,
+- lists of mappings that carry a unique identity (tests by name, metrics by
+  type) are matched by that identity, so reordering is not a change and an
+  edited test is reported field by field,
+- lists of plain values (tool paths, tags) report added and removed items,
+- multi-line text such as the prompt also gets a unified line diff.
+"""
+import difflib
+from typing import Any, Dict, List, Optional
+
+from services.artifacts.diff.models import ChangeType, DiffSection, FieldChange
+
+# Keys that identify an item in a list of mappings, in order of preference
+IDENTITY_KEYS = ("name", "id", "type")
+
+# Top-level keys wrapping the artifact definition in eval and tool files
+WRAPPER_KEYS = {"eval", "tool"}
+
+MODEL_PARAM_FIELDS = {
+    "provider", "model", "failover_model", "temperature", "top_p", "max_tokens",
+    "max_completion_tokens", "response_format", "stream", "stream_options", "n_completions",
+    "stop", "presence_penalty", "frequency_penalty", "seed", "logprobs", "top_logprobs",
+    "logit_bias", "reasoning_effort", "extra_args", "api_base",
+}
+TOOL_FIELDS = {"tools", "tool_choice", "parallel_tool_calls"}
+METADATA_FIELDS = {"created_at", "updated_at", "user"}
+
+
+def diff_artifacts(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> List[FieldChange]:
+    """
+    Compute the changed fields between two versions of an artifact.
+
+    Args:
+        old: Parsed artifact of the base version, None if the file didn't exist
+        new: Parsed artifact of the head version, None if the file doesn't exist
+
+    Returns:
+        List[FieldChange]: Changes in document order, empty if the versions are equal
+    """
+    changes: List[FieldChange] = []
+    _diff_value("", old if old is not None else {}, new if new is not None else {}, changes)
+    return changes
+
+
+def _diff_value(path: str, old: Any, new: Any, changes: List[FieldChange]) -> None:
+    if old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        _diff_mapping(path, old, new, changes)
+    elif isinstance(old, list) and isinstance(new, list):
+        _diff_list(path, old, new, changes)
+    else:
+        changes.append(_change(path, ChangeType.MODIFIED, old, new))
+
+
+def _diff_mapping(path: str, old: Dict[str, Any], new: Dict[str, Any], changes: List[FieldChange]) -> None:
+    for key in list(old) + [key for key in new if key not in old]:
+        child = f"{path}.{key}" if path else str(key)
+        if key not in new:
+            changes.append(_change(child, ChangeType.REMOVED, old[key], None))
+        elif key not in old:
+            changes.append(_change(child, ChangeType.ADDED, None, new[key]))
+        else:
+            _diff_value(child, old[key], new[key], changes)
+
+
+def _diff_list(path: str, old: List[Any], new: List[Any], changes: List[FieldChange]) -> None:
+    identity = _identity_key(old, new)
+    if identity:
+        old_items = {item[identity]: item for item in old}
+        new_items = {item[identity]: item for item in new}
+        for item_id in list(old_items) + [item_id for item_id in new_items if item_id not in old_items]:
+            child = f"{path}[{item_id}]"
+            if item_id not in new_items:
+                changes.append(_change(child, ChangeType.REMOVED, old_items[item_id], None))
+            elif item_id not in old_items:
+                changes.append(_change(child, ChangeType.ADDED, None, new_items[item_id]))
+            else:
+                _diff_value(child, old_items[item_id], new_items[item_id], changes)
+        return
+
+    if all(_is_scalar(item) for item in old + new):
+        removed = [item for item in old if item not in new]
+        added = [item for item in new if item not in old]
+        if removed or added:
+            changes.extend(_change(path, ChangeType.REMOVED, item, None) for item in removed)
+            changes.extend(_change(path, ChangeType.ADDED, None, item) for item in added)
+            return
+
+    # Reordered plain values or lists without item identity
+    changes.append(_change(path, ChangeType.MODIFIED, old, new))
+
+
+def _identity_key(old: List[Any], new: List[Any]) -> Optional[str]:
+    """Return the key that uniquely identifies every item of both lists, if any."""
+    if not all(isinstance(item, dict) for item in old + new):
+        return None
+    for key in IDENTITY_KEYS:
+        if all(
+            all(key in item and _is_scalar(item[key]) for item in items)
+            and len({item[key] for item in items}) == len(items)
+            for items in (old, new)
+        ):
+            return key
+    return None
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _change(path: str, change: ChangeType, old: Any, new: Any) -> FieldChange:
+    text_diff = None
+    if change == ChangeType.MODIFIED and isinstance(old, str) and isinstance(new, str) and ("\n" in old or "\n" in new):
+        text_diff = list(difflib.unified_diff(
+            old.splitlines(), new.splitlines(), fromfile="base", tofile="head", lineterm=""
+        ))
+    return FieldChange(
+        path=path,
+        section=section_for_path(path),
+        change=change,
+        old_value=old,
+        new_value=new,
+        text_diff=text_diff
+    )
+
+
+def section_for_path(path: str) -> DiffSection:
+    """
+    Classify a field path into the part of the artifact it belongs to.
+
+    Args:
+        path: Field path as reported in FieldChange.path
+
+    Returns:
+        DiffSection: Section of the field
+    """
+    parts = path.replace("[", ".").split(".")
+    wrapper = parts[0] if parts[0] in WRAPPER_KEYS and len(parts) > 1 else None
+    field = parts[1] if wrapper else parts[0]
+
+    if field in METADATA_FIELDS:
+        return DiffSection.METADATA
+    if wrapper == "tool" or field in TOOL_FIELDS:
+        return DiffSection.TOOLS
+    if field == "prompt":
+        return DiffSection.PROMPT
+    if field in MODEL_PARAM_FIELDS:
+        return DiffSection.MODEL_PARAMS
+    if field == "tests":
+        return DiffSection.TESTS
+    if field == "metrics":
+        return DiffSection.METRICS
+    return DiffSection.OTHER
@@ -0,0 +1,124 @@
+"""
+Artifact Diff Service
+
+Compares a prompt, tool or eval file at two git revisions. Both revisions
+are read from the object database, so comparing never touches the working
+tree, and diffs are cached per blob pair.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from middlewares.rest.exceptions import NotFoundException
+from services.artifacts.diff.artifact_diff import diff_artifacts
+from services.artifacts.diff.diff_cache import ArtifactDiffCache, get_artifact_diff_cache
+from services.artifacts.diff.models import ArtifactDiff
+from services.local_repo.local_repo_service import LocalRepoService
+from schemas.artifact_type_enum import ArtifactType
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactDiffService:
+    """Service for comparing versions of artifacts across commit history."""
+
+    def __init__(self, local_repo_service: LocalRepoService, cache: Optional[ArtifactDiffCache] = None):
+        """
+        Initialize the service.
+
+        Args:
+            local_repo_service: Service reading artifacts and refs from local repositories
+            cache: Diff cache (the process-wide cache if None)
+        """
+        self.local_repo_service = local_repo_service
+        self.cache = cache or get_artifact_diff_cache()
+
+    async def diff(
+        self,
+        user_id: str,
+        repo_name: str,
+        file_path: str,
+        base_ref: str,
+        head_ref: str
+    ) -> ArtifactDiff:
+        """
+        Compare an artifact file between two git refs.
+
+        Args:
+            user_id: User ID
+            repo_name: Repository name
+            file_path: Relative path to the artifact file from repo root
+            base_ref: Branch, tag or commit SHA to compare from
+            head_ref: Branch, tag or commit SHA to compare to
+
+        Returns:
+            ArtifactDiff: Changed fields between the two versions
+
+        Raises:
+            NotFoundException: If the repository or a ref doesn't exist, or the file exists at neither ref
+        """
+        return await asyncio.to_thread(self._diff, user_id, repo_name, file_path, base_ref, head_ref)
+
+    def _diff(self, user_id: str, repo_name: str, file_path: str, base_ref: str, head_ref: str) -> ArtifactDiff:
+        base_commit, base_blob = self.local_repo_service.resolve_artifact_revision(
+            user_id, repo_name, file_path, base_ref
+        )
+        head_commit, head_blob = self.local_repo_service.resolve_artifact_revision(
+            user_id, repo_name, file_path, head_ref
+        )
+        if base_blob is None and head_blob is None:
+            raise NotFoundException(
+                resource="Artifact",
+                identifier=file_path
+            )
+
+        def compute():
+            logger.info(f"Computing diff of {file_path} between {base_commit[:8]} and {head_commit[:8]}")
+            artifact_type = self._artifact_type(file_path)
+            return diff_artifacts(
+                self._load(user_id, repo_name, file_path, artifact_type, base_commit, base_blob),
+                self._load(user_id, repo_name, file_path, artifact_type, head_commit, head_blob)
+            )
+
+        if base_blob == head_blob:
+            changes = []
+        else:
+            changes = self.cache.get_or_compute(ArtifactDiffCache.build_key(base_blob, head_blob), compute)
+
+        return ArtifactDiff(
+            repo_name=repo_name,
+            file_path=file_path,
+            base_ref=base_ref,
+            head_ref=head_ref,
+            base_commit=base_commit,
+            head_commit=head_commit,
+            base_blob=base_blob,
+            head_blob=head_blob,
+            changes=changes
+        )
+
+    def _load(
+        self,
+        user_id: str,
+        repo_name: str,
+        file_path: str,
+        artifact_type: ArtifactType,
+        commit_hash: str,
+        blob_hash: Optional[str]
+    ) -> Optional[dict]:
+        if blob_hash is None:
+            return None
+        return self.local_repo_service.load_artifact(
+            user_id=user_id,
+            repo_name=repo_name,
+            file_path=file_path,
+            artifact_type=artifact_type,
+            ref=commit_hash
+        )
+
+    @staticmethod
+    def _artifact_type(file_path: str) -> ArtifactType:
+        for artifact_type, extension in LocalRepoService.ARTIFACT_EXTENSION_PATTERNS.items():
+            if file_path.endswith(extension):
+                return artifact_type
+        return ArtifactType.PROMPT
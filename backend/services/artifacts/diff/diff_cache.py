@@ -0,0 +1,134 @@
+"""
+Cache of computed artifact diffs.
+
+Blob hashes name file contents, so the diff between two blobs never changes
+and is computed once per (base blob, head blob) pair, however many
+reviewers open it and whichever commits hold the blobs. Concurrent requests
+for a pair that is being computed wait for that computation instead of
+repeating it. Entries are only evicted, least recently used first, to bound
+memory.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from lib.metrics import record_cache_lookup
+from services.artifacts.diff.models import FieldChange
+from settings import settings
+
+DiffKey = Tuple[str, str]
+
+
+class ArtifactDiffCache:
+    """
+    LRU cache of field changes keyed by (base blob hash, head blob hash).
+
+    Safe to share between threads. Callers get their own copies of the
+    cached changes.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached diffs
+        """
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[DiffKey, List[FieldChange]]" = OrderedDict()
+        self._in_flight: Dict[DiffKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build_key(base_blob: Optional[str], head_blob: Optional[str]) -> DiffKey:
+        """
+        Build the key of a blob pair.
+
+        Args:
+            base_blob: Blob hash of the base version, None if the file is absent
+            head_blob: Blob hash of the head version, None if the file is absent
+
+        Returns:
+            DiffKey: Cache key
+        """
+        return base_blob or "", head_blob or ""
+
+    def lookup(self, key: DiffKey) -> Optional[List[FieldChange]]:
+        """
+        Look up a diff.
+
+        Args:
+            key: Key from build_key
+
+        Returns:
+            Optional[List[FieldChange]]: Copy of the cached changes, None on a cache miss
+        """
+        with self._lock:
+            changes = self._entries.get(key)
+            if changes is None:
+                return None
+            self._entries.move_to_end(key)
+        return [change.model_copy(deep=True) for change in changes]
+
+    def store(self, key: DiffKey, changes: List[FieldChange]) -> None:
+        """
+        Store the diff of a blob pair.
+
+        Args:
+            key: Key from build_key
+            changes: Computed changes
+        """
+        changes = [change.model_copy(deep=True) for change in changes]
+        with self._lock:
+            self._entries[key] = changes
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: DiffKey, compute: Callable[[], List[FieldChange]]) -> List[FieldChange]:
+        """
+        Return the cached diff of a blob pair, computing and storing it on a miss.
+
+        Only one caller computes a given pair at a time; others wait for its result.
+
+        Args:
+            key: Key from build_key
+            compute: Computes the changes of the pair
+
+        Returns:
+            List[FieldChange]: Copy of the changes
+        """
+        changes = self.lookup(key)
+        if changes is not None:
+            record_cache_lookup("artifact_diff", hit=True)
+            return changes
+
+        with self._lock:
+            pair_lock = self._in_flight.setdefault(key, threading.Lock())
+        with pair_lock:
+            try:
+                changes = self.lookup(key)
+                # A concurrent caller computed it while this one waited
+                record_cache_lookup("artifact_diff", hit=changes is not None)
+                if changes is None:
+                    changes = compute()
+                    self.store(key, changes)
+            finally:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+        return changes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache shared by all ArtifactDiffService instances
+_artifact_diff_cache: Optional[ArtifactDiffCache] = None
+
+
+def get_artifact_diff_cache() -> ArtifactDiffCache:
+    """Return the process-wide artifact diff cache configured from settings."""
+    global _artifact_diff_cache
+    if _artifact_diff_cache is None:
+        _artifact_diff_cache = ArtifactDiffCache(max_entries=settings.artifact_diff_cache_max_entries)
+    return _artifact_diff_cache
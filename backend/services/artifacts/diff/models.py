@@ -0,0 +1,49 @@
+"""Models for comparing two versions of an artifact."""
+
+from enum import Enum
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field
+
+
+class ChangeType(str, Enum):
+    """How a field changed between two versions."""
+    ADDED = "added"
+    REMOVED = "removed"
+    MODIFIED = "modified"
+
+
+class DiffSection(str, Enum):
+    """Part of an artifact a changed field belongs to."""
+    PROMPT = "prompt"
+    MODEL_PARAMS = "model_params"
+    TOOLS = "tools"
+    TESTS = "tests"
+    METRICS = "metrics"
+    METADATA = "metadata"
+    OTHER = "other"
+
+
+class FieldChange(BaseModel):
+    """A single changed field of an artifact."""
+    path: str = Field(description="Field path, e.g. 'temperature' or 'eval.tests[greeting].user_message'")
+    section: DiffSection = Field(description="Part of the artifact the field belongs to")
+    change: ChangeType = Field(description="Whether the field was added, removed or modified")
+    old_value: Optional[Any] = Field(default=None, description="Value in the base version")
+    new_value: Optional[Any] = Field(default=None, description="Value in the head version")
+    text_diff: Optional[List[str]] = Field(
+        default=None,
+        description="Unified diff lines for modified multi-line text such as the prompt"
+    )
+
+
+class ArtifactDiff(BaseModel):
+    """Field-aware comparison of an artifact file at two git revisions."""
+    repo_name: str = Field(description="Repository name")
+    file_path: str = Field(description="Artifact file path relative to the repository root")
+    base_ref: str = Field(description="Ref the comparison starts from")
+    head_ref: str = Field(description="Ref the comparison ends at")
+    base_commit: str = Field(description="Commit base_ref resolved to")
+    head_commit: str = Field(description="Commit head_ref resolved to")
+    base_blob: Optional[str] = Field(default=None, description="Blob hash of the file at base, None if absent")
+    head_blob: Optional[str] = Field(default=None, description="Blob hash of the file at head, None if absent")
+    changes: List[FieldChange] = Field(default_factory=list, description="Changed fields in document order")
@@ -16,6 +16,10 @@ from .models import (
     EvalExecutionResult,
     EvalExecutionData,
     EvalSummary,
+    EvalJob,
+    EvalJobEvent,
+    EvalJobEventType,
+    EvalJobStatus,
     # Conversational test models
     Turn,
     TurnRole,
@@ -24,7 +28,10 @@ from .models import (
 )
 from .eval_meta_service import EvalMetaService
 from .eval_execution_meta_service import EvalExecutionMetaService
-from .eval_execution_service import EvalExecutionService
+from .eval_execution_service import EvalExecutionService, EvalProgressListener
+from .eval_scheduler import EvalTestScheduler
+from .eval_job_store import EvalJobStore
+from .eval_job_queue import EvalJobQueue, get_eval_job_queue
 
 __all__ = [
     "MetricType",
@@ -37,9 +44,18 @@ __all__ = [
     "EvalExecutionResult",
     "EvalExecutionData",
     "EvalSummary",
+    "EvalJob",
+    "EvalJobEvent",
+    "EvalJobEventType",
+    "EvalJobStatus",
     "EvalMetaService",
     "EvalExecutionMetaService",
     "EvalExecutionService",
+    "EvalProgressListener",
+    "EvalTestScheduler",
+    "EvalJobStore",
+    "EvalJobQueue",
+    "get_eval_job_queue",
     # Conversational test models
     "Turn",
     "TurnRole",
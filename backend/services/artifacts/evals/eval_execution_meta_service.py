@@ -216,10 +216,9 @@ class EvalExecutionMetaService(ArtifactMetaInterface[EvalExecutionData, EvalExec
         
         # Save using FileOperationsService (for simplicity, not using git workflow for executions)
         full_file_path = repo_path / file_path
-        full_file_path.parent.mkdir(parents=True, exist_ok=True)
         
         file_ops = FileOperationsService()
-        save_result = file_ops.save_yaml_file(full_file_path, exec_dict)
+        save_result = file_ops.save_yaml_file(full_file_path, exec_dict, repo_root=repo_path)
         
         if not save_result.success:
             raise AppException(message=f"Failed to save execution to {file_path}")
@@ -8,6 +8,7 @@ Orchestrates eval execution workflow including:
 - Saving execution results to YAML files
 """
 
+import asyncio
 import logging
 import time
 from datetime import datetime, timezone
@@ -17,11 +18,22 @@ from middlewares.rest.exceptions import NotFoundException, AppException
 from services.artifacts.prompt.prompt_meta_service import PromptMetaService
 from services.llm.chat_completion_service import ChatCompletionService
 from services.config.config_service import ConfigService
+from services.llm.completion_cache import (
+    CompletionCacheMode,
+    CompletionCacheStats,
+    resolve_cache_mode,
+)
 
 from .eval_meta_service import EvalMetaService
 from .eval_execution_meta_service import EvalExecutionMetaService
 from lib.deepeval.deepeval_adapter import DeepEvalAdapter, LLMConfig
+from lib.metrics import time_eval_stage
+from lib.rate_limit import RequestPriority, request_priority
+from settings import settings
+from .eval_scheduler import EvalTestScheduler
+from .metric_batch import EvalMetricBatch
 from .models import (
+    MetricType,
     TestDefinition,
     TestExecutionResult,
     EvalExecutionResult,
@@ -35,6 +47,30 @@ from .models import (
 logger = logging.getLogger(__name__)
 
 
+class EvalProgressListener:
+    """
+    Receives progress of an eval run, e.g. to stream it or checkpoint results.
+
+    The default implementation ignores every notification; subclasses
+    override the ones they need.
+    """
+
+    async def run_started(self, tests: List[TestDefinition], completed_results: Dict[str, TestExecutionResult]) -> None:
+        """
+        Called once the tests of the run are known.
+
+        Args:
+            tests: Enabled tests of the run, in eval order, including already completed ones
+            completed_results: Results of tests completed by an earlier run, by test name
+        """
+
+    async def test_started(self, test_def: TestDefinition) -> None:
+        """Called when a test starts executing."""
+
+    async def test_completed(self, result: TestExecutionResult) -> None:
+        """Called with a test result once its metrics are evaluated."""
+
+
 class EvalExecutionService:
     """
     Service for executing evals and individual tests.
@@ -74,6 +110,20 @@ class EvalExecutionService:
         self.chat_completion_service = chat_completion_service
         self.config_service = config_service
 
+    def _create_scheduler(self) -> EvalTestScheduler:
+        """Create a scheduler bounded by the configured eval concurrency limits."""
+        return EvalTestScheduler(
+            max_concurrent_tests=settings.eval_max_concurrent_tests,
+            max_concurrent_requests_per_provider=settings.eval_max_concurrent_requests_per_provider
+        )
+
+    @staticmethod
+    def _is_batched_metric(metric_type: MetricType) -> bool:
+        """Whether an eval run defers this metric type to its metric batch."""
+        if MetricType.is_deterministic(metric_type):
+            return settings.eval_batch_deterministic_metrics
+        return settings.eval_batch_judge_metrics
+
     def _get_llm_config_for_metric(
         self,
         metric_config: MetricConfig,
@@ -127,7 +177,11 @@ class EvalExecutionService:
         user_id: str,
         repo_name: str,
         eval_name: str,
-        test_names: Optional[List[str]] = None
+        test_names: Optional[List[str]] = None,
+        cache_mode: Optional[CompletionCacheMode] = None,
+        completed_results: Optional[Dict[str, TestExecutionResult]] = None,
+        listener: Optional[EvalProgressListener] = None,
+        save_result: bool = True
     ) -> EvalExecutionResult:
         """
         Execute eval or specific tests within eval.
@@ -137,6 +191,14 @@ class EvalExecutionService:
             repo_name: Repository name
             eval_name: Eval name
             test_names: Optional list of specific test names to run (None = run all)
+            cache_mode: Completion cache mode (None uses the configured default)
+            completed_results: Results of tests finished by an earlier, interrupted run, by test name;
+                               these tests are not executed again
+            listener: Receives the run's progress. Each test result is reported once its metrics
+                      are evaluated, so batched metrics are then evaluated every
+                      eval_job_checkpoint_tests tests instead of once at the end
+            save_result: Whether to save the execution result; shards of a sharded run leave
+                         saving the merged result to their coordinator
             
         Returns:
             EvalExecutionResult with complete execution results
@@ -170,19 +232,33 @@ class EvalExecutionService:
         
         # Filter out disabled tests
         tests_to_run = [t for t in tests_to_run if t.enabled]
-        
-        # Execute each test with eval-level metrics
-        test_results = []
-        for test_def in tests_to_run:
+        completed_results = completed_results or {}
+        eval_tests = tests_to_run
+        tests_to_run = [t for t in tests_to_run if t.name not in completed_results]
+        if len(tests_to_run) < len(eval_tests):
+            logger.info(f"Resuming eval {eval_name}: {len(eval_tests) - len(tests_to_run)} tests already completed")
+        cache_mode = resolve_cache_mode(cache_mode)
+        scheduler = self._create_scheduler()
+        metric_batch = (
+            EvalMetricBatch(
+                self.deepeval_adapter,
+                max_concurrent_cases_per_group=settings.eval_max_concurrent_judge_cases
+            )
+            if settings.eval_batch_judge_metrics or settings.eval_batch_deterministic_metrics else None
+        )
+
+        async def _run_test(test_def: TestDefinition) -> TestExecutionResult:
             try:
-                result = await self._execute_single_test_internal(
-                    user_id, repo_name, test_def, eval_data.eval.metrics
-                )
-                test_results.append(result)
+                # Eval completions yield to interactive ones at the shared provider rate limiter
+                with request_priority(RequestPriority.BATCH):
+                    return await self._execute_single_test_internal(
+                        user_id, repo_name, test_def, eval_data.eval.metrics, cache_mode, scheduler,
+                        metric_batch
+                    )
             except Exception as e:
                 logger.error(f"Failed to execute test {test_def.name}: {e}")
                 # Create error result for failed test
-                error_result = TestExecutionResult(
+                return TestExecutionResult(
                     test_name=test_def.name,
                     prompt_reference=test_def.prompt_reference,
                     template_variables=test_def.template_variables,
@@ -195,7 +271,53 @@ class EvalExecutionService:
                     overall_passed=False,
                     executed_at=datetime.now(timezone.utc)
                 )
-                test_results.append(error_result)
+
+        # Results executed but waiting for their batched metrics before being reported
+        awaiting_metrics: List[TestExecutionResult] = []
+        report_lock = asyncio.Lock()
+
+        async def _report_batched() -> None:
+            async with report_lock:
+                ready = awaiting_metrics[:]
+                awaiting_metrics.clear()
+                # Evaluates every queued metric, including those of tests reported by a later call
+                with time_eval_stage("scoring"):
+                    await metric_batch.evaluate()
+                for result in ready:
+                    await listener.test_completed(result)
+
+        async def _run_and_report(test_def: TestDefinition) -> TestExecutionResult:
+            await listener.test_started(test_def)
+            result = await _run_test(test_def)
+            if metric_batch is not None and metric_batch.has_pending(result):
+                awaiting_metrics.append(result)
+                if len(awaiting_metrics) >= settings.eval_job_checkpoint_tests:
+                    await _report_batched()
+            else:
+                await listener.test_completed(result)
+            return result
+
+        # Execute tests concurrently with eval-level metrics; results keep test order
+        if listener is None:
+            executed = await scheduler.run(tests_to_run, _run_test)
+        else:
+            await listener.run_started(eval_tests, completed_results)
+            executed = await scheduler.run(tests_to_run, _run_and_report)
+
+        # Metrics deferred by the tests are evaluated together
+        if metric_batch is not None:
+            if listener is not None:
+                await _report_batched()
+            else:
+                with time_eval_stage("scoring"):
+                    await metric_batch.evaluate()
+
+        # Executed results follow the order of tests_to_run, i.e. eval order without completed tests
+        executed_results = iter(executed)
+        test_results = [
+            completed_results[t.name] if t.name in completed_results else next(executed_results)
+            for t in eval_tests
+        ]
         
         # Calculate summary statistics
         total_tests = len(test_results)
@@ -217,9 +339,11 @@ class EvalExecutionService:
         )
         
         # Save execution result
-        await self.eval_execution_meta_service.save_execution_result(
-            user_id, repo_name, eval_name, execution_result
-        )
+        if save_result:
+            with time_eval_stage("persistence"):
+                await self.eval_execution_meta_service.save_execution_result(
+                    user_id, repo_name, eval_name, execution_result
+                )
         
         logger.info(
             f"Completed eval {eval_name}: {passed_tests}/{total_tests} passed "
@@ -233,7 +357,8 @@ class EvalExecutionService:
         user_id: str,
         repo_name: str,
         eval_name: str,
-        test_name: str
+        test_name: str,
+        cache_mode: Optional[CompletionCacheMode] = None
     ) -> TestExecutionResult:
         """
         Execute single test.
@@ -243,6 +368,7 @@ class EvalExecutionService:
             repo_name: Repository name
             eval_name: Eval name
             test_name: Test name
+            cache_mode: Completion cache mode (None uses the configured default)
             
         Returns:
             TestExecutionResult with execution results
@@ -275,14 +401,19 @@ class EvalExecutionService:
             )
         
         # Execute the test with eval-level metrics
-        return await self._execute_single_test_internal(user_id, repo_name, test_def, eval_data.eval.metrics)
+        return await self._execute_single_test_internal(
+            user_id, repo_name, test_def, eval_data.eval.metrics, resolve_cache_mode(cache_mode)
+        )
     
     async def _execute_single_test_internal(
         self,
         user_id: str,
         repo_name: str,
         test_def: TestDefinition,
-        eval_metrics: Optional[List[MetricConfig]] = None
+        eval_metrics: Optional[List[MetricConfig]] = None,
+        cache_mode: CompletionCacheMode = CompletionCacheMode.OFF,
+        scheduler: Optional[EvalTestScheduler] = None,
+        metric_batch: Optional[EvalMetricBatch] = None
     ) -> TestExecutionResult:
         """
         Internal method to execute a single test.
@@ -292,21 +423,26 @@ class EvalExecutionService:
             repo_name: Repository name
             test_def: Test definition
             eval_metrics: Metrics from eval level
+            cache_mode: Completion cache mode for the test's completions
+            scheduler: Scheduler providing per-provider request slots (a new one if None)
+            metric_batch: Batch to defer metrics to (evaluated inline if None)
 
         Returns:
             TestExecutionResult with execution results
         """
         if eval_metrics is None:
             eval_metrics = []
+        if scheduler is None:
+            scheduler = self._create_scheduler()
 
         # Route to appropriate execution method based on test type
         if test_def.test_type == TestType.CONVERSATIONAL:
             return await self._execute_conversational_test(
-                user_id, repo_name, test_def, eval_metrics
+                user_id, repo_name, test_def, eval_metrics, cache_mode, scheduler
             )
         else:
             return await self._execute_single_turn_test(
-                user_id, repo_name, test_def, eval_metrics
+                user_id, repo_name, test_def, eval_metrics, cache_mode, scheduler, metric_batch
             )
 
     async def _execute_single_turn_test(
@@ -314,10 +450,21 @@ class EvalExecutionService:
         user_id: str,
         repo_name: str,
         test_def: TestDefinition,
-        eval_metrics: List[MetricConfig]
+        eval_metrics: List[MetricConfig],
+        cache_mode: CompletionCacheMode = CompletionCacheMode.OFF,
+        scheduler: Optional[EvalTestScheduler] = None,
+        metric_batch: Optional[EvalMetricBatch] = None
     ) -> TestExecutionResult:
-        """Execute a single-turn test."""
+        """
+        Execute a single-turn test.
+
+        With a metric_batch, metrics enabled for batching get a pending
+        placeholder and are queued on the batch; the caller evaluates the batch
+        and fills them in.
+        """
         start_time = time.time()
+        cache_stats = CompletionCacheStats(mode=cache_mode) if cache_mode != CompletionCacheMode.OFF else None
+        scheduler = scheduler or self._create_scheduler()
 
         try:
             # Parse prompt reference to extract file path
@@ -333,18 +480,7 @@ class EvalExecutionService:
             # Determine the user message to send
             user_message = test_def.user_message
 
-            # Execute prompt using ChatCompletionService
-            completion_response = await self.chat_completion_service.execute_completion_from_saved_prompt(
-                user_id=user_id,
-                prompt_id=prompt_id,
-                last_user_message=user_message,
-                conversation_history=None
-            )
-
-            actual_output = completion_response.content or ""
-            tools_called = [msg.model_dump() for msg in completion_response.tool_calls] if completion_response.tool_calls else None
-
-            # Load the prompt to get the input text for metrics
+            # Load the prompt for its provider and the input text for metrics
             prompt_meta = await self.prompt_service.get(
                 user_id, repo_name, prompt_file_path
             )
@@ -355,6 +491,22 @@ class EvalExecutionService:
                     identifier=prompt_file_path
                 )
 
+            # Execute prompt using ChatCompletionService
+            async with scheduler.provider_slot(prompt_meta.prompt.provider):
+                with time_eval_stage("completion"):
+                    completion_response = await self.chat_completion_service.execute_completion_from_saved_prompt(
+                        user_id=user_id,
+                        prompt_id=prompt_id,
+                        last_user_message=user_message,
+                        conversation_history=None,
+                        cache_mode=cache_mode
+                    )
+            if cache_stats:
+                cache_stats.record(completion_response.cache_status)
+
+            actual_output = completion_response.content or ""
+            tools_called = [msg.model_dump() for msg in completion_response.tool_calls] if completion_response.tool_calls else None
+
             # Apply template variables to prompt for input text
             prompt_text = prompt_meta.prompt.prompt
             for var_name, var_value in test_def.template_variables.items():
@@ -376,6 +528,7 @@ class EvalExecutionService:
 
             # Evaluate metrics
             metric_results = []
+            deferred_metrics = []
             if eval_metrics:
                 test_case_params: Dict[str, Any] = {
                     "input_text": str(input_text),
@@ -395,21 +548,34 @@ class EvalExecutionService:
 
                 test_case = self.deepeval_adapter.create_test_case(**test_case_params)
 
-                metrics = [
-                    self.deepeval_adapter.create_metric(
-                        metric_config,
-                        llm_config=self._get_llm_config_for_metric(metric_config, user_id)
-                    )
-                    for metric_config in eval_metrics
+                inline_metrics = []
+                inline_configs = []
+                for metric_config in eval_metrics:
+                    llm_config = self._get_llm_config_for_metric(metric_config, user_id)
+                    metric = self.deepeval_adapter.create_metric(metric_config, llm_config=llm_config)
+                    if metric_batch is not None and self._is_batched_metric(metric_config.type):
+                        judge = ""
+                        if MetricType.is_non_deterministic(metric_config.type):
+                            judge = f"{llm_config.provider}/{llm_config.model}" if llm_config else str(metric_config.model)
+                        deferred_metrics.append((len(metric_results), metric, metric_config, judge))
+                        metric_results.append(EvalMetricBatch.placeholder(metric_config))
+                    else:
+                        inline_metrics.append(metric)
+                        inline_configs.append(metric_config)
+                        metric_results.append(None)
+
+                with time_eval_stage("scoring"):
+                    inline_results = iter(await self.deepeval_adapter.evaluate_metrics(
+                        test_case, inline_metrics, inline_configs
+                    ))
+                metric_results = [
+                    result if result is not None else next(inline_results)
+                    for result in metric_results
                 ]
 
-                metric_results = await self.deepeval_adapter.evaluate_metrics(
-                    test_case, metrics, eval_metrics
-                )
-
             overall_passed = all(result.passed for result in metric_results) if metric_results else True
 
-            return TestExecutionResult(
+            test_result = TestExecutionResult(
                 test_name=test_def.name,
                 prompt_reference=test_def.prompt_reference,
                 template_variables=test_def.template_variables,
@@ -419,7 +585,11 @@ class EvalExecutionService:
                 overall_passed=overall_passed,
                 executed_at=datetime.now(timezone.utc),
                 test_type=TestType.SINGLE_TURN,
+                completion_cache=cache_stats,
             )
+            for position, metric, metric_config, judge in deferred_metrics:
+                metric_batch.add(test_result, position, test_case, metric, metric_config, judge)
+            return test_result
 
         except Exception as e:
             logger.error(f"Error executing test {test_def.name}: {e}")
@@ -432,15 +602,21 @@ class EvalExecutionService:
         user_id: str,
         repo_name: str,
         test_def: TestDefinition,
-        eval_metrics: List[MetricConfig]
+        eval_metrics: List[MetricConfig],
+        cache_mode: CompletionCacheMode = CompletionCacheMode.OFF,
+        scheduler: Optional[EvalTestScheduler] = None
     ) -> TestExecutionResult:
         """
         Execute a conversational (multi-turn) test.
 
         This method handles tests that have predefined conversation turns.
         It executes each turn through the chatbot and collects responses.
+        Turns run in order; the conversation history is extended as turns
+        complete rather than rebuilt for every user turn.
         """
         start_time = time.time()
+        cache_stats = CompletionCacheStats(mode=cache_mode) if cache_mode != CompletionCacheMode.OFF else None
+        scheduler = scheduler or self._create_scheduler()
 
         try:
             # Parse prompt reference
@@ -452,6 +628,18 @@ class EvalExecutionService:
 
             prompt_id = f"{repo_name}:{prompt_file_path}"
 
+            prompt_meta = await self.prompt_service.get(
+                user_id, repo_name, prompt_file_path
+            )
+
+            if not prompt_meta:
+                raise NotFoundException(
+                    resource="Prompt",
+                    identifier=prompt_file_path
+                )
+
+            provider = prompt_meta.prompt.provider
+
             # Get the predefined turns or empty list
             predefined_turns = test_def.turns or []
 
@@ -459,28 +647,30 @@ class EvalExecutionService:
             executed_turns: List[Turn] = []
 
             # Import message schemas for conversation history
-            from schemas.messages import UserMessageSchema, AIMessageSchema
+            from schemas.messages import MessageSchema, UserMessageSchema, AIMessageSchema
+
+            # History of completed exchanges, extended after every assistant response
+            conversation_history: List[MessageSchema] = []
 
             for turn in predefined_turns:
                 if turn.role == TurnRole.USER:
                     # Add user turn to executed turns
                     executed_turns.append(turn)
 
-                    # Build conversation history from previous turns
-                    conversation_history = []
-                    for prev_turn in executed_turns[:-1]:
-                        if prev_turn.role == TurnRole.USER:
-                            conversation_history.append(UserMessageSchema(content=prev_turn.content))
-                        else:
-                            conversation_history.append(AIMessageSchema(content=prev_turn.content))
-
-                    # Get assistant response
-                    completion_response = await self.chat_completion_service.execute_completion_from_saved_prompt(
-                        user_id=user_id,
-                        prompt_id=prompt_id,
-                        last_user_message=turn.content,
-                        conversation_history=conversation_history if conversation_history else None,
-                    )
+                    # Get assistant response; latency excludes time spent waiting for a provider slot
+                    async with scheduler.provider_slot(provider):
+                        turn_start = time.perf_counter()
+                        with time_eval_stage("completion"):
+                            completion_response = await self.chat_completion_service.execute_completion_from_saved_prompt(
+                                user_id=user_id,
+                                prompt_id=prompt_id,
+                                last_user_message=turn.content,
+                                conversation_history=conversation_history if conversation_history else None,
+                                cache_mode=cache_mode,
+                            )
+                        latency_ms = int((time.perf_counter() - turn_start) * 1000)
+                    if cache_stats:
+                        cache_stats.record(completion_response.cache_status)
 
                     assistant_content = completion_response.content or ""
                     tools_called = [tc.model_dump() for tc in completion_response.tool_calls] if completion_response.tool_calls else None
@@ -490,7 +680,10 @@ class EvalExecutionService:
                         role=TurnRole.ASSISTANT,
                         content=assistant_content,
                         tools_called=tools_called,
+                        latency_ms=latency_ms,
                     ))
+                    conversation_history.append(UserMessageSchema(content=turn.content))
+                    conversation_history.append(AIMessageSchema(content=assistant_content))
 
             # Create actual test fields - for conversational tests, actual_output is the full conversation
             end_time = time.time()
@@ -511,9 +704,10 @@ class EvalExecutionService:
             if eval_metrics:
                 # For conversational metrics, we need to create a conversational test case
                 # This will be evaluated with DeepEval's conversational metrics
-                metric_results = await self._evaluate_conversational_metrics(
-                    executed_turns, eval_metrics, test_def, user_id
-                )
+                with time_eval_stage("scoring"):
+                    metric_results = await self._evaluate_conversational_metrics(
+                        executed_turns, eval_metrics, test_def, user_id
+                    )
 
             overall_passed = all(result.passed for result in metric_results) if metric_results else True
 
@@ -528,6 +722,7 @@ class EvalExecutionService:
                 executed_at=datetime.now(timezone.utc),
                 test_type=TestType.CONVERSATIONAL,
                 executed_turns=executed_turns,
+                completion_cache=cache_stats,
             )
 
         except Exception as e:
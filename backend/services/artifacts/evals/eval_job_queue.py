@@ -0,0 +1,455 @@
+"""
+Eval Job Queue
+
+Runs eval executions as background jobs instead of inside the HTTP request
+that asked for them, so long evals are not cut off by proxy timeouts and a
+dropped connection does not throw away completed work:
+- a submitted job gets an ID and waits in a local queue served by a fixed
+  number of workers on the event loop,
+- per-test progress is published as a sequence of events that clients
+  follow over SSE and can re-join from the last event they saw,
+- every completed test result is checkpointed in the job store; a job that
+  was cancelled, failed or interrupted by a restart can be resumed and only
+  executes the tests without a checkpoint.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Callable, ContextManager, Dict, List, Optional
+
+from lib.metrics import time_eval_stage
+from middlewares.rest.exceptions import ConflictException, NotFoundException
+from services.llm.completion_cache import CompletionCacheMode
+from settings import settings
+
+from .eval_execution_service import EvalExecutionService, EvalProgressListener
+from .eval_job_store import EvalJobStore
+from .models import (
+    EvalJob,
+    EvalJobEvent,
+    EvalJobEventType,
+    EvalJobStatus,
+    TestDefinition,
+    TestExecutionResult,
+)
+
+logger = logging.getLogger(__name__)
+
+# Builds an EvalExecutionService for one job and releases its resources on exit
+EvalServiceFactory = Callable[[], ContextManager[EvalExecutionService]]
+
+
+class _JobRun:
+    """In-memory state of a job: the job itself, its events and its running task."""
+
+    def __init__(self, job: EvalJob):
+        self.job = job
+        self.events: List[EvalJobEvent] = []
+        self.condition = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+
+
+class _JobProgress(EvalProgressListener):
+    """Checkpoints and publishes the progress of one job's eval run."""
+
+    def __init__(self, queue: "EvalJobQueue", run: _JobRun):
+        self.queue = queue
+        self.run = run
+
+    async def run_started(self, tests: List[TestDefinition], completed_results: Dict[str, TestExecutionResult]) -> None:
+        job = self.run.job
+        job.total_tests = len(tests)
+        reused = [completed_results[t.name] for t in tests if t.name in completed_results]
+        job.completed_tests = len(reused)
+        job.passed_tests = sum(1 for result in reused if result.overall_passed)
+        await self.queue._save(job)
+        await self.queue._emit(self.run, EvalJobEventType.STATUS)
+
+    async def test_started(self, test_def: TestDefinition) -> None:
+        await self.queue._emit(self.run, EvalJobEventType.TEST_STARTED, test_name=test_def.name)
+
+    async def test_completed(self, result: TestExecutionResult) -> None:
+        job = self.run.job
+        with time_eval_stage("persistence"):
+            await asyncio.to_thread(self.queue.store.save_checkpoint, job.id, result)
+        job.completed_tests += 1
+        if result.overall_passed:
+            job.passed_tests += 1
+        await self.queue._emit(
+            self.run, EvalJobEventType.TEST_COMPLETED, test_name=result.test_name, test_result=result
+        )
+
+
+class EvalJobQueue:
+    """
+    Local queue of background eval jobs.
+
+    Lives on the application's event loop: start() it on startup and stop()
+    it on shutdown. Jobs left unfinished by stop() are marked interrupted.
+    """
+
+    def __init__(self, store: EvalJobStore, workers: int = 2, max_finished_runs: int = 100):
+        """
+        Initialize the queue.
+
+        Args:
+            store: Store persisting jobs and checkpoints
+            workers: Number of jobs executed at once
+            max_finished_runs: Finished jobs whose events are kept in memory for clients re-joining their stream
+        """
+        self.store = store
+        self.workers = max(1, workers)
+        self.max_finished_runs = max(1, max_finished_runs)
+        self._runs: Dict[str, _JobRun] = {}
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._pending: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._service_factory: Optional[EvalServiceFactory] = None
+        self._stopping = False
+
+    async def start(self, service_factory: EvalServiceFactory, retention_seconds: Optional[float] = None) -> None:
+        """
+        Start the workers.
+
+        Jobs left queued or running by a previous process are marked interrupted
+        and finished jobs past the retention period are deleted.
+
+        Args:
+            service_factory: Builds the EvalExecutionService a job runs with
+            retention_seconds: Age after which finished jobs are deleted (None keeps them)
+        """
+        self._service_factory = service_factory
+        self._stopping = False
+        try:
+            await asyncio.to_thread(self.store.mark_interrupted)
+            if retention_seconds is not None:
+                await asyncio.to_thread(self.store.purge, retention_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to recover eval jobs of the previous run: {e}")
+        self._pending = asyncio.Queue()
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"Eval job queue started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Stop the workers; running jobs are marked interrupted and can be resumed later."""
+        self._stopping = True
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._pending = None
+
+    async def submit(
+        self,
+        user_id: str,
+        repo_name: str,
+        file_path: str,
+        test_names: Optional[List[str]] = None,
+        cache_mode: Optional[CompletionCacheMode] = None
+    ) -> EvalJob:
+        """
+        Queue an eval execution.
+
+        Args:
+            user_id: User ID
+            repo_name: Repository name
+            file_path: Eval file path within the repository
+            test_names: Tests to execute (None executes all tests)
+            cache_mode: Completion cache mode (None uses the configured default)
+
+        Returns:
+            EvalJob: The queued job
+        """
+        job = EvalJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            repo_name=repo_name,
+            file_path=file_path,
+            test_names=test_names,
+            cache_mode=cache_mode
+        )
+        run = _JobRun(job)
+        self._runs[job.id] = run
+        await self._enqueue(run)
+        logger.info(f"Queued eval job {job.id} for {file_path} in {repo_name}")
+        return job.model_copy(deep=True)
+
+    async def get(self, job_id: str, user_id: str) -> EvalJob:
+        """
+        Get a job of a user.
+
+        Args:
+            job_id: Job ID
+            user_id: User ID
+
+        Returns:
+            EvalJob: The job
+
+        Raises:
+            NotFoundException: If the user has no job with this ID
+        """
+        run = await self._get_run(job_id, user_id)
+        return run.job.model_copy(deep=True)
+
+    async def list_jobs(self, user_id: str, limit: int = 50) -> List[EvalJob]:
+        """
+        List a user's jobs, most recently updated first.
+
+        Args:
+            user_id: User ID
+            limit: Maximum number of jobs
+
+        Returns:
+            List[EvalJob]: The user's jobs
+        """
+        jobs = await asyncio.to_thread(self.store.list_jobs, user_id, limit)
+        # In-memory state is ahead of the store for running jobs
+        return [
+            self._runs[job.id].job.model_copy(deep=True) if job.id in self._runs else job
+            for job in jobs
+        ]
+
+    async def cancel(self, job_id: str, user_id: str) -> EvalJob:
+        """
+        Cancel a queued or running job; its checkpoints are kept so it can be resumed.
+
+        Args:
+            job_id: Job ID
+            user_id: User ID
+
+        Returns:
+            EvalJob: The job; unchanged if it had already finished
+
+        Raises:
+            NotFoundException: If the user has no job with this ID
+        """
+        run = await self._get_run(job_id, user_id)
+        if run.task is not None:
+            run.task.cancel()
+            try:
+                await asyncio.shield(run.task)
+            except asyncio.CancelledError:
+                pass
+        if run.job.status == EvalJobStatus.QUEUED:
+            # Not started yet
+            await self._finish(run, EvalJobStatus.CANCELLED)
+        return run.job.model_copy(deep=True)
+
+    async def resume(self, job_id: str, user_id: str) -> EvalJob:
+        """
+        Queue a cancelled, failed or interrupted job again.
+
+        Tests with a checkpointed result are not executed again.
+
+        Args:
+            job_id: Job ID
+            user_id: User ID
+
+        Returns:
+            EvalJob: The queued job
+
+        Raises:
+            NotFoundException: If the user has no job with this ID
+            ConflictException: If the job is queued, running or completed
+        """
+        run = await self._get_run(job_id, user_id)
+        if not run.job.status.is_resumable:
+            raise ConflictException(
+                message=f"Eval job is {run.job.status.value} and cannot be resumed",
+                context={"job_id": job_id}
+            )
+        self._finished.pop(job_id, None)
+        run.job.error = None
+        run.job.finished_at = None
+        await self._enqueue(run)
+        logger.info(f"Resuming eval job {job_id}")
+        return run.job.model_copy(deep=True)
+
+    async def events(
+        self,
+        job_id: str,
+        user_id: str,
+        after: int = 0,
+        heartbeat_seconds: Optional[float] = None
+    ) -> AsyncIterator[Optional[EvalJobEvent]]:
+        """
+        Follow a job's events until it finishes.
+
+        Args:
+            job_id: Job ID
+            user_id: User ID
+            after: Sequence number of the last event already received (0 streams from the start)
+            heartbeat_seconds: If set, None is yielded after this many seconds without events
+
+        Yields:
+            Optional[EvalJobEvent]: Events in order, or None as a heartbeat
+
+        Raises:
+            NotFoundException: If the user has no job with this ID
+        """
+        run = await self._get_run(job_id, user_id)
+        position = after
+
+        while True:
+            async with run.condition:
+                try:
+                    await asyncio.wait_for(
+                        run.condition.wait_for(lambda: len(run.events) > position or run.job.status.is_finished),
+                        heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pending = None
+                else:
+                    pending = run.events[position:]
+                    finished = run.job.status.is_finished
+
+            if pending is None:
+                yield None
+                continue
+            for event in pending:
+                position = event.sequence
+                yield event
+            if finished and not pending:
+                return
+
+    async def _get_run(self, job_id: str, user_id: str) -> _JobRun:
+        run = self._runs.get(job_id)
+        if run is None:
+            job = await asyncio.to_thread(self.store.get_job, job_id)
+            if job is not None:
+                # Jobs of earlier processes or evicted from memory start a new event stream
+                run = self._runs.setdefault(job_id, _JobRun(job))
+                if not run.events:
+                    await self._emit(run, EvalJobEventType.STATUS)
+                if run.job.status.is_finished:
+                    self._retire(run)
+        if run is None or run.job.user_id != user_id:
+            raise NotFoundException(
+                resource="Eval job",
+                identifier=job_id
+            )
+        return run
+
+    async def _enqueue(self, run: _JobRun) -> None:
+        if self._pending is None:
+            raise ConflictException(message="Eval job queue is not running")
+        run.job.status = EvalJobStatus.QUEUED
+        await self._save(run.job)
+        await self._emit(run, EvalJobEventType.STATUS)
+        self._pending.put_nowait(run.job.id)
+
+    async def _worker(self) -> None:
+        while not self._stopping:
+            job_id = await self._pending.get()
+            run = self._runs.get(job_id)
+            if run is None or run.job.status != EvalJobStatus.QUEUED:
+                # Cancelled while queued
+                continue
+            run.task = asyncio.create_task(self._execute(run))
+            try:
+                await run.task
+            except asyncio.CancelledError:
+                # A job cancelled before it started running; only shutdown stops the worker
+                if self._stopping:
+                    raise
+                if not run.job.status.is_finished:
+                    await self._finish(run, EvalJobStatus.CANCELLED)
+            finally:
+                run.task = None
+
+    async def _execute(self, run: _JobRun) -> None:
+        job = run.job
+        try:
+            job.status = EvalJobStatus.RUNNING
+            job.started_at = datetime.now(timezone.utc)
+            await self._save(job)
+            await self._emit(run, EvalJobEventType.STATUS)
+
+            completed_results = await asyncio.to_thread(self.store.load_checkpoints, job.id)
+            with self._service_factory() as eval_execution_service:
+                result = await eval_execution_service.execute_eval(
+                    job.user_id,
+                    job.repo_name,
+                    job.file_path,
+                    job.test_names,
+                    cache_mode=job.cache_mode,
+                    completed_results=completed_results,
+                    listener=_JobProgress(self, run)
+                )
+        except asyncio.CancelledError:
+            status = EvalJobStatus.INTERRUPTED if self._stopping else EvalJobStatus.CANCELLED
+            logger.info(f"Eval job {job.id} {status.value} after {job.completed_tests} tests")
+            await self._finish(run, status)
+            return
+        except Exception as e:
+            logger.error(f"Eval job {job.id} failed: {e}", exc_info=True)
+            job.error = getattr(e, "message", None) or str(e)
+            await self._finish(run, EvalJobStatus.FAILED)
+            return
+
+        job.result = result
+        job.total_tests = result.total_tests
+        job.completed_tests = result.total_tests
+        job.passed_tests = result.passed_tests
+        await asyncio.to_thread(self.store.delete_checkpoints, job.id)
+        logger.info(f"Eval job {job.id} completed: {result.passed_tests}/{result.total_tests} passed")
+        await self._finish(run, EvalJobStatus.COMPLETED)
+
+    async def _finish(self, run: _JobRun, status: EvalJobStatus) -> None:
+        run.job.status = status
+        run.job.finished_at = datetime.now(timezone.utc)
+        await self._save(run.job)
+        await self._emit(run, EvalJobEventType.STATUS)
+        self._retire(run)
+
+    def _retire(self, run: _JobRun) -> None:
+        """Keep a finished job's events for re-joining clients, evicting the oldest finished jobs."""
+        self._finished[run.job.id] = None
+        self._finished.move_to_end(run.job.id)
+        while len(self._finished) > self.max_finished_runs:
+            job_id, _ = self._finished.popitem(last=False)
+            self._runs.pop(job_id, None)
+
+    async def _save(self, job: EvalJob) -> None:
+        await asyncio.to_thread(self.store.save_job, job.model_copy(deep=True))
+
+    async def _emit(
+        self,
+        run: _JobRun,
+        event_type: EvalJobEventType,
+        test_name: Optional[str] = None,
+        test_result: Optional[TestExecutionResult] = None
+    ) -> None:
+        job = run.job
+        async with run.condition:
+            run.events.append(EvalJobEvent(
+                sequence=len(run.events) + 1,
+                type=event_type,
+                job_id=job.id,
+                status=job.status,
+                total_tests=job.total_tests,
+                completed_tests=job.completed_tests,
+                passed_tests=job.passed_tests,
+                test_name=test_name,
+                test_result=test_result,
+                error=job.error
+            ))
+            run.condition.notify_all()
+
+
+# Process-wide queue shared by all requests
+_eval_job_queue: Optional[EvalJobQueue] = None
+
+
+def get_eval_job_queue() -> EvalJobQueue:
+    """Return the process-wide eval job queue configured from settings."""
+    global _eval_job_queue
+    if _eval_job_queue is None:
+        _eval_job_queue = EvalJobQueue(
+            store=EvalJobStore(Path(settings.eval_job_store_path)),
+            workers=settings.eval_job_workers
+        )
+    return _eval_job_queue
@@ -0,0 +1,204 @@
+"""
+Eval Job Store
+
+Persists background eval jobs and the results of their completed tests in
+SQLite, so a job outlives the request that submitted it and the process that
+ran it: a job interrupted by a restart is marked as such and can be resumed
+from its checkpoints without executing its finished tests again.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .models import EvalJob, EvalJobStatus, TestExecutionResult
+
+logger = logging.getLogger(__name__)
+
+
+class EvalJobStore:
+    """
+    SQLite store of eval jobs and their checkpointed test results.
+
+    Safe to share between threads. Calls block on disk I/O; call them from a
+    worker thread when running on an event loop.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize the store; the database is opened on first use.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS eval_jobs ("
+                "id TEXT PRIMARY KEY, user_id TEXT NOT NULL, status TEXT NOT NULL, "
+                "data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS eval_job_checkpoints ("
+                "job_id TEXT NOT NULL, test_name TEXT NOT NULL, result TEXT NOT NULL, "
+                "PRIMARY KEY (job_id, test_name))"
+            )
+            self._connection = connection
+        return self._connection
+
+    def save_job(self, job: EvalJob) -> None:
+        """
+        Insert or update a job.
+
+        Args:
+            job: Job to store
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO eval_jobs (id, user_id, status, data, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job.id, job.user_id, job.status.value, job.model_dump_json(), time.time())
+            )
+            connection.commit()
+
+    def get_job(self, job_id: str) -> Optional[EvalJob]:
+        """
+        Get a job by ID.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Optional[EvalJob]: The job, or None if it doesn't exist
+        """
+        with self._lock:
+            row = self._connect().execute("SELECT data FROM eval_jobs WHERE id = ?", (job_id,)).fetchone()
+        return EvalJob.model_validate_json(row[0]) if row else None
+
+    def list_jobs(self, user_id: str, limit: int = 50) -> List[EvalJob]:
+        """
+        List a user's jobs, most recently updated first.
+
+        Args:
+            user_id: User ID
+            limit: Maximum number of jobs
+
+        Returns:
+            List[EvalJob]: The user's jobs
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT data FROM eval_jobs WHERE user_id = ? ORDER BY updated_at DESC LIMIT ?", (user_id, limit)
+            ).fetchall()
+        return [EvalJob.model_validate_json(row[0]) for row in rows]
+
+    def save_checkpoint(self, job_id: str, result: TestExecutionResult) -> None:
+        """
+        Store the final result of a completed test.
+
+        Args:
+            job_id: Job the test belongs to
+            result: Test result with evaluated metrics
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO eval_job_checkpoints (job_id, test_name, result) VALUES (?, ?, ?)",
+                (job_id, result.test_name, result.model_dump_json())
+            )
+            connection.commit()
+
+    def load_checkpoints(self, job_id: str) -> Dict[str, TestExecutionResult]:
+        """
+        Load the checkpointed test results of a job.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Dict of test name to result
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT test_name, result FROM eval_job_checkpoints WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return {name: TestExecutionResult.model_validate_json(result) for name, result in rows}
+
+    def delete_checkpoints(self, job_id: str) -> None:
+        """
+        Delete the checkpoints of a job, e.g. once it completed.
+
+        Args:
+            job_id: Job ID
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM eval_job_checkpoints WHERE job_id = ?", (job_id,))
+            connection.commit()
+
+    def mark_interrupted(self) -> List[str]:
+        """
+        Mark jobs left queued or running by a previous process as interrupted.
+
+        Returns:
+            List[str]: IDs of the interrupted jobs
+        """
+        unfinished = (EvalJobStatus.QUEUED.value, EvalJobStatus.RUNNING.value)
+        with self._lock:
+            connection = self._connect()
+            rows = connection.execute(
+                "SELECT data FROM eval_jobs WHERE status IN (?, ?)", unfinished
+            ).fetchall()
+            now = time.time()
+            interrupted = []
+            for (data,) in rows:
+                job = EvalJob.model_validate_json(data)
+                job.status = EvalJobStatus.INTERRUPTED
+                connection.execute(
+                    "UPDATE eval_jobs SET status = ?, data = ?, updated_at = ? WHERE id = ?",
+                    (job.status.value, job.model_dump_json(), now, job.id)
+                )
+                interrupted.append(job.id)
+            connection.commit()
+        if interrupted:
+            logger.info(f"Marked {len(interrupted)} unfinished eval jobs as interrupted")
+        return interrupted
+
+    def purge(self, older_than_seconds: float) -> int:
+        """
+        Delete finished jobs not updated for a while, with their checkpoints.
+
+        Args:
+            older_than_seconds: Minimum age since the last update
+
+        Returns:
+            int: Number of deleted jobs
+        """
+        unfinished = (EvalJobStatus.QUEUED.value, EvalJobStatus.RUNNING.value)
+        cutoff = time.time() - older_than_seconds
+        with self._lock:
+            connection = self._connect()
+            condition = "updated_at < ? AND status NOT IN (?, ?)"
+            connection.execute(
+                f"DELETE FROM eval_job_checkpoints WHERE job_id IN (SELECT id FROM eval_jobs WHERE {condition})",
+                (cutoff, *unfinished)
+            )
+            deleted = connection.execute(f"DELETE FROM eval_jobs WHERE {condition}", (cutoff, *unfinished)).rowcount
+            connection.commit()
+        return deleted
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
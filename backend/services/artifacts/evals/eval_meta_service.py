@@ -105,7 +105,8 @@ class EvalMetaService(ArtifactMetaInterface[EvalData, EvalMeta]):
         self,
         user_id: str,
         repo_name: str,
-        file_path: str
+        file_path: str,
+        ref: Optional[str] = None
     ) -> Optional[EvalMeta]:
         """
         Get a single eval by file path.
@@ -114,6 +115,7 @@ class EvalMetaService(ArtifactMetaInterface[EvalData, EvalMeta]):
             user_id: User ID
             repo_name: Repository name
             file_path: Relative path to eval file from repo root
+            ref: Optional branch, tag or commit SHA to read the eval at (default: working tree)
             
         Returns:
             Optional[EvalMeta]: Eval metadata if found, None otherwise
@@ -131,7 +133,8 @@ class EvalMetaService(ArtifactMetaInterface[EvalData, EvalMeta]):
             user_id=user_id,
             repo_name=repo_name,
             file_path=file_path,
-            artifact_type=ArtifactType.EVAL
+            artifact_type=ArtifactType.EVAL,
+            ref=ref
         )
         
         if not eval_data_raw or "eval" not in eval_data_raw:
@@ -0,0 +1,73 @@
+"""
+Eval Test Scheduler
+
+Runs the tests of an eval concurrently. Turns within one conversation stay
+sequential, but independent tests (and therefore independent conversations)
+are interleaved so one slow conversation no longer blocks the rest of the
+suite. Two limits keep the fan-out polite:
+- a cap on how many tests run at once,
+- a per-provider cap on in-flight completion requests, so a suite hitting a
+  single provider stays within its rate limits.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class EvalTestScheduler:
+    """
+    Bounded scheduler for eval test execution.
+
+    A scheduler instance is created per eval run; provider slots are shared by
+    every test of that run.
+    """
+
+    def __init__(self, max_concurrent_tests: int = 8, max_concurrent_requests_per_provider: int = 4):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrent_tests: Maximum number of tests executing at once
+            max_concurrent_requests_per_provider: Maximum in-flight completions per LLM provider
+        """
+        self.max_concurrent_tests = max(1, max_concurrent_tests)
+        self.max_concurrent_requests_per_provider = max(1, max_concurrent_requests_per_provider)
+        self._provider_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def provider_slot(self, provider: str) -> AsyncIterator[None]:
+        """
+        Hold one of the provider's request slots for the duration of a completion.
+
+        Args:
+            provider: LLM provider the completion is sent to
+        """
+        semaphore = self._provider_semaphores.get(provider)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent_requests_per_provider)
+            self._provider_semaphores[provider] = semaphore
+        async with semaphore:
+            yield
+
+    async def run(self, items: Sequence[T], worker: Callable[[T], Awaitable[R]]) -> List[R]:
+        """
+        Run worker over items concurrently and return results in input order.
+
+        Args:
+            items: Work items (e.g. test definitions)
+            worker: Coroutine function executing one item; it should handle its own errors
+
+        Returns:
+            List[R]: Worker results, in the same order as items
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_tests)
+
+        async def _bounded(item: T) -> R:
+            async with semaphore:
+                return await worker(item)
+
+        return list(await asyncio.gather(*(_bounded(item) for item in items)))
@@ -0,0 +1,158 @@
+"""
+Eval Metric Batch
+
+Metrics measured inline run one test and one metric instance at a time on the
+event loop. An eval run instead collects its metrics here while its tests
+execute and evaluates them once every prompt has run, grouped by metric type
+(and judge model for LLM-judged metrics):
+- LLM-judged metrics (answer relevancy, faithfulness, bias, ...) issue
+  several judge completions per test case, so in a large eval they outnumber
+  the prompt completions. Each group is measured as one concurrent fan-out
+  (bounded per group); judge completions go through the shared judge runtime,
+  which caps in-flight calls per provider and backs off when a provider rate
+  limits.
+- Deterministic metrics score a whole group in one measure_batch pass in a
+  worker thread, so the CPU work stays off the event loop.
+Results are written back into the test results they belong to.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from lib.deepeval.deepeval_adapter import DeepEvalAdapter
+from .models import MetricConfig, MetricResult, MetricType, TestExecutionResult
+
+logger = logging.getLogger(__name__)
+
+
+class PendingMetric(NamedTuple):
+    """A metric waiting for evaluation and where its result goes."""
+    test_result: TestExecutionResult
+    position: int
+    test_case: Any
+    metric: Any
+    config: MetricConfig
+
+
+class EvalMetricBatch:
+    """
+    Metrics of an eval run, evaluated in groups after the prompts ran.
+
+    A batch instance is created per eval run.
+    """
+
+    def __init__(self, deepeval_adapter: DeepEvalAdapter, max_concurrent_cases_per_group: int = 16):
+        """
+        Initialize the batch.
+
+        Args:
+            deepeval_adapter: DeepEval adapter measuring the metrics
+            max_concurrent_cases_per_group: Maximum test cases measured at once per LLM-judged group
+        """
+        self.deepeval_adapter = deepeval_adapter
+        self.max_concurrent_cases_per_group = max(1, max_concurrent_cases_per_group)
+        self._groups: Dict[Tuple[MetricType, str, str], List[PendingMetric]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(group) for group in self._groups.values())
+
+    def has_pending(self, test_result: TestExecutionResult) -> bool:
+        """
+        Whether metrics of a test result are still waiting for evaluation.
+
+        Args:
+            test_result: Test result to check
+
+        Returns:
+            bool: True if the batch holds metrics writing into test_result
+        """
+        return any(
+            pending.test_result is test_result
+            for group in self._groups.values()
+            for pending in group
+        )
+
+    @staticmethod
+    def placeholder(config: MetricConfig) -> MetricResult:
+        """
+        Result standing in for a metric until the batch is evaluated.
+
+        Args:
+            config: Metric configuration
+
+        Returns:
+            MetricResult marked as pending
+        """
+        return MetricResult(
+            type=config.type,
+            score=0.0,
+            passed=False,
+            threshold=config.threshold or 0.7,
+            reason="Pending batch evaluation"
+        )
+
+    def add(
+        self,
+        test_result: TestExecutionResult,
+        position: int,
+        test_case: Any,
+        metric: Any,
+        config: MetricConfig,
+        judge: str = ""
+    ) -> None:
+        """
+        Queue a metric for evaluation.
+
+        Args:
+            test_result: Test result the metric belongs to
+            position: Index of the metric's placeholder in test_result.metric_results
+            test_case: DeepEval LLMTestCase to measure
+            metric: Metric instance for this test case
+            config: Metric configuration
+            judge: Judge model identifier (e.g. "openai/gpt-4o") of an LLM-judged metric, used for grouping
+        """
+        pending = PendingMetric(test_result, position, test_case, metric, config)
+        key = (config.type, judge, config.model_dump_json())
+        self._groups.setdefault(key, []).append(pending)
+
+    async def evaluate(self) -> None:
+        """
+        Evaluate every queued metric and write the results into their test results.
+
+        Groups run concurrently; a failing metric yields an error MetricResult
+        and fails its test, as when metrics are evaluated inline.
+        """
+        if not self._groups:
+            return
+
+        groups = list(self._groups.items())
+        self._groups = {}
+        logger.info(
+            f"Evaluating {sum(len(group) for _, group in groups)} metrics in {len(groups)} groups"
+        )
+
+        group_results = await asyncio.gather(*(self._evaluate_group(group) for _, group in groups))
+
+        affected: Dict[int, TestExecutionResult] = {}
+        for (_, group), results in zip(groups, group_results):
+            for pending, result in zip(group, results):
+                pending.test_result.metric_results[pending.position] = result
+                affected[id(pending.test_result)] = pending.test_result
+
+        for test_result in affected.values():
+            if test_result.actual_test_fields.error:
+                continue
+            test_result.overall_passed = all(result.passed for result in test_result.metric_results)
+
+    async def _evaluate_group(self, group: List[PendingMetric]) -> List[MetricResult]:
+        config = group[0].config
+        test_cases = [pending.test_case for pending in group]
+        metrics = [pending.metric for pending in group]
+        if MetricType.is_deterministic(config.type):
+            return await asyncio.to_thread(
+                self.deepeval_adapter.evaluate_deterministic_batch, test_cases, metrics, config
+            )
+        return await self.deepeval_adapter.evaluate_metric_batch(
+            test_cases, metrics, config, max_concurrency=self.max_concurrent_cases_per_group
+        )
@@ -5,11 +5,12 @@ These models handle data validation and serialization for DeepEval eval framewor
 across eval definitions and execution results.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Dict, Any, List, Optional, TypeAlias, Literal
 from pydantic import BaseModel, Field, model_validator
 from lib.deepeval import MetricType, BaseMetricConfig, MetricConfig, MetricResult
+from services.llm.completion_cache import CompletionCacheMode, CompletionCacheStats
 
 
 class TurnRole(str, Enum):
@@ -37,6 +38,10 @@ class Turn(BaseModel):
         default=None,
         description="Tools called during this turn (for agent evaluation)"
     )
+    latency_ms: Optional[int] = Field(
+        default=None,
+        description="Completion latency for assistant turns produced during execution"
+    )
 
 
 class TestType(str, Enum):
@@ -256,6 +261,19 @@ class EvalDefinition(BaseModel):
         }
     }
 
+    @model_validator(mode='after')
+    def validate_unique_test_names(self) -> 'EvalDefinition':
+        """Validate that test names are unique; runs, checkpoints and shards identify tests by name."""
+        seen = set()
+        duplicates = []
+        for test in self.tests:
+            if test.name in seen and test.name not in duplicates:
+                duplicates.append(test.name)
+            seen.add(test.name)
+        if duplicates:
+            raise ValueError(f"Test names must be unique within an eval; duplicated: {', '.join(duplicates)}")
+        return self
+
 
 class EvalData(BaseModel):
     """Wrapper for YAML serialization"""
@@ -284,6 +302,10 @@ class TestExecutionResult(BaseModel):
         default=None,
         description="Conversation turns executed during the test (for conversational tests)"
     )
+    completion_cache: Optional[CompletionCacheStats] = Field(
+        default=None,
+        description="Completion cache hits and misses (only set when the cache is enabled)"
+    )
 
     model_config = {
         "json_encoders": {
@@ -363,6 +385,73 @@ class EvalExecutionMeta(BaseModel):
     }
 
 
+class EvalJobStatus(str, Enum):
+    """Lifecycle state of a background eval job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    # The server stopped while the job was queued or running
+    INTERRUPTED = "interrupted"
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the job is no longer queued or running."""
+        return self not in (EvalJobStatus.QUEUED, EvalJobStatus.RUNNING)
+
+    @property
+    def is_resumable(self) -> bool:
+        """Whether the job can be queued again, reusing its checkpointed test results."""
+        return self in (EvalJobStatus.FAILED, EvalJobStatus.CANCELLED, EvalJobStatus.INTERRUPTED)
+
+
+class EvalJob(BaseModel):
+    """An eval execution submitted to the background job queue."""
+    id: str = Field(description="Job ID")
+    user_id: str = Field(description="User who submitted the job")
+    repo_name: str = Field(description="Repository name")
+    file_path: str = Field(description="Eval file path within the repository")
+    test_names: Optional[List[str]] = Field(default=None, description="Tests to execute; None executes all tests")
+    cache_mode: Optional[CompletionCacheMode] = Field(default=None, description="Completion cache mode")
+    status: EvalJobStatus = Field(default=EvalJobStatus.QUEUED, description="Current job state")
+    total_tests: Optional[int] = Field(default=None, description="Number of tests, known once the job started")
+    completed_tests: int = Field(default=0, description="Tests with a final result, including checkpointed ones")
+    passed_tests: int = Field(default=0, description="Completed tests that passed")
+    error: Optional[str] = Field(default=None, description="Error of a failed job")
+    result: Optional[EvalExecutionResult] = Field(default=None, description="Execution result of a completed job")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = {
+        "json_encoders": {
+            datetime: lambda v: v.isoformat()
+        }
+    }
+
+
+class EvalJobEventType(str, Enum):
+    """Kind of progress event of a background eval job."""
+    STATUS = "status"
+    TEST_STARTED = "test_started"
+    TEST_COMPLETED = "test_completed"
+
+
+class EvalJobEvent(BaseModel):
+    """Progress event of a background eval job, streamed to clients over SSE."""
+    sequence: int = Field(description="Position of the event in the job's event stream, starting at 1")
+    type: EvalJobEventType = Field(description="Event kind")
+    job_id: str = Field(description="Job ID")
+    status: EvalJobStatus = Field(description="Job state when the event was emitted")
+    total_tests: Optional[int] = Field(default=None, description="Number of tests, once known")
+    completed_tests: int = Field(default=0, description="Tests completed so far")
+    passed_tests: int = Field(default=0, description="Completed tests that passed so far")
+    test_name: Optional[str] = Field(default=None, description="Test the event is about")
+    test_result: Optional[TestExecutionResult] = Field(default=None, description="Result of a completed test")
+    error: Optional[str] = Field(default=None, description="Error of a failed job")
+
+
 class MetricMetadataModel(BaseModel):
     """
     Metadata for a single metric type.
@@ -0,0 +1,31 @@
+"""
+Sharded eval execution.
+
+Splits large evals into shards executed by worker processes on this node
+and, through a shared queue backend, by workers on other nodes; the shard
+results are merged into one EvalExecutionResult.
+"""
+
+from .models import EvalShard, ShardOutcome, ShardStatus
+from .shard_queue_interface import IShardQueue
+from .memory_shard_queue import InMemoryShardQueue
+from .sqlite_shard_queue import SQLiteShardQueue
+from .shard_queue_factory import create_shard_queue, get_eval_shard_queue
+from .shard_worker import EvalShardWorker, run_worker_process
+from .shard_runner import EvalShardRunner, merge_shard_outcomes, plan_shards
+
+__all__ = [
+    "EvalShard",
+    "ShardOutcome",
+    "ShardStatus",
+    "IShardQueue",
+    "InMemoryShardQueue",
+    "SQLiteShardQueue",
+    "create_shard_queue",
+    "get_eval_shard_queue",
+    "EvalShardWorker",
+    "run_worker_process",
+    "EvalShardRunner",
+    "merge_shard_outcomes",
+    "plan_shards",
+]
@@ -0,0 +1,75 @@
+"""
+Command line for sharded evals.
+
+    # Serve the shards of every run on a shared queue, e.g. on another node
+    python -m services.artifacts.evals.sharding worker --queue <url>
+
+    # Execute an eval as shards, e.g. in a CI stage; exits with 1 if a test failed
+    python -m services.artifacts.evals.sharding run --user-id <id> --repo <name> --eval <path>
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from typing import List, Optional
+
+from settings import settings
+
+from .shard_queue_factory import create_shard_queue
+from .shard_runner import EvalShardRunner
+from .shard_worker import run_worker_process
+
+
+async def _run_eval(args: argparse.Namespace) -> int:
+    from api.deps import eval_execution_service_scope
+
+    queue = create_shard_queue(args.queue)
+    try:
+        with eval_execution_service_scope() as service:
+            runner = EvalShardRunner(
+                service, queue,
+                queue_url=args.queue,
+                local_workers=args.workers,
+                shard_size=args.shard_size
+            )
+            result = await runner.run(
+                args.user_id, args.repo, args.eval,
+                test_names=args.tests or None,
+                timeout_seconds=args.timeout
+            )
+    finally:
+        queue.close()
+    print(
+        f"{result.eval_name}: {result.passed_tests}/{result.total_tests} passed "
+        f"in {result.total_execution_time_ms}ms"
+    )
+    return 0 if result.failed_tests == 0 else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m services.artifacts.evals.sharding")
+    parser.add_argument("--queue", default=settings.eval_shard_queue_url, help="Shard queue URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker = commands.add_parser("worker", help="Execute shards of every run on the queue")
+    worker.add_argument("--worker-id", default=None, help="Worker ID (generated by default)")
+
+    run = commands.add_parser("run", help="Execute an eval as shards")
+    run.add_argument("--user-id", required=True, help="User the eval is executed for")
+    run.add_argument("--repo", required=True, help="Repository name")
+    run.add_argument("--eval", required=True, help="Eval file path within the repository")
+    run.add_argument("--tests", nargs="*", help="Test names to execute (all by default)")
+    run.add_argument("--workers", type=int, default=None, help="Worker processes started on this node")
+    run.add_argument("--shard-size", type=int, default=None, help="Tests per shard")
+    run.add_argument("--timeout", type=float, default=None, help="Seconds to wait for the shards")
+
+    args = parser.parse_args(argv)
+    if args.command == "worker":
+        run_worker_process(args.queue, worker_id=args.worker_id)
+        return 0
+    logging.basicConfig(level=logging.INFO)
+    return asyncio.run(_run_eval(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+In-Memory Shard Queue
+
+Shard queue held in the memory of one process. Its workers run on the
+coordinator's event loop, which makes it the backend for tests and for
+development setups without a shared store.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ..models import TestExecutionResult
+from .models import EvalShard, ShardOutcome, ShardStatus
+from .shard_queue_interface import IShardQueue
+
+
+@dataclass
+class _Entry:
+    shard: EvalShard
+    status: ShardStatus = ShardStatus.PENDING
+    worker_id: Optional[str] = None
+    lease_expires: float = 0.0
+    outcome: Optional[ShardOutcome] = None
+
+
+class InMemoryShardQueue(IShardQueue):
+    """Shard queue shared by the workers of the current process. Safe to share between threads."""
+
+    shared_across_processes = False
+
+    def __init__(self):
+        # Insertion order is claim order
+        self._entries: Dict[Tuple[str, int], _Entry] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, shards: List[EvalShard]) -> None:
+        with self._lock:
+            for shard in shards:
+                self._entries[(shard.run_id, shard.index)] = _Entry(shard=shard)
+
+    def claim(self, worker_id: str, lease_seconds: float, run_id: Optional[str] = None) -> Optional[EvalShard]:
+        now = time.time()
+        with self._lock:
+            for (entry_run_id, _), entry in self._entries.items():
+                if run_id is not None and entry_run_id != run_id:
+                    continue
+                claimable = entry.status == ShardStatus.PENDING or (
+                    entry.status == ShardStatus.CLAIMED and entry.lease_expires < now
+                )
+                if claimable:
+                    entry.status = ShardStatus.CLAIMED
+                    entry.worker_id = worker_id
+                    entry.lease_expires = now + lease_seconds
+                    return entry.shard
+        return None
+
+    def renew(self, run_id: str, index: int, worker_id: str, lease_seconds: float) -> bool:
+        with self._lock:
+            entry = self._entries.get((run_id, index))
+            if entry is None or entry.status != ShardStatus.CLAIMED or entry.worker_id != worker_id:
+                return False
+            entry.lease_expires = time.time() + lease_seconds
+            return True
+
+    def complete(self, shard: EvalShard, worker_id: str, test_results: List[TestExecutionResult]) -> None:
+        self._finish(shard, ShardOutcome(
+            run_id=shard.run_id,
+            index=shard.index,
+            status=ShardStatus.COMPLETED,
+            worker_id=worker_id,
+            test_results=test_results
+        ))
+
+    def fail(self, shard: EvalShard, worker_id: str, error: str) -> None:
+        self._finish(shard, ShardOutcome(
+            run_id=shard.run_id,
+            index=shard.index,
+            status=ShardStatus.FAILED,
+            worker_id=worker_id,
+            error=error
+        ))
+
+    def _finish(self, shard: EvalShard, outcome: ShardOutcome) -> None:
+        with self._lock:
+            entry = self._entries.get((shard.run_id, shard.index))
+            if entry is None or entry.status.is_finished or entry.worker_id != outcome.worker_id:
+                # Finished already, or reclaimed by another worker after the lease expired
+                return
+            entry.status = outcome.status
+            entry.outcome = outcome
+
+    def release(self, run_id: str, worker_id: str) -> int:
+        released = 0
+        with self._lock:
+            for (entry_run_id, _), entry in self._entries.items():
+                if entry_run_id == run_id and entry.status == ShardStatus.CLAIMED and entry.worker_id == worker_id:
+                    entry.status = ShardStatus.PENDING
+                    entry.worker_id = None
+                    released += 1
+        return released
+
+    def outcomes(self, run_id: str) -> List[ShardOutcome]:
+        with self._lock:
+            outcomes = [
+                entry.outcome for (entry_run_id, _), entry in self._entries.items()
+                if entry_run_id == run_id and entry.outcome is not None
+            ]
+        return sorted(outcomes, key=lambda outcome: outcome.index)
+
+    def delete_run(self, run_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == run_id]:
+                del self._entries[key]
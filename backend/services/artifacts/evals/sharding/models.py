@@ -0,0 +1,52 @@
+"""
+Models for sharded eval runs.
+"""
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from services.llm.completion_cache import CompletionCacheMode
+
+from ..models import TestExecutionResult
+
+
+class ShardStatus(str, Enum):
+    """Lifecycle of a shard in the shard queue"""
+    PENDING = "pending"
+    CLAIMED = "claimed"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the shard reached a final state"""
+        return self in (ShardStatus.COMPLETED, ShardStatus.FAILED)
+
+
+class EvalShard(BaseModel):
+    """A slice of an eval's tests executed by one worker"""
+    run_id: str = Field(description="ID of the sharded run the shard belongs to")
+    index: int = Field(description="Position of the shard within its run")
+    count: int = Field(description="Number of shards in the run")
+    user_id: str = Field(description="User the eval is executed for")
+    repo_name: str = Field(description="Repository name")
+    file_path: str = Field(description="Eval file path within the repository")
+    test_names: List[str] = Field(description="Tests executed by this shard")
+    cache_mode: Optional[CompletionCacheMode] = Field(
+        default=None,
+        description="Completion cache mode (None uses the worker's configured default)"
+    )
+
+
+class ShardOutcome(BaseModel):
+    """Final state of a shard: its test results, or the error that failed it"""
+    run_id: str = Field(description="ID of the sharded run the shard belongs to")
+    index: int = Field(description="Position of the shard within its run")
+    status: ShardStatus = Field(description="Completed or failed")
+    worker_id: Optional[str] = Field(default=None, description="Worker that finished the shard")
+    test_results: List[TestExecutionResult] = Field(
+        default_factory=list,
+        description="Results of the shard's tests (completed shards only)"
+    )
+    error: Optional[str] = Field(default=None, description="Why the shard failed")
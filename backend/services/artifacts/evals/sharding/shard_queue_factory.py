@@ -0,0 +1,57 @@
+"""
+Shard Queue Factory
+
+Creates the shard queue backend named by a queue URL:
+- memory:// keeps the queue in this process,
+- sqlite:///<path> shares it with the worker processes of this node,
+- module.path:factory calls a custom factory returning an IShardQueue, for
+  backends shared with workers on other nodes.
+"""
+import importlib
+from pathlib import Path
+from typing import Optional
+
+from settings import settings
+
+from .memory_shard_queue import InMemoryShardQueue
+from .shard_queue_interface import IShardQueue
+from .sqlite_shard_queue import SQLiteShardQueue
+
+
+def create_shard_queue(queue_url: str) -> IShardQueue:
+    """
+    Create a shard queue from its URL.
+
+    Args:
+        queue_url: memory://, sqlite:///<path> or module.path:factory
+
+    Returns:
+        IShardQueue: The queue backend
+
+    Raises:
+        ValueError: If the URL names no known backend
+    """
+    if queue_url.startswith("memory://"):
+        return InMemoryShardQueue()
+    if queue_url.startswith("sqlite:///"):
+        # Like database_url: sqlite:///relative.db or sqlite:////absolute.db
+        return SQLiteShardQueue(Path(queue_url[len("sqlite:///"):]))
+    module_name, separator, factory_name = queue_url.partition(":")
+    if not separator or "/" in queue_url:
+        raise ValueError(f"Unknown shard queue backend: {queue_url}")
+    queue = getattr(importlib.import_module(module_name), factory_name)()
+    if not isinstance(queue, IShardQueue):
+        raise ValueError(f"Shard queue factory {queue_url} did not return an IShardQueue")
+    return queue
+
+
+# Process-wide queue shared by all sharded runs and workers
+_eval_shard_queue: Optional[IShardQueue] = None
+
+
+def get_eval_shard_queue() -> IShardQueue:
+    """Return the process-wide shard queue configured from settings."""
+    global _eval_shard_queue
+    if _eval_shard_queue is None:
+        _eval_shard_queue = create_shard_queue(settings.eval_shard_queue_url)
+    return _eval_shard_queue
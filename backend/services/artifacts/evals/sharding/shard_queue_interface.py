@@ -0,0 +1,75 @@
+"""
+Shard Queue Interface
+
+This module defines the abstract base class for the queues distributing the
+shards of sharded eval runs to workers, so the local backends can be replaced
+by one that workers on other nodes share.
+"""
+
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from ..models import TestExecutionResult
+from .models import EvalShard, ShardOutcome
+
+
+class IShardQueue(ABC):
+    """
+    Abstract base class for shard queue backends.
+
+    A worker claims a shard for a lease period and renews the lease while it
+    executes the shard; a shard whose lease expired without an outcome, e.g.
+    because its worker died, can be claimed again. Only the first outcome
+    reported for a shard by the worker holding it is kept.
+
+    Methods block on I/O; call them from a worker thread when running on an
+    event loop.
+    """
+
+    # Whether workers in other processes see the same queue, i.e. whether a
+    # run can start worker processes for it
+    shared_across_processes: bool = True
+
+    @abstractmethod
+    def submit(self, shards: List[EvalShard]) -> None:
+        """Queue the shards of a run"""
+        pass
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float, run_id: Optional[str] = None) -> Optional[EvalShard]:
+        """Claim the next pending shard, of any run or only of run_id; None when there is none"""
+        pass
+
+    @abstractmethod
+    def renew(self, run_id: str, index: int, worker_id: str, lease_seconds: float) -> bool:
+        """Extend the lease of a shard the worker holds; False when the worker no longer holds it"""
+        pass
+
+    @abstractmethod
+    def complete(self, shard: EvalShard, worker_id: str, test_results: List[TestExecutionResult]) -> None:
+        """Report the results of a shard the worker holds"""
+        pass
+
+    @abstractmethod
+    def fail(self, shard: EvalShard, worker_id: str, error: str) -> None:
+        """Report that a shard the worker holds could not be executed"""
+        pass
+
+    @abstractmethod
+    def release(self, run_id: str, worker_id: str) -> int:
+        """Return the unfinished shards a worker holds to the queue; returns how many"""
+        pass
+
+    @abstractmethod
+    def outcomes(self, run_id: str) -> List[ShardOutcome]:
+        """Outcomes of the run's finished shards, by shard index"""
+        pass
+
+    @abstractmethod
+    def delete_run(self, run_id: str) -> None:
+        """Delete a run's shards and outcomes"""
+        pass
+
+    def close(self) -> None:
+        """Release the backend's resources"""
+        pass
@@ -0,0 +1,334 @@
+"""
+Eval Shard Runner
+
+Coordinates sharded eval runs, so suites of thousands of tests are spread
+over several worker processes and nodes instead of one event loop:
+- the eval's enabled tests are split into shards of eval_shard_size tests,
+  dealt round-robin so neighbouring (often similarly expensive) tests land
+  in different shards,
+- the shards are queued and executed by worker processes started on this
+  node and by any remote workers serving the same queue; shards of a worker
+  that crashed are queued again,
+- the shard results are merged into one EvalExecutionResult in the eval's
+  test order, whichever worker finished first, and saved like an unsharded
+  run's result.
+"""
+import asyncio
+import logging
+import math
+import multiprocessing
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from middlewares.rest.exceptions import AppException, NotFoundException
+from services.llm.completion_cache import CompletionCacheMode
+from settings import settings
+
+from ..eval_execution_service import EvalExecutionService
+from ..models import (
+    ActualTestFieldsModel,
+    EvalExecutionResult,
+    TestDefinition,
+    TestExecutionResult,
+)
+from .models import EvalShard, ShardOutcome, ShardStatus
+from .shard_queue_interface import IShardQueue
+from .shard_worker import EvalShardWorker, in_process_service_factory, new_worker_id, run_worker_process
+
+logger = logging.getLogger(__name__)
+
+
+def plan_shards(test_names: List[str], shard_size: int) -> List[List[str]]:
+    """
+    Split tests into shards of at most shard_size tests.
+
+    Tests are dealt round-robin, so the plan only depends on the test order.
+
+    Args:
+        test_names: Tests in eval order
+        shard_size: Maximum number of tests per shard
+
+    Returns:
+        List of the shards' test names
+    """
+    if not test_names:
+        return []
+    shard_count = math.ceil(len(test_names) / max(1, shard_size))
+    return [test_names[index::shard_count] for index in range(shard_count)]
+
+
+def _error_result(test_def: TestDefinition, error: str) -> TestExecutionResult:
+    return TestExecutionResult(
+        test_name=test_def.name,
+        prompt_reference=test_def.prompt_reference,
+        template_variables=test_def.template_variables,
+        actual_test_fields=ActualTestFieldsModel(
+            actual_output="",
+            error=error
+        ),
+        expected_test_fields=test_def.test_fields,
+        metric_results=[],
+        overall_passed=False,
+        executed_at=datetime.now(timezone.utc)
+    )
+
+
+def merge_shard_outcomes(
+    eval_name: str,
+    tests: List[TestDefinition],
+    shards: List[EvalShard],
+    outcomes: List[ShardOutcome],
+    total_execution_time_ms: int
+) -> EvalExecutionResult:
+    """
+    Merge the outcomes of a run's shards into one execution result.
+
+    Results keep the eval's test order. Tests of failed or unfinished shards
+    are reported as failed tests with the shard's error.
+
+    Args:
+        eval_name: Eval name
+        tests: Executed tests in eval order
+        shards: The run's shards
+        outcomes: Outcomes of the finished shards
+        total_execution_time_ms: Wall-clock duration of the run
+
+    Returns:
+        EvalExecutionResult of all tests
+    """
+    results: Dict[str, TestExecutionResult] = {}
+    errors: Dict[str, str] = {}
+    outcomes_by_index = {outcome.index: outcome for outcome in outcomes}
+    for shard in shards:
+        outcome = outcomes_by_index.get(shard.index)
+        if outcome is None:
+            error = f"Shard {shard.index + 1}/{shard.count} did not finish"
+        elif outcome.status == ShardStatus.FAILED:
+            error = f"Shard {shard.index + 1}/{shard.count} failed: {outcome.error}"
+        else:
+            error = f"Shard {shard.index + 1}/{shard.count} reported no result for this test"
+            results.update({result.test_name: result for result in outcome.test_results})
+        errors.update({name: error for name in shard.test_names})
+
+    test_results = [results.get(t.name) or _error_result(t, errors[t.name]) for t in tests]
+    passed_tests = sum(1 for r in test_results if r.overall_passed)
+    return EvalExecutionResult(
+        eval_name=eval_name,
+        test_results=test_results,
+        total_tests=len(test_results),
+        passed_tests=passed_tests,
+        failed_tests=len(test_results) - passed_tests,
+        total_execution_time_ms=total_execution_time_ms,
+        executed_at=datetime.now(timezone.utc)
+    )
+
+
+class EvalShardRunner:
+    """Executes an eval as shards spread over worker processes and nodes."""
+
+    def __init__(
+        self,
+        eval_execution_service: EvalExecutionService,
+        queue: IShardQueue,
+        queue_url: Optional[str] = None,
+        local_workers: Optional[int] = None,
+        shard_size: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+        poll_seconds: float = 0.5
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            eval_execution_service: Loads the eval and saves the merged result; also
+                                    executes the shards for a queue not shared across processes
+            queue: Queue the shards are distributed through
+            queue_url: URL worker processes open the queue with (None uses eval_shard_queue_url)
+            local_workers: Worker processes started on this node (None uses eval_shard_local_workers)
+            shard_size: Tests per shard (None uses eval_shard_size)
+            lease_seconds: Seconds a worker holds a shard (None uses eval_shard_lease_seconds)
+            poll_seconds: Seconds between checks for finished shards
+        """
+        self.eval_execution_service = eval_execution_service
+        self.queue = queue
+        self.queue_url = queue_url or settings.eval_shard_queue_url
+        self.local_workers = local_workers if local_workers is not None else settings.eval_shard_local_workers
+        self.shard_size = shard_size or settings.eval_shard_size
+        self.lease_seconds = lease_seconds if lease_seconds is not None else settings.eval_shard_lease_seconds
+        self.poll_seconds = poll_seconds
+
+    async def run(
+        self,
+        user_id: str,
+        repo_name: str,
+        eval_name: str,
+        test_names: Optional[List[str]] = None,
+        cache_mode: Optional[CompletionCacheMode] = None,
+        timeout_seconds: Optional[float] = None
+    ) -> EvalExecutionResult:
+        """
+        Execute an eval or specific tests within it as shards.
+
+        Args:
+            user_id: User ID
+            repo_name: Repository name
+            eval_name: Eval name
+            test_names: Optional list of specific test names to run (None = run all)
+            cache_mode: Completion cache mode (None uses the configured default)
+            timeout_seconds: Seconds to wait for the shards; tests of unfinished shards are
+                             reported as errors (None uses eval_shard_timeout_seconds)
+
+        Returns:
+            EvalExecutionResult with the merged results of all shards
+
+        Raises:
+            NotFoundException: If the eval or tests don't exist
+            AppException: If the worker processes keep crashing
+        """
+        start_time = time.time()
+
+        eval_data = await self.eval_execution_service.eval_meta_service.get(user_id, repo_name, eval_name)
+        if not eval_data:
+            raise NotFoundException(
+                resource="Eval",
+                identifier=eval_name
+            )
+
+        tests = eval_data.eval.tests
+        if test_names:
+            tests = [t for t in tests if t.name in test_names]
+            if not tests:
+                raise NotFoundException(
+                    resource="Tests",
+                    identifier=", ".join(test_names)
+                )
+        tests = [t for t in tests if t.enabled]
+
+        run_id = uuid.uuid4().hex
+        planned = plan_shards([t.name for t in tests], self.shard_size)
+        shards = [
+            EvalShard(
+                run_id=run_id,
+                index=index,
+                count=len(planned),
+                user_id=user_id,
+                repo_name=repo_name,
+                file_path=eval_name,
+                test_names=names,
+                cache_mode=cache_mode
+            )
+            for index, names in enumerate(planned)
+        ]
+        logger.info(f"Executing eval {eval_name} as run {run_id}: {len(tests)} tests in {len(shards)} shards")
+
+        if timeout_seconds is None:
+            timeout_seconds = settings.eval_shard_timeout_seconds or None
+        deadline = start_time + timeout_seconds if timeout_seconds else None
+
+        outcomes: List[ShardOutcome] = []
+        if shards:
+            await asyncio.to_thread(self.queue.submit, shards)
+            try:
+                outcomes = await self._wait_for_shards(run_id, len(shards), deadline)
+            finally:
+                await asyncio.to_thread(self.queue.delete_run, run_id)
+
+        execution_result = merge_shard_outcomes(
+            eval_name, tests, shards, outcomes, int((time.time() - start_time) * 1000)
+        )
+
+        await self.eval_execution_service.eval_execution_meta_service.save_execution_result(
+            user_id, repo_name, eval_name, execution_result
+        )
+
+        logger.info(
+            f"Completed sharded eval {eval_name}: {execution_result.passed_tests}/{execution_result.total_tests} "
+            f"passed in {execution_result.total_execution_time_ms}ms"
+        )
+
+        return execution_result
+
+    async def _wait_for_shards(self, run_id: str, shard_count: int, deadline: Optional[float]) -> List[ShardOutcome]:
+        if self.queue.shared_across_processes:
+            return await self._wait_with_processes(run_id, shard_count, deadline)
+        return await self._wait_with_tasks(run_id, shard_count, deadline)
+
+    async def _wait_with_tasks(self, run_id: str, shard_count: int, deadline: Optional[float]) -> List[ShardOutcome]:
+        # The queue lives in this process, so its workers run on this event loop
+        service_factory = in_process_service_factory(self.eval_execution_service)
+        tasks = [
+            asyncio.create_task(
+                EvalShardWorker(self.queue, service_factory, lease_seconds=self.lease_seconds)
+                .run(run_id=run_id, exit_when_idle=True)
+            )
+            for _ in range(max(1, min(self.local_workers, shard_count)))
+        ]
+        try:
+            while True:
+                outcomes = await asyncio.to_thread(self.queue.outcomes, run_id)
+                if len(outcomes) >= shard_count:
+                    return outcomes
+                if all(task.done() for task in tasks):
+                    # Surfaces a queue error that stopped the workers
+                    await asyncio.gather(*tasks)
+                    return await asyncio.to_thread(self.queue.outcomes, run_id)
+                if deadline is not None and time.time() >= deadline:
+                    logger.warning(f"Sharded run {run_id} timed out with {len(outcomes)}/{shard_count} shards finished")
+                    return outcomes
+                await asyncio.sleep(self.poll_seconds)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _wait_with_processes(self, run_id: str, shard_count: int, deadline: Optional[float]) -> List[ShardOutcome]:
+        # Fresh interpreters: forking would copy the event loop and open database connections
+        context = multiprocessing.get_context("spawn")
+        processes: Dict[str, multiprocessing.process.BaseProcess] = {}
+        restarts_left = self.local_workers
+
+        def start_worker() -> None:
+            worker_id = new_worker_id()
+            process = context.Process(
+                target=run_worker_process,
+                kwargs={"queue_url": self.queue_url, "worker_id": worker_id, "run_id": run_id, "exit_when_idle": True},
+                daemon=True
+            )
+            process.start()
+            processes[worker_id] = process
+
+        for _ in range(min(self.local_workers, shard_count)):
+            start_worker()
+        try:
+            while True:
+                outcomes = await asyncio.to_thread(self.queue.outcomes, run_id)
+                if len(outcomes) >= shard_count:
+                    return outcomes
+                if deadline is not None and time.time() >= deadline:
+                    logger.warning(f"Sharded run {run_id} timed out with {len(outcomes)}/{shard_count} shards finished")
+                    return outcomes
+                for worker_id, process in list(processes.items()):
+                    if process.is_alive() or process.exitcode == 0:
+                        continue
+                    # The worker crashed: queue its shard again and replace it
+                    del processes[worker_id]
+                    released = await asyncio.to_thread(self.queue.release, run_id, worker_id)
+                    logger.warning(
+                        f"Eval shard worker {worker_id} exited with code {process.exitcode}; "
+                        f"requeued {released} shards of run {run_id}"
+                    )
+                    if restarts_left <= 0:
+                        raise AppException(
+                            message="Eval shard workers keep exiting before finishing their shards",
+                            context={"run_id": run_id}
+                        )
+                    restarts_left -= 1
+                    start_worker()
+                await asyncio.sleep(self.poll_seconds)
+        finally:
+            for process in processes.values():
+                if process.is_alive():
+                    process.terminate()
+            await asyncio.to_thread(lambda: [process.join() for process in processes.values()])
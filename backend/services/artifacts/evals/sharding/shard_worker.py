@@ -0,0 +1,190 @@
+"""
+Eval Shard Worker
+
+Claims shards from a shard queue and executes their tests. Workers run as
+processes started by a sharded run on the coordinator's node, as tasks on the
+coordinator's event loop for the in-memory queue, or as standalone processes
+on other nodes serving every run of a shared queue:
+
+    python -m services.artifacts.evals.sharding worker
+"""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Optional
+
+from settings import settings
+
+from ..eval_execution_service import EvalExecutionService
+from .models import EvalShard
+from .shard_queue_factory import create_shard_queue
+from .shard_queue_interface import IShardQueue
+
+logger = logging.getLogger(__name__)
+
+# Builds the EvalExecutionService a worker runs shards with and releases its resources on exit
+EvalServiceFactory = Callable[[], ContextManager[EvalExecutionService]]
+
+
+def new_worker_id() -> str:
+    """Return a worker ID unique across the nodes sharing a queue."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class EvalShardWorker:
+    """Executes shards claimed from a shard queue."""
+
+    def __init__(
+        self,
+        queue: IShardQueue,
+        service_factory: EvalServiceFactory,
+        worker_id: Optional[str] = None,
+        lease_seconds: Optional[float] = None,
+        poll_seconds: float = 1.0,
+        heartbeat_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            queue: Queue to claim shards from
+            service_factory: Builds the EvalExecutionService shards are executed with
+            worker_id: Worker ID (None generates one)
+            lease_seconds: Seconds a claimed shard is held (None uses eval_shard_lease_seconds)
+            poll_seconds: Seconds between claims while the queue is empty
+            heartbeat_seconds: Seconds between lease renewals while a shard executes
+                (None renews three times per lease)
+        """
+        self.queue = queue
+        self.service_factory = service_factory
+        self.worker_id = worker_id or new_worker_id()
+        self.lease_seconds = lease_seconds if lease_seconds is not None else settings.eval_shard_lease_seconds
+        self.poll_seconds = poll_seconds
+        self.heartbeat_seconds = heartbeat_seconds if heartbeat_seconds is not None else self.lease_seconds / 3
+
+    async def run(
+        self,
+        run_id: Optional[str] = None,
+        exit_when_idle: bool = False,
+        stop_event: Optional[asyncio.Event] = None
+    ) -> int:
+        """
+        Claim and execute shards until stopped.
+
+        Args:
+            run_id: Only claim shards of this run (None serves every run)
+            exit_when_idle: Return once no shard can be claimed instead of polling
+            stop_event: Return once set
+
+        Returns:
+            int: Number of shards executed
+        """
+        executed = 0
+        with self.service_factory() as service:
+            while stop_event is None or not stop_event.is_set():
+                shard = await asyncio.to_thread(self.queue.claim, self.worker_id, self.lease_seconds, run_id)
+                if shard is None:
+                    if exit_when_idle:
+                        break
+                    await asyncio.sleep(self.poll_seconds)
+                    continue
+                await self.run_shard(service, shard)
+                executed += 1
+        return executed
+
+    async def run_shard(self, service: EvalExecutionService, shard: EvalShard) -> None:
+        """
+        Execute a shard and report its outcome to the queue.
+
+        The shard's lease is renewed while it executes. Execution stops when the
+        lease was lost, since another worker may have claimed the shard again.
+
+        Args:
+            service: Service executing the shard's tests
+            shard: Claimed shard
+        """
+        logger.info(
+            f"Worker {self.worker_id} executing shard {shard.index + 1}/{shard.count} "
+            f"of run {shard.run_id} ({len(shard.test_names)} tests)"
+        )
+        # The coordinator saves the merged result of all shards
+        execution = asyncio.ensure_future(service.execute_eval(
+            shard.user_id, shard.repo_name, shard.file_path,
+            test_names=shard.test_names,
+            cache_mode=shard.cache_mode,
+            save_result=False
+        ))
+        lease_lost = asyncio.Event()
+        heartbeat = asyncio.create_task(self._renew_lease(shard, execution, lease_lost))
+        try:
+            result = await execution
+        except asyncio.CancelledError:
+            if not lease_lost.is_set():
+                raise
+            return
+        except Exception as e:
+            logger.error(f"Shard {shard.index} of run {shard.run_id} failed: {e}")
+            await asyncio.to_thread(self.queue.fail, shard, self.worker_id, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+        await asyncio.to_thread(self.queue.complete, shard, self.worker_id, result.test_results)
+
+    async def _renew_lease(self, shard: EvalShard, execution: asyncio.Future, lease_lost: asyncio.Event) -> None:
+        """Renew the shard's lease until cancelled; cancel its execution once the lease is lost."""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                held = await asyncio.to_thread(
+                    self.queue.renew, shard.run_id, shard.index, self.worker_id, self.lease_seconds
+                )
+            except Exception as e:
+                # Retried on the next heartbeat; the lease outlives a few missed renewals
+                logger.warning(f"Failed to renew the lease of shard {shard.index} of run {shard.run_id}: {e}")
+                continue
+            if not held:
+                logger.warning(
+                    f"Worker {self.worker_id} lost the lease of shard {shard.index} of run {shard.run_id}; "
+                    "stopping its execution"
+                )
+                lease_lost.set()
+                execution.cancel()
+                return
+
+
+def run_worker_process(
+    queue_url: str,
+    worker_id: Optional[str] = None,
+    run_id: Optional[str] = None,
+    exit_when_idle: bool = False
+) -> None:
+    """
+    Entry point of a worker process.
+
+    Args:
+        queue_url: Queue to claim shards from
+        worker_id: Worker ID (None generates one)
+        run_id: Only claim shards of this run (None serves every run)
+        exit_when_idle: Exit once no shard can be claimed instead of polling
+    """
+    # Imported here: the process assembles the request-independent service graph itself
+    from api.deps import eval_execution_service_scope
+    from lib.tracing import configure_tracing, shutdown_tracing
+
+    logging.basicConfig(level=logging.INFO)
+    configure_tracing()
+    queue = create_shard_queue(queue_url)
+    worker = EvalShardWorker(queue, eval_execution_service_scope, worker_id=worker_id)
+    try:
+        asyncio.run(worker.run(run_id=run_id, exit_when_idle=exit_when_idle))
+    finally:
+        queue.close()
+        shutdown_tracing()
+
+
+def in_process_service_factory(service: EvalExecutionService) -> EvalServiceFactory:
+    """Return a factory handing out an existing service, for workers on the coordinator's event loop."""
+    return lambda: nullcontext(service)
@@ -0,0 +1,157 @@
+"""
+SQLite Shard Queue
+
+Shard queue in a SQLite file, shared by the worker processes of one node.
+Shards are claimed in an immediate transaction, so two processes never hold
+a live lease on the same shard.
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from ..models import TestExecutionResult
+from .models import EvalShard, ShardOutcome, ShardStatus
+from .shard_queue_interface import IShardQueue
+
+
+class SQLiteShardQueue(IShardQueue):
+    """Shard queue in a SQLite file. Safe to share between threads and processes."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize the queue; the database is opened on first use.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode; claims open their own immediate transaction
+            connection = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS eval_shards ("
+                "run_id TEXT NOT NULL, shard_index INTEGER NOT NULL, shard TEXT NOT NULL, "
+                "status TEXT NOT NULL, worker_id TEXT, lease_expires REAL NOT NULL DEFAULT 0, "
+                "outcome TEXT, created_at REAL NOT NULL, PRIMARY KEY (run_id, shard_index))"
+            )
+            self._connection = connection
+        return self._connection
+
+    def submit(self, shards: List[EvalShard]) -> None:
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO eval_shards (run_id, shard_index, shard, status, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (shard.run_id, shard.index, shard.model_dump_json(), ShardStatus.PENDING.value, now)
+                        for shard in shards
+                    ]
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+
+    def claim(self, worker_id: str, lease_seconds: float, run_id: Optional[str] = None) -> Optional[EvalShard]:
+        now = time.time()
+        condition = "(status = ? OR (status = ? AND lease_expires < ?))"
+        params: list = [ShardStatus.PENDING.value, ShardStatus.CLAIMED.value, now]
+        if run_id is not None:
+            condition += " AND run_id = ?"
+            params.append(run_id)
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    f"SELECT run_id, shard_index, shard FROM eval_shards WHERE {condition} "
+                    "ORDER BY created_at, shard_index LIMIT 1",
+                    params
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "UPDATE eval_shards SET status = ?, worker_id = ?, lease_expires = ? "
+                        "WHERE run_id = ? AND shard_index = ?",
+                        (ShardStatus.CLAIMED.value, worker_id, now + lease_seconds, row[0], row[1])
+                    )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        return EvalShard.model_validate_json(row[2]) if row else None
+
+    def renew(self, run_id: str, index: int, worker_id: str, lease_seconds: float) -> bool:
+        with self._lock:
+            return self._connect().execute(
+                "UPDATE eval_shards SET lease_expires = ? "
+                "WHERE run_id = ? AND shard_index = ? AND worker_id = ? AND status = ?",
+                (time.time() + lease_seconds, run_id, index, worker_id, ShardStatus.CLAIMED.value)
+            ).rowcount == 1
+
+    def complete(self, shard: EvalShard, worker_id: str, test_results: List[TestExecutionResult]) -> None:
+        self._finish(ShardOutcome(
+            run_id=shard.run_id,
+            index=shard.index,
+            status=ShardStatus.COMPLETED,
+            worker_id=worker_id,
+            test_results=test_results
+        ))
+
+    def fail(self, shard: EvalShard, worker_id: str, error: str) -> None:
+        self._finish(ShardOutcome(
+            run_id=shard.run_id,
+            index=shard.index,
+            status=ShardStatus.FAILED,
+            worker_id=worker_id,
+            error=error
+        ))
+
+    def _finish(self, outcome: ShardOutcome) -> None:
+        with self._lock:
+            # A worker whose shard was reclaimed after its lease expired cannot finish it
+            self._connect().execute(
+                "UPDATE eval_shards SET status = ?, outcome = ? "
+                "WHERE run_id = ? AND shard_index = ? AND worker_id = ? AND status NOT IN (?, ?)",
+                (
+                    outcome.status.value, outcome.model_dump_json(), outcome.run_id, outcome.index,
+                    outcome.worker_id, ShardStatus.COMPLETED.value, ShardStatus.FAILED.value
+                )
+            )
+
+    def release(self, run_id: str, worker_id: str) -> int:
+        with self._lock:
+            return self._connect().execute(
+                "UPDATE eval_shards SET status = ?, worker_id = NULL, lease_expires = 0 "
+                "WHERE run_id = ? AND worker_id = ? AND status = ?",
+                (ShardStatus.PENDING.value, run_id, worker_id, ShardStatus.CLAIMED.value)
+            ).rowcount
+
+    def outcomes(self, run_id: str) -> List[ShardOutcome]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT outcome FROM eval_shards WHERE run_id = ? AND outcome IS NOT NULL ORDER BY shard_index",
+                (run_id,)
+            ).fetchall()
+        return [ShardOutcome.model_validate_json(row[0]) for row in rows]
+
+    def delete_run(self, run_id: str) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM eval_shards WHERE run_id = ?", (run_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
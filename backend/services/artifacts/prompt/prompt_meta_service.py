@@ -9,6 +9,7 @@ import logging
 from datetime import datetime, timezone
 from typing import List, Optional, Union, Tuple
 
+from lib.tracing import traced
 from schemas.artifact_type_enum import ArtifactType
 from services.artifacts.artifact_meta_interface import ArtifactMetaInterface
 from services.config.config_interface import IConfig
@@ -50,6 +51,7 @@ class PromptMetaService(ArtifactMetaInterface[PromptData, PromptMeta]):
         self.local_repo_service = local_repo_service
 
     
+    @traced("prompt.save")
     async def save(
         self,
         user_id: str,
@@ -143,13 +145,15 @@ class PromptMetaService(ArtifactMetaInterface[PromptData, PromptMeta]):
             updated_prompt.pr_info = save_result.pr_info.model_dump(mode='json')
         return updated_prompt, save_result.pr_info
     
+    @traced("prompt.get")
     async def get(
         self,
         user_id: str,
         repo_name: str,
-        file_path: str
+        file_path: str,
+        ref: Optional[str] = None
     ) -> Optional[PromptMeta]:
-        """Get a single prompt by repo_name and file_path."""
+        """Get a single prompt by repo_name and file_path, optionally as it exists at a git ref."""
         try:
             # Get repository path using local_repo service
             repo_path = self.local_repo_service.get_repo_path(user_id, repo_name)
@@ -159,13 +163,14 @@ class PromptMetaService(ArtifactMetaInterface[PromptData, PromptMeta]):
                 user_id=user_id,
                 repo_name=repo_name,
                 artifact_type=ArtifactType.PROMPT,
-                file_path=file_path
+                file_path=file_path,
+                ref=ref
             )
             if not yaml_data:
                 return None
             
             # Get commit history for this file
-            recent_commits = self.local_repo_service.get_file_commit_history(repo_path, file_path)
+            recent_commits = self.local_repo_service.get_file_commit_history(repo_path, file_path, ref=ref)
             
             # Parse datetime fields
             created_at = yaml_data.get("created_at")
@@ -231,6 +236,7 @@ class PromptMetaService(ArtifactMetaInterface[PromptData, PromptMeta]):
             return None
     
     
+    @traced("prompt.delete")
     async def delete(
         self,
         user_id: str,
@@ -256,6 +262,7 @@ class PromptMetaService(ArtifactMetaInterface[PromptData, PromptMeta]):
             logger.error(f"Failed to delete prompt {repo_name}:{file_path}: {e}")
             return False
     
+    @traced("prompt.discover")
     async def discover(
         self,
         user_id: str,
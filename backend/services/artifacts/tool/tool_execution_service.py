@@ -5,6 +5,7 @@ import json
 import logging
 from typing import Any, Callable, Dict, List, Optional
 
+from lib.tracing import traced
 from services.artifacts.tool.models import ContentType, MockType, ToolDefinition
 from services.artifacts.tool.tool import create_callable_from_tool_definition
 from services.artifacts.tool.tool_meta_service import ToolMetaService
@@ -34,6 +35,7 @@ class ToolExecutionService:
         Returns:
             A callable that executes the mock logic
         """
+        @traced("tool.execute", **{"tool.name": tool.name})
         def mock_logic(**kwargs: Any) -> Any:
             """Execute the mock logic based on tool configuration."""
             if not tool.mock.enabled:
@@ -128,6 +130,7 @@ class ToolExecutionService:
                 return json.dumps(response)
             return str(response)
     
+    @traced("tools.load")
     async def create_callable_tools(
         self,
         tool_paths: List[str],
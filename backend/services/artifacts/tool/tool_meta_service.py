@@ -166,7 +166,7 @@ class ToolMetaService(ArtifactMetaInterface[ToolData, ToolMeta]):
             logger.exception("Failed to delete tool at %s", file_path)
             return False
     
-    async def get(self, user_id: str, repo_name: str, file_path: str) -> Optional[ToolMeta]:
+    async def get(self, user_id: str, repo_name: str, file_path: str, ref: Optional[str] = None) -> Optional[ToolMeta]:
         """
         Get a single tool artifact by file path.
         
@@ -174,6 +174,7 @@ class ToolMetaService(ArtifactMetaInterface[ToolData, ToolMeta]):
             user_id: User ID
             repo_name: Repository name
             file_path: Relative path to tool file from repo root
+            ref: Optional branch, tag or commit SHA to read the tool at (default: working tree)
             
         Returns:
             Optional[ToolMeta]: Tool metadata if found, None otherwise
@@ -184,7 +185,8 @@ class ToolMetaService(ArtifactMetaInterface[ToolData, ToolMeta]):
                 user_id=user_id,
                 repo_name=repo_name,
                 file_path=file_path,
-                artifact_type=ArtifactType.TOOL
+                artifact_type=ArtifactType.TOOL,
+                ref=ref
             )
             
             if not yaml_data:
@@ -2,6 +2,7 @@
 Session management service for UserSessions database operations.
 """
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from database.models.user_sessions import UserSessions
 from database.models.user import User
 from database.daos.user.user_sessions_dao import UserSessionDAO
@@ -16,15 +17,16 @@ logger = logging.getLogger(__name__)
 class SessionService:
     """Service for managing user sessions in database."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, async_db: Optional[AsyncSession] = None):
         """
         Initialize SessionService with database session.
         
         Args:
             db: Database session instance
+            async_db: Optional asyncio database session for request-path lookups
         """
         self.db = db
-        self.user_session_dao = UserSessionDAO(db)
+        self.user_session_dao = UserSessionDAO(db, async_db)
 
     def create_session(
             self,
@@ -268,6 +270,32 @@ class SessionService:
             logger.error(f"Failed to validate session {session_id}: {e}")
             return None
 
+    async def ais_session_valid(self, session_id: str, ttl_minutes: int = 1440) -> Optional[UserSessions]:
+        """
+        Check if session is valid and return it, without blocking the event loop.
+
+        Args:
+            session_id: Session identifier
+            ttl_minutes: Time-to-live in minutes
+
+        Returns:
+            UserSessions object if session is valid, None otherwise
+        """
+        try:
+            user_session = await self.user_session_dao.aget_session_by_id(session_id)
+
+            if not user_session:
+                return None
+
+            if self.user_session_dao.is_expired(user_session, ttl_minutes * 60):
+                return None
+
+            return user_session
+
+        except Exception as e:
+            logger.error(f"Failed to validate session {session_id}: {e}")
+            return None
+
     def get_oauth_token_and_user_info(self, session_id: str) -> Optional[OAuthTokenUserInfo]:
         """
         Get OAuth token and user info by session_id using relationship.
@@ -4,6 +4,7 @@ from services.config.config_factory import ConfigStrategyFactory
 from schemas.hosting_type_enum import HostingType
 from services.config.models import OAuthConfig, LLMConfig, LLMConfigScope, RepoConfig, HostingConfig, AppConfig
 from services.config.config_interface import IConfig
+from lib.rate_limit import get_provider_rate_limiter
 
 if TYPE_CHECKING:
     from services.remote_repo.remote_repo_service import RemoteRepoService
@@ -63,7 +64,10 @@ class ConfigService:
     def set_llm_configs(self, user_id: str, llm_configs: List[LLMConfig]) -> List[LLMConfig] | None:
         if not self.db:
             raise ValueError("Database session required for LLM configs")
-        return self.config.set_llm_configs(self.db, user_id, llm_configs)
+        saved_configs = self.config.set_llm_configs(self.db, user_id, llm_configs)
+        # Changed quotas take effect for every feature calling the provider
+        get_provider_rate_limiter().load_budgets(config.model_dump() for config in saved_configs or [])
+        return saved_configs
     
     def set_repo_configs(self, user_id: str, repo_configs: List[RepoConfig], remote_repo_service: Optional['RemoteRepoService'] = None) -> List[RepoConfig] | None:
         if not self.db:
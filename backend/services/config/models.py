@@ -74,6 +74,14 @@ class LLMConfig(BaseModel):
         default=LLMConfigScope.ORGANIZATION,
         description="Scope of the LLM config: 'organization' for ENV configs, 'user' for user-specific configs"
     )
+    rpm_limit: Optional[int] = Field(
+        default=None,
+        description="Requests per minute allowed for this API key and model (None uses the server default)"
+    )
+    tpm_limit: Optional[int] = Field(
+        default=None,
+        description="Tokens per minute allowed for this API key and model (None uses the server default)"
+    )
 
 
 class RepoConfig(BaseModel):
@@ -138,6 +138,8 @@ class IndividualConfig(IConfig):
                         api_key=config.get("api_key"),
                         api_base_url=config.get("api_base_url") or "",
                         label=config.get("label") or "",  # Parse label from ENV config
+                        rpm_limit=config.get("rpm_limit"),
+                        tpm_limit=config.get("tpm_limit"),
                         scope=LLMConfigScope.USER
                     )
                     for config in llm_configs_data
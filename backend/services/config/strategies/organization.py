@@ -129,6 +129,10 @@ class OrganizationConfig(IConfig):
                 # Delete from file system first
                 if repo.local_path:
                     logger.info(f"Deleting repository directory: {repo.local_path}")
+                    # Pooled handles would keep git processes running on the deleted repository
+                    # (imported here: services.local_repo imports the config package)
+                    from services.local_repo.repo_handles import get_repo_handle_registry
+                    get_repo_handle_registry().evict(repo.local_path)
                     file_ops.delete_directory(repo.local_path)
                 # Delete from database
                 user_repos_dao.delete_repository(repo.id)
@@ -204,6 +208,10 @@ class OrganizationConfig(IConfig):
                 # Delete from file system first
                 if repo.local_path:
                     logger.info(f"Deleting repository directory: {repo.local_path}")
+                    # Pooled handles would keep git processes running on the deleted repository
+                    # (imported here: services.local_repo imports the config package)
+                    from services.local_repo.repo_handles import get_repo_handle_registry
+                    get_repo_handle_registry().evict(repo.local_path)
                     file_ops.delete_directory(repo.local_path)
                 # Delete from database
                 user_repos_dao.delete_repository(repo.id)
@@ -265,6 +273,8 @@ class OrganizationConfig(IConfig):
                         api_key=config.get("api_key"),
                         api_base_url=config.get("api_base_url") or "",
                         label=config.get("label") or "",  # Parse label from ENV config
+                        rpm_limit=config.get("rpm_limit"),
+                        tpm_limit=config.get("tpm_limit"),
                         scope=LLMConfigScope.ORGANIZATION  # ENV configs have organization scope
                     )
                     for config in llm_configs_data
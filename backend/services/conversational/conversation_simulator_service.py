@@ -11,6 +11,14 @@ from typing import Optional, List
 from services.config.config_service import ConfigService
 from services.artifacts.prompt.prompt_meta_service import PromptMetaService
 from services.llm.chat_completion_service import ChatCompletionService
+from services.llm.completion_cache import (
+    CompletionCache,
+    CompletionCacheMissError,
+    CompletionCacheMode,
+    hash_text,
+    resolve_cache_mode,
+)
+from services.llm.models import ChatCompletionResponse
 from services.conversational.models import (
     SimulateConversationRequest,
     SimulateConversationResponse,
@@ -63,6 +71,10 @@ If the conversation cannot proceed (assistant refuses, dead end, etc.), respond
 """
 
 
+# Sampling arguments of the user simulator
+USER_SIMULATOR_MODEL_ARGS = {"temperature": 0.8}
+
+
 class ConversationSimulatorService:
     """Service for simulating conversations based on user goals."""
 
@@ -148,10 +160,14 @@ class ConversationSimulatorService:
         request: SimulateConversationRequest,
         conversation_history: List[Turn],
         user_id: str,
+        cache_mode: CompletionCacheMode = CompletionCacheMode.OFF,
     ) -> tuple[str, bool, Optional[str]]:
         """
         Generate the next user message.
 
+        Simulated user messages go through the completion cache like the
+        assistant's completions, so a replayed simulation calls no provider.
+
         Returns:
             Tuple of (message, should_stop, stopping_reason)
         """
@@ -161,20 +177,54 @@ class ConversationSimulatorService:
             user_id
         )
 
+        prompt = self._build_user_simulator_prompt(
+            request.user_goal,
+            request.user_persona,
+            request.stopping_criteria,
+            conversation_history,
+        )
+
+        cache_key: Optional[str] = None
+        cache_request: Optional[dict] = None
+        if cache_mode != CompletionCacheMode.OFF:
+            cache_request = {
+                "kind": "simulated_user_message",
+                "provider": request.provider,
+                "model": request.model,
+                "api_base": (api_base or "").rstrip("/"),
+                "model_args": USER_SIMULATOR_MODEL_ARGS,
+                "prompt_sha": hash_text(prompt),
+            }
+            cache_key = CompletionCache.build_key(cache_request)
+            if cache_mode in (CompletionCacheMode.READ_WRITE, CompletionCacheMode.REPLAY):
+                cached_response = self.chat_completion_service.completion_cache.get(cache_key)
+                if cached_response is not None:
+                    return self._parse_user_message(cached_response.content)
+                if cache_mode == CompletionCacheMode.REPLAY:
+                    raise CompletionCacheMissError(cache_key)
+
+        content = await self._run_user_simulator(request, api_key, api_base, prompt)
+        if cache_key is not None:
+            self.chat_completion_service.completion_cache.put(
+                cache_key, ChatCompletionResponse(content=content), cache_request
+            )
+        return self._parse_user_message(content)
+
+    async def _run_user_simulator(
+        self,
+        request: SimulateConversationRequest,
+        api_key: str,
+        api_base: Optional[str],
+        prompt: str,
+    ) -> str:
+        """Run the user simulator agent and return its raw output."""
         model_id = f"{request.provider}/{request.model}"
         agent = await PromptOptimizerAgent.create(
             model_id=model_id,
             api_key=api_key,
             api_base=api_base,
             instructions="",  # Instructions will be in the prompt
-            model_args={"temperature": 0.8}
-        )
-
-        prompt = self._build_user_simulator_prompt(
-            request.user_goal,
-            request.user_persona,
-            request.stopping_criteria,
-            conversation_history,
+            model_args=dict(USER_SIMULATOR_MODEL_ARGS)
         )
 
         trace = await agent.run(prompt)
@@ -199,6 +249,11 @@ class ConversationSimulatorService:
             except Exception:
                 pass
 
+        return content
+
+    @staticmethod
+    def _parse_user_message(content: str) -> tuple[str, bool, Optional[str]]:
+        """Split the simulator output into the user message and its stopping signal."""
         content = content.strip()
 
         # Check for stopping signals
@@ -214,6 +269,7 @@ class ConversationSimulatorService:
         request: SimulateConversationRequest,
         user_id: str,
         repo_name: str,
+        cache_mode: Optional[CompletionCacheMode] = None,
     ) -> SimulateConversationResponse:
         """
         Simulate a conversation based on user goal.
@@ -226,6 +282,7 @@ class ConversationSimulatorService:
             request: SimulateConversationRequest with simulation parameters
             user_id: User ID for configuration lookup
             repo_name: Repository name for prompt lookup
+            cache_mode: Completion cache mode (None uses the configured default)
 
         Returns:
             SimulateConversationResponse with simulated conversation
@@ -279,6 +336,7 @@ class ConversationSimulatorService:
         request.provider = provider
         request.model = model
 
+        cache_mode = resolve_cache_mode(cache_mode)
         turns: List[Turn] = []
         goal_achieved = False
         stopping_reason = None
@@ -291,6 +349,7 @@ class ConversationSimulatorService:
                     request,
                     turns,
                     user_id,
+                    cache_mode,
                 )
 
                 if should_stop:
@@ -328,6 +387,7 @@ class ConversationSimulatorService:
                         prompt_id=prompt_id,
                         last_user_message=user_message,
                         conversation_history=conversation_history if conversation_history else None,
+                        cache_mode=cache_mode,
                     )
 
                     assistant_content = completion_response.content or ""
@@ -353,6 +413,7 @@ class ConversationSimulatorService:
                         request,
                         turns,
                         user_id,
+                        cache_mode,
                     )
                     if should_stop:
                         goal_achieved = stop_reason == "Goal was achieved"
@@ -9,10 +9,13 @@ Handles operations like:
 """
 
 import logging
+import os
 import shutil
+import stat
+import tempfile
 import yaml
 from pathlib import Path
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Set, Union
 from pydantic import BaseModel
 
 from schemas.artifact_type_enum import ArtifactType
@@ -20,6 +23,10 @@ from settings import settings
 
 logger = logging.getLogger(__name__)
 
+# The umask can only be read by setting it, which is process-wide, so it is read once at import
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 
 class SavedFileData(BaseModel):
     """Result of saving an artifact with path information."""
@@ -36,6 +43,10 @@ class FileOperationsService:
     making it easier to mock in tests and maintain consistency across the codebase.
     """
     
+    def __init__(self):
+        # Directories created by this instance; lets repeated saves skip mkdir
+        self._known_directories: Set[Path] = set()
+    
     def delete_directory(self, path: Union[str, Path]) -> bool:
         """
         Delete a directory and all its contents.
@@ -51,6 +62,7 @@ class FileOperationsService:
         try:
             if dir_path.exists() and dir_path.is_dir():
                 shutil.rmtree(dir_path)
+                self._forget_directories_under(dir_path)
                 logger.info(f"Deleted directory: {dir_path}")
                 return True
             else:
@@ -60,6 +72,13 @@ class FileOperationsService:
             logger.error(f"Failed to delete directory {dir_path}: {e}", exc_info=True)
             return False
     
+    def _forget_directories_under(self, dir_path: Path) -> None:
+        """Drop cached directories that were removed along with dir_path."""
+        self._known_directories = {
+            known for known in self._known_directories
+            if known != dir_path and dir_path not in known.parents
+        }
+    
     def delete_file(self, path: Union[str, Path]) -> bool:
         """
         Delete a file.
@@ -130,19 +149,46 @@ class FileOperationsService:
             logger.error(f"Failed to load YAML file {file_path}: {e}", exc_info=True)
             return None
     
+    def parse_yaml(self, content: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        """
+        Parse YAML content, e.g. a file read from the git object database.
+        
+        Args:
+            content: YAML document
+            
+        Returns:
+            Optional[Dict[str, Any]]: Parsed data or None if parsing failed
+        """
+        try:
+            return yaml.safe_load(content)
+        except Exception as e:
+            logger.error(f"Failed to parse YAML content: {e}", exc_info=True)
+            return None
+    
     def save_yaml_file(
         self,
         file_path: Path,
         data: Dict[str, Any],
-        exclusive: bool = False
+        exclusive: bool = False,
+        repo_root: Optional[Path] = None,
+        atomic: bool = True,
+        fsync: bool = False
     ) -> SavedFileData:
         """
         Save YAML file to the specified path.
         
+        By default the file is written atomically: the YAML is dumped to a
+        temporary file in the target directory and then renamed over the
+        destination, so concurrent readers never observe a partially written file.
+        
         Args:
             file_path: Full path to the file to save
             data: Data to save as YAML
             exclusive: If True, fail if file already exists
+            repo_root: Repository root used to compute the relative path. When
+                omitted, the root is discovered by looking for the meta directory.
+            atomic: If True, write to a temp file and rename it into place
+            fsync: If True, flush the file (and its directory) to disk before returning
             
         Returns:
             SavedFileData with success status and path information
@@ -151,29 +197,24 @@ class FileOperationsService:
         filename = file_path.name
 
         try:
-            # Create the directory
-            directory_path.mkdir(parents=True, exist_ok=True)
+            self._ensure_directory(directory_path)
             
-            # Save the YAML file
-            mode = 'x' if exclusive else 'w'
-            with open(file_path, mode) as f:
-                yaml.safe_dump(data, f)
+            try:
+                self._write_yaml(file_path, data, exclusive, atomic, fsync)
+            except FileNotFoundError:
+                # The directory was removed behind our back (e.g. by a git checkout)
+                self._known_directories.discard(directory_path)
+                self._ensure_directory(directory_path)
+                self._write_yaml(file_path, data, exclusive, atomic, fsync)
             
             # Extract directory name from path
             dir_name = directory_path.name
             
             # Calculate relative path from repo root
-            # The repo root is the directory containing the meta_directory (.promptrepo)
-            relative_path = str(file_path)
-            repo_root = None
-            
-            # Walk up the directory tree to find the repo root
-            for parent in file_path.parents:
-                if (parent / settings.meta_directory).exists():
-                    # This parent directory contains .promptrepo, so it's the repo root
-                    repo_root = parent
-                    break
+            if repo_root is None:
+                repo_root = self._find_repo_root(file_path)
             
+            relative_path = str(file_path)
             if repo_root:
                 relative_path = str(file_path.relative_to(repo_root))
             else:
@@ -197,4 +238,109 @@ class FileOperationsService:
                 relative_path=str(file_path),
                 directory_name=directory_path.name,
                 filename=filename
-            )
\ No newline at end of file
+            )
+    
+    def _ensure_directory(self, directory_path: Path) -> None:
+        """
+        Create a directory (and parents) once per service instance.
+        
+        Directories already created or seen by this instance are remembered so
+        repeated saves into the same folder skip the mkdir syscalls.
+        """
+        if directory_path in self._known_directories:
+            return
+        directory_path.mkdir(parents=True, exist_ok=True)
+        self._known_directories.add(directory_path)
+    
+    def _write_yaml(
+        self,
+        file_path: Path,
+        data: Dict[str, Any],
+        exclusive: bool,
+        atomic: bool,
+        fsync: bool
+    ) -> None:
+        """Write YAML either atomically or directly to the destination."""
+        if atomic:
+            self._write_yaml_atomic(file_path, data, exclusive=exclusive, fsync=fsync)
+            return
+        
+        mode = 'x' if exclusive else 'w'
+        with open(file_path, mode) as f:
+            yaml.safe_dump(data, f)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def _write_yaml_atomic(
+        self,
+        file_path: Path,
+        data: Dict[str, Any],
+        exclusive: bool = False,
+        fsync: bool = False
+    ) -> None:
+        """
+        Write YAML to a temp file in the target directory and move it into place.
+        
+        In exclusive mode the temp file is hard-linked to the destination, which
+        fails with FileExistsError if the destination already exists.
+        """
+        directory_path = file_path.parent
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=f".{file_path.name}.", suffix=".tmp", dir=directory_path
+        )
+        tmp_path = Path(tmp_name)
+        try:
+            # mkstemp creates the file owner-only; keep the mode open() would give it
+            os.fchmod(fd, self._target_file_mode(file_path))
+            with os.fdopen(fd, 'w') as f:
+                yaml.safe_dump(data, f)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            
+            if exclusive:
+                os.link(tmp_path, file_path)
+                tmp_path.unlink()
+            else:
+                os.replace(tmp_path, file_path)
+            
+            if fsync:
+                self._fsync_directory(directory_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
+    @staticmethod
+    def _target_file_mode(file_path: Path) -> int:
+        """Mode of the existing file, or the umask-filtered default for a new one."""
+        try:
+            return stat.S_IMODE(file_path.stat().st_mode)
+        except FileNotFoundError:
+            return 0o666 & ~_UMASK
+    
+    @staticmethod
+    def _fsync_directory(directory_path: Path) -> None:
+        """Flush a directory entry so a completed rename survives a crash."""
+        try:
+            dir_fd = os.open(directory_path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+    
+    @staticmethod
+    def _find_repo_root(file_path: Path) -> Optional[Path]:
+        """
+        Find the repo root by walking up to the directory containing the meta directory.
+        
+        Only used when callers do not pass an explicit repo_root.
+        """
+        for parent in file_path.parents:
+            if (parent / settings.meta_directory).exists():
+                return parent
+        return None
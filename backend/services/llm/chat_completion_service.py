@@ -3,9 +3,8 @@ Chat completion service using ChatAgent.
 """
 import json
 import logging
-from typing import Optional, List, Dict, Any, Callable
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Callable
 from datetime import datetime
-from any_agent import AgentTrace
 from fastapi import HTTPException
 from services.config.config_service import ConfigService
 from services.artifacts.prompt.prompt_meta_service import PromptMetaService
@@ -24,6 +23,24 @@ from middlewares.rest.exceptions import (
     NotFoundException
 )
 from services.artifacts.tool.tool_execution_service import ToolExecutionService
+from lib.metrics import record_llm_cost
+from lib.tracing import get_tracer, link_agent_trace, set_span_attributes, traced
+from services.llm.completion_failover import (
+    complete_with_failover,
+    get_completion_latency_tracker,
+    hedge_delay_seconds,
+)
+from settings import settings
+from services.llm.completion_cache import (
+    CompletionCache,
+    CompletionCacheMode,
+    CompletionCacheMissError,
+    get_completion_cache,
+    hash_text,
+)
+
+if TYPE_CHECKING:
+    from any_agent import AgentTrace
 
 logger = logging.getLogger(__name__)
 
@@ -31,11 +48,25 @@ logger = logging.getLogger(__name__)
 class ChatCompletionService:
     """Service class for handling chat completions using ChatAgent."""
     
-    def __init__(self, config_service: ConfigService, tool_execution_service: Optional[ToolExecutionService] = None, prompt_service: Optional[PromptMetaService] = None):
+    def __init__(
+        self,
+        config_service: ConfigService,
+        tool_execution_service: Optional[ToolExecutionService] = None,
+        prompt_service: Optional[PromptMetaService] = None,
+        completion_cache: Optional[CompletionCache] = None
+    ):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.config_service = config_service
         self.tool_execution_service = tool_execution_service
         self.prompt_service = prompt_service
+        self._completion_cache = completion_cache
+
+    @property
+    def completion_cache(self) -> CompletionCache:
+        """Completion cache used when a cache mode other than OFF is active."""
+        if self._completion_cache is None:
+            self._completion_cache = get_completion_cache()
+        return self._completion_cache
     
 
     def _get_api_details(self, provider: str, model: str, user_id: str) -> tuple[str, str | None]:
@@ -78,7 +109,60 @@ class ChatCompletionService:
             })
         return json.dumps(conversation, ensure_ascii=False)
 
-    def _extract_tool_messages_from_trace(self, trace: AgentTrace) -> List[MessageSchema]:
+    def _build_cache_request(
+        self,
+        prompt_data: Any,
+        api_base_url: Optional[str],
+        model_args: Dict[str, Any],
+        filtered_history: Optional[List[MessageSchema]],
+        last_user_message: Optional[str],
+        loaded_tools: Optional[List[Callable[..., Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Build the normalized request used as the completion cache key.
+
+        Only inputs that influence the model output are included; the API key
+        and timestamps are left out so entries are shared across credentials.
+
+        Args:
+            prompt_data: PromptData of the prompt being executed
+            api_base_url: Provider base URL, if any
+            model_args: Model arguments passed to the agent
+            filtered_history: Conversation history without system messages
+            last_user_message: Last user message, if any
+            loaded_tools: Callable tools passed to the agent
+
+        Returns:
+            Dict[str, Any]: JSON-serializable normalized request
+        """
+        tool_hashes: List[str] = []
+        for tool in loaded_tools or []:
+            definition = getattr(tool, "__tool_definition__", None)
+            if definition is not None and hasattr(definition, "model_dump"):
+                tool_hashes.append(hash_text(json.dumps(definition.model_dump(mode="json"), sort_keys=True, default=str)))
+            else:
+                tool_hashes.append(hash_text(getattr(tool, "__name__", repr(tool))))
+
+        return {
+            "provider": prompt_data.provider,
+            "model": prompt_data.model,
+            "api_base": (api_base_url or "").rstrip("/"),
+            "prompt_sha": hash_text(prompt_data.prompt or ""),
+            "model_args": model_args,
+            "seed": prompt_data.seed,
+            "response_format": prompt_data.response_format,
+            "tool_choice": prompt_data.tool_choice,
+            "reasoning_effort": prompt_data.reasoning_effort,
+            "extra_args": prompt_data.extra_args,
+            "history": [
+                {"role": msg.role, "content": msg.content}
+                for msg in filtered_history or []
+            ],
+            "last_user_message": last_user_message,
+            "tools": sorted(tool_hashes),
+        }
+
+    def _extract_tool_messages_from_trace(self, trace: "AgentTrace") -> List[MessageSchema]:
         """
         Extract tool calls and tool messages from agent trace.
 
@@ -152,13 +236,15 @@ class ChatCompletionService:
 
         return tool_messages
     
+    @traced("chat_completion")
     async def _execute_completion_from_prompt_meta(
         self,
         prompt_meta: PromptMeta,
         user_id: str,
         tool_execution_service: Optional[ToolExecutionService] = None,
         conversation_history: Optional[List[MessageSchema]] = None,
-        last_user_message: Optional[str] = None
+        last_user_message: Optional[str] = None,
+        cache_mode: Optional[CompletionCacheMode] = None
     ) -> ChatCompletionResponse:
         """
         Private method to execute completion using PromptMeta.
@@ -168,11 +254,18 @@ class ChatCompletionService:
             user_id: User ID for API key lookup
             conversation_history: Optional conversation history (excluding last user message)
             last_user_message: The last user message to process (if None, uses prompt as single-turn)
+            cache_mode: Completion cache mode (None disables the cache)
             
         Returns:
             ChatCompletionResponse with content, metadata, and usage information
         """
         prompt_data = prompt_meta.prompt
+        set_span_attributes(**{
+            "gen_ai.system": prompt_data.provider,
+            "gen_ai.request.model": prompt_data.model,
+            "prompt.repo_name": prompt_meta.repo_name,
+            "prompt.file_path": prompt_meta.file_path,
+        })
         
         # Get API details
         api_key, api_base_url = self._get_api_details(
@@ -260,105 +353,243 @@ class ChatCompletionService:
             else:
                 # No user message provided, use the prompt itself as the query (single-turn)
                 prompt_to_send = prompt_data.prompt
+
+            # Serve from / record into the completion cache when enabled
+            mode = CompletionCacheMode(cache_mode) if cache_mode else CompletionCacheMode.OFF
+            cache_key: Optional[str] = None
+            cache_request: Optional[Dict[str, Any]] = None
+            if mode != CompletionCacheMode.OFF:
+                cache_request = self._build_cache_request(
+                    prompt_data, api_base_url, model_args, filtered_history, last_user_message, loaded_tools
+                )
+                cache_key = CompletionCache.build_key(cache_request)
+                if mode in (CompletionCacheMode.READ_WRITE, CompletionCacheMode.REPLAY):
+                    cached_response = self.completion_cache.get(cache_key)
+                    if cached_response is not None:
+                        cached_response.cache_status = "hit"
+                        set_span_attributes(**{"completion.cache_status": "hit"})
+                        return cached_response
+                    if mode == CompletionCacheMode.REPLAY:
+                        raise CompletionCacheMissError(cache_key)
             
-            # Create ChatAgent instance
-            model_identifier = f"{prompt_data.provider}/{prompt_data.model}"
+            # Run on the primary model, failing over to failover_model when configured
+            async def run_primary() -> ChatCompletionResponse:
+                return await self._run_agent(
+                    prompt_data.provider, prompt_data.model, api_key, api_base_url,
+                    prompt_data.prompt, model_args, loaded_tools, prompt_to_send,
+                    conversation_history, last_user_message
+                )
+
+            failover_target = self._failover_target(prompt_data, user_id)
+            if failover_target is None:
+                response = await run_primary()
+            else:
+                failover_provider, failover_model = failover_target
+
+                async def run_failover() -> ChatCompletionResponse:
+                    failover_api_key, failover_api_base_url = self._get_api_details(
+                        failover_provider, failover_model, user_id=user_id
+                    )
+                    return await self._run_agent(
+                        failover_provider, failover_model, failover_api_key, failover_api_base_url,
+                        prompt_data.prompt, model_args, loaded_tools, prompt_to_send,
+                        conversation_history, last_user_message
+                    )
+
+                primary_identifier = f"{prompt_data.provider}/{prompt_data.model}"
+                tracker = get_completion_latency_tracker()
+                response, failover_reason = await complete_with_failover(
+                    run_primary,
+                    run_failover,
+                    primary_identifier,
+                    tracker,
+                    timeout_seconds=settings.completion_failover_timeout_seconds or None,
+                    hedge_after_seconds=(
+                        hedge_delay_seconds(tracker, primary_identifier)
+                        if settings.completion_hedging_enabled else None
+                    )
+                )
+                if failover_reason is not None:
+                    response.failover_reason = failover_reason.value
+
+            # Only answers of the primary model are cached under its key
+            if cache_key is not None and response.failover_reason is None:
+                self.completion_cache.put(cache_key, response, cache_request)
+                response.cache_status = "miss"
+            set_span_attributes(**{
+                "completion.model": response.model,
+                "completion.failover_reason": response.failover_reason,
+                "completion.cache_status": response.cache_status,
+            })
+            return response
+                
+        except Exception as e:
+            self.logger.error(f"Error in completion from prompt meta: {e}")
+            raise ServiceUnavailableException(
+                message=f"Completion error: {str(e)}",
+                context={
+                    "provider": prompt_data.provider,
+                    "model": prompt_data.model,
+                    "failover_model": prompt_data.failover_model
+                }
+            )
+
+    def _failover_target(self, prompt_data: Any, user_id: str) -> Optional[tuple[str, str]]:
+        """
+        Resolve the provider and model of a prompt's failover_model.
+
+        Args:
+            prompt_data: PromptData of the prompt being executed
+            user_id: User ID for the LLM config lookup
+
+        Returns:
+            (provider, model) of the failover model, or None when the prompt has none.
+            A failover_model of the form "provider/model" may use another configured
+            provider; otherwise the failover model runs on the prompt's provider.
+        """
+        failover_model = (prompt_data.failover_model or "").strip()
+        if not failover_model:
+            return None
+        provider, model = prompt_data.provider, failover_model
+        if "/" in failover_model:
+            # Model names may contain slashes too; only a configured provider prefix switches provider
+            candidate_provider, candidate_model = failover_model.split("/", 1)
+            llm_configs = self.config_service.get_llm_configs(user_id=user_id) or []
+            if any(config.provider == candidate_provider and config.model == candidate_model for config in llm_configs):
+                provider, model = candidate_provider, candidate_model
+        if (provider, model) == (prompt_data.provider, prompt_data.model):
+            return None
+        return provider, model
+
+    async def _run_agent(
+        self,
+        provider: str,
+        model: str,
+        api_key: str,
+        api_base_url: Optional[str],
+        instructions: str,
+        model_args: Dict[str, Any],
+        loaded_tools: Optional[List[Callable[..., Any]]],
+        prompt_to_send: str,
+        conversation_history: Optional[List[MessageSchema]],
+        last_user_message: Optional[str]
+    ) -> ChatCompletionResponse:
+        """
+        Run the chat agent on one model and build the completion response.
+
+        Args:
+            provider: Provider of the model
+            model: Model name
+            api_key: API key for the provider
+            api_base_url: Provider base URL, if any
+            instructions: System prompt
+            model_args: Model arguments passed to the agent
+            loaded_tools: Callable tools passed to the agent
+            prompt_to_send: Formatted user prompt
+            conversation_history: Conversation history (excluding last user message)
+            last_user_message: Last user message, if any
+
+        Returns:
+            ChatCompletionResponse recording the model that answered
+        """
+        # Create ChatAgent instance
+        model_identifier = f"{provider}/{model}"
+        with get_tracer().start_as_current_span(
+            "chat_agent.run",
+            attributes={"gen_ai.system": provider, "gen_ai.request.model": model}
+        ):
             chat_agent = await ChatAgent.create(
                 model_id=model_identifier,
                 api_key=api_key,
                 api_base=api_base_url,
-                instructions=prompt_data.prompt,
+                instructions=instructions,
                 model_args=model_args,
                 tools=loaded_tools,
             )
-            
-            # Run the agent with the formatted prompt
-            trace: AgentTrace = await chat_agent.run(prompt_to_send)
 
-            # Extract content from trace
-            content = ""
-            
-            # Try to get content from final_output first
-            if trace.final_output:
-                if isinstance(trace.final_output, str):
-                    content = trace.final_output
-                elif isinstance(trace.final_output, dict):
-                    content = str(trace.final_output.get("content", trace.final_output))
-                else:
-                    content = str(trace.final_output)
-            
-            # If final_output is empty, try to extract from messages in trace
-            if not content:
-                try:
-                    messages = trace.spans_to_messages()
-
-                    # Get the last assistant message with actual content (not empty or tool calls)
-                    for msg in reversed(messages):
-                        if msg.role == "assistant":
-                            msg_content = msg.content if isinstance(msg.content, str) else str(msg.content) if msg.content else ""
-                            # Skip empty content and content that looks like tool call JSON
-                            if msg_content and not msg_content.startswith('[{"tool.'):
-                                content = msg_content
-                                break
-                except Exception as e:
-                    self.logger.error(f"Failed to extract content from trace messages: {e}")
-
-            # Extract token usage from trace
-            token_usage: Optional[TokenUsage] = None
-            if trace.tokens:
-                token_usage = TokenUsage(
-                    input_tokens=trace.tokens.input_tokens,
-                    output_tokens=trace.tokens.output_tokens,
-                    total_tokens=trace.tokens.total_tokens
-                )
-            
-            # Extract cost information from trace
-            cost_info: Optional[CostInfo] = None
-            if trace.cost:
-                cost_info = CostInfo(
-                    input_cost=trace.cost.input_cost,
-                    output_cost=trace.cost.output_cost,
-                    total_cost=trace.cost.total_cost
-                )
-            
-            # Extract duration from trace
-            duration_ms = 0.0
+            # Run the agent with the formatted prompt; its AgentTrace spans are linked to this span
+            trace: "AgentTrace" = await chat_agent.run(prompt_to_send)
+            link_agent_trace(trace)
+
+        # Extract content from trace
+        content = ""
+        
+        # Try to get content from final_output first
+        if trace.final_output:
+            if isinstance(trace.final_output, str):
+                content = trace.final_output
+            elif isinstance(trace.final_output, dict):
+                content = str(trace.final_output.get("content", trace.final_output))
+            else:
+                content = str(trace.final_output)
+        
+        # If final_output is empty, try to extract from messages in trace
+        if not content:
             try:
-                duration_ms = trace.duration.total_seconds() * 1000
-            except (ValueError, AttributeError) as e:
-                self.logger.warning(f"Could not extract duration from trace: {e}")
-            
-            finish_reason = "stop"
-            
-            # Extract tool calls and tool messages from trace
-            tool_calls_list = self._extract_tool_messages_from_trace(trace)
-            
-            # Build the full conversation history including the response
-            all_messages: Optional[List[MessageSchema]] = None
-            if conversation_history:
-                all_messages = list(conversation_history)
-                if last_user_message:
-                    all_messages.append(UserMessageSchema(content=last_user_message))
-                # Ensure content is a string for AIMessageSchema
-                final_content = content if isinstance(content, str) else str(content)
-                all_messages.append(AIMessageSchema(content=final_content))
-            
-            return ChatCompletionResponse(
-                content=content,
-                finish_reason=finish_reason,
-                usage=token_usage,
-                cost=cost_info,
-                duration_ms=duration_ms,
-                tool_calls=tool_calls_list,
-                messages=all_messages
+                messages = trace.spans_to_messages()
+
+                # Get the last assistant message with actual content (not empty or tool calls)
+                for msg in reversed(messages):
+                    if msg.role == "assistant":
+                        msg_content = msg.content if isinstance(msg.content, str) else str(msg.content) if msg.content else ""
+                        # Skip empty content and content that looks like tool call JSON
+                        if msg_content and not msg_content.startswith('[{"tool.'):
+                            content = msg_content
+                            break
+            except Exception as e:
+                self.logger.error(f"Failed to extract content from trace messages: {e}")
+
+        # Extract token usage from trace
+        token_usage: Optional[TokenUsage] = None
+        if trace.tokens:
+            token_usage = TokenUsage(
+                input_tokens=trace.tokens.input_tokens,
+                output_tokens=trace.tokens.output_tokens,
+                total_tokens=trace.tokens.total_tokens
             )
-                
-        except Exception as e:
-            self.logger.error(f"Error in completion from prompt meta: {e}")
-            raise ServiceUnavailableException(
-                message=f"Completion error: {str(e)}",
-                context={"provider": prompt_data.provider, "model": prompt_data.model}
+        
+        # Extract cost information from trace
+        cost_info: Optional[CostInfo] = None
+        if trace.cost:
+            cost_info = CostInfo(
+                input_cost=trace.cost.input_cost,
+                output_cost=trace.cost.output_cost,
+                total_cost=trace.cost.total_cost
             )
+            record_llm_cost(provider, model, cost_info.total_cost)
+        
+        # Extract duration from trace
+        duration_ms = 0.0
+        try:
+            duration_ms = trace.duration.total_seconds() * 1000
+        except (ValueError, AttributeError) as e:
+            self.logger.warning(f"Could not extract duration from trace: {e}")
+        
+        finish_reason = "stop"
+        
+        # Extract tool calls and tool messages from trace
+        tool_calls_list = self._extract_tool_messages_from_trace(trace)
+        
+        # Build the full conversation history including the response
+        all_messages: Optional[List[MessageSchema]] = None
+        if conversation_history:
+            all_messages = list(conversation_history)
+            if last_user_message:
+                all_messages.append(UserMessageSchema(content=last_user_message))
+            # Ensure content is a string for AIMessageSchema
+            final_content = content if isinstance(content, str) else str(content)
+            all_messages.append(AIMessageSchema(content=final_content))
+        
+        return ChatCompletionResponse(
+            content=content,
+            finish_reason=finish_reason,
+            usage=token_usage,
+            cost=cost_info,
+            duration_ms=duration_ms,
+            tool_calls=tool_calls_list,
+            messages=all_messages,
+            model=model_identifier
+        )
     
     async def execute_completion(
         self,
@@ -414,7 +645,8 @@ class ChatCompletionService:
         user_id: str,
         prompt_id: str,
         last_user_message: Optional[str] = None,
-        conversation_history: Optional[List[MessageSchema]] = None
+        conversation_history: Optional[List[MessageSchema]] = None,
+        cache_mode: Optional[CompletionCacheMode] = None
     ) -> ChatCompletionResponse:
         """
         Execute completion from a saved prompt by prompt_id.
@@ -424,6 +656,7 @@ class ChatCompletionService:
             prompt_id: Prompt ID in format "repo_name:file_path"
             last_user_message: Optional last user message (if None, uses prompt as single-turn)
             conversation_history: Optional conversation history
+            cache_mode: Completion cache mode (None disables the cache)
             
         Returns:
             ChatCompletionResponse with content and metadata
@@ -472,7 +705,8 @@ class ChatCompletionService:
             user_id=user_id,
             conversation_history=conversation_history,
             last_user_message=last_user_message,
-            tool_execution_service=self.tool_execution_service
+            tool_execution_service=self.tool_execution_service,
+            cache_mode=cache_mode
         )
 
     def validate_provider_and_model(self, provider: str, model: str) -> None:
@@ -0,0 +1,260 @@
+"""
+Content-addressed completion cache.
+
+Stores chat completion responses on disk keyed by a hash of the normalized
+request (prompt hash, provider/model, model args, message history and tool
+set). Used to make eval and simulation re-runs deterministic and cheap:
+- READ_WRITE: serve hits, call the provider and store on misses
+- RECORD: always call the provider and (over)write the entry
+- REPLAY: serve hits only; a miss is an error (for offline CI runs)
+
+The store is bounded by total size and evicts least recently used entries.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from lib.metrics import record_cache_lookup
+from services.llm.models import ChatCompletionResponse
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key layout changes so old entries are never matched
+CACHE_KEY_VERSION = 1
+
+
+class CompletionCacheMode(str, Enum):
+    """How completions interact with the cache."""
+    OFF = "off"
+    READ_WRITE = "read_write"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class CompletionCacheStats(BaseModel):
+    """Cache hits and misses for the completions of a single test."""
+    mode: CompletionCacheMode = Field(description="Cache mode used for the completions")
+    hits: int = Field(default=0, description="Completions served from the cache")
+    misses: int = Field(default=0, description="Completions that called the provider")
+
+    def record(self, cache_status: Optional[str]) -> None:
+        """Count a completion by its cache_status ("hit" or "miss")."""
+        if cache_status == "hit":
+            self.hits += 1
+        elif cache_status == "miss":
+            self.misses += 1
+
+
+class CompletionCacheMissError(Exception):
+    """Raised in REPLAY mode when no recorded completion exists for a request."""
+
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__(f"No recorded completion for request {key[:12]} (replay mode)")
+
+
+def resolve_cache_mode(mode: Optional[CompletionCacheMode] = None) -> CompletionCacheMode:
+    """
+    Return the effective cache mode, falling back to the configured default.
+
+    Args:
+        mode: Explicit mode requested by the caller, or None for the default
+
+    Returns:
+        CompletionCacheMode: Mode to use for the completion
+    """
+    if mode is not None:
+        return CompletionCacheMode(mode)
+    try:
+        return CompletionCacheMode(settings.completion_cache_mode.lower())
+    except ValueError:
+        logger.warning(f"Unknown completion cache mode '{settings.completion_cache_mode}'; caching disabled")
+        return CompletionCacheMode.OFF
+
+
+def hash_text(text: str) -> str:
+    """Return the sha256 hex digest of a string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """
+    On-disk, size-bounded LRU cache of chat completion responses.
+
+    Entries live in `<root>/<key[:2]>/<key>.json`. Recency is tracked with the
+    file mtime, which is bumped on every hit, so the LRU order survives restarts.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Directory where entries are stored
+            max_bytes: Maximum total size of stored entries
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        # key -> (size_bytes, last_used); loaded lazily from disk
+        self._index: Optional[Dict[str, Tuple[int, float]]] = None
+        self._total_bytes = 0
+
+    @staticmethod
+    def build_key(request: Dict[str, Any]) -> str:
+        """
+        Build the content address for a normalized completion request.
+
+        Args:
+            request: JSON-serializable description of everything that influences the output
+
+        Returns:
+            str: Hex digest identifying the request
+        """
+        canonical = json.dumps(
+            {"v": CACHE_KEY_VERSION, **request},
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str
+        )
+        return hash_text(canonical)
+
+    def _path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> Dict[str, Tuple[int, float]]:
+        """Scan the store once to learn entry sizes and recency."""
+        if self._index is not None:
+            return self._index
+
+        index: Dict[str, Tuple[int, float]] = {}
+        total = 0
+        if self.root.exists():
+            for entry_path in self.root.glob("*/*.json"):
+                try:
+                    stat = entry_path.stat()
+                except OSError:
+                    continue
+                index[entry_path.stem] = (stat.st_size, stat.st_mtime)
+                total += stat.st_size
+        self._index = index
+        self._total_bytes = total
+        return index
+
+    def get(self, key: str) -> Optional[ChatCompletionResponse]:
+        """
+        Return the cached response for key, or None on a miss.
+
+        Corrupt entries are removed and treated as misses.
+        """
+        entry_path = self._path_for(key)
+        try:
+            data = json.loads(entry_path.read_text(encoding="utf-8"))
+            response = ChatCompletionResponse(**data["response"])
+        except FileNotFoundError:
+            record_cache_lookup("completion", hit=False)
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable completion cache entry {key[:12]}: {e}")
+            self._remove(key)
+            record_cache_lookup("completion", hit=False)
+            return None
+        record_cache_lookup("completion", hit=True)
+
+        now = time.time()
+        try:
+            os.utime(entry_path, (now, now))
+        except OSError:
+            pass
+        index = self._load_index()
+        if key in index:
+            index[key] = (index[key][0], now)
+        return response
+
+    def put(self, key: str, response: ChatCompletionResponse, request: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Store a response under key, evicting least recently used entries if needed.
+
+        Args:
+            key: Content address from build_key
+            response: Completion response to store
+            request: Optional normalized request, stored alongside for debugging
+        """
+        payload = json.dumps({
+            "key": key,
+            "created_at": time.time(),
+            "request": request,
+            "response": response.model_dump(mode="json", exclude={"cache_status"}),
+        }, ensure_ascii=False, default=str)
+
+        entry_path = self._path_for(key)
+        index = self._load_index()
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix=f".{key[:12]}.", suffix=".tmp", dir=entry_path.parent)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_name, entry_path)
+        except OSError as e:
+            logger.warning(f"Failed to write completion cache entry {key[:12]}: {e}")
+            return
+
+        size = len(payload.encode("utf-8"))
+        previous = index.get(key)
+        if previous:
+            self._total_bytes -= previous[0]
+        index[key] = (size, time.time())
+        self._total_bytes += size
+        self._evict_if_needed()
+
+    def _evict_if_needed(self) -> None:
+        """Remove least recently used entries until the store fits in max_bytes."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        index = self._load_index()
+        # Evict down to 90% so a burst of writes does not evict on every put
+        target = int(self.max_bytes * 0.9)
+        for key, _ in sorted(index.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= target:
+                break
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        index = self._load_index()
+        entry = index.pop(key, None)
+        if entry:
+            self._total_bytes -= entry[0]
+        try:
+            self._path_for(key).unlink()
+        except OSError:
+            pass
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of stored entries in bytes."""
+        self._load_index()
+        return self._total_bytes
+
+
+# Process-wide cache instance
+_completion_cache: Optional[CompletionCache] = None
+
+
+def get_completion_cache() -> CompletionCache:
+    """Return the process-wide completion cache configured from settings."""
+    global _completion_cache
+    if _completion_cache is None:
+        _completion_cache = CompletionCache(
+            root=Path(settings.completion_cache_path),
+            max_bytes=settings.completion_cache_max_mb * 1024 * 1024
+        )
+    return _completion_cache
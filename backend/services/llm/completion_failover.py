@@ -0,0 +1,198 @@
+"""
+Failover and hedged requests for prompt completions.
+
+A prompt with a failover_model is completed resiliently:
+- the primary model gets completion_failover_timeout_seconds; an error or
+  a timeout sends the completion to the failover model,
+- with completion_hedging_enabled, the failover model is also started when
+  the primary has not answered within its recent p95 latency, and the first
+  successful answer wins; the other request is cancelled.
+Latencies are tracked per model in the process, so the hedge delay follows
+the provider's current behaviour. Time the primary spends queued in the
+provider rate limiter counts neither towards its timeout, its hedge delay
+nor its latency, so a busy limiter alone does not trigger failover.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from lib.rate_limit import QueueWaitClock, measure_queue_wait
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Latencies needed before the observed quantile replaces the default hedge delay
+MIN_LATENCY_SAMPLES = 20
+
+
+class FailoverReason(str, Enum):
+    """Why the failover model answered instead of the primary model"""
+    ERROR = "error"
+    TIMEOUT = "timeout"
+    HEDGE = "hedge"
+
+
+class CompletionLatencyTracker:
+    """Recent successful completion latencies per model. Safe to share between threads."""
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Latencies kept per model
+        """
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, model: str, seconds: float) -> None:
+        """
+        Record the latency of a successful completion.
+
+        Args:
+            model: Model identifier (provider/model)
+            seconds: Completion latency
+        """
+        with self._lock:
+            latencies = self._latencies.get(model)
+            if latencies is None:
+                latencies = self._latencies[model] = deque(maxlen=self.window)
+            latencies.append(seconds)
+
+    def quantile(self, model: str, q: float) -> Optional[float]:
+        """
+        Return a latency quantile of a model.
+
+        Args:
+            model: Model identifier (provider/model)
+            q: Quantile between 0 and 1
+
+        Returns:
+            The quantile in seconds, or None with fewer than MIN_LATENCY_SAMPLES latencies
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get(model, ()))
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+
+def hedge_delay_seconds(tracker: CompletionLatencyTracker, model: str) -> float:
+    """
+    Return how long to wait for the primary model before hedging.
+
+    Args:
+        tracker: Latencies of recent completions
+        model: Primary model identifier (provider/model)
+
+    Returns:
+        The primary's p95 latency (completion_hedge_quantile), or completion_hedge_default_delay_seconds
+        until enough latencies are known; never below completion_hedge_min_delay_seconds
+    """
+    observed = tracker.quantile(model, settings.completion_hedge_quantile)
+    delay = observed if observed is not None else settings.completion_hedge_default_delay_seconds
+    return max(settings.completion_hedge_min_delay_seconds, delay)
+
+
+async def complete_with_failover(
+    primary: Callable[[], Awaitable[T]],
+    failover: Callable[[], Awaitable[T]],
+    primary_model: str,
+    tracker: CompletionLatencyTracker,
+    timeout_seconds: Optional[float] = None,
+    hedge_after_seconds: Optional[float] = None
+) -> Tuple[T, Optional[FailoverReason]]:
+    """
+    Run a completion on the primary model, falling back to the failover model.
+
+    Args:
+        primary: Sends the completion to the primary model
+        failover: Sends the completion to the failover model
+        primary_model: Primary model identifier, for latency tracking
+        tracker: Records the primary's latencies
+        timeout_seconds: Time the primary gets before failing over, not counting rate-limiter
+                         queueing (None waits indefinitely)
+        hedge_after_seconds: Start the failover request alongside the primary after it was served this long
+                             (None only fails over on error or timeout)
+
+    Returns:
+        The first successful response, and why the failover model produced it (None if the primary did)
+
+    Raises:
+        Exception: The failover model's error when both models failed
+    """
+    started = time.monotonic()
+    queue_wait: QueueWaitClock
+
+    def service_seconds() -> float:
+        # Time since the primary started, less the time it was queued in the rate limiter
+        return time.monotonic() - started - queue_wait.seconds()
+
+    async def wait_for_service(task: "asyncio.Future[T]", seconds: Optional[float]) -> bool:
+        # Wait until the task is done or the primary was served for seconds; returns whether it is done
+        while not task.done():
+            remaining = None if seconds is None else seconds - service_seconds()
+            if remaining is not None and remaining <= 0:
+                return False
+            await asyncio.wait({task}, timeout=remaining)
+        return True
+
+    async def timed_primary() -> T:
+        call = asyncio.ensure_future(primary())
+        try:
+            if not await wait_for_service(call, timeout_seconds or None):
+                raise asyncio.TimeoutError()
+        finally:
+            if not call.done():
+                call.cancel()
+        response = call.result()
+        tracker.observe(primary_model, service_seconds())
+        return response
+
+    # The primary's provider calls run in the clocked context
+    with measure_queue_wait() as queue_wait:
+        primary_task = asyncio.create_task(timed_primary())
+    failover_task: Optional[asyncio.Task] = None
+    try:
+        await wait_for_service(primary_task, hedge_after_seconds)
+        if primary_task.done():
+            error = primary_task.exception()
+            if error is None:
+                return primary_task.result(), None
+            reason = FailoverReason.TIMEOUT if isinstance(error, asyncio.TimeoutError) else FailoverReason.ERROR
+            logger.warning(f"Primary model {primary_model} failed ({reason.value}: {error!r}); using failover model")
+            return await failover(), reason
+
+        logger.info(f"Primary model {primary_model} slower than {hedge_after_seconds:.2f}s; hedging with failover model")
+        failover_task = asyncio.create_task(failover())
+        pending = {primary_task, failover_task}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in (primary_task, failover_task):
+                if task in done and task.exception() is None:
+                    return task.result(), (None if task is primary_task else FailoverReason.HEDGE)
+        # Both failed; the failover model's error is the last word
+        raise failover_task.exception()
+    finally:
+        for task in (primary_task, failover_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+# Process-wide tracker shared by all completion services
+_completion_latency_tracker: Optional[CompletionLatencyTracker] = None
+
+
+def get_completion_latency_tracker() -> CompletionLatencyTracker:
+    """Return the process-wide completion latency tracker."""
+    global _completion_latency_tracker
+    if _completion_latency_tracker is None:
+        _completion_latency_tracker = CompletionLatencyTracker()
+    return _completion_latency_tracker
@@ -0,0 +1,186 @@
+"""
+Model list cache for LLM providers.
+
+Provider model lists change rarely, but listing them requires a live call to
+the provider. This module caches the lists per (provider, api_base, api key
+fingerprint) with:
+- a fresh TTL during which cached lists are returned directly,
+- a stale window during which the cached list is returned immediately while a
+  background refresh runs (stale-while-revalidate),
+- single-flight coalescing so concurrent identical fetches share one call.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from lib.metrics import record_cache_lookup
+from services.llm.models import ModelInfo
+
+logger = logging.getLogger(__name__)
+
+ModelListKey = Tuple[str, str, str]
+ModelFetcher = Callable[[], Awaitable[List[ModelInfo]]]
+
+
+def api_key_fingerprint(api_key: str) -> str:
+    """Return a short, non-reversible fingerprint of an API key."""
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+class ModelListCache:
+    """
+    TTL cache of provider model lists with stale-while-revalidate semantics.
+
+    Failed fetches are never cached; if a refresh fails while a stale list is
+    available, the stale list keeps being served until it ages out.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 15 * 60,
+        stale_ttl_seconds: float = 24 * 60 * 60,
+        max_entries: int = 512
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Seconds a model list is considered fresh
+            stale_ttl_seconds: Seconds after fetch a list may still be served while refreshing
+            max_entries: Maximum number of cached model lists
+        """
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[ModelListKey, Tuple[float, List[ModelInfo]]] = {}
+        self._inflight: Dict[ModelListKey, "asyncio.Task[List[ModelInfo]]"] = {}
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def make_key(provider_id: str, api_key: str, api_base: str = "") -> ModelListKey:
+        """Build the cache key for a provider/credential/base URL combination."""
+        return (provider_id, (api_base or "").rstrip("/"), api_key_fingerprint(api_key))
+
+    async def get(self, key: ModelListKey, fetch: ModelFetcher) -> List[ModelInfo]:
+        """
+        Return the model list for key, fetching it if needed.
+
+        Args:
+            key: Cache key from make_key
+            fetch: Coroutine function performing the live provider call
+
+        Returns:
+            List[ModelInfo]: Cached or freshly fetched models
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            fetched_at, models = entry
+            age = now - fetched_at
+            if age < self.ttl_seconds:
+                record_cache_lookup("model_list", hit=True)
+                return models
+            if age < self.stale_ttl_seconds:
+                self._refresh_in_background(key, fetch)
+                record_cache_lookup("model_list", hit=True)
+                return models
+
+        record_cache_lookup("model_list", hit=False)
+        return await self._fetch_once(key, fetch)
+
+    async def _fetch_once(self, key: ModelListKey, fetch: ModelFetcher) -> List[ModelInfo]:
+        """
+        Run fetch for key, sharing the result with concurrent callers.
+
+        The fetch runs as its own task, so a caller that is cancelled (e.g. its
+        client disconnected) stops waiting without cancelling it for the others.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_store(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._fetch_done(key, done))
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, key: ModelListKey, fetch: ModelFetcher) -> List[ModelInfo]:
+        """Fetch a model list and cache it."""
+        models = await fetch()
+        self._store(key, models)
+        return models
+
+    def _fetch_done(self, key: ModelListKey, task: "asyncio.Task[List[ModelInfo]]") -> None:
+        """Forget a finished fetch."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark retrieved so a failure nobody waited for does not log a warning
+            task.exception()
+
+    def _refresh_in_background(self, key: ModelListKey, fetch: ModelFetcher) -> None:
+        """Schedule a refresh of a stale entry unless one is already running."""
+        if key in self._inflight:
+            return
+
+        async def _refresh() -> None:
+            try:
+                await self._fetch_once(key, fetch)
+            except Exception as e:
+                logger.warning(f"Background refresh of models for provider {key[0]} failed: {e}")
+
+        task = asyncio.create_task(_refresh())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _store(self, key: ModelListKey, models: List[ModelInfo]) -> None:
+        """Store a model list, evicting the oldest entry when full."""
+        self._entries[key] = (time.monotonic(), models)
+        if len(self._entries) > self.max_entries:
+            oldest_key = min(self._entries, key=lambda k: self._entries[k][0])
+            del self._entries[oldest_key]
+
+    def invalidate(self, key: Optional[ModelListKey] = None) -> None:
+        """Drop one cached model list, or all of them if key is omitted."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+# Process-wide cache shared by all ModelProviderService instances
+_model_list_cache: Optional[ModelListCache] = None
+
+
+def get_model_list_cache() -> ModelListCache:
+    """Return the process-wide model list cache."""
+    global _model_list_cache
+    if _model_list_cache is None:
+        _model_list_cache = ModelListCache()
+    return _model_list_cache
+
+
+def get_default_llm_provider_credentials() -> List[Tuple[str, str, str]]:
+    """
+    Return distinct (provider, api_key, api_base) tuples from DEFAULT_LLM_CONFIGS.
+
+    Entries without a provider or API key are skipped.
+    """
+    try:
+        configs = json.loads(os.environ.get("DEFAULT_LLM_CONFIGS", "[]")) or []
+    except json.JSONDecodeError:
+        logger.warning("DEFAULT_LLM_CONFIGS is not valid JSON; skipping model list warm-up")
+        return []
+
+    credentials: List[Tuple[str, str, str]] = []
+    for config in configs:
+        provider = config.get("provider")
+        api_key = config.get("api_key")
+        if not provider or not api_key:
+            continue
+        credential = (provider, api_key, config.get("api_base_url") or "")
+        if credential not in credentials:
+            credentials.append(credential)
+    return credentials
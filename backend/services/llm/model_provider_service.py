@@ -2,23 +2,39 @@
 Provider service for LLM providers and models.
 Handles provider information, configured providers, and model fetching.
 """
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Sequence
+import asyncio
 import logging
-from any_llm.constants import LLMProvider
-from lib.any_llm.any_llm_adapter import alist_models
 
 from services.config.config_service import ConfigService
 from services.llm.models import ProviderInfo, ModelInfo, ProvidersResponse
+from services.llm.model_list_cache import (
+    ModelListCache,
+    get_model_list_cache,
+    get_default_llm_provider_credentials,
+)
 from utils.constants import PROVIDER_NAMES_MAP
 
 logger = logging.getLogger(__name__)
 
 
+async def alist_models(provider: str, api_key: str, api_base: str = "") -> Sequence[Any]:
+    """
+    List a provider's models through the any_llm adapter.
+
+    any_llm imports every provider SDK, so it is loaded on first use rather
+    than when this module is imported.
+    """
+    from lib.any_llm.any_llm_adapter import alist_models as adapter_alist_models
+    return await adapter_alist_models(provider, api_key, api_base=api_base)
+
+
 class ModelProviderService:
     """Service for handling LLM provider operations."""
     
-    def __init__(self, config_service: ConfigService):
+    def __init__(self, config_service: ConfigService, model_list_cache: Optional[ModelListCache] = None):
         self.config_service = config_service
+        self.model_list_cache = model_list_cache or get_model_list_cache()
     
     def get_configured_providers(self, user_id: str) -> ProvidersResponse:
         """
@@ -82,6 +98,7 @@ class ModelProviderService:
             existing_ids = set()
             
             # Add providers from any_llm
+            from any_llm.constants import LLMProvider
             for provider_enum in LLMProvider:
                 provider_info = PROVIDER_NAMES_MAP.get(provider_enum)
                 provider_default_name = provider_enum.replace("_", " ").title()
@@ -130,26 +147,76 @@ class ModelProviderService:
             logger.error(f"Error getting available providers: {e}")
             return []
 
-    async def fetch_models_by_provider(self, provider_id: str, api_key: str, api_base: str = "") -> List[ModelInfo]:
+    async def fetch_models_by_provider(
+        self,
+        provider_id: str,
+        api_key: str,
+        api_base: str = "",
+        force_refresh: bool = False
+    ) -> List[ModelInfo]:
         """
         Fetch available models for a specific provider using API key.
         Connects to the actual provider APIs to get real-time model information.
+        Results are served from the process-wide model list cache; stale lists are
+        returned immediately while a background refresh runs.
         """
+        key = ModelListCache.make_key(provider_id, api_key, api_base)
+        if force_refresh:
+            self.model_list_cache.invalidate(key)
+        
         try:
-            models = []
-            
-            # Handle all providers with any-llm unified interface
-            # For custom providers (zai, litellm), they're now part of any-llm ecosystem
-            raw_models = await alist_models(provider_id, api_key, api_base=api_base or "")
-            models = [
-                ModelInfo(id=model.id, name=model.id)
-                for model in raw_models
-                if model.id and model.object == 'model'
-            ]
-            
-            logger.info(f"Returning {len(models)} models for provider {provider_id}")
-            return models
-            
+            return await self.model_list_cache.get(
+                key,
+                lambda: self._list_models(provider_id, api_key, api_base)
+            )
         except Exception as e:
             logger.error(f"Error fetching models for provider {provider_id}: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    @staticmethod
+    async def _list_models(provider_id: str, api_key: str, api_base: str = "") -> List[ModelInfo]:
+        """Call the live provider to list models; raises on failure."""
+        # Handle all providers with any-llm unified interface
+        # For custom providers (zai, litellm), they're now part of any-llm ecosystem
+        raw_models = await alist_models(provider_id, api_key, api_base=api_base or "")
+        models = [
+            ModelInfo(id=model.id, name=model.id)
+            for model in raw_models
+            if model.id and model.object == 'model'
+        ]
+        
+        logger.info(f"Returning {len(models)} models for provider {provider_id}")
+        return models
+
+
+async def warm_up_model_lists(model_list_cache: Optional[ModelListCache] = None) -> int:
+    """
+    Prefetch model lists for the providers configured in DEFAULT_LLM_CONFIGS.
+    
+    Intended to run as a background task at startup so the first settings page
+    load is served from the cache.
+    
+    Args:
+        model_list_cache: Cache to fill; defaults to the process-wide cache
+    
+    Returns:
+        int: Number of provider credentials whose model list was cached
+    """
+    cache = model_list_cache or get_model_list_cache()
+    credentials = get_default_llm_provider_credentials()
+    
+    async def warm(provider_id: str, api_key: str, api_base: str) -> bool:
+        try:
+            await cache.get(
+                ModelListCache.make_key(provider_id, api_key, api_base),
+                lambda: ModelProviderService._list_models(provider_id, api_key, api_base)
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Model list warm-up failed for provider {provider_id}: {e}")
+            return False
+    
+    results = await asyncio.gather(*(warm(*credential) for credential in credentials))
+    warmed = sum(results)
+    logger.info(f"Warmed model lists for {warmed}/{len(credentials)} default providers")
+    return warmed
@@ -33,6 +33,9 @@ class ChatCompletionResponse(BaseModel):
     duration_ms: Optional[float] = Field(None, description="Inference duration in milliseconds")
     tool_calls: Optional[List[MessageSchema]] = Field(None, description="Tool calls and tool responses from the agent trace")
     messages: Optional[List[MessageSchema]] = Field(None, description="Full conversation history including the response")
+    cache_status: Optional[Literal["hit", "miss"]] = Field(None, description="Completion cache outcome when the cache is enabled")
+    model: Optional[str] = Field(None, description="Model that produced the response (provider/model)")
+    failover_reason: Optional[Literal["error", "timeout", "hedge"]] = Field(None, description="Why the failover model answered instead of the primary model")
 
 
 # Schemas for LLM Providers endpoint
@@ -0,0 +1,96 @@
+"""
+Cache of artifacts parsed at a commit.
+
+A file at a given commit never changes, so an artifact read from the object
+database is parsed once per (commit hash, file path) and served from memory
+afterwards; history views and version comparisons re-read the same commits
+over and over. Entries never go stale and are only evicted, least recently
+used first, to bound memory.
+"""
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from lib.metrics import record_cache_lookup
+from settings import settings
+
+ArtifactRefKey = Tuple[str, str]
+
+# Marks a file known to be missing at a commit
+_MISSING = object()
+
+
+class ArtifactRefCache:
+    """
+    LRU cache of parsed artifacts keyed by (commit hash, file path).
+
+    Safe to share between threads. Callers get their own copy of a cached
+    artifact, so modifying it does not affect the cache.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached artifacts
+        """
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[ArtifactRefKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, commit_hash: str, file_path: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Look up an artifact.
+
+        Args:
+            commit_hash: Full commit hash
+            file_path: File path relative to the repository root
+
+        Returns:
+            (found, artifact): found is False on a cache miss; artifact is None
+            for a file known to be missing at the commit
+        """
+        key = (commit_hash, file_path)
+        with self._lock:
+            if key not in self._entries:
+                record_cache_lookup("artifact_ref", hit=False)
+                return False, None
+            self._entries.move_to_end(key)
+            value = self._entries[key]
+        record_cache_lookup("artifact_ref", hit=True)
+        if value is _MISSING:
+            return True, None
+        return True, copy.deepcopy(value)
+
+    def store(self, commit_hash: str, file_path: str, artifact: Optional[Dict[str, Any]]) -> None:
+        """
+        Store the artifact parsed from a file at a commit.
+
+        Args:
+            commit_hash: Full commit hash
+            file_path: File path relative to the repository root
+            artifact: Parsed artifact, or None if the commit has no such file
+        """
+        value = _MISSING if artifact is None else copy.deepcopy(artifact)
+        with self._lock:
+            self._entries[(commit_hash, file_path)] = value
+            self._entries.move_to_end((commit_hash, file_path))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache shared by all LocalRepoService instances
+_artifact_ref_cache: Optional[ArtifactRefCache] = None
+
+
+def get_artifact_ref_cache() -> ArtifactRefCache:
+    """Return the process-wide artifact cache configured from settings."""
+    global _artifact_ref_cache
+    if _artifact_ref_cache is None:
+        _artifact_ref_cache = ArtifactRefCache(max_entries=settings.artifact_ref_cache_max_entries)
+    return _artifact_ref_cache
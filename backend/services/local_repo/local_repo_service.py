@@ -6,6 +6,7 @@ including automatic branch creation, commits, and pushes when saving artifacts.
 Also handles repository cloning and ensuring repositories are available.
 """
 
+import asyncio
 import logging
 import re
 import uuid
@@ -14,8 +15,10 @@ from pathlib import Path
 from typing import List, Optional, TYPE_CHECKING, Tuple
 
 from sqlmodel import Session
+from lib.tracing import traced
 from database.daos.user.user_repos_dao import UserReposDAO
 from services.local_repo.git_service import GitService
+from services.local_repo.artifact_ref_cache import get_artifact_ref_cache
 from middlewares.rest.exceptions import AppException, NotFoundException
 from schemas.artifact_type_enum import ArtifactType
 from services.config.config_service import ConfigService
@@ -157,6 +160,7 @@ class LocalRepoService:
         
         return sanitized
 
+    @traced("local_repo.save_artifact")
     async def save_artifact(
         self,
         user_id: str,
@@ -239,7 +243,8 @@ class LocalRepoService:
         # Save the file using FileOperationsService
         save_result = self.file_ops_service.save_yaml_file(
             file_path=full_file_path,
-            data=artifact_data
+            data=artifact_data,
+            repo_root=repo_path
         )
         
         if not save_result.success:
@@ -247,8 +252,8 @@ class LocalRepoService:
                 message=f"Failed to save {artifact_type.value} to {full_file_path}"
             )
         
-        # Calculate relative path from repo root for git operations
-        relative_path = str(full_file_path.relative_to(repo_path))
+        # Relative path from repo root for git operations
+        relative_path = save_result.relative_path
         
         action = "Updated" if is_update else "Created"
         logger.info(f"{action} {artifact_type.value} '{artifact_name}' at {relative_path} in {repo_name}")
@@ -273,12 +278,14 @@ class LocalRepoService:
             pr_info=pr_info
         )
 
+    @traced("local_repo.load_artifact")
     def load_artifact(
         self,
         user_id: str,
         repo_name: str,
         file_path: str,
-        artifact_type: ArtifactType
+        artifact_type: ArtifactType,
+        ref: Optional[str] = None
     ) -> Optional[dict]:
         """
         Load an artifact file from the repository.
@@ -288,6 +295,8 @@ class LocalRepoService:
             repo_name: Repository name
             file_path: Relative path to the artifact file from repo root
             artifact_type: Type of artifact (PROMPT, TOOL, EVAL, etc.)
+            ref: Optional branch, tag or commit SHA to read the artifact at;
+                 the working tree is read if None
 
         Returns:
             Optional[dict]: Artifact data as dictionary, or None if file doesn't exist
@@ -304,6 +313,9 @@ class LocalRepoService:
                 identifier=repo_name
             )
 
+        if ref:
+            return self._load_artifact_at_ref(repo_path, file_path, ref)
+
         # Construct full file path
         full_file_path = repo_path / file_path
 
@@ -311,8 +323,85 @@ class LocalRepoService:
         artifact_data = self.file_ops_service.load_yaml_file(full_file_path)
 
         return artifact_data
+
+    @traced("local_repo.resolve_artifact_revision")
+    def resolve_artifact_revision(
+        self,
+        user_id: str,
+        repo_name: str,
+        file_path: str,
+        ref: str
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Resolve which version of an artifact file a git ref holds.
+
+        Args:
+            user_id: User ID
+            repo_name: Repository name
+            file_path: Relative path to the artifact file from repo root
+            ref: Branch, tag or commit SHA
+
+        Returns:
+            Tuple of (commit hash, blob hash of the file or None if the file doesn't exist at ref)
+
+        Raises:
+            NotFoundException: If the repository doesn't exist or ref does not name a commit
+        """
+        repo_path = self.get_repo_path(user_id, repo_name)
+        if not repo_path.exists():
+            raise NotFoundException(
+                resource="Repository",
+                identifier=repo_name
+            )
+
+        git_service = GitService(repo_path)
+        commit_hash = git_service.resolve_commit(ref)
+        if not commit_hash:
+            raise NotFoundException(
+                resource="Git ref",
+                identifier=ref
+            )
+        return commit_hash, git_service.get_blob_hash_at_commit(commit_hash, file_path)
+
+    def _load_artifact_at_ref(self, repo_path: Path, file_path: str, ref: str) -> Optional[dict]:
+        """
+        Load an artifact as it exists at a git ref, without touching the working tree.
+
+        The ref is resolved to a commit and the file is read from the object
+        database; parsed artifacts are cached per (commit, path).
+
+        Args:
+            repo_path: Path to the repository
+            file_path: Relative path to the artifact file from repo root
+            ref: Branch, tag or commit SHA
+
+        Returns:
+            Optional[dict]: Artifact data as dictionary, or None if the file doesn't exist at ref
+
+        Raises:
+            NotFoundException: If ref does not name a commit
+        """
+        git_service = GitService(repo_path)
+        commit_hash = git_service.resolve_commit(ref)
+        if not commit_hash:
+            raise NotFoundException(
+                resource="Git ref",
+                identifier=ref
+            )
+
+        cache = get_artifact_ref_cache()
+        found, artifact_data = cache.lookup(commit_hash, file_path)
+        if found:
+            return artifact_data
+
+        content = git_service.read_file_at_commit(commit_hash, file_path)
+        artifact_data = self.file_ops_service.parse_yaml(content) if content is not None else None
+        if content is None or artifact_data is not None:
+            cache.store(commit_hash, file_path, artifact_data)
+        return artifact_data
     
     
+    @traced("local_repo.ensure_repos_cloned")
     def ensure_repos_cloned(
         self,
         user_id: str,
@@ -437,6 +526,7 @@ class LocalRepoService:
             logger.error(f"Error cloning repository {repo_id}: {e}", exc_info=True)
             return False
     
+    @traced("local_repo.handle_git_workflow_after_save")
     async def handle_git_workflow_after_save(
         self,
         user_id: str,
@@ -452,18 +542,21 @@ class LocalRepoService:
         Handle git workflow after saving an artifact file (prompt, tool, etc.).
         
         If current branch is same as base branch:
-        1. Create a new branch (with artifact name in branch name)
-        2. Stage the file
-        3. Commit changes
-        4. Push to remote
-        5. Create PR if possible
-        
-        If current branch is different from base branch:
-        1. Stage the file
-        2. Commit changes
+        1. Commit the file to a new branch (with artifact name in branch name)
+        2. Switch the working tree to the new branch
         3. Push to remote
         4. Create PR if possible
         
+        If current branch is different from base branch:
+        1. Commit the file to the current branch
+        2. Push to remote
+        3. Create PR if possible
+        
+        Commits are written directly into the object database, so saving
+        never checks out a branch or rewrites files in the working tree; the
+        saved file is already there, and only HEAD and its index entry are
+        updated to match the new commit.
+        
         Args:
             user_id: User ID
             repo_name: Repository name
@@ -503,6 +596,10 @@ class LocalRepoService:
                 base = Path(file_path).stem
             artifact_name = base.replace('_', '-').replace(' ', '-')
             
+            # Commit the file content as saved in the working tree
+            commit_message = f"Update {artifact_type.value}: {file_path}"
+            files = {file_path: (repo_path / file_path).read_bytes()}
+            
             # Check if current branch is same as base branch
             if current_branch == base_branch:
                 logger.info(f"Current branch '{current_branch}' is same as base branch, creating new branch and committing changes")
@@ -512,40 +609,38 @@ class LocalRepoService:
                 short_uuid = str(uuid.uuid4())[:8]
                 new_branch_name = f"update-{artifact_type.value}-{artifact_name}-{timestamp}-{short_uuid}"
                 
-                # Create and checkout new branch
-                branch_result = git_service.checkout_new_branch(
+                # Commit to a new branch forked from the base branch
+                commit_result = git_service.commit_files(
                     branch_name=new_branch_name,
-                    base_branch=base_branch,
-                    oauth_token=oauth_token
+                    files=files,
+                    commit_message=commit_message,
+                    base_ref=base_branch,
+                    author_name=author_name,
+                    author_email=author_email
                 )
                 
-                if not branch_result.success:
-                    logger.error(f"Failed to create branch {new_branch_name}: {branch_result.message}")
-                    return None
-                
-                # Update current_branch to the new branch for commit/push
+                # Update current_branch to the new branch for push
                 current_branch = new_branch_name
             else:
                 # Already on a feature branch, just commit and push
                 logger.info(f"Current branch '{current_branch}' is different from base branch '{base_branch}', committing and pushing to existing branch")
+                commit_result = git_service.commit_files(
+                    branch_name=current_branch,
+                    files=files,
+                    commit_message=commit_message,
+                    author_name=author_name,
+                    author_email=author_email
+                )
             
-            # Stage the file
-            add_result = git_service.add_files([file_path])
-            if not add_result.success:
-                logger.error(f"Failed to stage file {file_path}: {add_result.message}")
-                return None
-            
-            # Commit changes with user information
-            commit_message = f"Update {artifact_type.value}: {file_path}"
-            commit_result = git_service.commit_changes(
-                commit_message=commit_message,
-                author_name=author_name,
-                author_email=author_email
-            )
             if not commit_result.success:
                 logger.error(f"Failed to commit changes: {commit_result.message}")
                 return None
             
+            # Later saves continue on the branch; the working tree already holds the file
+            sync_result = git_service.sync_head_to_branch(current_branch, [file_path])
+            if not sync_result.success:
+                logger.warning(f"Could not switch working tree to {current_branch}: {sync_result.message}")
+            
             # Validate required parameters for push
             if not oauth_token:
                 raise AppException(
@@ -617,6 +712,53 @@ class LocalRepoService:
             logger.error(f"Error in git workflow after save: {e}", exc_info=True)
             return None
     
+    @traced("local_repo.fetch_base_branch")
+    async def fetch_base_branch(
+        self,
+        user_id: str,
+        repo_name: str,
+        oauth_token: Optional[str] = None
+    ) -> dict:
+        """
+        Fetch the latest base branch from the remote without touching the working tree.
+        
+        Unlike get_latest_base_branch_content this neither switches branches nor
+        discards local changes: the remote base branch is fetched into
+        origin/<base_branch>, and artifacts can then be read at that ref.
+        
+        Args:
+            user_id: ID of the user
+            repo_name: Name of the repository
+            oauth_token: OAuth token for authentication
+            
+        Returns:
+            dict: Result of the operation, with the ref to read and its commit hash
+        """
+        base_branch = self.config_service.get_base_branch_for_repo(user_id, repo_name)
+        repo_url = self.config_service.get_repo_url_for_repo(user_id, repo_name)
+        repo_path = self.get_repo_path(user_id, repo_name)
+        
+        if not (repo_path.exists() and (repo_path / ".git").exists()):
+            logger.warning(f"Repository {repo_name} not found at {repo_path}")
+            return {"success": False, "message": f"Repository {repo_name} not found or not a git repository"}
+        
+        if not repo_url:
+            return {"success": False, "message": "Repository URL not found in configuration"}
+        
+        # The fetch is network bound; keep it off the event loop
+        git_service = GitService(repo_path)
+        fetch_result = await asyncio.to_thread(git_service.fetch_branch, oauth_token, base_branch, repo_url)
+        if not fetch_result.success:
+            return {"success": False, "message": fetch_result.message}
+        
+        return {
+            "success": True,
+            "message": f"Fetched latest {base_branch} of {repo_name}",
+            "ref": fetch_result.data["ref"],
+            "commit_hash": fetch_result.data["commit_hash"]
+        }
+    
+    @traced("local_repo.get_latest_base_branch_content")
     async def get_latest_base_branch_content(
         self,
         user_id: str,
@@ -689,6 +831,7 @@ class LocalRepoService:
         ArtifactType.EVAL: ".eval.yaml"
     }
     
+    @traced("local_repo.discover_artifacts")
     def discover_artifacts(
         self,
         user_id: str,
@@ -753,11 +896,17 @@ class LocalRepoService:
         )
         return result
     
-    def get_file_commit_history(self, repo_path: Path, file_path: str, limit: int = 5) -> list[CommitInfo]:
-        """Get commit history for a specific file using GitService."""
+    def get_file_commit_history(
+        self,
+        repo_path: Path,
+        file_path: str,
+        limit: int = 5,
+        ref: Optional[str] = None
+    ) -> list[CommitInfo]:
+        """Get commit history for a specific file using GitService, optionally up to a ref."""
         try:
             git_service = GitService(repo_path)
-            return git_service.get_file_commit_history(file_path, limit)
+            return git_service.get_file_commit_history(file_path, limit, ref=ref)
         except Exception as e:
             logger.warning(f"Failed to get commit history for {file_path}: {e}")
             return []
\ No newline at end of file
@@ -0,0 +1,225 @@
+"""
+Repository handle registry.
+
+Opening a GitPython Repo is cheap, but the first object read through it
+starts two persistent git processes (cat-file --batch and --batch-check)
+that die with the handle. Opening a fresh Repo per operation therefore
+forks new git processes for every call. This module keeps Repo handles open
+per repository and leases them out:
+- a leased handle is used by one caller at a time, since the persistent
+  cat-file pipes are not safe to share between threads; concurrent callers
+  on one repository each get their own handle,
+- released handles are kept idle and reused, so object reads become pipe
+  reads on already running processes,
+- idle handles are closed after a timeout by a background sweep, and the
+  number of open handles is bounded by closing the least recently used idle
+  handles.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from git import Repo
+
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RepoHandleRegistry:
+    """
+    Pool of open Repo handles per repository path.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, max_handles: int = 32, idle_timeout_seconds: float = 300.0):
+        """
+        Initialize the registry.
+
+        Args:
+            max_handles: Maximum number of open handles across all repositories
+            idle_timeout_seconds: Seconds an unused handle stays open
+        """
+        self.max_handles = max(1, max_handles)
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._idle: Dict[str, List[Tuple[float, Repo]]] = {}
+        self._open = 0
+        # Bumped by evict() and close() so handles leased before are closed on release
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        # Timer closing idle handles once they time out; runs only while handles are idle
+        self._sweeper: Optional[threading.Timer] = None
+
+    @staticmethod
+    def _key(repo_path: Union[str, Path]) -> str:
+        return str(Path(repo_path).resolve())
+
+    @contextmanager
+    def lease(self, repo_path: Union[str, Path]) -> Iterator[Repo]:
+        """
+        Lease an open handle for a repository.
+
+        Args:
+            repo_path: Path to the git repository
+
+        Yields:
+            Repo: Handle for exclusive use until the context exits
+
+        Raises:
+            git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError: If repo_path is not a repository
+        """
+        key = self._key(repo_path)
+        repo, generation = self._acquire(key)
+        try:
+            yield repo
+        finally:
+            self._release(key, repo, generation)
+
+    def _generation(self, key: str) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(key, 0)
+
+    def _acquire(self, key: str) -> Tuple[Repo, Tuple[int, int]]:
+        to_close: List[Repo] = []
+        with self._lock:
+            to_close.extend(self._expire_idle())
+            generation = self._generation(key)
+            handles = self._idle.get(key)
+            if handles:
+                _, repo = handles.pop()
+                if not handles:
+                    del self._idle[key]
+            else:
+                repo = None
+                if self._open >= self.max_handles:
+                    to_close.extend(self._close_least_recently_used(self._open - self.max_handles + 1))
+                self._open += 1
+        self._close_all(to_close)
+
+        if repo is None:
+            try:
+                repo = Repo(key)
+            except Exception:
+                with self._lock:
+                    self._open -= 1
+                raise
+        return repo, generation
+
+    def _release(self, key: str, repo: Repo, generation: Tuple[int, int]) -> None:
+        to_close: List[Repo] = []
+        with self._lock:
+            to_close.extend(self._expire_idle())
+            if generation != self._generation(key) or self._open > self.max_handles:
+                # Evicted while leased, or opened past the bound while all handles were leased
+                self._open -= 1
+                to_close.append(repo)
+            else:
+                self._idle.setdefault(key, []).append((time.monotonic(), repo))
+                self._schedule_sweep()
+        self._close_all(to_close)
+
+    def _schedule_sweep(self) -> None:
+        """Start the sweep timer for the oldest idle handle; called with the lock held."""
+        if self._sweeper is not None or not self._idle:
+            return
+        oldest = min(used for handles in self._idle.values() for used, _ in handles)
+        delay = max(0.0, oldest + self.idle_timeout_seconds - time.monotonic())
+        self._sweeper = threading.Timer(delay, self._sweep)
+        self._sweeper.daemon = True
+        self._sweeper.start()
+
+    def _sweep(self) -> None:
+        """Close idle handles past the timeout, then wait for the next one to time out."""
+        with self._lock:
+            self._sweeper = None
+            expired = self._expire_idle()
+            self._schedule_sweep()
+        self._close_all(expired)
+
+    def _expire_idle(self) -> List[Repo]:
+        """Remove idle handles past the timeout; called with the lock held."""
+        cutoff = time.monotonic() - self.idle_timeout_seconds
+        expired: List[Repo] = []
+        for key in list(self._idle):
+            handles = self._idle[key]
+            kept = [(used, repo) for used, repo in handles if used >= cutoff]
+            expired.extend(repo for used, repo in handles if used < cutoff)
+            if kept:
+                self._idle[key] = kept
+            else:
+                del self._idle[key]
+        self._open -= len(expired)
+        return expired
+
+    def _close_least_recently_used(self, count: int) -> List[Repo]:
+        """Remove up to count idle handles, oldest first; called with the lock held."""
+        candidates = sorted(
+            ((used, key, index) for key, handles in self._idle.items() for index, (used, _) in enumerate(handles))
+        )[:count]
+        removed: List[Repo] = []
+        for _, key, index in sorted(candidates, key=lambda c: c[2], reverse=True):
+            removed.append(self._idle[key].pop(index)[1])
+        for key in [key for key, handles in self._idle.items() if not handles]:
+            del self._idle[key]
+        self._open -= len(removed)
+        return removed
+
+    @staticmethod
+    def _close_all(repos: List[Repo]) -> None:
+        for repo in repos:
+            try:
+                repo.close()
+            except Exception as e:
+                logger.warning(f"Failed to close repository handle: {e}")
+
+    def evict(self, repo_path: Union[str, Path]) -> None:
+        """
+        Close the handles of a repository, e.g. after it was re-cloned or removed.
+
+        Handles leased at the time are closed when they are released.
+
+        Args:
+            repo_path: Path to the git repository
+        """
+        key = self._key(repo_path)
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            handles = self._idle.pop(key, [])
+            self._open -= len(handles)
+        self._close_all([repo for _, repo in handles])
+
+    def close(self) -> None:
+        """Close every idle handle; leased handles are closed when released."""
+        with self._lock:
+            if self._sweeper is not None:
+                self._sweeper.cancel()
+                self._sweeper = None
+            self._epoch += 1
+            handles = [repo for entries in self._idle.values() for _, repo in entries]
+            self._idle.clear()
+            self._open -= len(handles)
+        self._close_all(handles)
+
+    @property
+    def open_handles(self) -> int:
+        """Number of open handles, idle or leased."""
+        return self._open
+
+
+# Process-wide registry shared by all GitService instances
+_repo_handle_registry: Optional[RepoHandleRegistry] = None
+
+
+def get_repo_handle_registry() -> RepoHandleRegistry:
+    """Return the process-wide repository handle registry configured from settings."""
+    global _repo_handle_registry
+    if _repo_handle_registry is None:
+        _repo_handle_registry = RepoHandleRegistry(
+            max_handles=settings.git_repo_handles_max,
+            idle_timeout_seconds=settings.git_repo_handle_idle_seconds
+        )
+    return _repo_handle_registry
@@ -6,6 +6,7 @@ This module implements the IRemoteRepo interface for Bitbucket repositories.
 
 import httpx
 import logging
+from typing import Optional
 
 from services.remote_repo.remote_repo_interface import IRemoteRepo
 from services.remote_repo.models import (
@@ -16,6 +17,11 @@ from services.remote_repo.models import (
     PullRequestResult,
     PullRequestInfo
 )
+from services.remote_repo.remote_repo_cache import (
+    ConditionalHttpClient,
+    RemoteRepoCache,
+    fetch_remaining_pages,
+)
 from services.oauth.models import OAuthError
 
 logger = logging.getLogger(__name__)
@@ -28,27 +34,90 @@ class BitbucketRepoLocator(IRemoteRepo):
     This implementation handles repositories hosted on Bitbucket.
     """
     
-    def __init__(self, access_token: str, username: str):
+    def __init__(
+        self,
+        access_token: str,
+        username: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[RemoteRepoCache] = None,
+        cache_scope: str = ""
+    ):
+        """
+        Args:
+            access_token: Bitbucket OAuth access token
+            username: Bitbucket username whose repositories are listed
+            http_client: Optional shared client; a private one is created if omitted
+            cache: Optional ETag cache used for conditional GET requests
+            cache_scope: Cache scope (per user/credential) for ETag entries
+        """
         self.access_token = access_token
         self.username = username
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        self._owns_http_client = http_client is None
+        self.http_client = ConditionalHttpClient(
+            http_client or httpx.AsyncClient(timeout=30.0),
+            cache=cache,
+            scope=cache_scope
+        )
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.http_client.aclose()
+        if self._owns_http_client:
+            await self.http_client.aclose()
+
+    @property
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.access_token}"
+        }
+
+    async def _get_all_values(self, url: str, first_data: dict, pagelen: int) -> list:
+        """
+        Collect "values" across all pages of a Bitbucket paginated response.
+
+        When the first page reports "size", the remaining pages are fetched
+        concurrently; otherwise the "next" links are followed sequentially.
+        """
+        values = list(first_data.get("values", []))
+        
+        async def fetch_page(page: int) -> list:
+            page_response = await self.http_client.get(
+                url,
+                headers=self._headers,
+                params={"pagelen": pagelen, "page": page}
+            )
+            if page_response.status_code != 200:
+                logger.error(f"Bitbucket page {page} of {url} failed: {page_response.status_code}")
+                return []
+            return page_response.json().get("values", [])
+        
+        size = first_data.get("size")
+        if isinstance(size, int):
+            total_pages = -(-size // pagelen)
+            values.extend(await fetch_remaining_pages(fetch_page, total_pages))
+            return values
+        
+        next_url = first_data.get("next")
+        while next_url:
+            page_response = await self.http_client.get(next_url, headers=self._headers)
+            if page_response.status_code != 200:
+                break
+            page_data = page_response.json()
+            values.extend(page_data.get("values", []))
+            next_url = page_data.get("next")
+        return values
 
     async def get_repositories(self) -> RepositoryList:
         """Get user repositories from Bitbucket API."""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.access_token}"
-            }
+            url = f"https://api.bitbucket.org/2.0/repositories/{self.username}"
+            pagelen = 100  # Bitbucket's maximum pagelen value
             
             response = await self.http_client.get(
-                f"https://api.bitbucket.org/2.0/repositories/{self.username}",
-                headers=headers
+                url,
+                headers=self._headers,
+                params={"pagelen": pagelen, "page": 1}
             )
             
             if response.status_code == 401:
@@ -57,10 +126,10 @@ class BitbucketRepoLocator(IRemoteRepo):
                 logger.error(f"Bitbucket user repositories failed: {response.status_code} {response.text}")
                 raise OAuthError("Failed to retrieve user repositories from Bitbucket", "bitbucket")
             
-            repos_data = response.json()
+            repos_data = await self._get_all_values(url, response.json(), pagelen)
             
             repos_list = []
-            for repo_data in repos_data.get("values", []):
+            for repo_data in repos_data:
                 clone_links = repo_data.get("links", {}).get("clone", [])
                 clone_url = None
                 for link in clone_links:
@@ -98,9 +167,7 @@ class BitbucketRepoLocator(IRemoteRepo):
             # First get default branch
             repo_response = await self.http_client.get(
                 f"https://api.bitbucket.org/2.0/repositories/{owner}/{repo}",
-                headers={
-                    "Authorization": f"Bearer {self.access_token}"
-                }
+                headers=self._headers
             )
             
             if repo_response.status_code == 401:
@@ -113,46 +180,26 @@ class BitbucketRepoLocator(IRemoteRepo):
             repo_data = repo_response.json()
             default_branch = repo_data.get("mainbranch", {}).get("name", "main")
             
-            # Get all branches with pagination support
-            all_branches = []
-            page = 1
+            branches_url = f"https://api.bitbucket.org/2.0/repositories/{owner}/{repo}/refs/branches"
             pagelen = 100  # Bitbucket's maximum pagelen value
             
-            while True:
-                branches_response = await self.http_client.get(
-                    f"https://api.bitbucket.org/2.0/repositories/{owner}/{repo}/refs/branches",
-                    headers={
-                        "Authorization": f"Bearer {self.access_token}"
-                    },
-                    params={
-                        "pagelen": pagelen,
-                        "page": page
-                    }
+            branches_response = await self.http_client.get(
+                branches_url,
+                headers=self._headers,
+                params={"pagelen": pagelen, "page": 1}
+            )
+            
+            if branches_response.status_code != 200:
+                logger.error(f"Failed to get branches: {branches_response.status_code}")
+                # Return just the default branch if we can't get branches
+                return RepositoryBranchesResponse(
+                    branches=[BranchInfo(name=default_branch, is_default=True)],
+                    default_branch=default_branch
                 )
-                
-                if branches_response.status_code != 200:
-                    logger.error(f"Failed to get branches: {branches_response.status_code}")
-                    # Return just the default branch if we can't get branches
-                    if not all_branches:
-                        return RepositoryBranchesResponse(
-                            branches=[BranchInfo(name=default_branch, is_default=True)],
-                            default_branch=default_branch
-                        )
-                    break
-                
-                branches_data = branches_response.json()
-                values = branches_data.get("values", [])
-                
-                if not values:
-                    break
-                
-                all_branches.extend(values)
-                
-                # Check if there's a next page using Bitbucket's pagination
-                if not branches_data.get("next"):
-                    break
-                
-                page += 1
+            
+            all_branches = await self._get_all_values(
+                branches_url, branches_response.json(), pagelen
+            )
             
             branches = [
                 BranchInfo(
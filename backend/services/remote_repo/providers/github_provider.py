@@ -6,6 +6,7 @@ This module implements the IRemoteRepo interface for GitHub repositories.
 
 import httpx
 import logging
+from typing import Optional
 
 from services.remote_repo.remote_repo_interface import IRemoteRepo
 from services.remote_repo.models import (
@@ -16,6 +17,11 @@ from services.remote_repo.models import (
     PullRequestResult,
     PullRequestInfo
 )
+from services.remote_repo.remote_repo_cache import (
+    ConditionalHttpClient,
+    RemoteRepoCache,
+    fetch_remaining_pages,
+)
 from services.oauth.models import OAuthError
 
 logger = logging.getLogger(__name__)
@@ -28,28 +34,64 @@ class GitHubRepoLocator(IRemoteRepo):
     This implementation handles repositories hosted on GitHub.
     """
     
-    def __init__(self, access_token: str):
+    def __init__(
+        self,
+        access_token: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[RemoteRepoCache] = None,
+        cache_scope: str = ""
+    ):
+        """
+        Args:
+            access_token: GitHub OAuth access token
+            http_client: Optional shared client; a private one is created if omitted
+            cache: Optional ETag cache used for conditional GET requests
+            cache_scope: Cache scope (per user/credential) for ETag entries
+        """
         self.access_token = access_token
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        self._owns_http_client = http_client is None
+        self.http_client = ConditionalHttpClient(
+            http_client or httpx.AsyncClient(timeout=30.0),
+            cache=cache,
+            scope=cache_scope
+        )
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.http_client.aclose()
+        if self._owns_http_client:
+            await self.http_client.aclose()
+
+    @property
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.access_token}",
+            "Accept": "application/vnd.github.v3+json",
+            "X-GitHub-Api-Version": "2022-11-28"
+        }
+
+    @staticmethod
+    def _last_page(response: httpx.Response) -> int:
+        """Return the last page number advertised in the Link header (1 if absent)."""
+        last_url = response.links.get("last", {}).get("url")
+        if not last_url:
+            return 1
+        try:
+            return int(httpx.URL(last_url).params.get("page", 1))
+        except ValueError:
+            return 1
 
     async def get_repositories(self) -> RepositoryList:
-        """Get user repositories from GitHub API."""
+        """Get user repositories from GitHub API, fetching all pages."""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Accept": "application/vnd.github.v3+json",
-                "X-GitHub-Api-Version": "2022-11-28"
-            }
+            url = "https://api.github.com/user/repos"
+            per_page = 100  # GitHub's maximum per_page value
             
             response = await self.http_client.get(
-                "https://api.github.com/user/repos",
-                headers=headers
+                url,
+                headers=self._headers,
+                params={"per_page": per_page, "page": 1}
             )
             
             if response.status_code == 401:
@@ -58,7 +100,19 @@ class GitHubRepoLocator(IRemoteRepo):
                 logger.error(f"GitHub user repositories failed: {response.status_code} {response.text}")
                 raise OAuthError("Failed to retrieve user repositories from GitHub", "github")
             
+            async def fetch_page(page: int) -> list:
+                page_response = await self.http_client.get(
+                    url,
+                    headers=self._headers,
+                    params={"per_page": per_page, "page": page}
+                )
+                if page_response.status_code != 200:
+                    logger.error(f"GitHub user repositories page {page} failed: {page_response.status_code}")
+                    raise OAuthError("Failed to retrieve user repositories from GitHub", "github")
+                return page_response.json()
+            
             repos_data = response.json()
+            repos_data.extend(await fetch_remaining_pages(fetch_page, self._last_page(response)))
             
             repos_list = []
             for repo_data in repos_data:
@@ -92,11 +146,7 @@ class GitHubRepoLocator(IRemoteRepo):
             # First get default branch
             repo_response = await self.http_client.get(
                 f"https://api.github.com/repos/{owner}/{repo}",
-                headers={
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                    "X-GitHub-Api-Version": "2022-11-28"
-                }
+                headers=self._headers
             )
             
             if repo_response.status_code == 401:
@@ -109,46 +159,39 @@ class GitHubRepoLocator(IRemoteRepo):
             repo_data = repo_response.json()
             default_branch = repo_data.get("default_branch", "main")
             
-            # Get all branches with pagination support
-            all_branches = []
-            page = 1
+            # Get the first page; the Link header tells how many pages remain
+            branches_url = f"https://api.github.com/repos/{owner}/{repo}/branches"
             per_page = 100  # GitHub's maximum per_page value
             
-            while True:
-                branches_response = await self.http_client.get(
-                    f"https://api.github.com/repos/{owner}/{repo}/branches",
-                    headers={
-                        "Authorization": f"Bearer {self.access_token}",
-                        "Accept": "application/vnd.github.v3+json",
-                        "X-GitHub-Api-Version": "2022-11-28"
-                    },
-                    params={
-                        "per_page": per_page,
-                        "page": page
-                    }
+            branches_response = await self.http_client.get(
+                branches_url,
+                headers=self._headers,
+                params={"per_page": per_page, "page": 1}
+            )
+            
+            if branches_response.status_code != 200:
+                logger.error(f"Failed to get branches: {branches_response.status_code}")
+                # Return just the default branch if we can't get branches
+                return RepositoryBranchesResponse(
+                    branches=[BranchInfo(name=default_branch, is_default=True)],
+                    default_branch=default_branch
+                )
+            
+            async def fetch_page(page: int) -> list:
+                page_response = await self.http_client.get(
+                    branches_url,
+                    headers=self._headers,
+                    params={"per_page": per_page, "page": page}
                 )
-                
-                if branches_response.status_code != 200:
-                    logger.error(f"Failed to get branches: {branches_response.status_code}")
-                    # Return just the default branch if we can't get branches
-                    if not all_branches:
-                        return RepositoryBranchesResponse(
-                            branches=[BranchInfo(name=default_branch, is_default=True)],
-                            default_branch=default_branch
-                        )
-                    break
-                
-                branches_data = branches_response.json()
-                if not branches_data:
-                    break
-                
-                all_branches.extend(branches_data)
-                
-                # Check if there are more pages
-                if len(branches_data) < per_page:
-                    break
-                
-                page += 1
+                if page_response.status_code != 200:
+                    logger.error(f"Failed to get branches page {page}: {page_response.status_code}")
+                    return []
+                return page_response.json()
+            
+            all_branches = branches_response.json()
+            all_branches.extend(
+                await fetch_remaining_pages(fetch_page, self._last_page(branches_response))
+            )
             
             branches = [
                 BranchInfo(
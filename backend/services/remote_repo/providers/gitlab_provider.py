@@ -6,6 +6,7 @@ This module implements the IRemoteRepo interface for GitLab repositories.
 
 import httpx
 import logging
+from typing import Optional
 
 from services.remote_repo.remote_repo_interface import IRemoteRepo
 from services.remote_repo.models import (
@@ -16,6 +17,11 @@ from services.remote_repo.models import (
     PullRequestResult,
     PullRequestInfo
 )
+from services.remote_repo.remote_repo_cache import (
+    ConditionalHttpClient,
+    RemoteRepoCache,
+    fetch_remaining_pages,
+)
 from services.oauth.models import OAuthError
 
 logger = logging.getLogger(__name__)
@@ -28,26 +34,101 @@ class GitLabRepoLocator(IRemoteRepo):
     This implementation handles repositories hosted on GitLab.
     """
     
-    def __init__(self, access_token: str):
+    def __init__(
+        self,
+        access_token: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[RemoteRepoCache] = None,
+        cache_scope: str = ""
+    ):
+        """
+        Args:
+            access_token: GitLab OAuth access token
+            http_client: Optional shared client; a private one is created if omitted
+            cache: Optional ETag cache used for conditional GET requests
+            cache_scope: Cache scope (per user/credential) for ETag entries
+        """
         self.access_token = access_token
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        self._owns_http_client = http_client is None
+        self.http_client = ConditionalHttpClient(
+            http_client or httpx.AsyncClient(timeout=30.0),
+            cache=cache,
+            scope=cache_scope
+        )
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.http_client.aclose()
+        if self._owns_http_client:
+            await self.http_client.aclose()
+
+    @property
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.access_token}"
+        }
+
+    @staticmethod
+    def _total_pages(response: httpx.Response) -> Optional[int]:
+        """
+        Return the page count from the X-Total-Pages header.
+
+        GitLab omits the header for very large collections, in which case
+        None is returned and callers fall back to following X-Next-Page.
+        """
+        total_pages = response.headers.get("x-total-pages")
+        if not total_pages:
+            return None
+        try:
+            return int(total_pages)
+        except ValueError:
+            return None
+
+    async def _get_all_pages(self, url: str, first_response: httpx.Response, params: dict) -> list:
+        """Collect items of every page, fetching concurrently once the total is known."""
+        items = first_response.json()
+        
+        async def fetch_page(page: int) -> list:
+            page_response = await self.http_client.get(
+                url,
+                headers=self._headers,
+                params={**params, "page": page}
+            )
+            if page_response.status_code != 200:
+                logger.error(f"GitLab page {page} of {url} failed: {page_response.status_code}")
+                return []
+            return page_response.json()
+        
+        total_pages = self._total_pages(first_response)
+        if total_pages is not None:
+            items.extend(await fetch_remaining_pages(fetch_page, total_pages))
+            return items
+        
+        # No total available: follow X-Next-Page sequentially
+        next_page = first_response.headers.get("x-next-page")
+        while next_page:
+            page_response = await self.http_client.get(
+                url,
+                headers=self._headers,
+                params={**params, "page": int(next_page)}
+            )
+            if page_response.status_code != 200:
+                break
+            items.extend(page_response.json())
+            next_page = page_response.headers.get("x-next-page")
+        return items
 
     async def get_repositories(self) -> RepositoryList:
-        """Get user repositories from GitLab API."""
+        """Get user repositories from GitLab API, fetching all pages."""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.access_token}"
-            }
+            url = "https://gitlab.com/api/v4/projects"
+            params = {"membership": "true", "per_page": 100}  # 100 is GitLab's maximum per_page
             
             response = await self.http_client.get(
-                "https://gitlab.com/api/v4/projects?membership=true",
-                headers=headers
+                url,
+                headers=self._headers,
+                params={**params, "page": 1}
             )
             
             if response.status_code == 401:
@@ -56,7 +137,7 @@ class GitLabRepoLocator(IRemoteRepo):
                 logger.error(f"GitLab user repositories failed: {response.status_code} {response.text}")
                 raise OAuthError("Failed to retrieve user repositories from GitLab", "gitlab")
             
-            repos_data = response.json()
+            repos_data = await self._get_all_pages(url, response, params)
             
             repos_list = []
             for repo_data in repos_data:
@@ -94,9 +175,7 @@ class GitLabRepoLocator(IRemoteRepo):
             # First get default branch
             repo_response = await self.http_client.get(
                 f"https://gitlab.com/api/v4/projects/{project_path}",
-                headers={
-                    "Authorization": f"Bearer {self.access_token}"
-                }
+                headers=self._headers
             )
             
             if repo_response.status_code == 401:
@@ -109,44 +188,24 @@ class GitLabRepoLocator(IRemoteRepo):
             repo_data = repo_response.json()
             default_branch = repo_data.get("default_branch", "main")
             
-            # Get all branches with pagination support
-            all_branches = []
-            page = 1
-            per_page = 100  # GitLab's maximum per_page value
+            branches_url = f"https://gitlab.com/api/v4/projects/{project_path}/repository/branches"
+            params = {"per_page": 100}  # GitLab's maximum per_page value
             
-            while True:
-                branches_response = await self.http_client.get(
-                    f"https://gitlab.com/api/v4/projects/{project_path}/repository/branches",
-                    headers={
-                        "Authorization": f"Bearer {self.access_token}"
-                    },
-                    params={
-                        "per_page": per_page,
-                        "page": page
-                    }
+            branches_response = await self.http_client.get(
+                branches_url,
+                headers=self._headers,
+                params={**params, "page": 1}
+            )
+            
+            if branches_response.status_code != 200:
+                logger.error(f"Failed to get branches: {branches_response.status_code}")
+                # Return just the default branch if we can't get branches
+                return RepositoryBranchesResponse(
+                    branches=[BranchInfo(name=default_branch, is_default=True)],
+                    default_branch=default_branch
                 )
-                
-                if branches_response.status_code != 200:
-                    logger.error(f"Failed to get branches: {branches_response.status_code}")
-                    # Return just the default branch if we can't get branches
-                    if not all_branches:
-                        return RepositoryBranchesResponse(
-                            branches=[BranchInfo(name=default_branch, is_default=True)],
-                            default_branch=default_branch
-                        )
-                    break
-                
-                branches_data = branches_response.json()
-                if not branches_data:
-                    break
-                
-                all_branches.extend(branches_data)
-                
-                # Check if there are more pages
-                if len(branches_data) < per_page:
-                    break
-                
-                page += 1
+            
+            all_branches = await self._get_all_pages(branches_url, branches_response, params)
             
             branches = [
                 BranchInfo(
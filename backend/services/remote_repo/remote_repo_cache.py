@@ -0,0 +1,307 @@
+"""
+Remote Repository Cache
+
+This module provides a process-wide, per-user cache for remote repository
+listings. It keeps two layers:
+- A TTL result cache of parsed listings (repositories, branches) so repeated
+  UI visits within the TTL never reach the provider API.
+- An ETag response cache used to send conditional requests (If-None-Match)
+  once the TTL expires. Providers answer unchanged resources with 304, which
+  does not count against the primary rate limit.
+
+It also owns the shared httpx client so provider locators reuse connections
+instead of opening a fresh pool per call.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import httpx
+from pydantic import BaseModel
+
+from lib.metrics import record_cache_lookup
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Response headers worth replaying when a cached body is served for a 304
+_REPLAYED_HEADERS = ("link", "x-total", "x-total-pages", "x-next-page", "content-type")
+
+
+class CachedHttpResponse(BaseModel):
+    """A cached GET response that can be revalidated with its ETag."""
+    etag: str
+    body: bytes
+    headers: Dict[str, str]
+
+
+class RemoteRepoCache:
+    """
+    Per-user cache for remote repository listings and conditional GET responses.
+
+    Entries are scoped by user so one user's listing is never served to another.
+    Both layers are bounded LRUs.
+    """
+
+    def __init__(
+        self,
+        result_ttl_seconds: float = 60.0,
+        max_results: int = 1024,
+        max_responses: int = 4096
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            result_ttl_seconds: Seconds a parsed listing is served without revalidation
+            max_results: Maximum number of parsed listings kept
+            max_responses: Maximum number of ETag-tagged responses kept
+        """
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_results = max_results
+        self.max_responses = max_responses
+        self._results: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._responses: "OrderedDict[Tuple[str, str], CachedHttpResponse]" = OrderedDict()
+        # Fetch lock of each listing being fetched and the number of callers holding or awaiting it
+        self._locks: Dict[Tuple[str, str], Tuple[asyncio.Lock, int]] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    # ------------------------------------------------------------------
+    # Parsed listing results (TTL)
+    # ------------------------------------------------------------------
+
+    def get_result(self, scope: str, key: str) -> Optional[Any]:
+        """Return a cached listing if it has not expired."""
+        entry = self._results.get((scope, key))
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            return None
+        self._results.move_to_end((scope, key))
+        return value
+
+    def set_result(self, scope: str, key: str, value: Any) -> None:
+        """Store a listing for the configured TTL."""
+        self._results[(scope, key)] = (time.monotonic() + self.result_ttl_seconds, value)
+        self._results.move_to_end((scope, key))
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+
+    async def get_or_fetch(
+        self,
+        scope: str,
+        key: str,
+        fetch: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Return a fresh cached listing or fetch it once.
+
+        Concurrent callers for the same (scope, key) share a lock, so a burst of
+        requests from one user results in a single upstream fetch.
+        """
+        cached = self.get_result(scope, key)
+        if cached is not None:
+            record_cache_lookup("remote_repo", hit=True)
+            return cached
+
+        lock, users = self._locks.get((scope, key), (asyncio.Lock(), 0))
+        self._locks[(scope, key)] = (lock, users + 1)
+        try:
+            async with lock:
+                cached = self.get_result(scope, key)
+                # A concurrent caller fetched it while this one waited
+                record_cache_lookup("remote_repo", hit=cached is not None)
+                if cached is not None:
+                    return cached
+                value = await fetch()
+                self.set_result(scope, key, value)
+                return value
+        finally:
+            self._release_lock((scope, key), lock)
+
+    def _release_lock(self, lock_key: Tuple[str, str], lock: asyncio.Lock) -> None:
+        """Drop a caller's hold on a fetch lock; the last one removes it."""
+        entry = self._locks.get(lock_key)
+        if entry is None or entry[0] is not lock:
+            return
+        if entry[1] <= 1:
+            del self._locks[lock_key]
+        else:
+            self._locks[lock_key] = (lock, entry[1] - 1)
+
+    def invalidate(self, scope: str, key: Optional[str] = None) -> None:
+        """
+        Drop cached listings for a user.
+
+        Args:
+            scope: User scope
+            key: Specific listing key; drops every listing of the scope if omitted
+        """
+        if key is not None:
+            self._results.pop((scope, key), None)
+            return
+        for cache_key in [k for k in self._results if k[0] == scope]:
+            del self._results[cache_key]
+
+    # ------------------------------------------------------------------
+    # Conditional GET responses (ETag)
+    # ------------------------------------------------------------------
+
+    def get_response(self, scope: str, request_key: str) -> Optional[CachedHttpResponse]:
+        """Return the last ETag-tagged response for a request."""
+        cached = self._responses.get((scope, request_key))
+        if cached is not None:
+            self._responses.move_to_end((scope, request_key))
+        return cached
+
+    def set_response(self, scope: str, request_key: str, response: CachedHttpResponse) -> None:
+        """Store an ETag-tagged response."""
+        self._responses[(scope, request_key)] = response
+        self._responses.move_to_end((scope, request_key))
+        while len(self._responses) > self.max_responses:
+            self._responses.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Shared HTTP client
+    # ------------------------------------------------------------------
+
+    def get_http_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            )
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        self._http_client = None
+
+    def clear(self) -> None:
+        """Drop all cached listings and responses."""
+        self._results.clear()
+        self._responses.clear()
+        self._locks.clear()
+
+
+def token_fingerprint(access_token: str) -> str:
+    """Return a short, non-reversible fingerprint for scoping cache entries by credential."""
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()[:16]
+
+
+class ConditionalHttpClient:
+    """
+    Thin wrapper around an httpx client that revalidates GETs with If-None-Match.
+
+    When the provider answers 304 Not Modified, the cached body is replayed as a
+    regular 200 response so callers handle both cases identically.
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        cache: Optional[RemoteRepoCache] = None,
+        scope: str = ""
+    ):
+        self.http_client = http_client
+        self.cache = cache
+        self.scope = scope
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """Issue a GET, sending If-None-Match when a cached ETag is available."""
+        if self.cache is None:
+            return await self.http_client.get(url, headers=headers, params=params)
+
+        request_key = str(httpx.URL(url, params=params))
+        cached = self.cache.get_response(self.scope, request_key)
+        request_headers = dict(headers or {})
+        if cached is not None:
+            request_headers["If-None-Match"] = cached.etag
+
+        response = await self.http_client.get(url, headers=request_headers, params=params)
+
+        if response.status_code == 304 and cached is not None:
+            logger.debug(f"Remote listing not modified: {request_key}")
+            return httpx.Response(
+                200,
+                content=cached.body,
+                headers=cached.headers,
+                request=response.request
+            )
+
+        etag = response.headers.get("etag")
+        if response.status_code == 200 and etag:
+            self.cache.set_response(self.scope, request_key, CachedHttpResponse(
+                etag=etag,
+                body=response.content,
+                headers={
+                    name: response.headers[name]
+                    for name in _REPLAYED_HEADERS
+                    if name in response.headers
+                }
+            ))
+        return response
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Issue a POST; never cached."""
+        return await self.http_client.post(url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close the wrapped client."""
+        await self.http_client.aclose()
+
+
+async def fetch_remaining_pages(
+    fetch_page: Callable[[int], Awaitable[List[T]]],
+    total_pages: int,
+    max_concurrency: int = 4
+) -> List[T]:
+    """
+    Fetch pages 2..total_pages concurrently and return their items in page order.
+
+    Args:
+        fetch_page: Coroutine function returning the items of a single page
+        total_pages: Total number of pages reported by the provider
+        max_concurrency: Maximum number of in-flight page requests
+
+    Returns:
+        List[T]: Items of pages 2..total_pages, concatenated in order
+    """
+    if total_pages < 2:
+        return []
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded(page: int) -> List[T]:
+        async with semaphore:
+            return await fetch_page(page)
+
+    pages = await asyncio.gather(*(_bounded(page) for page in range(2, total_pages + 1)))
+    return [item for page_items in pages for item in page_items]
+
+
+# Process-wide cache instance shared by all RemoteRepoService instances
+_remote_repo_cache: Optional[RemoteRepoCache] = None
+
+
+def get_remote_repo_cache() -> RemoteRepoCache:
+    """Return the process-wide remote repository cache."""
+    global _remote_repo_cache
+    if _remote_repo_cache is None:
+        _remote_repo_cache = RemoteRepoCache(result_ttl_seconds=settings.remote_repo_cache_ttl_seconds)
+    return _remote_repo_cache
@@ -7,9 +7,10 @@ including fetching repository lists and branch information.
 
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from sqlmodel import Session
+from lib.tracing import traced
 from database.models.user_sessions import UserSessions
 from settings import settings
 from services.oauth.models import OAuthError
@@ -18,6 +19,11 @@ from database.daos.user.user_repos_dao import UserReposDAO
 from database.models.user_repos import RepoStatus
 from services.remote_repo.models import RepositoryList, RepositoryBranchesResponse, PullRequestResult
 from services.remote_repo.remote_repo_interface import IRemoteRepo
+from services.remote_repo.remote_repo_cache import (
+    RemoteRepoCache,
+    get_remote_repo_cache,
+    token_fingerprint,
+)
 from services.remote_repo.providers import (
     GitHubRepoLocator,
     GitLabRepoLocator,
@@ -33,23 +39,24 @@ class RemoteRepoService:
     Service class for locating and cloning repositories using different strategies.
     Uses constructor injection for config and auth services following SOLID principles.
     """
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: Optional[RemoteRepoCache] = None):
         self.db = db
         self.user_dao = UserDAO(db)
         self.user_repos_dao = UserReposDAO(db)
+        self.cache = cache or get_remote_repo_cache()
     
-    async def get_repositories(
-        self,
-        user_session: UserSessions
-    ) -> RepositoryList:
+    def _create_locator(self, user_session: UserSessions) -> Tuple[IRemoteRepo, str]:
         """
-        Get repositories for a given user based on the configured locator strategy.
+        Build the provider locator for a user session.
+        
+        The locator shares the cache's HTTP client and ETag store, scoped to the
+        user, provider and credential so entries never leak across users.
         
         Args:
-            user_id: The ID of the user to fetch repositories for.
-
+            user_session: User session containing OAuth credentials
+        
         Returns:
-            RepositoryList: A list of repository information.
+            Tuple[IRemoteRepo, str]: The locator and its cache scope
         """
         try:
             user = self.user_dao.get_user_by_id(user_session.user_id)
@@ -70,74 +77,90 @@ class RemoteRepoService:
         if not oauth_provider or not oauth_token:
             raise ValueError(f"OAuth provider and token not configured for user {user_session.user_id}")
         
+        provider = oauth_provider.lower()
+        scope = f"{user_session.user_id}:{provider}:{token_fingerprint(oauth_token)}"
+        locator_kwargs = {
+            "http_client": self.cache.get_http_client(),
+            "cache": self.cache,
+            "cache_scope": scope,
+        }
+        
         locator: IRemoteRepo
-        if oauth_provider.lower() == "github":
-            locator = GitHubRepoLocator(oauth_token)
-        elif oauth_provider.lower() == "gitlab":
-            locator = GitLabRepoLocator(oauth_token)
-        elif oauth_provider.lower() == "bitbucket":
+        if provider == "github":
+            locator = GitHubRepoLocator(oauth_token, **locator_kwargs)
+        elif provider == "gitlab":
+            locator = GitLabRepoLocator(oauth_token, **locator_kwargs)
+        elif provider == "bitbucket":
             username = oauth_username
             if not username:
                 raise ValueError(f"OAuth username not configured for user {user_session.user_id} with Bitbucket")
-            locator = BitbucketRepoLocator(oauth_token, username)
+            locator = BitbucketRepoLocator(oauth_token, username, **locator_kwargs)
         else:
             raise OAuthError(f"Unsupported provider: {oauth_provider}", oauth_provider)
         
-        async with locator:
-            return await locator.get_repositories()
+        return locator, scope
+    
+    @traced("remote_repo.get_repositories")
+    async def get_repositories(
+        self,
+        user_session: UserSessions,
+        force_refresh: bool = False
+    ) -> RepositoryList:
+        """
+        Get repositories for a given user based on the configured locator strategy.
+        
+        Results are cached per user for a short TTL; after that the provider is
+        revalidated with conditional requests.
+        
+        Args:
+            user_session: Session of the user to fetch repositories for.
+            force_refresh: Skip the TTL cache (conditional requests are still used).
+
+        Returns:
+            RepositoryList: A list of repository information.
+        """
+        locator, scope = self._create_locator(user_session)
+        if force_refresh:
+            self.cache.invalidate(scope, "repositories")
+        
+        async def fetch() -> RepositoryList:
+            async with locator:
+                return await locator.get_repositories()
+        
+        return await self.cache.get_or_fetch(scope, "repositories", fetch)
     
+    @traced("remote_repo.get_repository_branches")
     async def get_repository_branches(
         self,
         user_session: UserSessions,
         owner: str,
-        repo: str
+        repo: str,
+        force_refresh: bool = False
     ) -> RepositoryBranchesResponse:
         """
         Get branches for a specific repository.
         
         Args:
-            user_id: The ID of the user to fetch branches for
+            user_session: Session of the user to fetch branches for
             owner: Repository owner/organization
             repo: Repository name
+            force_refresh: Skip the TTL cache (conditional requests are still used)
         
         Returns:
             RepositoryBranchesResponse: Branch information for the repository
         """
-        try:
-            user = self.user_dao.get_user_by_id(user_session.user_id)
-            if not user:
-                raise ValueError(f"User not found for ID: {user_session.user_id}")
-
-            oauth_provider = user.oauth_provider
-            oauth_token = user_session.oauth_token
-            oauth_username = user.oauth_username
-
-        except ValueError as e:
-            logger.error(f"Failed to retrieve user or session data: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"An unexpected error occurred while fetching OAuth details: {e}")
-            raise
-
-        if not oauth_provider or not oauth_token:
-            raise ValueError(f"OAuth provider and token not configured for user {user_session.user_id}")
+        locator, scope = self._create_locator(user_session)
+        cache_key = f"branches:{owner}/{repo}"
+        if force_refresh:
+            self.cache.invalidate(scope, cache_key)
         
-        locator: IRemoteRepo
-        if oauth_provider.lower() == "github":
-            locator = GitHubRepoLocator(oauth_token)
-        elif oauth_provider.lower() == "gitlab":
-            locator = GitLabRepoLocator(oauth_token)
-        elif oauth_provider.lower() == "bitbucket":
-            username = oauth_username
-            if not username:
-                raise ValueError(f"OAuth username not configured for user {user_session.user_id} with Bitbucket")
-            locator = BitbucketRepoLocator(oauth_token, username)
-        else:
-            raise OAuthError(f"Unsupported provider: {oauth_provider}", oauth_provider)
+        async def fetch() -> RepositoryBranchesResponse:
+            async with locator:
+                return await locator.get_repository_branches(owner, repo)
         
-        async with locator:
-            return await locator.get_repository_branches(owner, repo)
+        return await self.cache.get_or_fetch(scope, cache_key, fetch)
     
+    @traced("remote_repo.clone_user_repository")
     def clone_user_repository(
         self,
         user_id: str,
@@ -221,6 +244,7 @@ class RemoteRepoService:
                 self.db.rollback()
             return False
     
+    @traced("remote_repo.create_pull_request_if_not_exists")
     async def create_pull_request_if_not_exists(
         self,
         user_session: UserSessions,
@@ -248,37 +272,9 @@ class RemoteRepoService:
         Returns:
             PullRequestResult: Result of the operation
         """
-        try:
-            user = self.user_dao.get_user_by_id(user_session.user_id)
-            if not user:
-                raise ValueError(f"User not found for ID: {user_session.user_id}")
-
-            oauth_provider = user.oauth_provider
-            oauth_token = user_session.oauth_token
-            oauth_username = user.oauth_username
-
-        except ValueError as e:
-            logger.error(f"Failed to retrieve user or session data: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"An unexpected error occurred while fetching OAuth details: {e}")
-            raise
-
-        if not oauth_provider or not oauth_token:
-            raise ValueError(f"OAuth provider and token not configured for user {user_session.user_id}")
-        
-        locator: IRemoteRepo
-        if oauth_provider.lower() == "github":
-            locator = GitHubRepoLocator(oauth_token)
-        elif oauth_provider.lower() == "gitlab":
-            locator = GitLabRepoLocator(oauth_token)
-        elif oauth_provider.lower() == "bitbucket":
-            username = oauth_username
-            if not username:
-                raise ValueError(f"OAuth username not configured for user {user_session.user_id} with Bitbucket")
-            locator = BitbucketRepoLocator(oauth_token, username)
-        else:
-            raise OAuthError(f"Unsupported provider: {oauth_provider}", oauth_provider)
+        locator, scope = self._create_locator(user_session)
+        # The head branch was just pushed, so the cached branch listing is stale
+        self.cache.invalidate(scope, f"branches:{owner}/{repo}")
         
         async with locator:
             # Check if PR already exists
@@ -1,6 +1,7 @@
 """
 Shared chat service module.
 """
+from .shared_chat_cache import SharedChatCache, CachedSharedChat, get_shared_chat_cache
 from .shared_chat_service import SharedChatService
 
-__all__ = ["SharedChatService"]
+__all__ = ["SharedChatService", "SharedChatCache", "CachedSharedChat", "get_shared_chat_cache"]
@@ -0,0 +1,142 @@
+"""
+Response cache for public shared chat reads.
+
+A shared chat never changes after it is created; it can only be deleted. The
+public read endpoint therefore caches the serialized response body per
+share_id together with a strong ETag derived from those bytes, so repeated
+views skip the database and the re-serialization of the message array, and
+clients/CDNs can revalidate with If-None-Match.
+
+Entries expire after a TTL so workers that did not handle a delete stop
+serving the chat within the same window a CDN would.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from pydantic import BaseModel
+
+from lib.metrics import record_cache_lookup
+from settings import settings
+
+
+class CachedSharedChat(BaseModel):
+    """Serialized public response of a shared chat."""
+    etag: str
+    body: bytes
+
+
+def compute_etag(body: bytes) -> str:
+    """Return the strong (quoted) ETag of a response body."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so
+    W/-prefixed validators from intermediaries still match.
+
+    Args:
+        if_none_match: Raw If-None-Match header value
+        etag: Current strong ETag of the resource
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+class SharedChatCache:
+    """Thread-safe, bounded LRU of serialized shared chat responses keyed by share_id."""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 300.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of shared chats kept
+            ttl_seconds: Seconds an entry is served before it is rebuilt
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, CachedSharedChat]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, share_id: str) -> Optional[CachedSharedChat]:
+        """
+        Return the cached response for share_id, if present and not expired.
+
+        Args:
+            share_id: The share identifier
+
+        Returns:
+            Optional[CachedSharedChat]: Cached response, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(share_id)
+            if entry is None:
+                record_cache_lookup("shared_chat", hit=False)
+                return None
+            stored_at, cached = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[share_id]
+                record_cache_lookup("shared_chat", hit=False)
+                return None
+            self._entries.move_to_end(share_id)
+            record_cache_lookup("shared_chat", hit=True)
+            return cached
+
+    def put(self, share_id: str, body: bytes) -> CachedSharedChat:
+        """
+        Store a serialized response and return it with its ETag.
+
+        Args:
+            share_id: The share identifier
+            body: Serialized response body
+
+        Returns:
+            CachedSharedChat: The stored entry
+        """
+        cached = CachedSharedChat(etag=compute_etag(body), body=body)
+        with self._lock:
+            self._entries[share_id] = (time.monotonic(), cached)
+            self._entries.move_to_end(share_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def invalidate(self, share_id: str) -> None:
+        """Drop the cached response of share_id, if any."""
+        with self._lock:
+            self._entries.pop(share_id, None)
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+
+
+_shared_chat_cache: Optional[SharedChatCache] = None
+
+
+def get_shared_chat_cache() -> SharedChatCache:
+    """Return the process-wide shared chat response cache."""
+    global _shared_chat_cache
+    if _shared_chat_cache is None:
+        _shared_chat_cache = SharedChatCache(
+            max_entries=settings.shared_chat_cache_max_entries,
+            ttl_seconds=settings.shared_chat_cache_max_age
+        )
+    return _shared_chat_cache
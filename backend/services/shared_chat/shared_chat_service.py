@@ -3,7 +3,9 @@ Service for managing shared chat functionality.
 Handles business logic for creating and retrieving shared chats.
 """
 from datetime import datetime, UTC
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
+import base64
+import json
 import logging
 
 from database.daos.shared_chat import SharedChatDAO
@@ -13,10 +15,16 @@ from schemas.shared_chat import (
     CreateSharedChatResponse,
     SharedChatResponse,
     SharedChatListItem,
+    SharedChatListPage,
     SharedChatMessage,
     SharedChatModelConfig,
 )
-from middlewares.rest import NotFoundException
+from services.shared_chat.shared_chat_cache import (
+    CachedSharedChat,
+    SharedChatCache,
+    get_shared_chat_cache,
+)
+from middlewares.rest import BadRequestException, NotFoundException, success_response
 
 logger = logging.getLogger(__name__)
 
@@ -24,16 +32,30 @@ logger = logging.getLogger(__name__)
 class SharedChatService:
     """Service for shared chat operations."""
 
-    def __init__(self, dao: SharedChatDAO, base_url: str = ""):
+    def __init__(
+        self,
+        dao: SharedChatDAO,
+        base_url: str = "",
+        response_cache: Optional[SharedChatCache] = None
+    ):
         """
         Initialize SharedChatService.
 
         Args:
             dao: SharedChatDAO instance
             base_url: Base URL for generating share links
+            response_cache: Cache of serialized public responses (defaults to the process-wide cache)
         """
         self.dao = dao
         self.base_url = base_url
+        self._response_cache = response_cache
+
+    @property
+    def response_cache(self) -> SharedChatCache:
+        """Cache of serialized public shared chat responses."""
+        if self._response_cache is None:
+            self._response_cache = get_shared_chat_cache()
+        return self._response_cache
 
     def _generate_unique_share_id(self) -> str:
         """
@@ -82,6 +104,7 @@ class SharedChatService:
             prompt_meta=request.prompt_meta,
             total_tokens=request.total_tokens,
             total_cost=request.total_cost,
+            message_count=len(messages_data),
             created_by=user_id,
             created_at=datetime.now(UTC),
             is_active=True,
@@ -118,8 +141,53 @@ class SharedChatService:
         Raises:
             NotFoundException: If shared chat not found
         """
-        shared_chat = self.dao.get_by_share_id(share_id)
+        return self._to_response(share_id, self.dao.get_by_share_id(share_id))
+
+    async def aget_shared_chat(self, share_id: str) -> SharedChatResponse:
+        """
+        Get a shared chat by its share ID without blocking the event loop.
+
+        Args:
+            share_id: The share identifier
+
+        Returns:
+            SharedChatResponse with chat data
+
+        Raises:
+            NotFoundException: If shared chat not found
+        """
+        return self._to_response(share_id, await self.dao.aget_by_share_id(share_id))
 
+    async def aget_shared_chat_cached(self, share_id: str) -> CachedSharedChat:
+        """
+        Get the serialized public response of a shared chat, with its ETag.
+
+        Shared chats are immutable once created, so the serialized response is
+        kept in the response cache until the chat is deleted or the entry ages out.
+
+        Args:
+            share_id: The share identifier
+
+        Returns:
+            CachedSharedChat with the response body and its ETag
+
+        Raises:
+            NotFoundException: If shared chat not found
+        """
+        cached = self.response_cache.get(share_id)
+        if cached is not None:
+            return cached
+
+        shared_chat = await self.aget_shared_chat(share_id)
+        body = success_response(
+            data=shared_chat,
+            message="Shared chat retrieved successfully"
+        ).model_dump_json().encode("utf-8")
+        return self.response_cache.put(share_id, body)
+
+    @staticmethod
+    def _to_response(share_id: str, shared_chat: Optional[SharedChats]) -> SharedChatResponse:
+        """Convert a stored shared chat to its response, raising if it was not found."""
         if not shared_chat:
             logger.warning(f"Shared chat not found: {share_id}")
             raise NotFoundException(
@@ -150,37 +218,107 @@ class SharedChatService:
         self,
         user_id: str,
         limit: int = 50,
-        offset: int = 0
-    ) -> List[SharedChatListItem]:
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> SharedChatListPage:
         """
-        List all shared chats created by a user.
+        List the shared chats created by a user, newest first.
 
         Args:
             user_id: User ID
             limit: Maximum number of results
-            offset: Number of records to skip
+            offset: Number of records to skip (ignored when cursor is given)
+            cursor: Opaque cursor returned with the previous page
 
         Returns:
-            List of SharedChatListItem
-        """
-        shared_chats = self.dao.get_by_user(user_id, limit, offset)
-
-        items = []
-        for chat in shared_chats:
-            messages_data = chat.messages.get("messages", [])
-            items.append(
-                SharedChatListItem(
-                    id=chat.id,
-                    share_id=chat.share_id,
-                    title=chat.title,
-                    total_tokens=chat.total_tokens,
-                    total_cost=chat.total_cost,
-                    created_at=chat.created_at,
-                    message_count=len(messages_data),
-                )
+            SharedChatListPage with the items and the cursor of the next page
+
+        Raises:
+            BadRequestException: If the cursor is malformed
+        """
+        rows = self.dao.get_summaries_by_user(
+            user_id, limit + 1, offset, self.decode_cursor(cursor)
+        )
+        return self._to_page(rows, limit)
+
+    async def alist_user_shared_chats(
+        self,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> SharedChatListPage:
+        """
+        List the shared chats created by a user without blocking the event loop.
+
+        Args:
+            user_id: User ID
+            limit: Maximum number of results
+            offset: Number of records to skip (ignored when cursor is given)
+            cursor: Opaque cursor returned with the previous page
+
+        Returns:
+            SharedChatListPage with the items and the cursor of the next page
+
+        Raises:
+            BadRequestException: If the cursor is malformed
+        """
+        rows = await self.dao.aget_summaries_by_user(
+            user_id, limit + 1, offset, self.decode_cursor(cursor)
+        )
+        return self._to_page(rows, limit)
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, chat_id: str) -> str:
+        """
+        Encode the keyset position of a listed chat as an opaque cursor.
+
+        Args:
+            created_at: Creation time of the last chat on the page
+            chat_id: Database ID of the last chat on the page
+
+        Returns:
+            URL-safe cursor string
+        """
+        payload = json.dumps({"created_at": created_at.isoformat(), "id": chat_id})
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+        """
+        Decode a cursor produced by encode_cursor.
+
+        Args:
+            cursor: Cursor string, or None for the first page
+
+        Returns:
+            (created_at, id) tuple, or None when no cursor was given
+
+        Raises:
+            BadRequestException: If the cursor is malformed
+        """
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            return datetime.fromisoformat(payload["created_at"]), str(payload["id"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise BadRequestException(
+                message="Invalid pagination cursor",
+                context={"cursor": cursor, "reason": str(e)}
             )
 
-        return items
+    @classmethod
+    def _to_page(cls, rows: List[Any], limit: int) -> SharedChatListPage:
+        """Convert summary rows (fetched with one extra row) to a page."""
+        has_more = len(rows) > limit
+        items = [SharedChatListItem.model_validate(row) for row in rows[:limit]]
+        next_cursor = None
+        if has_more and items:
+            last = items[-1]
+            next_cursor = cls.encode_cursor(last.created_at, last.id)
+        return SharedChatListPage(items=items, next_cursor=next_cursor)
 
     def delete_shared_chat(self, share_id: str, user_id: str) -> bool:
         """
@@ -197,6 +335,7 @@ class SharedChatService:
             NotFoundException: If shared chat not found or not owned by user
         """
         success = self.dao.delete(share_id, user_id)
+        self.response_cache.invalidate(share_id)
 
         if not success:
             raise NotFoundException(
@@ -19,6 +19,10 @@ class Settings(BaseSettings):
         description="Database URL"
     )
     database_echo: bool = Field(default=True, description="Echo SQL queries")
+    sqlite_production_profile: bool = Field(
+        default=False,
+        description="Run SQLite in WAL mode with tuned pragmas and serialize writing sessions of this process"
+    )
 
     # Server Configuration
     host: str = Field(default="0.0.0.0", description="Server host")
@@ -46,6 +50,273 @@ class Settings(BaseSettings):
         description="Directory for storing metadata files (e.g., tools, evals, executions)"
     )
 
+    warm_model_lists_on_startup: bool = Field(
+        default=True,
+        description="Prefetch provider model lists for DEFAULT_LLM_CONFIGS in the background at startup"
+    )
+
+    warm_heavy_stacks_on_startup: bool = Field(
+        default=False,
+        description="Import the agent and eval libraries in a background thread after startup instead of on first use"
+    )
+
+    eval_max_concurrent_tests: int = Field(
+        default=8,
+        description="Maximum number of eval tests executed concurrently"
+    )
+
+    eval_max_concurrent_requests_per_provider: int = Field(
+        default=4,
+        description="Maximum in-flight eval completions per LLM provider"
+    )
+
+    eval_max_concurrent_judge_calls_per_provider: int = Field(
+        default=4,
+        description="Maximum in-flight LLM-judge (metric) completions per LLM provider"
+    )
+
+    eval_judge_max_clients: int = Field(
+        default=32,
+        description="Maximum LLM-judge provider clients (each with its own connection pool) kept open; the least recently used is closed"
+    )
+
+    eval_batch_judge_metrics: bool = Field(
+        default=True,
+        description="Evaluate LLM-judged metrics of an eval run in grouped batches after its prompts ran"
+    )
+
+    eval_batch_deterministic_metrics: bool = Field(
+        default=True,
+        description="Score deterministic metrics of an eval run in one batch pass per metric, off the event loop"
+    )
+
+    eval_max_concurrent_judge_cases: int = Field(
+        default=16,
+        description="Maximum test cases measured at once per metric/judge model group in a batch"
+    )
+
+    llm_rate_limit_enabled: bool = Field(
+        default=True,
+        description="Meter provider calls of every feature through the shared provider rate limiter"
+    )
+
+    llm_default_rpm_limit: int = Field(
+        default=0,
+        description="Requests per minute per provider, API key and model when its LLM config sets no rpm_limit (0 = unlimited)"
+    )
+
+    llm_default_tpm_limit: int = Field(
+        default=0,
+        description="Tokens per minute per provider, API key and model when its LLM config sets no tpm_limit (0 = unlimited)"
+    )
+
+    llm_max_concurrent_requests: int = Field(
+        default=16,
+        description="Maximum in-flight requests per provider, API key and model across all features"
+    )
+
+    llm_interactive_reserve_ratio: float = Field(
+        default=0.1,
+        description="Share of each rate budget batch requests (evals, judges) leave free for interactive requests"
+    )
+
+    llm_rate_limit_processes: int = Field(
+        default=1,
+        description="Processes (server workers, eval shard workers) sharing the provider quotas; each gets an equal share"
+    )
+
+    llm_rate_limit_max_retries: int = Field(
+        default=3,
+        description="Retries of a provider call rejected by a rate limit"
+    )
+
+    llm_rate_limit_backoff_seconds: float = Field(
+        default=1.0,
+        description="Pause after a rate limit without Retry-After, doubled per retry"
+    )
+
+    eval_job_workers: int = Field(
+        default=2,
+        description="Number of background eval jobs executed at once"
+    )
+
+    eval_job_store_path: str = Field(
+        default="/persistence/eval_jobs.db",
+        description="SQLite file storing background eval jobs and their checkpointed test results"
+    )
+
+    eval_job_checkpoint_tests: int = Field(
+        default=8,
+        description="Tests of a background eval job whose batched metrics are evaluated together before their results are checkpointed"
+    )
+
+    eval_job_retention_days: int = Field(
+        default=7,
+        description="Days finished background eval jobs and their checkpoints are kept"
+    )
+
+    eval_shard_queue_url: str = Field(
+        default="sqlite:////persistence/eval_shards.db",
+        description=(
+            "Queue of sharded eval runs: memory:// (in-process), sqlite:///<path> (worker processes on this node) "
+            "or module:factory of a custom backend shared by workers on other nodes"
+        )
+    )
+
+    eval_shard_local_workers: int = Field(
+        default=4,
+        description="Worker processes started on this node for a sharded eval run (0 leaves the shards to remote workers)"
+    )
+
+    eval_shard_size: int = Field(
+        default=50,
+        description="Tests per shard of a sharded eval run"
+    )
+
+    eval_shard_lease_seconds: int = Field(
+        default=1800,
+        description="Seconds a worker holds a shard before another worker may claim it again"
+    )
+
+    eval_shard_timeout_seconds: int = Field(
+        default=0,
+        description="Seconds a sharded eval run waits for its shards; tests of unfinished shards are reported as errors (0 waits indefinitely)"
+    )
+
+    completion_cache_mode: str = Field(
+        default="off",
+        description="Default completion cache mode for evals: off, read_write, record or replay"
+    )
+
+    completion_cache_path: str = Field(
+        default="/persistence/completion_cache",
+        description="Directory for the on-disk completion cache"
+    )
+
+    completion_cache_max_mb: int = Field(
+        default=256,
+        description="Maximum size of the completion cache in megabytes"
+    )
+
+    completion_failover_timeout_seconds: float = Field(
+        default=60.0,
+        description="Seconds the primary model of a prompt with a failover_model gets before the failover model is used (0 waits indefinitely)"
+    )
+
+    completion_hedging_enabled: bool = Field(
+        default=False,
+        description="Also send a completion to the failover model when the primary is slower than usual; the first response wins"
+    )
+
+    completion_hedge_quantile: float = Field(
+        default=0.95,
+        description="Latency quantile of the primary model after which a hedged request is sent"
+    )
+
+    completion_hedge_default_delay_seconds: float = Field(
+        default=10.0,
+        description="Hedge delay used until enough latencies of the primary model have been observed"
+    )
+
+    completion_hedge_min_delay_seconds: float = Field(
+        default=0.5,
+        description="Lower bound of the hedge delay"
+    )
+
+    embedding_cache_path: str = Field(
+        default="/persistence/embedding_cache.db",
+        description="SQLite file of the persistent embedding vector cache"
+    )
+
+    embedding_cache_max_entries: int = Field(
+        default=200_000,
+        description="Maximum number of vectors kept in the embedding cache"
+    )
+
+    embedding_batch_size: int = Field(
+        default=128,
+        description="Maximum texts sent in one embedding request"
+    )
+
+    git_repo_handles_max: int = Field(
+        default=32,
+        description="Maximum number of open git repository handles (each keeps cat-file processes running)"
+    )
+
+    git_repo_handle_idle_seconds: float = Field(
+        default=300.0,
+        description="Seconds an unused git repository handle stays open"
+    )
+
+    artifact_ref_cache_max_entries: int = Field(
+        default=2048,
+        description="Maximum number of artifacts read at a git ref kept parsed in memory"
+    )
+
+    artifact_diff_cache_max_entries: int = Field(
+        default=1024,
+        description="Maximum number of computed artifact version diffs kept in memory"
+    )
+
+    remote_repo_cache_ttl_seconds: float = Field(
+        default=60.0,
+        description="Seconds remote repository and branch listings are served without revalidating them with the provider"
+    )
+
+    shared_chat_cache_max_age: int = Field(
+        default=300,
+        description="Seconds public shared chat responses may be cached by clients, CDNs and the server"
+    )
+
+    shared_chat_cache_max_entries: int = Field(
+        default=512,
+        description="Maximum number of shared chat responses kept in memory"
+    )
+
+    metrics_enabled: bool = Field(
+        default=False,
+        description=(
+            "Serve Prometheus metrics at /metrics. Off by default: metrics expose routes, model and provider "
+            "names, token and cost counters and eval volumes; set metrics_bearer_token when the API is reachable "
+            "by others than the scraper"
+        )
+    )
+
+    metrics_bearer_token: str = Field(
+        default="",
+        description="Bearer token scrapers must send to /metrics (empty = no authentication)"
+    )
+
+    tracing_enabled: bool = Field(
+        default=False,
+        description="Export OpenTelemetry spans of requests, services, git operations and LLM calls"
+    )
+
+    tracing_exporters: str = Field(
+        default="otlp",
+        description="Comma-separated span exporters: otlp, console and/or file"
+    )
+
+    tracing_otlp_endpoint: str = Field(
+        default="",
+        description="OTLP/HTTP traces endpoint (empty uses OTEL_EXPORTER_OTLP_* variables or http://localhost:4318/v1/traces)"
+    )
+
+    tracing_file_path: str = Field(
+        default="/persistence/traces.jsonl",
+        description="JSON-lines file the file exporter appends spans to"
+    )
+
+    tracing_service_name: str = Field(
+        default="promptrepo-backend",
+        description="service.name reported with exported spans"
+    )
+
+    tracing_sample_ratio: float = Field(
+        default=1.0,
+        description="Share of new traces sampled; requests continuing a trace follow its sampling decision"
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -0,0 +1,150 @@
+"""
+Benchmark for SQLite under mixed read/write load.
+
+Compares the plain SQLite configuration (rollback journal, no writer queue)
+with the production profile of SQLiteAdapter (WAL, tuned pragmas, single
+writer). Writer threads insert rows while reader threads query them, each
+operation using its own session as request handlers do.
+
+Skipped by default; run with:
+    RUN_BENCHMARKS=1 python -m pytest tests/benchmarks -s
+or directly:
+    python -m tests.benchmarks.test_sqlite_concurrency
+"""
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import Dict, List
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlmodel import select
+
+from database.database_adapter import SQLiteAdapter
+from database.models.user import User
+
+DURATION_SECONDS = float(os.environ.get("BENCHMARK_DURATION_SECONDS", "3"))
+WRITER_THREADS = 4
+READER_THREADS = 8
+
+
+def _percentile(samples: List[float], percentile: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * percentile))
+    return ordered[index]
+
+
+def run_mixed_load(
+    production_profile: bool,
+    duration_seconds: float = DURATION_SECONDS
+) -> Dict[str, float]:
+    """
+    Run writers and readers concurrently against a fresh database.
+
+    Args:
+        production_profile: Whether the adapter uses the production profile
+        duration_seconds: How long to run the load
+
+    Returns:
+        Dict[str, float]: Throughput, error count and read latency percentiles
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        adapter = SQLiteAdapter(
+            f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}",
+            production_profile=production_profile
+        )
+        adapter.create_tables()
+
+        stop = threading.Event()
+        lock = threading.Lock()
+        counters = {"writes": 0, "reads": 0, "errors": 0}
+        read_latencies: List[float] = []
+
+        def writer() -> None:
+            while not stop.is_set():
+                session_generator = adapter.get_session()
+                session = next(session_generator)
+                try:
+                    session.add(User(
+                        id=str(uuid.uuid4()),
+                        oauth_provider="github",
+                        oauth_username=f"user-{uuid.uuid4().hex[:8]}"
+                    ))
+                    session.commit()
+                    with lock:
+                        counters["writes"] += 1
+                except OperationalError:
+                    session.rollback()
+                    with lock:
+                        counters["errors"] += 1
+                finally:
+                    session_generator.close()
+
+        def reader() -> None:
+            while not stop.is_set():
+                session_generator = adapter.get_session()
+                session = next(session_generator)
+                started = time.perf_counter()
+                try:
+                    session.exec(select(User).limit(20)).all()
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        counters["reads"] += 1
+                        read_latencies.append(elapsed)
+                except OperationalError:
+                    with lock:
+                        counters["errors"] += 1
+                finally:
+                    session_generator.close()
+
+        threads = [threading.Thread(target=writer) for _ in range(WRITER_THREADS)]
+        threads += [threading.Thread(target=reader) for _ in range(READER_THREADS)]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration_seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        adapter.engine.dispose()
+
+    return {
+        "writes_per_second": counters["writes"] / duration_seconds,
+        "reads_per_second": counters["reads"] / duration_seconds,
+        "errors": counters["errors"],
+        "read_p50_ms": _percentile(read_latencies, 0.50) * 1000,
+        "read_p99_ms": _percentile(read_latencies, 0.99) * 1000,
+    }
+
+
+def _report(name: str, result: Dict[str, float]) -> None:
+    print(
+        f"{name:<12} writes/s={result['writes_per_second']:>8.1f} "
+        f"reads/s={result['reads_per_second']:>8.1f} errors={result['errors']:>4} "
+        f"read p50={result['read_p50_ms']:.2f}ms p99={result['read_p99_ms']:.2f}ms"
+    )
+
+
+@pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run benchmarks")
+class TestSQLiteConcurrencyBenchmark:
+    """Mixed read/write benchmark for the SQLite production profile"""
+
+    def test_production_profile_under_mixed_load(self):
+        """Test the production profile sustains mixed load without lock errors and with faster reads"""
+        baseline = run_mixed_load(production_profile=False)
+        production = run_mixed_load(production_profile=True)
+        _report("baseline", baseline)
+        _report("production", production)
+
+        assert production["errors"] == 0
+        assert production["writes_per_second"] > 0
+        assert production["reads_per_second"] >= baseline["reads_per_second"]
+
+
+if __name__ == "__main__":
+    _report("baseline", run_mixed_load(production_profile=False))
+    _report("production", run_mixed_load(production_profile=True))
@@ -8,7 +8,7 @@ Tests cover:
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 
 from lib.deepeval.deepeval_adapter import DeepEvalAdapter
 from services.evals.models import MetricConfig, MetricType, MetricResult
@@ -165,7 +165,7 @@ class TestMetricEvaluation:
         
         # Create mock metric that raises exception
         mock_metric = Mock()
-        mock_metric.measure.side_effect = Exception("Metric evaluation failed")
+        mock_metric.a_measure = AsyncMock(side_effect=Exception("Metric evaluation failed"))
         
         config = MetricConfig(
             type=MetricType.ANSWER_RELEVANCY,
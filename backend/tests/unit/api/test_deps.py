@@ -136,7 +136,7 @@ class TestAuthenticationDependencies:
             mock_config = Mock()
             mock_config.type = HostingType.ORGANIZATION
             mock_config_service.get_hosting_config.return_value = mock_config
-            mock_session_service.is_session_valid.return_value = None
+            mock_session_service.ais_session_valid.return_value = None
             
             with pytest.raises(AuthenticationException) as exc_info:
                 await get_current_user(
@@ -146,7 +146,7 @@ class TestAuthenticationDependencies:
                 )
             
             assert "Authentication Required" in str(exc_info.value)
-            mock_session_service.is_session_valid.assert_called_once_with("test-session-id")
+            mock_session_service.ais_session_valid.assert_awaited_once_with("test-session-id")
 
         @pytest.mark.asyncio
         async def test_successful_authentication(self, mock_config_service, mock_session_service, mock_user_session):
@@ -155,7 +155,7 @@ class TestAuthenticationDependencies:
             mock_config = Mock()
             mock_config.type = HostingType.ORGANIZATION
             mock_config_service.get_hosting_config.return_value = mock_config
-            mock_session_service.is_session_valid.return_value = mock_user_session
+            mock_session_service.ais_session_valid.return_value = mock_user_session
             
             result = await get_current_user(
                 session_service=mock_session_service,
@@ -164,14 +164,14 @@ class TestAuthenticationDependencies:
             )
             
             assert result == "test-user-123"
-            mock_session_service.is_session_valid.assert_called_once_with("test-session-id")
+            mock_session_service.ais_session_valid.assert_awaited_once_with("test-session-id")
 
         @pytest.mark.asyncio
         async def test_hosting_config_exception(self, mock_config_service, mock_session_service, mock_user_session):
             """Test that authentication continues when hosting config fails"""
             # Setup mocks to raise exception on get_hosting_config
             mock_config_service.get_hosting_config.side_effect = Exception("Config error")
-            mock_session_service.is_session_valid.return_value = mock_user_session
+            mock_session_service.ais_session_valid.return_value = mock_user_session
             
             result = await get_current_user(
                 session_service=mock_session_service,
@@ -227,7 +227,7 @@ class TestAuthenticationDependencies:
             mock_config.type = HostingType.ORGANIZATION
             mock_config_service.get_hosting_config.return_value = mock_config
             mock_get_session.return_value = "test-session-id"
-            mock_session_service.is_session_valid.return_value = None
+            mock_session_service.ais_session_valid.return_value = None
             
             result = await get_optional_user(
                 session_service=mock_session_service,
@@ -239,18 +239,18 @@ class TestAuthenticationDependencies:
 
         @patch('api.deps.get_session_from_cookie')
         @pytest.mark.asyncio
-        async def test_session_not_found_returns_none(self, mock_get_session, mock_config_service, mock_session_service, mock_request):
-            """Test that session not found returns None"""
+        async def test_validated_session_is_not_fetched_again(self, mock_get_session, mock_config_service, mock_session_service, mock_request):
+            """Test that the session returned by validation is used without a second lookup"""
             # Setup mocks
             mock_config = Mock()
             mock_config.type = HostingType.ORGANIZATION
             mock_config_service.get_hosting_config.return_value = mock_config
             mock_get_session.return_value = "test-session-id"
             
-            # Create a mock session object for is_session_valid to return
+            # The validated session is used directly; no second lookup is made
             mock_session = Mock(spec=UserSessions)
             mock_session.user_id = "test-user-123"
-            mock_session_service.is_session_valid.return_value = mock_session
+            mock_session_service.ais_session_valid.return_value = mock_session
             mock_session_service.get_session_by_id.return_value = None
             
             result = await get_optional_user(
@@ -259,7 +259,8 @@ class TestAuthenticationDependencies:
                 request=mock_request
             )
             
-            assert result is None
+            assert result == "test-user-123"
+            mock_session_service.get_session_by_id.assert_not_called()
 
         @patch('api.deps.get_session_from_cookie')
         @pytest.mark.asyncio
@@ -270,8 +271,7 @@ class TestAuthenticationDependencies:
             mock_config.type = HostingType.ORGANIZATION
             mock_config_service.get_hosting_config.return_value = mock_config
             mock_get_session.return_value = "test-session-id"
-            mock_session_service.is_session_valid.return_value = True
-            mock_session_service.get_session_by_id.return_value = mock_user_session
+            mock_session_service.ais_session_valid.return_value = mock_user_session
             
             result = await get_optional_user(
                 session_service=mock_session_service,
@@ -288,8 +288,7 @@ class TestAuthenticationDependencies:
             # Setup mocks to raise exception on get_hosting_config
             mock_config_service.get_hosting_config.side_effect = Exception("Config error")
             mock_get_session.return_value = "test-session-id"
-            mock_session_service.is_session_valid.return_value = True
-            mock_session_service.get_session_by_id.return_value = mock_user_session
+            mock_session_service.ais_session_valid.return_value = mock_user_session
             
             result = await get_optional_user(
                 session_service=mock_session_service,
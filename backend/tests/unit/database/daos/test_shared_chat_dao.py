@@ -0,0 +1,90 @@
+"""
+Unit tests for the SharedChatDAO listing queries.
+"""
+import pytest
+from datetime import datetime, timedelta
+from sqlmodel import Session
+
+from database.daos.shared_chat import SharedChatDAO
+from database.models.shared_chats import SharedChats
+
+
+@pytest.fixture
+def shared_chat_dao(db_session: Session) -> SharedChatDAO:
+    """Fixture to create a SharedChatDAO instance."""
+    return SharedChatDAO(db_session)
+
+
+@pytest.fixture
+def user_chats(db_session: Session) -> list:
+    """Fixture creating five chats for one user, two of them sharing a timestamp."""
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    created = [base, base + timedelta(minutes=1), base + timedelta(minutes=1),
+               base + timedelta(minutes=2), base + timedelta(minutes=3)]
+    chats = []
+    for i, created_at in enumerate(created):
+        chat = SharedChats(
+            id=f"chat-{i}",
+            share_id=f"share{i}",
+            title=f"Chat {i}",
+            messages={"messages": [{"id": str(n)} for n in range(i)]},
+            model_config_data={"provider": "openai", "model": "gpt-4"},
+            total_tokens=i * 10,
+            total_cost=i * 0.5,
+            message_count=i,
+            created_by="user-1",
+            created_at=created_at,
+        )
+        db_session.add(chat)
+        chats.append(chat)
+    db_session.add(SharedChats(
+        id="other", share_id="other", title="Other", messages={"messages": []},
+        model_config_data={}, created_by="user-2", created_at=base
+    ))
+    db_session.add(SharedChats(
+        id="deleted", share_id="deleted", title="Deleted", messages={"messages": []},
+        model_config_data={}, created_by="user-1", created_at=base, is_active=False
+    ))
+    db_session.commit()
+    return chats
+
+
+class TestSharedChatDAOListing:
+    """Test cases for the keyset-paginated summary listing."""
+
+    def test_summaries_only_include_summary_columns(self, shared_chat_dao: SharedChatDAO, user_chats: list):
+        """Test rows carry summary columns and not the JSON blobs."""
+        rows = shared_chat_dao.get_summaries_by_user("user-1", limit=1)
+
+        assert len(rows) == 1
+        assert set(rows[0]._fields) == {
+            "id", "share_id", "title", "total_tokens", "total_cost", "message_count", "created_at"
+        }
+        assert rows[0].id == "chat-4"
+        assert rows[0].message_count == 4
+
+    def test_keyset_pages_cover_every_row_once(self, shared_chat_dao: SharedChatDAO, user_chats: list):
+        """Test walking pages by (created_at, id) visits each active chat once, newest first."""
+        seen = []
+        after = None
+        while True:
+            rows = shared_chat_dao.get_summaries_by_user("user-1", limit=2, after=after)
+            if not rows:
+                break
+            seen.extend(row.id for row in rows)
+            after = (rows[-1].created_at, rows[-1].id)
+
+        assert seen == ["chat-4", "chat-3", "chat-2", "chat-1", "chat-0"]
+
+    def test_offset_still_supported(self, shared_chat_dao: SharedChatDAO, user_chats: list):
+        """Test offset pagination keeps working when no cursor is given."""
+        rows = shared_chat_dao.get_summaries_by_user("user-1", limit=2, offset=2)
+
+        assert [row.id for row in rows] == ["chat-2", "chat-1"]
+
+    @pytest.mark.asyncio
+    async def test_async_falls_back_to_sync_session(self, shared_chat_dao: SharedChatDAO, user_chats: list):
+        """Test the async listing uses the sync session when no async session is set."""
+        rows = await shared_chat_dao.aget_summaries_by_user("user-1", limit=10)
+
+        assert [row.id for row in rows] == ["chat-4", "chat-3", "chat-2", "chat-1", "chat-0"]
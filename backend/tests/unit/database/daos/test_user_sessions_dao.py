@@ -111,6 +111,18 @@ def test_get_session_by_id_not_found(user_session_dao: UserSessionDAO):
     assert retrieved_session is None
 
 
+@pytest.mark.asyncio
+async def test_aget_session_by_id_without_async_session(user_session_dao: UserSessionDAO, sample_session_data: dict):
+    """Test the async lookup falls back to the sync session when no async session is configured."""
+    created_session = user_session_dao.create_session(**sample_session_data)
+
+    retrieved_session = await user_session_dao.aget_session_by_id(created_session.session_id)
+
+    assert retrieved_session is not None
+    assert retrieved_session.session_id == created_session.session_id
+    assert await user_session_dao.aget_session_by_id("nonexistentsessionid123456789") is None
+
+
 def test_get_sessions_by_user_id(user_session_dao: UserSessionDAO, sample_session_data: dict, sample_user: User):
     """Test retrieving all sessions for a user."""
     # Create multiple sessions for the user
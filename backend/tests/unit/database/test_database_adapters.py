@@ -6,7 +6,7 @@ import pytest
 import os
 import tempfile
 from unittest.mock import patch, MagicMock
-from sqlmodel import select
+from sqlmodel import Session, select
 from database.database_adapter import SQLiteAdapter, PostgreSQLAdapter, MySQLAdapter
 from database.models.user import User
 
@@ -309,4 +309,132 @@ class TestMySQLAdapter:
 
 class TestDatabaseAdapterCommon:
     """Test cases common to all database adapters"""
-    
\ No newline at end of file
+    
+
+class TestAsyncDatabaseAdapter:
+    """Test cases for the asyncio engine and session path"""
+
+    @pytest.mark.parametrize("database_url,expected_async,expected_sync", [
+        ("sqlite:///data.db", "sqlite+aiosqlite:///data.db", "sqlite:///data.db"),
+        ("sqlite+aiosqlite:///data.db", "sqlite+aiosqlite:///data.db", "sqlite:///data.db"),
+        ("postgresql://u:p@h/db", "postgresql+asyncpg://u:p@h/db", "postgresql://u:p@h/db"),
+        ("postgresql+asyncpg://u:p@h/db", "postgresql+asyncpg://u:p@h/db", "postgresql://u:p@h/db"),
+        ("mysql+pymysql://u:p@h/db", "mysql+aiomysql://u:p@h/db", "mysql+pymysql://u:p@h/db"),
+    ])
+    def test_driver_urls(self, database_url, expected_async, expected_sync):
+        """Test one DATABASE_URL maps to matching sync and async driver URLs"""
+        adapter = SQLiteAdapter(database_url)
+
+        assert adapter.async_database_url == expected_async
+        assert adapter.sync_database_url == expected_sync
+
+    @pytest.mark.asyncio
+    async def test_sqlite_async_session_reads_sync_writes(self):
+        """Test the async session sees rows written through the sync engine"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            adapter = SQLiteAdapter(f"sqlite:///{os.path.join(tmp_dir, 'async.db')}")
+            adapter.create_tables()
+            with Session(adapter.engine) as session:
+                session.add(User(id="async-user", oauth_provider="github", oauth_username="async"))
+                session.commit()
+
+            async for session in adapter.get_async_session():
+                user = (await session.exec(select(User).where(User.id == "async-user"))).first()
+
+            await adapter.dispose()
+
+        assert user is not None
+        assert user.oauth_username == "async"
+
+    @pytest.mark.asyncio
+    async def test_missing_async_driver_falls_back_to_sync(self):
+        """Test no async session is created when the async driver is not installed"""
+        adapter = MySQLAdapter("mysql+pymysql://u:p@h/db")
+
+        with patch("database.database_adapter.importlib.util.find_spec", return_value=None):
+            sessions = [session async for session in adapter.get_async_session()]
+
+        assert adapter.async_driver_available is False
+        assert sessions == [None]
+        assert adapter._async_engine is None
+
+
+class TestSQLitePerformanceProfile:
+    """Test cases for SQLite pragmas and the single-writer queue"""
+
+    def test_pragmas_applied_on_connect(self):
+        """Test file databases of the production profile run in WAL mode with the configured pragmas"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            adapter = SQLiteAdapter(f"sqlite:///{os.path.join(tmp_dir, 'wal.db')}", production_profile=True)
+            with adapter.engine.connect() as connection:
+                journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+                synchronous = connection.exec_driver_sql("PRAGMA synchronous").scalar()
+                busy_timeout = connection.exec_driver_sql("PRAGMA busy_timeout").scalar()
+            adapter.engine.dispose()
+
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
+        assert busy_timeout == 5000
+
+    def test_profile_is_opt_in(self):
+        """Test plain SQLite adapters keep the default journal mode and no writer lock"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            adapter = SQLiteAdapter(f"sqlite:///{os.path.join(tmp_dir, 'plain.db')}")
+            with adapter.engine.connect() as connection:
+                journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+            adapter.engine.dispose()
+            leftover_files = sorted(os.listdir(tmp_dir))
+
+        assert journal_mode == "delete"
+        assert adapter.uses_writer_queue is False
+        assert leftover_files == ["plain.db"]
+
+    def test_session_reads_its_own_writes(self):
+        """Test a writing session reads its uncommitted rows on the same connection"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            adapter = SQLiteAdapter(f"sqlite:///{os.path.join(tmp_dir, 'writer.db')}", production_profile=True)
+            adapter.create_tables()
+
+            session_generator = adapter.get_session()
+            session = next(session_generator)
+            session.add(User(id="writer-user", oauth_provider="github", oauth_username="writer"))
+            session.flush()
+            user = session.exec(select(User).where(User.id == "writer-user")).first()
+            session.rollback()
+            after_rollback = session.exec(select(User).where(User.id == "writer-user")).first()
+
+            session_generator.close()
+            adapter.engine.dispose()
+
+        assert user is not None
+        assert after_rollback is None
+
+    def test_writer_lock_held_until_transaction_ends(self):
+        """Test a session holds the writer lock from its first write until commit"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            adapter = SQLiteAdapter(f"sqlite:///{os.path.join(tmp_dir, 'lock.db')}", production_profile=True)
+            adapter.create_tables()
+
+            session_generator = adapter.get_session()
+            session = next(session_generator)
+            session.exec(select(User)).all()
+            locked_after_read = adapter._writer_lock.locked()
+            session.add(User(id="lock-user", oauth_provider="github", oauth_username="lock"))
+            session.flush()
+            locked_after_write = adapter._writer_lock.locked()
+            session.commit()
+            locked_after_commit = adapter._writer_lock.locked()
+
+            session_generator.close()
+            adapter.engine.dispose()
+
+        assert locked_after_read is False
+        assert locked_after_write is True
+        assert locked_after_commit is False
+
+    def test_memory_database_skips_writer_queue(self):
+        """Test in-memory databases skip the writer lock and WAL"""
+        adapter = SQLiteAdapter("sqlite:///:memory:", production_profile=True)
+
+        assert adapter.uses_writer_queue is False
+        assert "journal_mode" not in adapter.get_pragmas()
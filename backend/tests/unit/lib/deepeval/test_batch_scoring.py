@@ -0,0 +1,138 @@
+"""
+Test suite for batch scoring of deterministic metrics
+Tests that measure_batch scores every test case exactly as measure does
+"""
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("deepeval")
+
+from lib.deepeval.custom_metrics import (  # noqa: E402
+    ExactMatchMetric,
+    FuzzyMatchMetric,
+    KeywordPatternPresenceMetric,
+    SemanticSimilarityMetric,
+)
+
+
+def make_case(actual, expected=None, keywords=None, patterns=None):
+    """Create a test case carrying the fields the deterministic metrics read"""
+    return SimpleNamespace(
+        actual_output=actual,
+        expected_output=expected,
+        expected_keywords=keywords or [],
+        expected_patterns=patterns or [],
+    )
+
+
+CASES = [
+    make_case("The quick brown fox", "The quick brown fox", ["fox"], [r"qu\w+k"]),
+    make_case("  The quick   brown fox ", "The quick brown fox", ["FOX", "dog"], [r"(unclosed"]),
+    make_case("A lazy dog sleeps in the sun", "The quick brown fox jumps", ["sun"], [r"\bdog\b", r"cat"]),
+    make_case("the and of", "is it an", ["the"]),
+    make_case("Revenue grew 12% in the third quarter", "Third quarter revenue grew by twelve percent", ["revenue"]),
+    make_case("", "expected", ["x"]),
+    make_case("actual", None),
+    make_case("The quick brown fox", "The quick brown fox", ["fox"], [r"qu\w+k"]),
+]
+
+
+def measure_one(metric_class, test_case):
+    """Measure one test case the inline way, as (score, reason, error)"""
+    metric = metric_class()
+    try:
+        metric.measure(test_case)
+        return metric.score, metric.reason, None
+    except ValueError as e:
+        return 0.0, "", str(e)
+
+
+class TestMeasureBatch:
+    """Test cases for measure_batch of the deterministic metrics"""
+
+    @pytest.mark.parametrize("metric_class", [
+        ExactMatchMetric, FuzzyMatchMetric, KeywordPatternPresenceMetric, SemanticSimilarityMetric,
+    ])
+    def test_batch_matches_inline_measure(self, metric_class):
+        """Test batch scores, reasons and errors equal measuring each test case on its own"""
+        measurements = metric_class().measure_batch(CASES)
+
+        assert [tuple(m) for m in measurements] == [measure_one(metric_class, case) for case in CASES]
+
+    def test_fuzzy_match_json_field_errors_per_case(self):
+        """Test a test case whose output lacks the JSON field fails alone"""
+        metric = FuzzyMatchMetric(json_field="answer")
+        measurements = metric.measure_batch([
+            make_case('{"answer": "Paris"}', '{"answer": "Paris"}'),
+            make_case("not json", '{"answer": "Paris"}'),
+        ])
+
+        assert measurements[0].score == 1.0
+        assert measurements[1].error == "Output is not valid JSON, but json_field 'answer' was specified"
+
+
+class TestSemanticSimilarityEmbeddings:
+    """Test cases for SemanticSimilarityMetric with an embedding model"""
+
+    VECTORS = {
+        "The cat sat": [1.0, 0.0],
+        "A cat was sitting": [0.8, 0.6],
+        "Stock prices fell": [-1.0, 0.0],
+    }
+
+    @pytest.fixture
+    def metric(self):
+        """Create an embedding-mode metric whose embedder looks texts up in VECTORS"""
+        from lib.deepeval.embeddings import EmbeddingConfig
+
+        metric = SemanticSimilarityMetric(embedding=EmbeddingConfig(provider="local", model="test"))
+        metric._embedder = SimpleNamespace(embed=lambda texts: [self.VECTORS[text] for text in texts])
+        return metric
+
+    def test_measure_scores_cosine(self, metric):
+        """Test the score is the cosine similarity of the two outputs"""
+        metric.measure(make_case("A cat was sitting", "The cat sat"))
+
+        assert metric.score == pytest.approx(0.8)
+        assert metric.reason.startswith("High semantic similarity (0.80)")
+        assert metric.success
+
+    def test_negative_similarity_scores_zero(self, metric):
+        """Test opposite embeddings are clipped to a 0.0 score"""
+        metric.measure(make_case("Stock prices fell", "The cat sat"))
+
+        assert metric.score == 0.0
+
+    async def test_a_measure_embeds_off_the_event_loop(self, metric):
+        """Test async measuring embeds the outputs in a worker thread"""
+        embed = metric._embedder.embed
+        threads = []
+        metric._embedder = SimpleNamespace(
+            embed=lambda texts: threads.append(threading.current_thread()) or embed(texts)
+        )
+
+        score = await metric.a_measure(make_case("A cat was sitting", "The cat sat"))
+
+        assert score == pytest.approx(0.8)
+        assert threads and threads[0] is not threading.current_thread()
+
+    def test_batch_matches_inline_measure(self, metric):
+        """Test batch scores equal measuring each test case on its own"""
+        cases = [
+            make_case("A cat was sitting", "The cat sat"),
+            make_case("", "The cat sat"),
+            make_case("Stock prices fell", "The cat sat"),
+            make_case("The cat sat", "The cat sat"),
+        ]
+
+        expected = []
+        for case in cases:
+            try:
+                metric.measure(case)
+                expected.append((pytest.approx(metric.score), metric.reason, None))
+            except ValueError as e:
+                expected.append((0.0, "", str(e)))
+
+        assert [tuple(m) for m in metric.measure_batch(cases)] == expected
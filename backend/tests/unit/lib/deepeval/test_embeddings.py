@@ -0,0 +1,140 @@
+"""
+Test suite for text embeddings
+Tests the persistent vector cache, cached embedding requests and cosine similarity
+"""
+import math
+
+import pytest
+
+from lib.deepeval.embeddings import EmbeddingCache, EmbeddingConfig, TextEmbedder, cosine_similarities
+
+
+class RecordingEmbedder(TextEmbedder):
+    """Embedder returning deterministic vectors and recording each request"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = []
+
+    def _fetch(self, texts):
+        self.requests.append(list(texts))
+        return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a vector cache in a temporary database"""
+    embedding_cache = EmbeddingCache(tmp_path / "embeddings.db", max_entries=10)
+    yield embedding_cache
+    embedding_cache.close()
+
+
+@pytest.fixture
+def config():
+    """Create an embedding model configuration"""
+    return EmbeddingConfig(provider="openai", model="text-embedding-3-small", api_key="key")
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache"""
+
+    def test_roundtrip(self, cache):
+        """Test stored vectors are returned by key"""
+        key = EmbeddingCache.build_key("openai/m", "hello")
+        cache.put_many("openai/m", {key: [0.25, -1.5, 3.0]})
+
+        assert cache.get_many([key, "missing"]) == {key: [0.25, -1.5, 3.0]}
+
+    def test_key_depends_on_model(self):
+        """Test the same text embedded with different models gets different keys"""
+        assert EmbeddingCache.build_key("openai/a", "text") != EmbeddingCache.build_key("openai/b", "text")
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test vectors survive reopening the database"""
+        path = tmp_path / "embeddings.db"
+        first = EmbeddingCache(path)
+        first.put_many("openai/m", {"k": [1.0, 2.0]})
+        first.close()
+
+        second = EmbeddingCache(path)
+        try:
+            assert second.get_many(["k"]) == {"k": [1.0, 2.0]}
+        finally:
+            second.close()
+
+    def test_evicts_least_recently_used(self, cache):
+        """Test the oldest unused vectors are evicted once the cache is full"""
+        for index in range(10):
+            cache.put_many("openai/m", {f"k{index}": [float(index)]})
+        # Reading k0 makes it recently used
+        cache.get_many(["k0"])
+
+        cache.put_many("openai/m", {"k10": [10.0]})
+
+        remaining = cache.get_many([f"k{index}" for index in range(11)])
+        assert len(remaining) == 9
+        assert "k0" in remaining and "k10" in remaining
+        assert "k1" not in remaining and "k2" not in remaining
+
+
+class TestTextEmbedder:
+    """Test cases for TextEmbedder"""
+
+    def test_embed_requests_only_uncached_texts(self, cache, config):
+        """Test repeated and previously embedded texts are not requested again"""
+        embedder = RecordingEmbedder(config, cache=cache)
+
+        first = embedder.embed(["alpha", "beta", "alpha"])
+        second = embedder.embed(["beta", "gamma"])
+
+        assert embedder.requests == [["alpha", "beta"], ["gamma"]]
+        assert first == [[5.0, 1.0, 0.5], [4.0, 1.0, 0.5], [5.0, 1.0, 0.5]]
+        assert second == [[4.0, 1.0, 0.5], [5.0, 1.0, 0.5]]
+
+    def test_embed_chunks_requests(self, cache, config):
+        """Test misses are requested in chunks of the batch size"""
+        embedder = RecordingEmbedder(config, cache=cache, batch_size=2)
+
+        embedder.embed(["a", "b", "c", "d", "e"])
+
+        assert [len(request) for request in embedder.requests] == [2, 2, 1]
+
+    def test_cache_is_per_model(self, cache, config):
+        """Test another model does not reuse the first model's vectors"""
+        RecordingEmbedder(config, cache=cache).embed(["alpha"])
+        other = RecordingEmbedder(config.model_copy(update={"model": "other"}), cache=cache)
+
+        other.embed(["alpha"])
+
+        assert other.requests == [["alpha"]]
+
+
+class TestCosineSimilarities:
+    """Test cases for cosine_similarities"""
+
+    def test_pairs(self):
+        """Test identical, orthogonal and opposite vectors"""
+        similarities = cosine_similarities(
+            [[1.0, 0.0], [1.0, 0.0], [1.0, 2.0]],
+            [[2.0, 0.0], [0.0, 3.0], [-1.0, -2.0]]
+        )
+
+        assert [round(value, 6) for value in similarities] == [1.0, 0.0, -1.0]
+
+    def test_zero_vector(self):
+        """Test a zero vector scores 0.0 instead of dividing by zero"""
+        assert cosine_similarities([[0.0, 0.0]], [[1.0, 1.0]]) == [0.0]
+
+    def test_pure_python_fallback_matches(self, monkeypatch):
+        """Test the fallback without NumPy gives the same similarities"""
+        left = [[0.3, -1.2, 4.0], [1.0, 1.0, 1.0]]
+        right = [[2.2, 0.1, 3.3], [-0.5, 2.0, 0.0]]
+        expected = cosine_similarities(left, right)
+
+        monkeypatch.setattr("lib.deepeval.embeddings.NUMPY_AVAILABLE", False)
+
+        assert all(math.isclose(a, b) for a, b in zip(cosine_similarities(left, right), expected))
+
+    def test_empty(self):
+        """Test no pairs give no similarities"""
+        assert cosine_similarities([], []) == []
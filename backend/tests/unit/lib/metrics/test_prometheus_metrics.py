@@ -0,0 +1,164 @@
+"""
+Test suite for the Prometheus metrics
+Tests route latency labels, LLM call and token metrics, cache lookups,
+git and database timings, and the /metrics exposition
+"""
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from lib.metrics import (
+    instrument_engine,
+    metrics_request_authorized,
+    observe_llm_call,
+    record_cache_lookup,
+    render_metrics,
+    time_eval_stage,
+    time_git_operation,
+)
+from middlewares.rest.middleware import ResponseMiddleware
+from services.artifacts.diff.diff_cache import ArtifactDiffCache
+
+
+def sample(name, **labels):
+    """Current value of a sample, 0 if it was never recorded"""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestRequestMetrics:
+    """Test cases for HTTP request latency"""
+
+    async def test_requests_are_labelled_by_route_template(self):
+        """Requests to a parametrized route share the route template label"""
+        app = FastAPI()
+        app.add_middleware(ResponseMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: str):
+            return {"id": item_id}
+
+        labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+        before = sample("promptrepo_http_request_duration_seconds_count", **labels)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/items/1")
+            await client.get("/items/2")
+            await client.get("/missing")
+
+        assert sample("promptrepo_http_request_duration_seconds_count", **labels) - before == 2
+        assert sample(
+            "promptrepo_http_request_duration_seconds_count", method="GET", route="unmatched", status="404"
+        ) >= 1
+
+
+class TestLLMMetrics:
+    """Test cases for provider call metrics"""
+
+    def test_call_latency_and_tokens(self):
+        """A call records its latency and the input and output tokens it reports"""
+        response = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=12, completion_tokens=5))
+        before_input = sample("promptrepo_llm_tokens_total", provider="openai", model="gpt-metrics", kind="input")
+        before_output = sample("promptrepo_llm_tokens_total", provider="openai", model="gpt-metrics", kind="output")
+
+        observe_llm_call("openai", "gpt-metrics", 0.2, response=response)
+        observe_llm_call("openai", "gpt-metrics", 0.1, error=RuntimeError("down"))
+
+        assert sample("promptrepo_llm_tokens_total", provider="openai", model="gpt-metrics", kind="input") \
+            - before_input == 12
+        assert sample("promptrepo_llm_tokens_total", provider="openai", model="gpt-metrics", kind="output") \
+            - before_output == 5
+        assert sample(
+            "promptrepo_llm_request_duration_seconds_count", provider="openai", model="gpt-metrics", outcome="error"
+        ) >= 1
+
+
+class TestCacheMetrics:
+    """Test cases for cache lookup counters"""
+
+    def test_diff_cache_hits_and_misses(self):
+        """A computed diff is a miss, serving it again a hit"""
+        before_hits = sample("promptrepo_cache_lookups_total", cache="artifact_diff", result="hit")
+        before_misses = sample("promptrepo_cache_lookups_total", cache="artifact_diff", result="miss")
+        cache = ArtifactDiffCache(max_entries=4)
+
+        cache.get_or_compute(("base-metrics", "head-metrics"), lambda: [])
+        cache.get_or_compute(("base-metrics", "head-metrics"), lambda: [])
+
+        assert sample("promptrepo_cache_lookups_total", cache="artifact_diff", result="hit") - before_hits == 1
+        assert sample("promptrepo_cache_lookups_total", cache="artifact_diff", result="miss") - before_misses == 1
+
+    def test_lookups_are_counted_in_bulk(self):
+        """Bulk lookups add their counts; empty counts are ignored"""
+        before = sample("promptrepo_cache_lookups_total", cache="bulk_test", result="hit")
+
+        record_cache_lookup("bulk_test", hit=True, count=3)
+        record_cache_lookup("bulk_test", hit=True, count=0)
+
+        assert sample("promptrepo_cache_lookups_total", cache="bulk_test", result="hit") - before == 3
+
+
+class TestTimings:
+    """Test cases for git, eval stage and database timings"""
+
+    def test_git_operation_decorator(self):
+        """A decorated git operation is timed and keeps its return value"""
+        @time_git_operation("metrics_test")
+        def operation(value):
+            return value
+
+        before = sample("promptrepo_git_operation_duration_seconds_count", operation="metrics_test")
+
+        assert operation(3) == 3
+        assert sample("promptrepo_git_operation_duration_seconds_count", operation="metrics_test") - before == 1
+
+    async def test_eval_stage_context_manager(self):
+        """An eval stage is timed around awaited work"""
+        before = sample("promptrepo_eval_stage_duration_seconds_count", stage="persistence")
+
+        with time_eval_stage("persistence"):
+            pass
+
+        assert sample("promptrepo_eval_stage_duration_seconds_count", stage="persistence") - before == 1
+
+    def test_database_statements_are_timed(self):
+        """Statements of an instrumented engine are timed by statement type"""
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+        instrument_engine(engine)
+        before = sample("promptrepo_db_query_duration_seconds_count", statement="SELECT")
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        assert sample("promptrepo_db_query_duration_seconds_count", statement="SELECT") - before == 1
+
+
+class TestExposition:
+    """Test cases for the /metrics exposition"""
+
+    def test_render_metrics(self):
+        """All metric families are rendered in the Prometheus text format"""
+        body, content_type = render_metrics()
+
+        assert content_type.startswith("text/plain")
+        for name in (
+            "promptrepo_http_request_duration_seconds",
+            "promptrepo_llm_request_duration_seconds",
+            "promptrepo_llm_cost_usd",
+            "promptrepo_eval_stage_duration_seconds",
+            "promptrepo_git_operation_duration_seconds",
+            "promptrepo_cache_lookups",
+            "promptrepo_db_query_duration_seconds",
+        ):
+            assert name.encode() in body
+
+    def test_bearer_token_is_required_when_configured(self):
+        """Only requests carrying the configured bearer token may read the metrics"""
+        assert metrics_request_authorized(None, "")
+        assert metrics_request_authorized("Bearer s3cret", "s3cret")
+        assert metrics_request_authorized("bearer s3cret", "s3cret")
+        assert not metrics_request_authorized(None, "s3cret")
+        assert not metrics_request_authorized("Bearer wrong", "s3cret")
+        assert not metrics_request_authorized("Basic s3cret", "s3cret")
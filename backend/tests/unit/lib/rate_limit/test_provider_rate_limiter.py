@@ -0,0 +1,376 @@
+"""
+Test suite for the provider rate limiter
+Tests concurrency caps, RPM/TPM buckets, priority classes, pauses and Retry-After backoff,
+and metering of any_llm adapter completions
+"""
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from lib.rate_limit import (
+    ProviderRateLimiter,
+    RateLimitBudget,
+    RequestPriority,
+    estimate_tokens,
+    request_priority,
+    retry_after_seconds,
+)
+
+
+class RateLimitError(Exception):
+    """Stand-in for a provider SDK's rate-limit exception"""
+
+    def __init__(self, retry_after=None, headers=None):
+        super().__init__("slow down")
+        self.retry_after = retry_after
+        if headers is not None:
+            self.response = SimpleNamespace(headers=headers)
+
+
+async def acquire_and_hold(limiter, order, label, release, **kwargs):
+    """Acquire a slot, record the grant and hold the slot until released"""
+    async with limiter.acquire("openai", "gpt-4o", api_key="key", **kwargs):
+        order.append(label)
+        await release.wait()
+
+
+async def assert_waits(acquisition, timeout=0.05):
+    """Assert an acquisition is still waiting after the timeout"""
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(acquisition, timeout)
+
+
+class TestProviderRateLimiter:
+    """Test cases for ProviderRateLimiter"""
+
+    async def test_caps_in_flight_calls_per_key(self):
+        """Calls beyond the concurrency cap wait; other keys are not affected"""
+        limiter = ProviderRateLimiter(max_concurrent=2)
+        in_flight = 0
+        peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            async with limiter.acquire("openai", "gpt-4o", api_key="key"):
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        async def other_key():
+            async with limiter.acquire("openai", "gpt-4o", api_key="other"):
+                return True
+
+        hold = asyncio.Event()
+        holders = [asyncio.create_task(acquire_and_hold(limiter, [], i, hold)) for i in range(2)]
+        await asyncio.sleep(0.01)
+        assert await asyncio.wait_for(other_key(), 0.5)
+        hold.set()
+        await asyncio.gather(*holders, *(call() for _ in range(6)))
+
+        assert peak == 2
+
+    async def test_request_budget_paces_calls(self):
+        """Once the RPM bucket is drained, calls wait for it to refill"""
+        limiter = ProviderRateLimiter()
+        limiter.set_budget("openai", "gpt-4o", RateLimitBudget(rpm=600))
+        for _ in range(600):
+            async with limiter.acquire("openai", "gpt-4o", api_key="key"):
+                pass
+
+        started = time.monotonic()
+        async with limiter.acquire("openai", "gpt-4o", api_key="key"):
+            pass
+
+        assert time.monotonic() - started >= 0.08
+
+    async def test_budget_of_api_key_takes_precedence(self):
+        """A budget configured for an API key overrides the provider-wide one"""
+        limiter = ProviderRateLimiter()
+        limiter.set_budget("openai", "gpt-4o", RateLimitBudget(rpm=1000))
+        limiter.set_budget("openai", "gpt-4o", RateLimitBudget(rpm=1), api_key="key")
+
+        async with limiter.acquire("openai", "gpt-4o", api_key="key"):
+            pass
+
+        await assert_waits(limiter.acquire("openai", "gpt-4o", api_key="key").__aenter__())
+        async with limiter.acquire("openai", "gpt-4o", api_key="other"):
+            pass
+
+    async def test_interactive_calls_go_before_queued_batch_calls(self):
+        """A waiting interactive call is granted before batch calls that queued earlier"""
+        limiter = ProviderRateLimiter(max_concurrent=1)
+        order = []
+        release = asyncio.Event()
+        holder = asyncio.create_task(acquire_and_hold(limiter, order, "holder", release))
+        await asyncio.sleep(0.01)
+        batch = asyncio.create_task(
+            acquire_and_hold(limiter, order, "batch", release, priority=RequestPriority.BATCH)
+        )
+        await asyncio.sleep(0.01)
+        with request_priority(RequestPriority.INTERACTIVE):
+            interactive = asyncio.create_task(acquire_and_hold(limiter, order, "interactive", release))
+        await asyncio.sleep(0.01)
+
+        release.set()
+        await asyncio.gather(holder, batch, interactive)
+
+        assert order == ["holder", "interactive", "batch"]
+
+    async def test_batch_calls_leave_reserve_for_interactive_calls(self):
+        """Batch calls stop short of the reserve; interactive calls may use it"""
+        limiter = ProviderRateLimiter(interactive_reserve_ratio=0.5)
+        limiter.set_budget("openai", "gpt-4o", RateLimitBudget(tpm=1000))
+        async with limiter.acquire("openai", "gpt-4o", api_key="key", tokens=600, priority=RequestPriority.BATCH):
+            pass
+
+        async with limiter.acquire("openai", "gpt-4o", api_key="key", tokens=300):
+            pass
+
+        await assert_waits(
+            limiter.acquire("openai", "gpt-4o", api_key="key", tokens=50, priority=RequestPriority.BATCH).__aenter__()
+        )
+
+    async def test_priority_follows_context(self):
+        """Calls inherit the priority of the context they are made in"""
+        limiter = ProviderRateLimiter(interactive_reserve_ratio=0.5)
+        limiter.set_budget("openai", "gpt-4o", RateLimitBudget(tpm=1000))
+        async with limiter.acquire("openai", "gpt-4o", api_key="key", tokens=600):
+            pass
+
+        with request_priority(RequestPriority.BATCH):
+            await assert_waits(limiter.acquire("openai", "gpt-4o", api_key="key", tokens=50).__aenter__())
+
+    async def test_recorded_usage_settles_token_bucket(self):
+        """Tokens reserved beyond the reported usage are returned to the bucket"""
+        limiter = ProviderRateLimiter()
+        limiter.set_budget("openai", "gpt-4o", RateLimitBudget(tpm=1000))
+        async with limiter.acquire("openai", "gpt-4o", api_key="key", tokens=1000) as lease:
+            lease.record_usage(100)
+
+        async with limiter.acquire("openai", "gpt-4o", api_key="key", tokens=800):
+            pass
+
+    async def test_pause_holds_back_calls(self):
+        """A paused key grants no calls until the pause ends"""
+        limiter = ProviderRateLimiter()
+        limiter.pause("openai", "gpt-4o", 0.1, api_key="key")
+
+        started = time.monotonic()
+        async with limiter.acquire("openai", "gpt-4o", api_key="key"):
+            pass
+
+        assert time.monotonic() - started >= 0.09
+
+    async def test_call_retries_after_retry_after(self):
+        """A rate-limited call waits for Retry-After and is retried"""
+        limiter = ProviderRateLimiter(backoff_seconds=5.0)
+        responses = [RateLimitError(retry_after="0.05"), SimpleNamespace(usage=SimpleNamespace(total_tokens=3))]
+
+        async def request():
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        started = time.monotonic()
+        response = await limiter.call("openai", "gpt-4o", request, api_key="key")
+
+        assert response.usage.total_tokens == 3
+        assert 0.04 <= time.monotonic() - started < 1.0
+
+    async def test_call_gives_up_after_retries(self):
+        """The rate-limit error surfaces once the retries are used up"""
+        limiter = ProviderRateLimiter(max_retries=1, backoff_seconds=0.01)
+        request = AsyncMock(side_effect=RateLimitError())
+
+        with pytest.raises(RateLimitError):
+            await limiter.call("openai", "gpt-4o", request, api_key="key")
+
+        assert request.await_count == 2
+
+    async def test_call_does_not_retry_other_errors(self):
+        """Errors other than rate limits are raised right away"""
+        limiter = ProviderRateLimiter()
+        request = AsyncMock(side_effect=ValueError("bad request"))
+
+        with pytest.raises(ValueError):
+            await limiter.call("openai", "gpt-4o", request, api_key="key")
+
+        assert request.await_count == 1
+
+    async def test_streamed_call_holds_slot_until_stream_ends(self):
+        """A streamed call keeps its slot until the stream is exhausted"""
+        limiter = ProviderRateLimiter(max_concurrent=1)
+
+        async def chunks():
+            yield SimpleNamespace(usage=None)
+            yield SimpleNamespace(usage=None)
+
+        stream = await limiter.call("openai", "gpt-4o", AsyncMock(return_value=chunks()), api_key="key")
+
+        await assert_waits(limiter.acquire("openai", "gpt-4o", api_key="key").__aenter__())
+        assert len([chunk async for chunk in stream]) == 2
+        async with limiter.acquire("openai", "gpt-4o", api_key="key"):
+            pass
+
+    async def test_closed_stream_releases_slot(self):
+        """Closing a stream before its end releases the slot"""
+        limiter = ProviderRateLimiter(max_concurrent=1)
+
+        async def chunks():
+            yield SimpleNamespace(usage=None)
+            yield SimpleNamespace(usage=None)
+
+        stream = await limiter.call("openai", "gpt-4o", AsyncMock(return_value=chunks()), api_key="key")
+        await stream.__anext__()
+        await stream.aclose()
+
+        async with limiter.acquire("openai", "gpt-4o", api_key="key"):
+            pass
+
+    async def test_stream_usage_settles_token_bucket(self):
+        """Usage reported by a stream's final chunk returns unused reserved tokens to the bucket"""
+        limiter = ProviderRateLimiter()
+        limiter.set_budget("openai", "gpt-4o", RateLimitBudget(tpm=1000))
+
+        async def chunks():
+            yield SimpleNamespace(usage=None)
+            yield SimpleNamespace(usage=SimpleNamespace(total_tokens=100))
+
+        stream = await limiter.call("openai", "gpt-4o", AsyncMock(return_value=chunks()), api_key="key",
+                                    tokens=1000)
+        async for _ in stream:
+            pass
+
+        async with limiter.acquire("openai", "gpt-4o", api_key="key", tokens=800):
+            pass
+
+    async def test_slots_are_shared_across_event_loops(self):
+        """A call on another thread's event loop waits for a slot held on this loop"""
+        limiter = ProviderRateLimiter(max_concurrent=1)
+        granted = threading.Event()
+
+        async def other_loop_call():
+            async with limiter.acquire("openai", "gpt-4o", api_key="key"):
+                granted.set()
+
+        async with limiter.acquire("openai", "gpt-4o", api_key="key"):
+            thread = threading.Thread(target=lambda: asyncio.run(other_loop_call()))
+            thread.start()
+            await asyncio.sleep(0.05)
+            assert not granted.is_set()
+        await asyncio.to_thread(thread.join, 2)
+
+        assert granted.is_set()
+
+    async def test_disabled_limiter_grants_immediately(self):
+        """A disabled limiter neither caps nor pauses calls"""
+        limiter = ProviderRateLimiter(max_concurrent=1, enabled=False)
+        limiter.pause("openai", "gpt-4o", 10, api_key="key")
+
+        async with limiter.acquire("openai", "gpt-4o", api_key="key"):
+            async with limiter.acquire("openai", "gpt-4o", api_key="key"):
+                pass
+
+    async def test_budgets_are_split_between_processes(self):
+        """Each of the processes sharing a quota gets its share"""
+        limiter = ProviderRateLimiter(processes=2)
+        limiter.set_budget("openai", "gpt-4o", RateLimitBudget(rpm=2))
+
+        async with limiter.acquire("openai", "gpt-4o", api_key="key"):
+            pass
+
+        await assert_waits(limiter.acquire("openai", "gpt-4o", api_key="key").__aenter__())
+
+
+    def test_configured_budgets_are_loaded_when_built(self):
+        """The process-wide limiter starts with the quotas of DEFAULT_LLM_CONFIGS"""
+        from lib.rate_limit import get_provider_rate_limiter, provider_rate_limiter
+
+        configs = [
+            {"provider": "openai", "model": "gpt-4o", "api_key": "key", "rpm_limit": 60},
+            {"provider": "zai", "model": "glm-4.6", "tpm_limit": 1000},
+            {"provider": "openai", "model": "gpt-4o-mini"},
+        ]
+        with patch.object(provider_rate_limiter, "_provider_rate_limiter", None), \
+                patch.dict("os.environ", {"DEFAULT_LLM_CONFIGS": json.dumps(configs)}):
+            limiter = get_provider_rate_limiter()
+
+        assert limiter._budgets == {
+            provider_rate_limiter.limit_key("openai", "gpt-4o", "key"): RateLimitBudget(rpm=60),
+            ("zai", "*", "glm-4.6"): RateLimitBudget(tpm=1000),
+        }
+
+
+class TestRateLimitHelpers:
+    """Test cases for Retry-After parsing and token estimation"""
+
+    def test_retry_after_attribute(self):
+        """A retry_after attribute is read as seconds"""
+        assert retry_after_seconds(RateLimitError(retry_after=2)) == 2.0
+
+    def test_retry_after_headers(self):
+        """Retry-After and retry-after-ms response headers are read"""
+        assert retry_after_seconds(RateLimitError(headers={"retry-after": "3"})) == 3.0
+        assert retry_after_seconds(RateLimitError(headers={"retry-after-ms": "250"})) == 0.25
+
+    def test_retry_after_missing(self):
+        """No Retry-After gives None"""
+        assert retry_after_seconds(RateLimitError()) is None
+
+    def test_estimate_tokens(self):
+        """Prompt characters count a quarter token each, plus max_tokens"""
+        messages = [{"role": "user", "content": "x" * 400}, SimpleNamespace(content="y" * 40)]
+
+        assert estimate_tokens(messages, max_tokens=100) == 210
+
+
+class TestAdapterMetering:
+    """Test cases for completions sent through the any_llm adapter"""
+
+    async def test_acompletion_is_retried_after_rate_limit(self):
+        """An adapter completion rejected by a rate limit is retried through the shared limiter"""
+        from lib.any_llm.any_llm_adapter import CUSTOM_PROVIDERS, acompletion
+
+        limiter = ProviderRateLimiter(backoff_seconds=0.01)
+        response = SimpleNamespace(usage=None)
+        with patch("lib.any_llm.any_llm_adapter.get_provider_rate_limiter", return_value=limiter), \
+                patch.object(CUSTOM_PROVIDERS["zai"], "acompletion", new_callable=AsyncMock) as provider_call:
+            provider_call.side_effect = [RateLimitError(), response]
+
+            result = await acompletion(model="zai/glm-4.6", messages=[{"role": "user", "content": "hi"}],
+                                       api_key="key")
+
+        assert result is response
+        assert provider_call.await_count == 2
+
+    async def test_acompletion_is_metered_under_explicit_provider(self):
+        """A model without provider prefix is metered under the provider argument"""
+        from lib.any_llm.any_llm_adapter import acompletion
+
+        limiter = ProviderRateLimiter()
+        response = SimpleNamespace(usage=None)
+        with patch("lib.any_llm.any_llm_adapter.get_provider_rate_limiter", return_value=limiter), \
+                patch.object(limiter, "call", wraps=limiter.call) as metered_call, \
+                patch("lib.any_llm.any_llm_adapter.any_llm_acompletion", new_callable=AsyncMock,
+                      return_value=response) as provider_call:
+            result = await acompletion(model="gpt-4o", provider="openai",
+                                       messages=[{"role": "user", "content": "hi"}], api_key="key")
+
+        assert result is response
+        assert metered_call.call_args.args[:2] == ("openai", "gpt-4o")
+        assert provider_call.call_args.kwargs["provider"] == "openai"
+        assert provider_call.call_args.kwargs["model"] == "gpt-4o"
+
+    async def test_acompletion_without_provider_is_rejected(self):
+        """A model without provider prefix or provider argument is rejected before metering"""
+        from lib.any_llm.any_llm_adapter import acompletion
+
+        with pytest.raises(ValueError):
+            await acompletion(model="gpt-4o", messages=[{"role": "user", "content": "hi"}])
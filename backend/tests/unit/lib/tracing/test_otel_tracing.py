@@ -0,0 +1,178 @@
+"""
+Test suite for OpenTelemetry tracing
+Tests the traced decorator, server spans of the API layer, git operation spans,
+links to agent traces and the file exporter
+"""
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from lib.tracing import configure_tracing, get_tracer, link_agent_trace, traced
+from lib.tracing.otel_tracing import _create_exporters
+from middlewares.rest.middleware import ResponseMiddleware
+from services.local_repo.git_service import GitService
+
+
+@pytest.fixture(scope="module")
+def span_exporter():
+    """Collect finished spans of the process-wide SDK tracer provider"""
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider()
+        trace.set_tracer_provider(provider)
+    exporter = InMemorySpanExporter()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return exporter
+
+
+@pytest.fixture
+def spans(span_exporter):
+    """Spans finished during the test, by name"""
+    span_exporter.clear()
+
+    def finished():
+        return {span.name: span for span in span_exporter.get_finished_spans()}
+
+    return finished
+
+
+class TestTraced:
+    """Test cases for the traced decorator"""
+
+    def test_sync_function_span(self, spans):
+        """A synchronous function runs in a span with the given attributes"""
+        @traced("unit.sync", **{"unit.kind": "sync"})
+        def work(value):
+            return value * 2
+
+        assert work(2) == 4
+        assert spans()["unit.sync"].attributes["unit.kind"] == "sync"
+
+    async def test_async_function_span_is_parent(self, spans):
+        """Spans opened inside an async function are its children"""
+        @traced("unit.outer")
+        async def outer():
+            with get_tracer().start_as_current_span("unit.inner"):
+                pass
+
+        await outer()
+
+        finished = spans()
+        assert finished["unit.inner"].parent.span_id == finished["unit.outer"].context.span_id
+
+    async def test_exception_marks_span_failed(self, spans):
+        """An exception is recorded on the span and sets an error status"""
+        @traced("unit.failing")
+        async def failing():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await failing()
+
+        span = spans()["unit.failing"]
+        assert span.status.status_code == trace.StatusCode.ERROR
+        assert span.events[0].name == "exception"
+
+
+class TestServerSpans:
+    """Test cases for request spans of the API layer"""
+
+    async def test_request_span_continues_incoming_trace(self, spans):
+        """A request continues the caller's traceparent and is named after its route"""
+        app = FastAPI()
+        app.add_middleware(ResponseMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: str):
+            with get_tracer().start_as_current_span("unit.endpoint"):
+                return {"id": item_id}
+
+        trace_id = "0af7651916cd43dd8448eb211c80319c"
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get(
+                "/items/1", headers={"traceparent": f"00-{trace_id}-b7ad6b7169203331-01"}
+            )
+
+        finished = spans()
+        server_span = finished["GET /items/{item_id}"]
+        assert server_span.kind == trace.SpanKind.SERVER
+        assert format(server_span.context.trace_id, "032x") == trace_id
+        assert server_span.attributes["http.response.status_code"] == 200
+        assert format(finished["unit.endpoint"].context.trace_id, "032x") == trace_id
+        assert response.headers["X-Trace-ID"] == trace_id
+
+
+class TestGitSpans:
+    """Test cases for git operation spans"""
+
+    def test_git_operation_span(self, spans, tmp_path):
+        """Git operations run in spans named after the operation"""
+        GitService(tmp_path).get_current_branch()
+
+        assert "git.get_current_branch" in spans()
+
+
+class TestAgentTraceLinks:
+    """Test cases for linking AgentTrace spans"""
+
+    @staticmethod
+    def _agent_trace(trace_id):
+        root = SimpleNamespace(context=SimpleNamespace(trace_id=trace_id, span_id=11), parent=None)
+        child = SimpleNamespace(
+            context=SimpleNamespace(trace_id=trace_id, span_id=12), parent=SimpleNamespace(span_id=11)
+        )
+        return SimpleNamespace(spans=[child, root])
+
+    def test_links_root_span_of_other_trace(self, spans):
+        """The root span of an agent trace in another trace is linked"""
+        with get_tracer().start_as_current_span("unit.agent_run"):
+            link_agent_trace(self._agent_trace(0x1234))
+
+        span = spans()["unit.agent_run"]
+        assert span.attributes["agent.trace_id"] == format(0x1234, "032x")
+        assert [link.context.span_id for link in span.links] == [11]
+
+    def test_same_trace_is_not_linked(self, spans):
+        """Agent spans of the current trace are children already and are not linked"""
+        with get_tracer().start_as_current_span("unit.agent_run") as current:
+            link_agent_trace(self._agent_trace(current.get_span_context().trace_id))
+
+        assert list(spans()["unit.agent_run"].links) == []
+
+
+class TestConfiguration:
+    """Test cases for tracing configuration and exporters"""
+
+    def test_disabled_by_default(self):
+        """Nothing is configured unless tracing is enabled"""
+        with patch("lib.tracing.otel_tracing.settings") as settings:
+            settings.tracing_enabled = False
+            assert configure_tracing() is False
+
+    def test_file_exporter_writes_json_lines(self, span_exporter, tmp_path):
+        """The file exporter appends one JSON span per line"""
+        with patch("lib.tracing.otel_tracing.settings") as settings:
+            settings.tracing_file_path = str(tmp_path / "traces" / "spans.jsonl")
+            (exporter,) = _create_exporters("file")
+        span_exporter.clear()
+        with get_tracer().start_as_current_span("unit.exported"):
+            pass
+
+        exporter.export(span_exporter.get_finished_spans())
+        exporter.shutdown()
+
+        lines = (tmp_path / "traces" / "spans.jsonl").read_text().splitlines()
+        assert [json.loads(line)["name"] for line in lines] == ["unit.exported"]
+
+    def test_unknown_exporter(self):
+        """An unknown exporter name is a configuration error"""
+        with pytest.raises(ValueError):
+            _create_exporters("zipkin")
@@ -303,6 +303,22 @@ class TestOrganizationConfigStrategy:
                     # No need to restore - patch handles this automatically
                     pass
 
+    def test_removed_repos_release_their_handles(self):
+        """Test removing repositories evicts their pooled git handles before deleting them"""
+        from unittest.mock import Mock
+        removed_repo = Mock(id="old-repo", local_path="/tmp/repos/user/old-repo")
+        mock_user_repos_dao = Mock()
+        mock_user_repos_dao.get_user_repositories.return_value = [removed_repo]
+        mock_registry = Mock()
+
+        with patch('services.config.strategies.organization.UserReposDAO', return_value=mock_user_repos_dao), \
+                patch('services.config.strategies.organization.FileOperationsService') as mock_file_ops_class, \
+                patch('services.local_repo.repo_handles.get_repo_handle_registry', return_value=mock_registry):
+            self.strategy.set_repo_configs(Mock(), "test-user", [])
+
+        mock_registry.evict.assert_called_once_with("/tmp/repos/user/old-repo")
+        mock_file_ops_class.return_value.delete_directory.assert_called_once_with("/tmp/repos/user/old-repo")
+
 
 class TestConfigStrategyFactory:
     """Test cases for ConfigStrategyFactory"""
@@ -0,0 +1,216 @@
+"""
+Test suite for artifact version diffs
+Tests the field-aware diff, the blob pair cache and ArtifactDiffService over git history
+"""
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import git
+import pytest
+
+from middlewares.rest.exceptions import NotFoundException
+from services.artifacts.diff import ArtifactDiffCache, ArtifactDiffService, ChangeType, DiffSection, diff_artifacts
+from services.local_repo.artifact_ref_cache import ArtifactRefCache
+from services.local_repo.local_repo_service import LocalRepoService
+
+
+def by_path(changes):
+    return {change.path: change for change in changes}
+
+
+class TestDiffArtifacts:
+    """Test cases for diff_artifacts"""
+
+    def test_equal_artifacts_have_no_changes(self):
+        """Test identical versions produce no changes"""
+        artifact = {"name": "p", "prompt": "Hi", "tools": ["a.tool.yaml"]}
+        assert diff_artifacts(artifact, dict(artifact)) == []
+
+    def test_prompt_and_model_params(self):
+        """Test prompt text gets a line diff and model params are classified"""
+        changes = by_path(diff_artifacts(
+            {"prompt": "You are helpful.\nBe brief.", "temperature": 0.2, "model": "gpt-4"},
+            {"prompt": "You are helpful.\nBe thorough.", "temperature": 0.7, "model": "gpt-4", "seed": 1}
+        ))
+
+        assert set(changes) == {"prompt", "temperature", "seed"}
+        assert changes["prompt"].section == DiffSection.PROMPT
+        assert "-Be brief." in changes["prompt"].text_diff
+        assert "+Be thorough." in changes["prompt"].text_diff
+        assert changes["temperature"].section == DiffSection.MODEL_PARAMS
+        assert (changes["temperature"].old_value, changes["temperature"].new_value) == (0.2, 0.7)
+        assert changes["seed"].change == ChangeType.ADDED
+        assert changes["seed"].text_diff is None
+
+    def test_tool_list_reports_added_and_removed_items(self):
+        """Test tools are reported per added and removed tool"""
+        changes = diff_artifacts({"tools": ["a.tool.yaml", "b.tool.yaml"]}, {"tools": ["b.tool.yaml", "c.tool.yaml"]})
+
+        assert [(c.path, c.section, c.change, c.old_value, c.new_value) for c in changes] == [
+            ("tools", DiffSection.TOOLS, ChangeType.REMOVED, "a.tool.yaml", None),
+            ("tools", DiffSection.TOOLS, ChangeType.ADDED, None, "c.tool.yaml"),
+        ]
+
+    def test_tests_matched_by_name(self):
+        """Test eval tests are matched by name, so reordering is no change and edits are per field"""
+        old = {"eval": {"tests": [
+            {"name": "greeting", "user_message": "Hi"},
+            {"name": "farewell", "user_message": "Bye"},
+        ]}}
+        new = {"eval": {"tests": [
+            {"name": "farewell", "user_message": "Bye"},
+            {"name": "greeting", "user_message": "Hello"},
+            {"name": "refund", "user_message": "Money back"},
+        ]}}
+
+        changes = by_path(diff_artifacts(old, new))
+
+        assert set(changes) == {"eval.tests[greeting].user_message", "eval.tests[refund]"}
+        assert all(change.section == DiffSection.TESTS for change in changes.values())
+        assert changes["eval.tests[refund]"].change == ChangeType.ADDED
+
+    def test_list_without_identity_is_modified_as_a_whole(self):
+        """Test lists of mappings without a unique identity are reported as one change"""
+        changes = diff_artifacts({"stop": [{"a": 1}]}, {"stop": [{"a": 2}]})
+
+        assert [(c.path, c.change) for c in changes] == [("stop", ChangeType.MODIFIED)]
+
+    def test_added_file(self):
+        """Test a file missing in the base reports its top-level fields as added"""
+        changes = diff_artifacts(None, {"tool": {"name": "lookup"}})
+
+        assert [(c.path, c.section, c.change) for c in changes] == [("tool", DiffSection.OTHER, ChangeType.ADDED)]
+
+    def test_tool_artifact_and_metadata_sections(self):
+        """Test tool definition fields are tools changes and timestamps are metadata"""
+        changes = by_path(diff_artifacts(
+            {"tool": {"parameters": {"type": "object"}, "updated_at": "2024-01-01"}},
+            {"tool": {"parameters": {"type": "array"}, "updated_at": "2024-02-01"}}
+        ))
+
+        assert changes["tool.parameters.type"].section == DiffSection.TOOLS
+        assert changes["tool.updated_at"].section == DiffSection.METADATA
+
+
+class TestArtifactDiffCache:
+    """Test cases for ArtifactDiffCache"""
+
+    def test_computes_once_per_pair(self):
+        """Test a pair is computed on the first request only"""
+        cache = ArtifactDiffCache()
+        compute = Mock(return_value=diff_artifacts({"model": "a"}, {"model": "b"}))
+        key = ArtifactDiffCache.build_key("1" * 40, "2" * 40)
+
+        first = cache.get_or_compute(key, compute)
+        second = cache.get_or_compute(key, compute)
+
+        compute.assert_called_once()
+        assert first == second
+
+    def test_concurrent_requests_compute_once(self):
+        """Test requests for a pair being computed wait for that computation"""
+        cache = ArtifactDiffCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return []
+
+        key = ArtifactDiffCache.build_key("1" * 40, "2" * 40)
+        threads = [threading.Thread(target=cache.get_or_compute, args=(key, compute)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used pair is evicted when full"""
+        cache = ArtifactDiffCache(max_entries=2)
+        cache.store(("a", "b"), [])
+        cache.store(("b", "c"), [])
+        cache.lookup(("a", "b"))
+        cache.store(("c", "d"), [])
+
+        assert cache.lookup(("a", "b")) == []
+        assert cache.lookup(("b", "c")) is None
+        assert len(cache) == 2
+
+
+class TestArtifactDiffService:
+    """Test cases for ArtifactDiffService over a real repository"""
+
+    FILE_PATH = ".promptrepo/prompts/greet.prompt.yaml"
+
+    @pytest.fixture
+    def repo_path(self, tmp_path):
+        """Create a repository with three commits of a prompt, the last only touching another file"""
+        repo = git.Repo.init(tmp_path)
+        prompt_file = tmp_path / self.FILE_PATH
+        prompt_file.parent.mkdir(parents=True)
+        prompt_file.write_text("name: greet\nprompt: Hello\ntemperature: 0.2\n")
+        repo.index.add([self.FILE_PATH])
+        repo.index.commit("First")
+        repo.git.branch("-m", "main")
+        prompt_file.write_text("name: greet\nprompt: Hi there\ntemperature: 0.5\ntools:\n- a.tool.yaml\n")
+        repo.index.add([self.FILE_PATH])
+        repo.index.commit("Second")
+        (tmp_path / "README.md").write_text("# Prompts")
+        repo.index.add(["README.md"])
+        repo.index.commit("Third")
+        repo.close()
+        return tmp_path
+
+    @pytest.fixture
+    def service(self, repo_path):
+        """Create an ArtifactDiffService over the test repository with fresh caches"""
+        local_repo_service = LocalRepoService(config_service=Mock())
+        with patch.object(local_repo_service, "get_repo_path", return_value=repo_path), \
+             patch("services.local_repo.local_repo_service.get_artifact_ref_cache", return_value=ArtifactRefCache()):
+            yield ArtifactDiffService(local_repo_service, cache=ArtifactDiffCache())
+
+    def diff(self, service, base, head, file_path=None):
+        return asyncio.run(service.diff("user", "org/repo", file_path or self.FILE_PATH, base, head))
+
+    def test_diff_between_commits(self, service):
+        """Test changed fields between two commits with resolved commits and blobs"""
+        result = self.diff(service, "main~2", "main~1")
+
+        changes = by_path(result.changes)
+        assert set(changes) == {"prompt", "temperature", "tools"}
+        assert changes["tools"].change == ChangeType.ADDED
+        assert result.base_blob != result.head_blob
+        assert len(result.head_commit) == 40
+
+    def test_same_blob_pair_is_served_from_cache(self, service):
+        """Test commits holding the same file versions reuse the computed diff"""
+        first = self.diff(service, "main~2", "main~1")
+
+        with patch.object(service.local_repo_service, "load_artifact") as load:
+            second = self.diff(service, "main~2", "main")
+
+        load.assert_not_called()
+        assert second.changes == first.changes
+        assert second.head_commit != first.head_commit
+
+    def test_unchanged_file_has_no_changes(self, service):
+        """Test commits with the same file version compare as equal without loading it"""
+        with patch.object(service.local_repo_service, "load_artifact") as load:
+            result = self.diff(service, "main~1", "main")
+
+        load.assert_not_called()
+        assert result.changes == []
+
+    def test_missing_artifact_raises_not_found(self, service):
+        """Test a file that exists at neither ref is reported as not found"""
+        with pytest.raises(NotFoundException):
+            self.diff(service, "main~1", "main", file_path="missing.prompt.yaml")
+
+    def test_unknown_ref_raises_not_found(self, service):
+        """Test a ref that names no commit is reported as not found"""
+        with pytest.raises(NotFoundException):
+            self.diff(service, "no-such-branch", "main")
@@ -0,0 +1,427 @@
+"""
+Test suite for background eval jobs
+Tests the job store, the job queue (progress events, cancellation, checkpoints and resuming) and
+progress reporting of EvalExecutionService.execute_eval
+"""
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from middlewares.rest.exceptions import ConflictException, NotFoundException
+from services.artifacts.evals.eval_execution_service import EvalExecutionService, EvalProgressListener
+from services.artifacts.evals.eval_job_queue import EvalJobQueue
+from services.artifacts.evals.eval_job_store import EvalJobStore
+from services.artifacts.evals.metric_batch import EvalMetricBatch
+from services.artifacts.evals.models import (
+    ActualTestFieldsModel,
+    EvalDefinition,
+    EvalExecutionResult,
+    EvalJob,
+    EvalJobEventType,
+    EvalJobStatus,
+    ExpectedTestFieldsModel,
+    MetricConfig,
+    MetricType,
+    TestDefinition,
+    TestExecutionResult,
+)
+
+TEST_NAMES = ["a", "b", "c"]
+
+
+def make_test_result(name: str, passed: bool = True) -> TestExecutionResult:
+    """Create a test result"""
+    return TestExecutionResult(
+        test_name=name,
+        prompt_reference="file:///prompts/p.yaml",
+        template_variables={},
+        actual_test_fields=ActualTestFieldsModel(actual_output="out"),
+        expected_test_fields=ExpectedTestFieldsModel(),
+        metric_results=[],
+        overall_passed=passed,
+        executed_at=datetime.now(timezone.utc),
+    )
+
+
+def make_test_def(name: str) -> TestDefinition:
+    """Create a test definition"""
+    return TestDefinition(name=name, prompt_reference="file:///prompts/p.yaml", user_message="hi")
+
+
+class FakeEvalExecutionService:
+    """Runs an eval of TEST_NAMES through the listener; tests wait for a gate when one is set"""
+
+    def __init__(self, gate: asyncio.Event = None, fail: bool = False):
+        self.gate = gate
+        self.fail = fail
+        self.executed = []
+
+    async def execute_eval(self, user_id, repo_name, eval_name, test_names=None, cache_mode=None,
+                           completed_results=None, listener=None):
+        if self.fail:
+            raise NotFoundException(resource="Eval", identifier=eval_name)
+        completed_results = completed_results or {}
+        tests = [make_test_def(name) for name in TEST_NAMES]
+        await listener.run_started(tests, completed_results)
+        results = []
+        for test_def in tests:
+            if test_def.name in completed_results:
+                results.append(completed_results[test_def.name])
+                continue
+            await listener.test_started(test_def)
+            if self.gate is not None and test_def.name != "a":
+                await self.gate.wait()
+            result = make_test_result(test_def.name)
+            self.executed.append(test_def.name)
+            await listener.test_completed(result)
+            results.append(result)
+        return EvalExecutionResult(
+            eval_name=eval_name,
+            test_results=results,
+            total_tests=len(results),
+            passed_tests=len(results),
+            failed_tests=0,
+            total_execution_time_ms=1
+        )
+
+
+def factory_for(service):
+    """Create a service factory yielding the given service"""
+    @contextmanager
+    def factory():
+        yield service
+    return factory
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a job store in a temporary database"""
+    job_store = EvalJobStore(tmp_path / "jobs.db")
+    yield job_store
+    job_store.close()
+
+
+async def wait_for_status(queue, job_id, *statuses):
+    """Wait until a job reaches one of the statuses"""
+    for _ in range(200):
+        job = await queue.get(job_id, "user")
+        if job.status in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job stayed {job.status}")
+
+
+async def wait_for_completed_tests(queue, job_id, count):
+    """Wait until a job has checkpointed the given number of tests"""
+    for _ in range(200):
+        if (await queue.get(job_id, "user")).completed_tests >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Tests did not complete")
+
+
+async def collect_events(queue, job_id, after=0):
+    """Collect a job's events until it finishes"""
+    return [event async for event in queue.events(job_id, "user", after=after)]
+
+
+class TestEvalJobStore:
+    """Test cases for EvalJobStore"""
+
+    def test_job_roundtrip(self, store):
+        """Test jobs are stored and listed per user"""
+        store.save_job(EvalJob(id="j1", user_id="user", repo_name="r", file_path="e.eval.yaml"))
+        store.save_job(EvalJob(id="j2", user_id="other", repo_name="r", file_path="e.eval.yaml"))
+
+        assert store.get_job("j1").file_path == "e.eval.yaml"
+        assert store.get_job("missing") is None
+        assert [job.id for job in store.list_jobs("user")] == ["j1"]
+
+    def test_checkpoints(self, store):
+        """Test checkpointed results load by test name and are deleted per job"""
+        store.save_checkpoint("j1", make_test_result("a"))
+        store.save_checkpoint("j1", make_test_result("b", passed=False))
+
+        checkpoints = store.load_checkpoints("j1")
+        assert set(checkpoints) == {"a", "b"}
+        assert checkpoints["b"].overall_passed is False
+
+        store.delete_checkpoints("j1")
+        assert store.load_checkpoints("j1") == {}
+
+    def test_mark_interrupted(self, store):
+        """Test queued and running jobs of a previous process are marked interrupted"""
+        for job_id, status in [("q", EvalJobStatus.QUEUED), ("r", EvalJobStatus.RUNNING), ("d", EvalJobStatus.COMPLETED)]:
+            store.save_job(EvalJob(id=job_id, user_id="user", repo_name="r", file_path="e", status=status))
+
+        assert sorted(store.mark_interrupted()) == ["q", "r"]
+        assert store.get_job("r").status == EvalJobStatus.INTERRUPTED
+        assert store.get_job("d").status == EvalJobStatus.COMPLETED
+
+    def test_purge_keeps_unfinished_jobs(self, store):
+        """Test purging deletes old finished jobs with their checkpoints only"""
+        store.save_job(EvalJob(id="done", user_id="user", repo_name="r", file_path="e", status=EvalJobStatus.FAILED))
+        store.save_job(EvalJob(id="queued", user_id="user", repo_name="r", file_path="e"))
+        store.save_checkpoint("done", make_test_result("a"))
+
+        assert store.purge(older_than_seconds=-1) == 1
+        assert store.get_job("done") is None
+        assert store.load_checkpoints("done") == {}
+        assert store.get_job("queued") is not None
+
+
+class TestEvalJobQueue:
+    """Test cases for EvalJobQueue"""
+
+    async def test_job_runs_in_background_with_progress_events(self, store):
+        """Test a submitted job completes and its event stream reports each test"""
+        service = FakeEvalExecutionService()
+        queue = EvalJobQueue(store)
+        await queue.start(factory_for(service))
+        try:
+            job = await queue.submit("user", "org/repo", "e.eval.yaml")
+            assert job.status == EvalJobStatus.QUEUED
+
+            events = await collect_events(queue, job.id)
+        finally:
+            await queue.stop()
+
+        completed = [event for event in events if event.type == EvalJobEventType.TEST_COMPLETED]
+        assert [event.test_name for event in completed] == TEST_NAMES
+        assert [event.completed_tests for event in completed] == [1, 2, 3]
+        assert all(event.total_tests == 3 for event in completed)
+        assert events[-1].status == EvalJobStatus.COMPLETED
+        assert [event.sequence for event in events] == list(range(1, len(events) + 1))
+
+        job = await queue.get(job.id, "user")
+        assert job.result.total_tests == 3
+        assert store.load_checkpoints(job.id) == {}
+        # Job times are timezone-aware like other artifact times
+        assert all(t.tzinfo is not None for t in (job.created_at, job.started_at, job.finished_at))
+        assert job.created_at <= job.started_at <= job.finished_at
+
+    async def test_rejoining_stream_skips_seen_events(self, store):
+        """Test following a stream from a sequence number only yields later events"""
+        queue = EvalJobQueue(store)
+        await queue.start(factory_for(FakeEvalExecutionService()))
+        try:
+            job = await queue.submit("user", "org/repo", "e.eval.yaml")
+            events = await collect_events(queue, job.id)
+            rejoined = await collect_events(queue, job.id, after=3)
+        finally:
+            await queue.stop()
+
+        assert [event.sequence for event in rejoined] == [event.sequence for event in events[3:]]
+
+    async def test_cancel_and_resume_skip_completed_tests(self, store):
+        """Test a cancelled job keeps its checkpoints and resuming only runs the remaining tests"""
+        gate = asyncio.Event()
+        service = FakeEvalExecutionService(gate=gate)
+        queue = EvalJobQueue(store)
+        await queue.start(factory_for(service))
+        try:
+            job = await queue.submit("user", "org/repo", "e.eval.yaml")
+            await wait_for_completed_tests(queue, job.id, 1)
+
+            cancelled = await queue.cancel(job.id, "user")
+            assert cancelled.status == EvalJobStatus.CANCELLED
+            assert cancelled.completed_tests == 1
+            assert set(store.load_checkpoints(job.id)) == {"a"}
+
+            gate.set()
+            await queue.resume(job.id, "user")
+            resumed = await wait_for_status(queue, job.id, EvalJobStatus.COMPLETED)
+        finally:
+            await queue.stop()
+
+        assert service.executed == ["a", "b", "c"]
+        assert [result.test_name for result in resumed.result.test_results] == TEST_NAMES
+
+    async def test_cancel_queued_job(self, store):
+        """Test a job cancelled before a worker picks it up never runs"""
+        gate = asyncio.Event()
+        service = FakeEvalExecutionService(gate=gate)
+        queue = EvalJobQueue(store, workers=1)
+        await queue.start(factory_for(service))
+        try:
+            first = await queue.submit("user", "org/repo", "e.eval.yaml")
+            second = await queue.submit("user", "org/repo", "e.eval.yaml")
+
+            cancelled = await queue.cancel(second.id, "user")
+            gate.set()
+            await wait_for_status(queue, first.id, EvalJobStatus.COMPLETED)
+        finally:
+            await queue.stop()
+
+        assert cancelled.status == EvalJobStatus.CANCELLED
+        assert service.executed == TEST_NAMES
+
+    async def test_restart_resumes_interrupted_job(self, tmp_path):
+        """Test a job running at shutdown is interrupted and resumed by the next process from its checkpoints"""
+        path = tmp_path / "jobs.db"
+        first_service = FakeEvalExecutionService(gate=asyncio.Event())
+        first_queue = EvalJobQueue(EvalJobStore(path))
+        await first_queue.start(factory_for(first_service))
+        job = await first_queue.submit("user", "org/repo", "e.eval.yaml")
+        await wait_for_completed_tests(first_queue, job.id, 1)
+        await first_queue.stop()
+        first_queue.store.close()
+
+        second_service = FakeEvalExecutionService()
+        second_queue = EvalJobQueue(EvalJobStore(path))
+        await second_queue.start(factory_for(second_service))
+        try:
+            interrupted = await second_queue.get(job.id, "user")
+            assert interrupted.status == EvalJobStatus.INTERRUPTED
+
+            await second_queue.resume(job.id, "user")
+            completed = await wait_for_status(second_queue, job.id, EvalJobStatus.COMPLETED)
+        finally:
+            await second_queue.stop()
+            second_queue.store.close()
+
+        assert second_service.executed == ["b", "c"]
+        assert completed.result.total_tests == 3
+
+    async def test_failed_job_records_error(self, store):
+        """Test a job whose eval fails ends failed with the error"""
+        queue = EvalJobQueue(store)
+        await queue.start(factory_for(FakeEvalExecutionService(fail=True)))
+        try:
+            job = await queue.submit("user", "org/repo", "missing.eval.yaml")
+            events = await collect_events(queue, job.id)
+        finally:
+            await queue.stop()
+
+        assert events[-1].status == EvalJobStatus.FAILED
+        assert "not found" in events[-1].error
+
+    async def test_jobs_are_private_and_completed_jobs_not_resumable(self, store):
+        """Test other users cannot see a job and completed jobs cannot be resumed"""
+        queue = EvalJobQueue(store)
+        await queue.start(factory_for(FakeEvalExecutionService()))
+        try:
+            job = await queue.submit("user", "org/repo", "e.eval.yaml")
+            await wait_for_status(queue, job.id, EvalJobStatus.COMPLETED)
+
+            with pytest.raises(NotFoundException):
+                await queue.get(job.id, "someone-else")
+            with pytest.raises(ConflictException):
+                await queue.resume(job.id, "user")
+        finally:
+            await queue.stop()
+
+
+class RecordingListener(EvalProgressListener):
+    """Listener recording the notifications it receives"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def run_started(self, tests, completed_results):
+        self.calls.append(("run_started", [t.name for t in tests], sorted(completed_results)))
+
+    async def test_started(self, test_def):
+        self.calls.append(("test_started", test_def.name))
+
+    async def test_completed(self, result):
+        self.calls.append(("test_completed", result.test_name, result.overall_passed))
+
+
+class TestExecuteEvalProgress:
+    """Test cases for progress reporting and resuming in EvalExecutionService.execute_eval"""
+
+    @pytest.fixture
+    def service(self):
+        """Create an EvalExecutionService over an eval of three tests with mocked dependencies"""
+        eval_meta_service = Mock()
+        eval_meta_service.get = AsyncMock(return_value=SimpleNamespace(eval=SimpleNamespace(
+            tests=[make_test_def(name) for name in TEST_NAMES],
+            metrics=[]
+        )))
+        eval_execution_meta_service = Mock()
+        eval_execution_meta_service.save_execution_result = AsyncMock()
+        return EvalExecutionService(
+            eval_meta_service=eval_meta_service,
+            eval_execution_meta_service=eval_execution_meta_service,
+            prompt_service=Mock(),
+            deepeval_adapter=Mock(),
+            chat_completion_service=Mock(),
+            config_service=Mock(),
+        )
+
+    async def test_completed_tests_are_not_executed_again(self, service):
+        """Test checkpointed results are reused in eval order and only other tests execute"""
+        executed = []
+
+        async def execute(user_id, repo_name, test_def, *args):
+            executed.append(test_def.name)
+            return make_test_result(test_def.name)
+
+        listener = RecordingListener()
+        with patch.object(service, "_execute_single_test_internal", side_effect=execute):
+            result = await service.execute_eval(
+                "user", "org/repo", "e.eval.yaml",
+                completed_results={"b": make_test_result("b", passed=False)},
+                listener=listener
+            )
+
+        assert sorted(executed) == ["a", "c"]
+        assert [r.test_name for r in result.test_results] == TEST_NAMES
+        assert result.passed_tests == 2
+        assert listener.calls[0] == ("run_started", TEST_NAMES, ["b"])
+        assert sorted(c[1] for c in listener.calls if c[0] == "test_completed") == ["a", "c"]
+
+    async def test_results_keep_eval_order_without_listener(self, service):
+        """Test a synchronous run returns its results in eval order, whatever order tests finish in"""
+        async def execute(user_id, repo_name, test_def, *args):
+            # Later tests finish first
+            await asyncio.sleep(0.01 * (len(TEST_NAMES) - TEST_NAMES.index(test_def.name)))
+            return make_test_result(test_def.name)
+
+        with patch.object(service, "_execute_single_test_internal", side_effect=execute):
+            result = await service.execute_eval("user", "org/repo", "e.eval.yaml")
+
+        assert [r.test_name for r in result.test_results] == TEST_NAMES
+
+    def test_duplicate_test_names_are_rejected(self):
+        """Test an eval cannot define two tests with the same name"""
+        with pytest.raises(ValueError, match="duplicated: a"):
+            EvalDefinition(name="e", tests=[make_test_def("a"), make_test_def("b"), make_test_def("a")])
+
+    async def test_batched_metrics_reported_after_evaluation(self, service):
+        """Test tests with batched metrics are reported once their metrics are evaluated"""
+        config = MetricConfig(type=MetricType.ANSWER_RELEVANCY, threshold=0.5, provider="openai", model="gpt-4o")
+        batches = []
+
+        async def execute(user_id, repo_name, test_def, metrics, cache_mode, scheduler, metric_batch):
+            result = make_test_result(test_def.name, passed=False)
+            result.metric_results.append(EvalMetricBatch.placeholder(config))
+            metric_batch.add(result, 0, test_def.name, Mock(), config, "openai/gpt-4o")
+            return result
+
+        async def evaluate_group(group):
+            batches.append([pending.test_result.test_name for pending in group])
+            return [EvalMetricBatch.placeholder(config).model_copy(update={"passed": True}) for _ in group]
+
+        listener = RecordingListener()
+        with patch.object(service, "_execute_single_test_internal", side_effect=execute), \
+             patch.object(EvalMetricBatch, "_evaluate_group", side_effect=evaluate_group), \
+             patch("services.artifacts.evals.eval_execution_service.settings") as settings:
+            settings.eval_batch_judge_metrics = True
+            settings.eval_batch_deterministic_metrics = True
+            settings.eval_max_concurrent_tests = 8
+            settings.eval_max_concurrent_requests_per_provider = 4
+            settings.eval_max_concurrent_judge_cases = 16
+            settings.eval_job_checkpoint_tests = 2
+            await service.execute_eval("user", "org/repo", "e.eval.yaml", listener=listener)
+
+        completed = [c for c in listener.calls if c[0] == "test_completed"]
+        assert sorted(c[1] for c in completed) == TEST_NAMES
+        assert all(passed for _, _, passed in completed)
+        assert sum(len(batch) for batch in batches) == 3
+        assert len(batches) == 2
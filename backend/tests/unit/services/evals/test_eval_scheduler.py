@@ -0,0 +1,60 @@
+"""
+Test suite for EvalTestScheduler
+Tests bounded concurrent test execution, result ordering and per-provider request slots
+"""
+import asyncio
+import pytest
+
+from services.artifacts.evals.eval_scheduler import EvalTestScheduler
+
+
+class TestEvalTestScheduler:
+    """Test cases for EvalTestScheduler"""
+
+    @pytest.mark.asyncio
+    async def test_run_keeps_input_order(self):
+        """Test results are returned in the order of the submitted tests"""
+        scheduler = EvalTestScheduler(max_concurrent_tests=4)
+
+        async def worker(item: int) -> int:
+            await asyncio.sleep(0.01 * (5 - item))
+            return item * 10
+
+        assert await scheduler.run([1, 2, 3, 4], worker) == [10, 20, 30, 40]
+
+    @pytest.mark.asyncio
+    async def test_run_bounds_concurrent_tests(self):
+        """Test no more than max_concurrent_tests workers run at once"""
+        scheduler = EvalTestScheduler(max_concurrent_tests=3)
+        running = 0
+        peak = 0
+
+        async def worker(item: int) -> int:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return item
+
+        await scheduler.run(list(range(10)), worker)
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_provider_slots_are_per_provider(self):
+        """Test completions are capped per provider but providers do not block each other"""
+        scheduler = EvalTestScheduler(max_concurrent_tests=10, max_concurrent_requests_per_provider=2)
+        in_flight = {"openai": 0, "anthropic": 0}
+        peaks = {"openai": 0, "anthropic": 0}
+
+        async def worker(provider: str) -> None:
+            async with scheduler.provider_slot(provider):
+                in_flight[provider] += 1
+                peaks[provider] = max(peaks[provider], in_flight[provider])
+                await asyncio.sleep(0.01)
+                in_flight[provider] -= 1
+
+        await scheduler.run(["openai"] * 5 + ["anthropic"] * 5, worker)
+
+        assert peaks == {"openai": 2, "anthropic": 2}
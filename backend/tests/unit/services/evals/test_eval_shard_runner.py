@@ -0,0 +1,430 @@
+"""
+Test suite for sharded eval runs
+Tests shard planning, result merging, the in-memory and SQLite shard queues, and the shard runner
+with workers on the coordinator's event loop and on a shared queue
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from middlewares.rest.exceptions import NotFoundException
+from services.artifacts.evals.models import (
+    ActualTestFieldsModel,
+    EvalExecutionResult,
+    ExpectedTestFieldsModel,
+    TestDefinition,
+    TestExecutionResult,
+)
+from services.artifacts.evals.sharding import (
+    EvalShard,
+    EvalShardRunner,
+    EvalShardWorker,
+    InMemoryShardQueue,
+    ShardOutcome,
+    ShardStatus,
+    SQLiteShardQueue,
+    create_shard_queue,
+    merge_shard_outcomes,
+    plan_shards,
+)
+from services.artifacts.evals.sharding.shard_worker import in_process_service_factory
+
+
+def make_test_def(name: str, enabled: bool = True) -> TestDefinition:
+    """Create a test definition"""
+    return TestDefinition(name=name, prompt_reference="file:///prompts/p.yaml", user_message="hi", enabled=enabled)
+
+
+def make_test_result(name: str, passed: bool = True) -> TestExecutionResult:
+    """Create a test result"""
+    return TestExecutionResult(
+        test_name=name,
+        prompt_reference="file:///prompts/p.yaml",
+        template_variables={},
+        actual_test_fields=ActualTestFieldsModel(actual_output="out"),
+        expected_test_fields=ExpectedTestFieldsModel(),
+        metric_results=[],
+        overall_passed=passed,
+        executed_at=datetime.now(timezone.utc),
+    )
+
+
+def make_shard(run_id: str = "run", index: int = 0, test_names=None) -> EvalShard:
+    """Create a shard"""
+    return EvalShard(
+        run_id=run_id,
+        index=index,
+        count=1,
+        user_id="user",
+        repo_name="repo",
+        file_path="evals/e.yaml",
+        test_names=test_names or ["a"],
+    )
+
+
+class FakeEvalExecutionService:
+    """Executes the requested tests of an eval of the given tests; tests named in failing fail"""
+
+    def __init__(self, tests, failing=(), raising_for=None):
+        self.eval_meta_service = SimpleNamespace(
+            get=AsyncMock(return_value=SimpleNamespace(eval=SimpleNamespace(tests=tests)))
+        )
+        self.eval_execution_meta_service = SimpleNamespace(save_execution_result=AsyncMock(return_value=True))
+        self.failing = set(failing)
+        self.raising_for = raising_for
+        self.calls = []
+
+    async def execute_eval(self, user_id, repo_name, eval_name, test_names=None, cache_mode=None,
+                           completed_results=None, listener=None, save_result=True):
+        self.calls.append({"test_names": test_names, "save_result": save_result})
+        if self.raising_for in test_names:
+            raise RuntimeError("eval file changed")
+        await asyncio.sleep(0)
+        # Reversed, so merging has to restore the eval order
+        results = [make_test_result(name, passed=name not in self.failing) for name in reversed(test_names)]
+        passed = sum(1 for r in results if r.overall_passed)
+        return EvalExecutionResult(
+            eval_name=eval_name,
+            test_results=results,
+            total_tests=len(results),
+            passed_tests=passed,
+            failed_tests=len(results) - passed,
+            total_execution_time_ms=1
+        )
+
+
+@pytest.fixture
+def sqlite_queue(tmp_path):
+    """Create a SQLite shard queue in a temporary database"""
+    queue = SQLiteShardQueue(tmp_path / "shards.db")
+    yield queue
+    queue.close()
+
+
+class TestPlanShards:
+    """Tests for plan_shards"""
+
+    def test_deals_tests_round_robin(self):
+        """Tests are dealt round-robin into shards of at most shard_size tests"""
+        names = [f"t{i}" for i in range(7)]
+
+        shards = plan_shards(names, 3)
+
+        assert shards == [["t0", "t3", "t6"], ["t1", "t4"], ["t2", "t5"]]
+
+    def test_plan_covers_every_test_once_and_is_deterministic(self):
+        """Every test lands in exactly one shard and the same input gives the same plan"""
+        names = [f"t{i}" for i in range(5000)]
+
+        shards = plan_shards(names, 50)
+
+        assert len(shards) == 100
+        assert sorted(name for shard in shards for name in shard) == sorted(names)
+        assert max(len(shard) for shard in shards) == 50
+        assert plan_shards(names, 50) == shards
+
+    def test_no_tests_give_no_shards(self):
+        """An eval without tests has no shards"""
+        assert plan_shards([], 50) == []
+
+
+class TestMergeShardOutcomes:
+    """Tests for merge_shard_outcomes"""
+
+    def test_results_follow_eval_order(self):
+        """Merged results are in eval order regardless of shard and completion order"""
+        tests = [make_test_def(name) for name in ["a", "b", "c", "d"]]
+        shards = [make_shard(index=0, test_names=["a", "c"]), make_shard(index=1, test_names=["b", "d"])]
+        outcomes = [
+            ShardOutcome(run_id="run", index=1, status=ShardStatus.COMPLETED,
+                         test_results=[make_test_result("d", passed=False), make_test_result("b")]),
+            ShardOutcome(run_id="run", index=0, status=ShardStatus.COMPLETED,
+                         test_results=[make_test_result("c"), make_test_result("a")]),
+        ]
+
+        result = merge_shard_outcomes("evals/e.yaml", tests, shards, outcomes, 10)
+
+        assert [r.test_name for r in result.test_results] == ["a", "b", "c", "d"]
+        assert (result.total_tests, result.passed_tests, result.failed_tests) == (4, 3, 1)
+        assert result.total_execution_time_ms == 10
+
+    def test_failed_and_unfinished_shards_report_errors(self):
+        """Tests of failed or unfinished shards become failed results carrying the shard's error"""
+        tests = [make_test_def(name) for name in ["a", "b"]]
+        shards = [make_shard(index=0, test_names=["a"]), make_shard(index=1, test_names=["b"])]
+        outcomes = [ShardOutcome(run_id="run", index=0, status=ShardStatus.FAILED, error="boom")]
+
+        result = merge_shard_outcomes("evals/e.yaml", tests, shards, outcomes, 10)
+
+        assert result.failed_tests == 2
+        assert "boom" in result.test_results[0].actual_test_fields.error
+        assert "did not finish" in result.test_results[1].actual_test_fields.error
+
+
+@pytest.mark.parametrize("queue_kind", ["memory", "sqlite"])
+class TestShardQueues:
+    """Tests for the in-memory and SQLite shard queues"""
+
+    @pytest.fixture
+    def queue(self, queue_kind, sqlite_queue):
+        """Create the queue under test"""
+        return InMemoryShardQueue() if queue_kind == "memory" else sqlite_queue
+
+    def test_shards_are_claimed_once_in_order(self, queue):
+        """Each pending shard is handed to one worker, in submission order"""
+        queue.submit([make_shard(index=0), make_shard(index=1)])
+
+        first = queue.claim("w1", 60)
+        second = queue.claim("w2", 60)
+
+        assert (first.index, second.index) == (0, 1)
+        assert queue.claim("w3", 60) is None
+
+    def test_claim_can_be_limited_to_a_run(self, queue):
+        """A worker serving one run does not claim shards of another"""
+        queue.submit([make_shard(run_id="other")])
+
+        assert queue.claim("w1", 60, run_id="run") is None
+        assert queue.claim("w1", 60, run_id="other").run_id == "other"
+
+    def test_expired_lease_can_be_claimed_again(self, queue):
+        """A shard whose worker did not report in time goes to another worker"""
+        queue.submit([make_shard()])
+        queue.claim("w1", -1)
+
+        assert queue.claim("w2", 60).index == 0
+
+    def test_first_outcome_wins(self, queue):
+        """A late outcome of a reclaimed shard does not replace the first one"""
+        shard = make_shard()
+        queue.submit([shard])
+        queue.claim("w1", 60)
+
+        queue.complete(shard, "w1", [make_test_result("a")])
+        queue.fail(shard, "w2", "late")
+
+        outcomes = queue.outcomes("run")
+        assert len(outcomes) == 1
+        assert outcomes[0].status == ShardStatus.COMPLETED
+        assert outcomes[0].test_results[0].test_name == "a"
+
+    def test_renewed_lease_is_not_claimed_again(self, queue):
+        """A shard whose worker renews its lease stays with that worker"""
+        queue.submit([make_shard()])
+        queue.claim("w1", -1)
+
+        assert queue.renew("run", 0, "w1", 60) is True
+        assert queue.claim("w2", 60) is None
+
+    def test_reclaimed_shard_is_kept_by_its_new_worker(self, queue):
+        """A worker whose lease was taken over can neither renew nor finish the shard"""
+        shard = make_shard()
+        queue.submit([shard])
+        queue.claim("w1", -1)
+        queue.claim("w2", 60)
+
+        assert queue.renew("run", 0, "w1", 60) is False
+        queue.complete(shard, "w1", [make_test_result("a")])
+        assert queue.outcomes("run") == []
+
+        queue.fail(shard, "w2", "boom")
+        assert queue.outcomes("run")[0].worker_id == "w2"
+
+    def test_release_returns_a_workers_shards(self, queue):
+        """Shards held by a crashed worker are queued again"""
+        queue.submit([make_shard()])
+        queue.claim("w1", 60)
+
+        assert queue.release("run", "w1") == 1
+        assert queue.claim("w2", 60).index == 0
+
+    def test_delete_run(self, queue):
+        """Deleting a run removes its shards and outcomes"""
+        shard = make_shard()
+        queue.submit([shard])
+        queue.claim("w1", 60)
+        queue.fail(shard, "w1", "boom")
+
+        queue.delete_run("run")
+
+        assert queue.outcomes("run") == []
+        assert queue.claim("w1", 60) is None
+
+
+class TestSQLiteShardQueue:
+    """Tests specific to the SQLite shard queue"""
+
+    def test_queue_is_shared_between_connections(self, tmp_path):
+        """Workers opening the same file, as separate processes do, share its shards"""
+        coordinator = SQLiteShardQueue(tmp_path / "shards.db")
+        worker = SQLiteShardQueue(tmp_path / "shards.db")
+        try:
+            shard = make_shard()
+            coordinator.submit([shard])
+
+            claimed = worker.claim("w1", 60)
+            worker.complete(claimed, "w1", [make_test_result("a")])
+
+            assert coordinator.claim("w2", 60) is None
+            assert coordinator.outcomes("run")[0].worker_id == "w1"
+        finally:
+            coordinator.close()
+            worker.close()
+
+
+class TestEvalShardWorker:
+    """Tests for EvalShardWorker"""
+
+    async def test_lease_is_renewed_while_shard_executes(self):
+        """A shard running longer than its lease is not claimed by another worker"""
+        queue = InMemoryShardQueue()
+        queue.submit([make_shard()])
+        service = FakeEvalExecutionService([make_test_def("a")])
+        execute_eval = service.execute_eval
+
+        async def slow_execute_eval(*args, **kwargs):
+            await asyncio.sleep(0.2)
+            return await execute_eval(*args, **kwargs)
+
+        service.execute_eval = slow_execute_eval
+        worker = EvalShardWorker(
+            queue, in_process_service_factory(service), worker_id="w1", lease_seconds=0.05, heartbeat_seconds=0.01
+        )
+        execution = asyncio.create_task(worker.run(exit_when_idle=True))
+        await asyncio.sleep(0.1)
+
+        assert queue.claim("w2", 60) is None
+        assert await execution == 1
+        assert queue.outcomes("run")[0].worker_id == "w1"
+
+    async def test_execution_stops_when_lease_is_lost(self):
+        """A worker stops executing a shard it no longer holds and reports nothing"""
+        queue = InMemoryShardQueue()
+        shard = make_shard()
+        queue.submit([shard])
+        queue.claim("w1", 60)
+        started = asyncio.Event()
+
+        async def endless_execute_eval(*args, **kwargs):
+            started.set()
+            await asyncio.sleep(60)
+
+        service = SimpleNamespace(execute_eval=endless_execute_eval)
+        worker = EvalShardWorker(queue, in_process_service_factory(service), worker_id="w1", heartbeat_seconds=0.01)
+        execution = asyncio.create_task(worker.run_shard(service, shard))
+        await started.wait()
+        queue.release("run", "w1")
+
+        await asyncio.wait_for(execution, 5)
+        assert queue.outcomes("run") == []
+
+
+class TestCreateShardQueue:
+    """Tests for create_shard_queue"""
+
+    def test_builtin_backends(self, tmp_path):
+        """memory:// and sqlite:/// URLs create the built-in backends"""
+        assert isinstance(create_shard_queue("memory://"), InMemoryShardQueue)
+        queue = create_shard_queue(f"sqlite:///{tmp_path}/shards.db")
+        assert isinstance(queue, SQLiteShardQueue)
+        assert str(queue.path) == f"{tmp_path}/shards.db"
+
+    def test_custom_backend_factory(self):
+        """A module:factory URL calls the factory"""
+        queue = create_shard_queue("services.artifacts.evals.sharding.memory_shard_queue:InMemoryShardQueue")
+
+        assert isinstance(queue, InMemoryShardQueue)
+
+    def test_unknown_backend(self):
+        """An unknown URL is rejected"""
+        with pytest.raises(ValueError):
+            create_shard_queue("redis://localhost")
+
+
+class TestEvalShardRunner:
+    """Tests for EvalShardRunner"""
+
+    async def test_merges_in_process_shards_in_eval_order(self):
+        """Shards executed by in-process workers are merged in eval order and saved once"""
+        tests = [make_test_def(f"t{i}") for i in range(10)] + [make_test_def("off", enabled=False)]
+        service = FakeEvalExecutionService(tests, failing={"t3"})
+        runner = EvalShardRunner(service, InMemoryShardQueue(), local_workers=3, shard_size=4, poll_seconds=0.01)
+
+        result = await runner.run("user", "repo", "evals/e.yaml")
+
+        assert [r.test_name for r in result.test_results] == [f"t{i}" for i in range(10)]
+        assert (result.total_tests, result.passed_tests, result.failed_tests) == (10, 9, 1)
+        assert len(service.calls) == 3
+        assert all(call["save_result"] is False for call in service.calls)
+        service.eval_execution_meta_service.save_execution_result.assert_awaited_once_with(
+            "user", "repo", "evals/e.yaml", result
+        )
+
+    async def test_runs_selected_tests(self):
+        """Only the requested tests are sharded"""
+        service = FakeEvalExecutionService([make_test_def(name) for name in ["a", "b", "c"]])
+        runner = EvalShardRunner(service, InMemoryShardQueue(), local_workers=2, shard_size=1, poll_seconds=0.01)
+
+        result = await runner.run("user", "repo", "evals/e.yaml", test_names=["c", "a"])
+
+        assert [r.test_name for r in result.test_results] == ["a", "c"]
+
+    async def test_failed_shard_reports_error_results(self):
+        """A shard whose execution raised reports its tests as errors without failing the run"""
+        service = FakeEvalExecutionService([make_test_def(name) for name in ["a", "b"]], raising_for="b")
+        runner = EvalShardRunner(service, InMemoryShardQueue(), local_workers=2, shard_size=1, poll_seconds=0.01)
+
+        result = await runner.run("user", "repo", "evals/e.yaml")
+
+        assert result.test_results[0].overall_passed
+        assert "eval file changed" in result.test_results[1].actual_test_fields.error
+
+    async def test_missing_eval_raises_not_found(self):
+        """A missing eval raises NotFoundException before any shard is queued"""
+        service = FakeEvalExecutionService([])
+        service.eval_meta_service.get.return_value = None
+        runner = EvalShardRunner(service, InMemoryShardQueue())
+
+        with pytest.raises(NotFoundException):
+            await runner.run("user", "repo", "evals/missing.yaml")
+
+    async def test_shared_queue_is_served_by_remote_workers(self, sqlite_queue):
+        """With no local workers, shards are executed by workers serving the shared queue"""
+        service = FakeEvalExecutionService([make_test_def(f"t{i}") for i in range(6)])
+        runner = EvalShardRunner(service, sqlite_queue, local_workers=0, shard_size=2, poll_seconds=0.01)
+        stop = asyncio.Event()
+        remote_workers = [
+            asyncio.create_task(
+                EvalShardWorker(sqlite_queue, in_process_service_factory(service), poll_seconds=0.01).run(
+                    stop_event=stop
+                )
+            )
+            for _ in range(2)
+        ]
+        try:
+            result = await runner.run("user", "repo", "evals/e.yaml")
+        finally:
+            stop.set()
+            await asyncio.gather(*remote_workers)
+
+        assert [r.test_name for r in result.test_results] == [f"t{i}" for i in range(6)]
+        assert result.passed_tests == 6
+        # The run's shards are removed once merged
+        assert sqlite_queue.claim("w", 60) is None
+
+    async def test_timeout_reports_unfinished_shards(self, sqlite_queue):
+        """Tests of shards nobody finished before the timeout are reported as errors"""
+        service = FakeEvalExecutionService([make_test_def("a")])
+        runner = EvalShardRunner(service, sqlite_queue, local_workers=0, poll_seconds=0.01)
+
+        start = time.time()
+        result = await runner.run("user", "repo", "evals/e.yaml", timeout_seconds=0.05)
+
+        assert time.time() - start < 5
+        assert result.failed_tests == 1
+        assert "did not finish" in result.test_results[0].actual_test_fields.error
+        assert sqlite_queue.claim("w", 60) is None
@@ -0,0 +1,230 @@
+"""
+Test suite for JudgeRuntime
+Tests the shared judge event loop, provider client reuse, per-provider concurrency caps
+and rate-limit backoff
+"""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from lib.deepeval.judge_runtime import JudgeRuntime
+
+
+class FakeProviderClient:
+    """Provider client recording the loop it runs on and its peak concurrency"""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.loops = set()
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+        self.client = SimpleNamespace(closed=False, aclose=self._close_http_client)
+
+    async def _close_http_client(self):
+        self.client.closed = True
+
+    async def acompletion(self, model, messages, **kwargs):
+        self.loops.add(asyncio.get_running_loop())
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return SimpleNamespace(model=model, kwargs=kwargs)
+
+    async def aembedding(self, model, inputs, **kwargs):
+        self.calls += 1
+        # Deliberately out of order; the runtime orders vectors by index
+        data = [SimpleNamespace(index=i, embedding=[float(len(text))]) for i, text in enumerate(inputs)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+class RateLimitError(Exception):
+    """Stand-in for a provider SDK's rate-limit exception"""
+
+
+class RateLimitedClient(FakeProviderClient):
+    """Provider client rejecting its first calls with a rate-limit error"""
+
+    def __init__(self, rejections: int):
+        super().__init__()
+        self.rejections = rejections
+
+    async def acompletion(self, model, messages, **kwargs):
+        if self.rejections > 0:
+            self.rejections -= 1
+            raise RateLimitError("slow down")
+        return await super().acompletion(model, messages, **kwargs)
+
+
+@pytest.fixture
+def runtime():
+    """Create a runtime and stop its loop afterwards"""
+    judge_runtime = JudgeRuntime(max_concurrent_per_provider=2)
+    yield judge_runtime
+    judge_runtime.close()
+
+
+@pytest.fixture
+def fake_clients():
+    """Patch provider client creation, returning one fake client per created key"""
+    created = []
+
+    def create(provider, api_key=None, api_base=None):
+        client = FakeProviderClient()
+        created.append((provider, api_key, client))
+        return client
+
+    with patch("lib.any_llm.any_llm_adapter.create_provider_client", side_effect=create):
+        yield created
+
+
+class TestJudgeRuntime:
+    """Test cases for JudgeRuntime"""
+
+    def test_run_reuses_one_loop_thread(self, runtime):
+        """Test sync calls all run on the same background loop"""
+        async def current_loop():
+            return asyncio.get_running_loop(), threading.current_thread()
+
+        first_loop, first_thread = runtime.run(current_loop())
+        second_loop, second_thread = runtime.run(current_loop())
+
+        assert first_loop is second_loop
+        assert first_thread is second_thread
+        assert first_thread is not threading.current_thread()
+
+    @pytest.mark.asyncio
+    async def test_run_from_running_loop_thread(self, runtime):
+        """Test sync generate-style calls work when the caller already has a running loop"""
+        async def answer():
+            return 42
+
+        result = await asyncio.to_thread(runtime.run, answer())
+
+        assert result == 42
+
+    @pytest.mark.asyncio
+    async def test_run_on_runtime_loop_raises(self, runtime):
+        """Test blocking from the judge loop itself is refused instead of deadlocking"""
+        async def answer():
+            return 1
+
+        async def nested():
+            coro = answer()
+            with pytest.raises(RuntimeError):
+                runtime.run(coro)
+            return await runtime.submit(answer())
+
+        assert await runtime.submit(nested()) == 1
+
+    def test_complete_reuses_provider_client(self, runtime, fake_clients):
+        """Test one client is created per provider and credential and reused across calls"""
+        messages = [{"role": "user", "content": "hi"}]
+        for _ in range(3):
+            runtime.run(runtime.complete("openai", "gpt-4o", messages, api_key="key-1"))
+        runtime.run(runtime.complete("openai", "gpt-4o", messages, api_key="key-2"))
+
+        assert [(provider, key) for provider, key, _ in fake_clients] == [
+            ("openai", "key-1"), ("openai", "key-2")
+        ]
+        client = fake_clients[0][2]
+        assert client.calls == 3
+        assert client.loops == {runtime.loop}
+
+    @pytest.mark.asyncio
+    async def test_complete_caps_concurrency_per_provider(self, runtime, fake_clients):
+        """Test in-flight calls per provider never exceed the configured cap"""
+        messages = [{"role": "user", "content": "hi"}]
+        await asyncio.gather(*(
+            runtime.complete("openai", "gpt-4o", messages, api_key="key", temperature=0.0)
+            for _ in range(6)
+        ))
+
+        client = fake_clients[0][2]
+        assert client.calls == 6
+        assert client.peak == 2
+
+    def test_complete_retries_after_rate_limit(self):
+        """Test a rate-limited judge call pauses the provider and is retried"""
+        runtime = JudgeRuntime(rate_limit_backoff_seconds=0.05)
+        client = RateLimitedClient(rejections=2)
+        try:
+            with patch("lib.any_llm.any_llm_adapter.create_provider_client", return_value=client):
+                started = time.perf_counter()
+                runtime.run(runtime.complete("openai", "gpt-4o", [], api_key="key"))
+                elapsed = time.perf_counter() - started
+        finally:
+            runtime.close()
+
+        assert client.calls == 1
+        assert elapsed >= 0.05 + 0.1
+
+    def test_complete_gives_up_after_retries(self):
+        """Test the rate-limit error surfaces once the retries are used up"""
+        runtime = JudgeRuntime(max_rate_limit_retries=1, rate_limit_backoff_seconds=0.01)
+        client = RateLimitedClient(rejections=5)
+        try:
+            with patch("lib.any_llm.any_llm_adapter.create_provider_client", return_value=client):
+                with pytest.raises(RateLimitError):
+                    runtime.run(runtime.complete("openai", "gpt-4o", [], api_key="key"))
+        finally:
+            runtime.close()
+
+        assert client.rejections == 3
+
+    def test_embed_returns_vectors_in_input_order(self, runtime, fake_clients):
+        """Test embeddings are requested through the shared client and returned in input order"""
+        vectors = runtime.run(runtime.embed("openai", "text-embedding-3-small", ["a", "bb", "ccc"], api_key="key"))
+        runtime.run(runtime.complete("openai", "gpt-4o", [], api_key="key"))
+
+        assert vectors == [[1.0], [2.0], [3.0]]
+        assert len(fake_clients) == 1
+        assert fake_clients[0][2].calls == 2
+
+    def test_least_recently_used_client_is_closed(self, fake_clients):
+        """Test clients beyond max_clients are closed, least recently used first"""
+        runtime = JudgeRuntime(max_clients=2)
+        try:
+            runtime.run(runtime.complete("openai", "gpt-4o", [], api_key="a"))
+            runtime.run(runtime.complete("openai", "gpt-4o", [], api_key="b"))
+            runtime.run(runtime.complete("openai", "gpt-4o", [], api_key="a"))
+            runtime.run(runtime.complete("openai", "gpt-4o", [], api_key="c"))
+
+            closed = [key for _, key, client in fake_clients if client.client.closed]
+        finally:
+            runtime.close()
+
+        assert closed == ["b"]
+        assert all(client.client.closed for _, _, client in fake_clients)
+
+    def test_client_evicted_during_a_call_is_closed_after_it(self):
+        """Test a client evicted while serving a call stays open until the call finishes"""
+        clients = {"a": FakeProviderClient(delay=0.2), "b": FakeProviderClient(delay=0.01)}
+        runtime = JudgeRuntime(max_clients=1)
+
+        async def overlapping_calls():
+            first = asyncio.ensure_future(runtime.complete("openai", "gpt-4o", [], api_key="a"))
+            await asyncio.sleep(0.05)
+            await runtime.complete("anthropic", "claude", [], api_key="b")
+            closed_during_call = clients["a"].client.closed
+            await first
+            return closed_during_call, clients["a"].client.closed
+
+        with patch(
+            "lib.any_llm.any_llm_adapter.create_provider_client",
+            side_effect=lambda provider, api_key=None, api_base=None: clients[api_key]
+        ):
+            try:
+                closed_during_call, closed_after_call = runtime.run(overlapping_calls())
+            finally:
+                runtime.close()
+
+        assert closed_during_call is False
+        assert closed_after_call is True
+        assert clients["b"].client.closed is True
@@ -0,0 +1,221 @@
+"""
+Test suite for EvalMetricBatch
+Tests grouping of LLM-judged and deterministic metrics, bounded fan-out and mapping results
+back to their tests, and inline metric evaluation
+"""
+import asyncio
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from lib.deepeval.deepeval_adapter import DeepEvalAdapter
+from services.artifacts.evals.metric_batch import EvalMetricBatch
+from services.artifacts.evals.models import (
+    ActualTestFieldsModel,
+    ExpectedTestFieldsModel,
+    MetricConfig,
+    MetricType,
+    TestExecutionResult,
+)
+
+
+class FakeJudgeMetric:
+    """Metric scoring a test case with a fixed score after a short judge delay"""
+
+    in_flight = 0
+    peak = 0
+
+    def __init__(self, score: float, fail: bool = False):
+        self.score = None
+        self.reason = None
+        self._score = score
+        self._fail = fail
+
+    async def a_measure(self, test_case):
+        FakeJudgeMetric.in_flight += 1
+        FakeJudgeMetric.peak = max(FakeJudgeMetric.peak, FakeJudgeMetric.in_flight)
+        await asyncio.sleep(0.01)
+        FakeJudgeMetric.in_flight -= 1
+        if self._fail:
+            raise RuntimeError("judge failed")
+        self.score = self._score
+        self.reason = f"judged {test_case}"
+        return self.score
+
+
+class FakeDeterministicMetric:
+    """Deterministic metric scoring a batch of test cases by output length"""
+
+    batches = []
+
+    def measure_batch(self, test_cases):
+        FakeDeterministicMetric.batches.append((list(test_cases), threading.current_thread()))
+        return [
+            SimpleNamespace(score=min(1.0, len(case) / 10), reason=f"length {len(case)}", error=None)
+            if case else SimpleNamespace(score=0.0, reason="", error="Actual output is required")
+            for case in test_cases
+        ]
+
+
+@pytest.fixture(autouse=True)
+def reset_fake_metric():
+    """Reset the fake metric's concurrency counters"""
+    FakeJudgeMetric.in_flight = 0
+    FakeJudgeMetric.peak = 0
+    FakeDeterministicMetric.batches = []
+
+
+@pytest.fixture
+def adapter():
+    """Create an adapter that does not require DeepEval to be installed"""
+    with patch("importlib.util.find_spec", return_value=object()):
+        return DeepEvalAdapter()
+
+
+def make_test_result(name: str, metric_results) -> TestExecutionResult:
+    """Create a passing test result holding the given metric results"""
+    return TestExecutionResult(
+        test_name=name,
+        prompt_reference="file:///prompts/p.yaml",
+        template_variables={},
+        actual_test_fields=ActualTestFieldsModel(actual_output="out"),
+        expected_test_fields=ExpectedTestFieldsModel(),
+        metric_results=metric_results,
+        overall_passed=False,
+        executed_at=datetime.now(timezone.utc),
+    )
+
+
+class TestEvalMetricBatch:
+    """Test cases for EvalMetricBatch"""
+
+    @pytest.mark.asyncio
+    async def test_results_map_back_to_tests(self, adapter):
+        """Test each result replaces its placeholder and tests pass or fail on the judged scores"""
+        relevancy = MetricConfig(type=MetricType.ANSWER_RELEVANCY, threshold=0.5, provider="openai", model="gpt-4o")
+        bias = MetricConfig(type=MetricType.BIAS, threshold=0.5, provider="openai", model="gpt-4o")
+        batch = EvalMetricBatch(adapter)
+
+        scores = {"t1": (0.9, 0.8), "t2": (0.9, 0.1)}
+        results = {}
+        for name, (relevancy_score, bias_score) in scores.items():
+            result = make_test_result(name, [
+                EvalMetricBatch.placeholder(relevancy), EvalMetricBatch.placeholder(bias)
+            ])
+            batch.add(result, 0, f"{name}-case", FakeJudgeMetric(relevancy_score), relevancy, "openai/gpt-4o")
+            batch.add(result, 1, f"{name}-case", FakeJudgeMetric(bias_score), bias, "openai/gpt-4o")
+            results[name] = result
+
+        assert len(batch) == 4
+        await batch.evaluate()
+
+        assert [r.score for r in results["t1"].metric_results] == [0.9, 0.8]
+        assert [r.type for r in results["t2"].metric_results] == [MetricType.ANSWER_RELEVANCY, MetricType.BIAS]
+        assert results["t2"].metric_results[1].passed is False
+        assert results["t1"].overall_passed is True
+        assert results["t2"].overall_passed is False
+        assert len(batch) == 0
+
+    @pytest.mark.asyncio
+    async def test_groups_by_metric_and_judge(self, adapter):
+        """Test metrics are evaluated in one group per metric type and judge model"""
+        config = MetricConfig(type=MetricType.TOXICITY, threshold=0.5, provider="openai", model="gpt-4o")
+        batch = EvalMetricBatch(adapter)
+        for index in range(3):
+            result = make_test_result(f"t{index}", [EvalMetricBatch.placeholder(config)])
+            judge = "openai/gpt-4o" if index < 2 else "anthropic/claude"
+            batch.add(result, 0, index, FakeJudgeMetric(1.0), config, judge)
+
+        with patch.object(adapter, "evaluate_metric_batch", wraps=adapter.evaluate_metric_batch) as evaluate:
+            await batch.evaluate()
+
+        assert sorted(len(call.args[0]) for call in evaluate.call_args_list) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_failed_metric_fails_its_test_only(self, adapter):
+        """Test a judge failure becomes an error result on its own test"""
+        config = MetricConfig(type=MetricType.FAITHFULNESS, threshold=0.5, provider="openai", model="gpt-4o")
+        batch = EvalMetricBatch(adapter)
+        ok = make_test_result("ok", [EvalMetricBatch.placeholder(config)])
+        broken = make_test_result("broken", [EvalMetricBatch.placeholder(config)])
+        batch.add(ok, 0, "ok", FakeJudgeMetric(0.9), config, "openai/gpt-4o")
+        batch.add(broken, 0, "broken", FakeJudgeMetric(0.9, fail=True), config, "openai/gpt-4o")
+
+        await batch.evaluate()
+
+        assert ok.overall_passed is True
+        assert broken.overall_passed is False
+        assert broken.metric_results[0].error == "judge failed"
+
+    @pytest.mark.asyncio
+    async def test_group_fan_out_is_bounded(self, adapter):
+        """Test no more test cases than the group limit are measured at once"""
+        config = MetricConfig(type=MetricType.BIAS, threshold=0.5, provider="openai", model="gpt-4o")
+        batch = EvalMetricBatch(adapter, max_concurrent_cases_per_group=3)
+        for index in range(10):
+            result = make_test_result(f"t{index}", [EvalMetricBatch.placeholder(config)])
+            batch.add(result, 0, index, FakeJudgeMetric(1.0), config, "openai/gpt-4o")
+
+        await batch.evaluate()
+
+        assert FakeJudgeMetric.peak == 3
+
+    @pytest.mark.asyncio
+    async def test_deterministic_group_scored_in_one_pass(self, adapter):
+        """Test a deterministic metric scores all its test cases in one batch call off the event loop"""
+        config = MetricConfig(type=MetricType.OUTPUT_LENGTH, threshold=0.5, include_reason=True)
+        batch = EvalMetricBatch(adapter)
+        outputs = ["0123456789", "0123", ""]
+        results = []
+        for output in outputs:
+            result = make_test_result(output or "empty", [EvalMetricBatch.placeholder(config)])
+            batch.add(result, 0, output, FakeDeterministicMetric(), config)
+            results.append(result)
+
+        await batch.evaluate()
+
+        assert len(FakeDeterministicMetric.batches) == 1
+        scored_cases, thread = FakeDeterministicMetric.batches[0]
+        assert scored_cases == outputs
+        assert thread is not threading.current_thread()
+        assert [r.overall_passed for r in results] == [True, False, False]
+        assert results[0].metric_results[0].reason == "length 10"
+        assert results[2].metric_results[0].error == "Actual output is required"
+
+
+class FakeMeasuredMetric:
+    """Deterministic metric recording the thread its synchronous measure runs on"""
+
+    def __init__(self):
+        self.score = None
+        self.reason = None
+        self.thread = None
+
+    def measure(self, test_case):
+        self.thread = threading.current_thread()
+        self.score = 1.0
+        self.reason = "measured"
+        return self.score
+
+
+class TestEvaluateMetrics:
+    """Test cases for metrics evaluated inline by DeepEvalAdapter.evaluate_metrics"""
+
+    @pytest.mark.asyncio
+    async def test_metrics_do_not_block_the_event_loop(self, adapter):
+        """Test judged metrics are awaited and deterministic metrics are measured in a worker thread"""
+        judged = MetricConfig(type=MetricType.ANSWER_RELEVANCY, threshold=0.5, provider="openai", model="gpt-4o")
+        deterministic = MetricConfig(type=MetricType.OUTPUT_LENGTH, threshold=0.5, include_reason=True)
+        measured = FakeMeasuredMetric()
+
+        results = await adapter.evaluate_metrics(
+            "output", [FakeJudgeMetric(0.9), measured], [judged, deterministic]
+        )
+
+        assert [r.score for r in results] == [0.9, 1.0]
+        assert measured.thread is not None
+        assert measured.thread is not threading.current_thread()
+        assert results[1].reason == "measured"
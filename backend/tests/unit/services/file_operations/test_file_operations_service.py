@@ -184,6 +184,67 @@ class TestFileOperationsService:
             result = self.service.save_yaml_file(test_file, test_data)
             assert result is False
     
+    def test_save_yaml_file_uses_explicit_repo_root(self):
+        """Test relative path is computed from the provided repo root"""
+        test_file = self.temp_dir / ".promptrepo" / "prompts" / "p.prompt.yaml"
+        
+        with patch.object(self.service, '_find_repo_root') as mock_find:
+            result = self.service.save_yaml_file(
+                test_file, {"name": "test"}, repo_root=self.temp_dir
+            )
+        
+        mock_find.assert_not_called()
+        assert result.success is True
+        assert result.relative_path == ".promptrepo/prompts/p.prompt.yaml"
+        assert result.directory_name == "prompts"
+    
+    def test_save_yaml_file_atomic_leaves_no_temp_files(self):
+        """Test atomic save replaces the file and cleans up temp files"""
+        test_file = self.temp_dir / "nested" / "test.yaml"
+        
+        self.service.save_yaml_file(test_file, {"version": 1}, fsync=True)
+        self.service.save_yaml_file(test_file, {"version": 2})
+        
+        assert yaml.safe_load(test_file.read_text()) == {"version": 2}
+        assert [p.name for p in test_file.parent.iterdir()] == ["test.yaml"]
+    
+    def test_save_yaml_file_atomic_exclusive_keeps_existing(self):
+        """Test atomic exclusive save does not overwrite and removes its temp file"""
+        test_file = self.temp_dir / "test.yaml"
+        test_file.write_text("existing content")
+        
+        with pytest.raises(FileExistsError):
+            self.service.save_yaml_file(test_file, {"name": "test"}, exclusive=True)
+        
+        assert test_file.read_text() == "existing content"
+        assert [p.name for p in self.temp_dir.iterdir()] == ["test.yaml"]
+
+    def test_save_yaml_file_atomic_keeps_file_mode(self):
+        """Test atomic save honours the umask for new files and keeps the mode of existing ones"""
+        new_file = self.temp_dir / "new.yaml"
+        existing_file = self.temp_dir / "existing.yaml"
+        existing_file.write_text("existing content")
+        existing_file.chmod(0o640)
+
+        with patch("services.file_operations.file_operations_service._UMASK", 0o022):
+            self.service.save_yaml_file(new_file, {"name": "new"})
+            self.service.save_yaml_file(existing_file, {"name": "existing"})
+
+        assert new_file.stat().st_mode & 0o777 == 0o644
+        assert existing_file.stat().st_mode & 0o777 == 0o640
+
+    def test_save_yaml_file_recreates_removed_directory(self):
+        """Test a cached directory removed externally is created again"""
+        import shutil
+        test_file = self.temp_dir / "nested" / "test.yaml"
+        self.service.save_yaml_file(test_file, {"name": "first"})
+        shutil.rmtree(test_file.parent)
+        
+        result = self.service.save_yaml_file(test_file, {"name": "second"})
+        
+        assert result.success is True
+        assert yaml.safe_load(test_file.read_text()) == {"name": "second"}
+    
     def test_load_yaml_file_success(self):
         """Test successful YAML file loading"""
         test_file = self.temp_dir / "test.yaml"
@@ -134,7 +134,7 @@ class TestGitService:
         assert "No changes to commit" in result.message
 
     @patch('services.local_repo.git_service.GitService._add_token_to_url')
-    @patch('services.local_repo.git_service.Repo')
+    @patch('services.local_repo.repo_handles.Repo')
     def test_push_branch(self, mock_repo_class, mock_add_token, git_service):
         """Test pushing a branch to remote."""
         # Mock remote operations
@@ -197,7 +197,7 @@ class TestGitService:
         assert "Switched to branch" in result.message
 
     @patch('services.local_repo.git_service.GitService._add_token_to_url')
-    @patch('services.local_repo.git_service.Repo')
+    @patch('services.local_repo.repo_handles.Repo')
     def test_pull_latest(self, mock_repo_class, mock_add_token, git_service):
         """Test pulling latest changes."""
         with patch.object(git_service, '_get_git_config') as mock_config:
@@ -231,7 +231,7 @@ class TestGitService:
                 "main"
             )
     @patch('services.local_repo.git_service.GitService._add_token_to_url')
-    @patch('services.local_repo.git_service.Repo')
+    @patch('services.local_repo.repo_handles.Repo')
     def test_pull_latest_with_force(self, mock_repo_class, mock_add_token, git_service):
         """Test pulling latest changes with force=True."""
         with patch.object(git_service, '_get_git_config') as mock_config:
@@ -268,7 +268,7 @@ class TestGitService:
             )
 
     @patch('services.local_repo.git_service.GitService._add_token_to_url')
-    @patch('services.local_repo.git_service.Repo')
+    @patch('services.local_repo.repo_handles.Repo')
     def test_pull_latest_with_branch_name(self, mock_repo_class, mock_add_token, git_service):
         """Test pulling latest changes with specific branch name."""
         with patch.object(git_service, '_get_git_config') as mock_config:
@@ -305,7 +305,7 @@ class TestGitService:
             )
 
     @patch('services.local_repo.git_service.GitService._add_token_to_url')
-    @patch('services.local_repo.git_service.Repo')
+    @patch('services.local_repo.repo_handles.Repo')
     def test_pull_latest_failure(self, mock_repo_class, mock_add_token, git_service):
         """Test pulling latest changes when it fails."""
         with patch.object(git_service, '_get_git_config') as mock_config:
@@ -334,7 +334,7 @@ class TestGitService:
             assert result.success is False
             assert "Failed to pull latest changes" in result.message
 
-    @patch('services.local_repo.git_service.Repo')
+    @patch('services.local_repo.repo_handles.Repo')
     def test_pull_latest_without_oauth_token(self, mock_repo_class, git_service):
         """Test pulling latest changes without OAuth token uses origin.pull()."""
         with patch.object(git_service, '_get_git_config') as mock_config:
@@ -378,4 +378,245 @@ class TestGitService:
         
         result = service._add_token_to_url(url, token)
         
-        assert result == url  # Should remain unchanged
\ No newline at end of file
+        assert result == url  # Should remain unchanged
+
+class TestGitServicePlumbingCommits:
+    """Test cases for working-tree-free commits."""
+
+    @pytest.fixture
+    def temp_repo(self):
+        """Create a temporary git repository with nested files."""
+        temp_dir = tempfile.mkdtemp()
+        repo_path = Path(temp_dir)
+
+        import git
+        repo = git.Repo.init(repo_path)
+        (repo_path / "README.md").write_text("# Test Repository")
+        (repo_path / ".promptrepo" / "prompts").mkdir(parents=True)
+        (repo_path / ".promptrepo" / "prompts" / "a.prompt.yaml").write_text("name: a\n")
+        (repo_path / ".promptrepo" / "run.sh").write_text("#!/bin/sh\n")
+        (repo_path / ".promptrepo" / "run.sh").chmod(0o755)
+        repo.index.add(["README.md", ".promptrepo/prompts/a.prompt.yaml", ".promptrepo/run.sh"])
+        repo.index.commit("Initial commit")
+        repo.git.branch("-m", "main")
+
+        yield repo_path
+
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def git_service(self, temp_repo):
+        """Create a GitService instance with a temporary repository."""
+        return GitService(temp_repo)
+
+    def test_commit_files_creates_branch_without_checkout(self, git_service, temp_repo):
+        """Test committing to a new branch leaves HEAD, index and working tree alone."""
+        import git
+        repo = git.Repo(temp_repo)
+        head_before = repo.head.commit.hexsha
+
+        result = git_service.commit_files(
+            branch_name="feature",
+            files={".promptrepo/prompts/b.prompt.yaml": "name: b\n"},
+            commit_message="Add b",
+            base_ref="main",
+            author_name="Test User",
+            author_email="test@example.com"
+        )
+
+        assert result.success is True
+        assert result.data["created_branch"] is True
+        assert repo.active_branch.name == "main"
+        assert repo.head.commit.hexsha == head_before
+        assert not (temp_repo / ".promptrepo" / "prompts" / "b.prompt.yaml").exists()
+        assert not repo.is_dirty()
+
+        commit = repo.heads["feature"].commit
+        assert commit.hexsha == result.data["commit_hash"]
+        assert commit.parents[0].hexsha == head_before
+        assert commit.author.name == "Test User"
+        assert commit.author.email == "test@example.com"
+        assert (commit.tree / ".promptrepo/prompts/b.prompt.yaml").data_stream.read() == b"name: b\n"
+        assert (commit.tree / ".promptrepo/prompts/a.prompt.yaml").data_stream.read() == b"name: a\n"
+
+    def test_commit_files_tree_matches_git(self, git_service, temp_repo):
+        """Test the written tree is identical to the one git builds from the same files."""
+        import git
+        repo = git.Repo(temp_repo)
+        files = {
+            ".promptrepo/prompts/a.prompt.yaml": "name: a2\n",
+            ".promptrepo/prompts-x/c.yaml": "c\n",
+            ".promptrepo/run.sh": "#!/bin/sh\necho hi\n",
+            "z.txt": b"\x00binary",
+        }
+
+        result = git_service.commit_files("feature", files, "Update", base_ref="main")
+
+        for file_path, content in files.items():
+            full_path = temp_repo / file_path
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, str):
+                full_path.write_text(content)
+            else:
+                full_path.write_bytes(content)
+        repo.git.add("-A")
+        expected_tree = repo.git.write_tree()
+
+        assert result.success is True
+        assert repo.heads["feature"].commit.tree.hexsha == expected_tree
+        repo.git.fsck("--strict")
+
+    def test_commit_files_appends_to_existing_branch(self, git_service, temp_repo):
+        """Test commits to an existing branch are parented on its tip, not on base_ref."""
+        import git
+        repo = git.Repo(temp_repo)
+        first = git_service.commit_files("feature", {"one.txt": "1"}, "One", base_ref="main")
+        second = git_service.commit_files("feature", {"two.txt": "2"}, "Two", base_ref="main")
+
+        commit = repo.heads["feature"].commit
+        assert second.data["created_branch"] is False
+        assert commit.parents[0].hexsha == first.data["commit_hash"]
+        assert {item.path for item in commit.tree.traverse()} >= {"one.txt", "two.txt"}
+
+    def test_commit_files_without_changes(self, git_service):
+        """Test committing unchanged content is reported like an empty commit."""
+        result = git_service.commit_files("main", {"README.md": "# Test Repository"}, "Nothing")
+
+        assert result.success is False
+        assert result.message == "No changes to commit"
+
+    def test_concurrent_commits_to_different_branches(self, git_service, temp_repo):
+        """Test saves to different branches of one clone run in parallel without losing commits."""
+        import git
+        from concurrent.futures import ThreadPoolExecutor
+
+        def save(index):
+            return git_service.commit_files(
+                f"branch-{index}", {f"file-{index}.txt": str(index)}, f"Save {index}", base_ref="main"
+            )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(save, range(8)))
+
+        repo = git.Repo(temp_repo)
+        assert all(result.success for result in results)
+        for index in range(8):
+            tree = repo.heads[f"branch-{index}"].commit.tree
+            assert (tree / f"file-{index}.txt").data_stream.read() == str(index).encode()
+
+    def test_concurrent_commits_to_one_branch(self, git_service, temp_repo):
+        """Test racing saves to one branch are retried on top of each other."""
+        import git
+        from concurrent.futures import ThreadPoolExecutor
+
+        git_service.commit_files("feature", {"base.txt": "base"}, "Base", base_ref="main")
+
+        def save(index):
+            return git_service.commit_files("feature", {f"file-{index}.txt": str(index)}, f"Save {index}")
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(save, range(3)))
+
+        repo = git.Repo(temp_repo)
+        paths = {item.path for item in repo.heads["feature"].commit.tree.traverse()}
+        assert all(result.success for result in results)
+        assert {"file-0.txt", "file-1.txt", "file-2.txt"} <= paths
+
+    def test_sync_head_to_branch(self, git_service, temp_repo):
+        """Test switching to a branch holding the saved file leaves a clean working tree."""
+        import git
+        file_path = ".promptrepo/prompts/a.prompt.yaml"
+        (temp_repo / file_path).write_text("name: edited\n")
+        git_service.commit_files("feature", {file_path: "name: edited\n"}, "Edit", base_ref="main")
+
+        result = git_service.sync_head_to_branch("feature", [file_path])
+
+        repo = git.Repo(temp_repo)
+        assert result.success is True
+        assert repo.active_branch.name == "feature"
+        assert not repo.is_dirty(untracked_files=True)
+
+
+class TestGitServiceRefReads:
+    """Test cases for reading files at a ref and fetching without checkout."""
+
+    @pytest.fixture
+    def temp_repo(self):
+        """Create a temporary repository with two commits on main and a feature branch."""
+        temp_dir = tempfile.mkdtemp()
+        repo_path = Path(temp_dir) / "repo"
+
+        import git
+        repo = git.Repo.init(repo_path)
+        (repo_path / "prompt.yaml").write_text("version: 1\n")
+        repo.index.add(["prompt.yaml"])
+        repo.index.commit("First")
+        repo.git.branch("-m", "main")
+        (repo_path / "prompt.yaml").write_text("version: 2\n")
+        repo.index.add(["prompt.yaml"])
+        repo.index.commit("Second")
+        repo.git.checkout("-b", "feature")
+
+        yield repo_path
+
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def git_service(self, temp_repo):
+        """Create a GitService instance with a temporary repository."""
+        return GitService(temp_repo)
+
+    def test_read_file_at_commit(self, git_service):
+        """Test files are read as they exist at each commit."""
+        first = git_service.resolve_commit("main~1")
+        second = git_service.resolve_commit("main")
+
+        assert git_service.read_file_at_commit(first, "prompt.yaml") == b"version: 1\n"
+        assert git_service.read_file_at_commit(second, "prompt.yaml") == b"version: 2\n"
+
+    def test_read_missing_file_at_commit(self, git_service):
+        """Test a file missing at a commit reads as None."""
+        commit = git_service.resolve_commit("main")
+
+        assert git_service.read_file_at_commit(commit, "missing.yaml") is None
+        assert git_service.read_file_at_commit(commit, "../prompt.yaml") is None
+
+    def test_get_blob_hash_at_commit(self, git_service):
+        """Test blob hashes identify file content and are None for missing files."""
+        first = git_service.resolve_commit("main~1")
+        second = git_service.resolve_commit("main")
+
+        first_blob = git_service.get_blob_hash_at_commit(first, "prompt.yaml")
+        assert first_blob == git_service.get_blob_hash_at_commit(first, "/prompt.yaml")
+        assert first_blob != git_service.get_blob_hash_at_commit(second, "prompt.yaml")
+        assert git_service.get_blob_hash_at_commit(second, "missing.yaml") is None
+
+    def test_resolve_unknown_ref(self, git_service):
+        """Test refs that do not name a commit resolve to None."""
+        assert git_service.resolve_commit("no-such-branch") is None
+        assert git_service.resolve_commit("--output=/tmp/x") is None
+
+    def test_get_file_commit_history_at_ref(self, git_service):
+        """Test history can start from a ref other than HEAD."""
+        history = git_service.get_file_commit_history("prompt.yaml", ref="main~1")
+
+        assert [commit.message for commit in history] == ["First"]
+
+    def test_fetch_branch_leaves_working_tree(self, git_service, temp_repo):
+        """Test fetching stores the remote branch as origin/<branch> without switching branches."""
+        import git
+        remote_path = temp_repo.parent / "remote"
+        remote = git.Repo.clone_from(str(temp_repo), str(remote_path), branch="main")
+        (remote_path / "prompt.yaml").write_text("version: 3\n")
+        remote.index.add(["prompt.yaml"])
+        remote_commit = remote.index.commit("Third")
+        (temp_repo / "prompt.yaml").write_text("local edit\n")
+
+        result = git_service.fetch_branch(None, "main", str(remote_path))
+
+        repo = git.Repo(temp_repo)
+        assert result.success is True
+        assert result.data == {"ref": "origin/main", "commit_hash": remote_commit.hexsha}
+        assert repo.active_branch.name == "feature"
+        assert (temp_repo / "prompt.yaml").read_text() == "local edit\n"
+        assert git_service.read_file_at_commit(remote_commit.hexsha, "prompt.yaml") == b"version: 3\n"
@@ -0,0 +1,224 @@
+"""
+Test suite for CompletionCache
+Tests key normalization, on-disk LRU eviction and cache modes in ChatCompletionService and the conversation simulator
+"""
+import os
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from services.llm.completion_cache import (
+    CompletionCache,
+    CompletionCacheMode,
+    CompletionCacheStats,
+)
+from services.llm.chat_completion_service import ChatCompletionService
+from services.llm.models import ChatCompletionResponse
+from services.artifacts.prompt.models import PromptMeta, PromptData
+from middlewares.rest.exceptions import ServiceUnavailableException
+
+
+def _response(content: str) -> ChatCompletionResponse:
+    return ChatCompletionResponse(content=content, finish_reason="stop")
+
+
+class TestCompletionCache:
+    """Test cases for the on-disk completion cache"""
+
+    def test_key_ignores_dict_ordering(self):
+        """Test equivalent requests map to the same key"""
+        first = CompletionCache.build_key({"model": "gpt-4", "model_args": {"temperature": 0, "top_p": 1}})
+        second = CompletionCache.build_key({"model_args": {"top_p": 1, "temperature": 0}, "model": "gpt-4"})
+        other = CompletionCache.build_key({"model": "gpt-4", "model_args": {"temperature": 0.5, "top_p": 1}})
+
+        assert first == second
+        assert first != other
+
+    def test_put_then_get(self, tmp_path):
+        """Test stored responses are returned without the cache status"""
+        cache = CompletionCache(tmp_path)
+        response = _response("hello")
+        response.cache_status = "miss"
+        cache.put("ab" * 32, response, {"model": "gpt-4"})
+
+        cached = cache.get("ab" * 32)
+
+        assert cached is not None
+        assert cached.content == "hello"
+        assert cached.cache_status is None
+        assert cache.get("cd" * 32) is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test the store is kept under max_bytes by evicting the oldest entries"""
+        cache = CompletionCache(tmp_path, max_bytes=10_000)
+        cache.put("a" * 64, _response("x" * 3000))
+        cache.put("b" * 64, _response("x" * 3000))
+        os.utime(cache._path_for("b" * 64), (1, 1))
+        cache._index = None
+        cache.get("a" * 64)
+        cache.put("c" * 64, _response("x" * 3000))
+        cache.put("d" * 64, _response("x" * 3000))
+
+        assert cache.get("b" * 64) is None
+        assert cache.get("d" * 64) is not None
+        assert cache.total_bytes <= 10_000
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        """Test unreadable entries are dropped instead of raising"""
+        cache = CompletionCache(tmp_path)
+        cache.put("e" * 64, _response("ok"))
+        cache._path_for("e" * 64).write_text("{not json", encoding="utf-8")
+
+        assert cache.get("e" * 64) is None
+        assert not cache._path_for("e" * 64).exists()
+
+    def test_stats_record(self):
+        """Test hit/miss counters"""
+        stats = CompletionCacheStats(mode=CompletionCacheMode.READ_WRITE)
+        for status in ("hit", "miss", "hit", None):
+            stats.record(status)
+
+        assert stats.hits == 2
+        assert stats.misses == 1
+
+
+class TestChatCompletionServiceCaching:
+    """Test cases for cache modes in ChatCompletionService"""
+
+    def setup_method(self):
+        """Setup before each test"""
+        config = Mock(provider="openai", model="gpt-4", api_key="sk-test", api_base_url=None)
+        self.config_service = Mock()
+        self.config_service.get_llm_configs.return_value = [config]
+        self.prompt_meta = PromptMeta(
+            prompt=PromptData(prompt="You are helpful", temperature=0.0, top_p=1.0, seed=7),
+            repo_name="repo",
+            file_path="prompts/p.yaml"
+        )
+
+    def _service(self, tmp_path) -> ChatCompletionService:
+        return ChatCompletionService(
+            config_service=self.config_service,
+            completion_cache=CompletionCache(tmp_path)
+        )
+
+    def _mock_agent(self, mock_chat_agent):
+        trace = Mock(final_output="answer", tokens=None, cost=None)
+        trace.duration.total_seconds.return_value = 0.5
+        trace.spans = []
+        agent = Mock()
+        agent.run = AsyncMock(return_value=trace)
+        mock_chat_agent.create = AsyncMock(return_value=agent)
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_read_write_serves_hits(self, tmp_path):
+        """Test a repeated identical completion is served from the cache"""
+        service = self._service(tmp_path)
+        with patch("services.llm.chat_completion_service.ChatAgent") as mock_chat_agent:
+            agent = self._mock_agent(mock_chat_agent)
+
+            first = await service._execute_completion_from_prompt_meta(
+                self.prompt_meta, "user-1", last_user_message="hi", cache_mode=CompletionCacheMode.READ_WRITE
+            )
+            second = await service._execute_completion_from_prompt_meta(
+                self.prompt_meta, "user-1", last_user_message="hi", cache_mode=CompletionCacheMode.READ_WRITE
+            )
+            await service._execute_completion_from_prompt_meta(
+                self.prompt_meta, "user-1", last_user_message="different", cache_mode=CompletionCacheMode.READ_WRITE
+            )
+
+        assert first.cache_status == "miss"
+        assert second.cache_status == "hit"
+        assert second.content == "answer"
+        assert agent.run.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_off_bypasses_cache(self, tmp_path):
+        """Test completions are not cached unless a mode is requested"""
+        service = self._service(tmp_path)
+        with patch("services.llm.chat_completion_service.ChatAgent") as mock_chat_agent:
+            agent = self._mock_agent(mock_chat_agent)
+            for _ in range(2):
+                response = await service._execute_completion_from_prompt_meta(
+                    self.prompt_meta, "user-1", last_user_message="hi"
+                )
+
+        assert response.cache_status is None
+        assert agent.run.await_count == 2
+        assert service.completion_cache.total_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_record_then_replay(self, tmp_path):
+        """Test replay serves recorded completions and fails on unknown requests"""
+        service = self._service(tmp_path)
+        with patch("services.llm.chat_completion_service.ChatAgent") as mock_chat_agent:
+            agent = self._mock_agent(mock_chat_agent)
+            await service._execute_completion_from_prompt_meta(
+                self.prompt_meta, "user-1", last_user_message="hi", cache_mode=CompletionCacheMode.RECORD
+            )
+            replayed = await service._execute_completion_from_prompt_meta(
+                self.prompt_meta, "user-1", last_user_message="hi", cache_mode=CompletionCacheMode.REPLAY
+            )
+            with pytest.raises(ServiceUnavailableException):
+                await service._execute_completion_from_prompt_meta(
+                    self.prompt_meta, "user-1", last_user_message="new", cache_mode=CompletionCacheMode.REPLAY
+                )
+
+        assert replayed.cache_status == "hit"
+        assert agent.run.await_count == 1
+
+
+class TestConversationSimulatorCaching:
+    """Test cases for cache modes in ConversationSimulatorService"""
+
+    @pytest.mark.asyncio
+    async def test_replayed_simulation_calls_no_provider(self, tmp_path):
+        """Test a recorded simulation is replayed without calling the simulator or the chatbot"""
+        from services.conversational.conversation_simulator_service import ConversationSimulatorService
+        from services.conversational.models import SimulateConversationRequest
+
+        config = Mock(provider="openai", model="gpt-4", api_key="sk-test", api_base_url=None)
+        config_service = Mock()
+        config_service.get_llm_configs.return_value = [config]
+        prompt_service = Mock()
+        prompt_service.get = AsyncMock(return_value=PromptMeta(
+            prompt=PromptData(prompt="You are helpful", provider="openai", model="gpt-4", temperature=0.0, top_p=1.0),
+            repo_name="repo",
+            file_path="prompts/p.yaml"
+        ))
+        chat_completion_service = ChatCompletionService(
+            config_service=config_service,
+            prompt_service=prompt_service,
+            completion_cache=CompletionCache(tmp_path)
+        )
+        simulator = ConversationSimulatorService(config_service, prompt_service, chat_completion_service)
+        request = SimulateConversationRequest(
+            prompt_reference="file:///prompts/p.yaml", user_goal="Get a refund",
+            min_turns=1, max_turns=4, provider="openai", model="gpt-4"
+        )
+
+        with patch("services.llm.chat_completion_service.ChatAgent") as mock_chat_agent, \
+                patch("services.conversational.conversation_simulator_service.PromptOptimizerAgent") as mock_user_agent:
+            trace = Mock(final_output="answer", tokens=None, cost=None)
+            trace.duration.total_seconds.return_value = 0.5
+            trace.spans = []
+            chat_agent = Mock(run=AsyncMock(return_value=trace))
+            mock_chat_agent.create = AsyncMock(return_value=chat_agent)
+            user_agent = Mock(run=AsyncMock(side_effect=lambda prompt: Mock(
+                final_output="[GOAL_ACHIEVED]" if "Conversation So Far" in prompt else "I want a refund"
+            )))
+            mock_user_agent.create = AsyncMock(return_value=user_agent)
+
+            recorded = await simulator.simulate_conversation(
+                request, "user-1", "repo", cache_mode=CompletionCacheMode.RECORD
+            )
+            calls = (chat_agent.run.await_count, user_agent.run.await_count)
+            replayed = await simulator.simulate_conversation(
+                request, "user-1", "repo", cache_mode=CompletionCacheMode.REPLAY
+            )
+
+        assert [t.content for t in recorded.turns] == ["I want a refund", "answer"]
+        assert calls == (1, 2)
+        assert replayed.turns == recorded.turns
+        assert replayed.goal_achieved is True
+        assert (chat_agent.run.await_count, user_agent.run.await_count) == calls
@@ -0,0 +1,236 @@
+"""
+Test suite for completion failover and hedged requests
+"""
+import asyncio
+
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from services.llm.completion_failover import (
+    CompletionLatencyTracker,
+    FailoverReason,
+    complete_with_failover,
+    hedge_delay_seconds,
+)
+from services.llm.chat_completion_service import ChatCompletionService
+from services.artifacts.prompt.models import PromptMeta, PromptData
+from middlewares.rest.exceptions import ServiceUnavailableException
+
+
+def _answer(label: str, delay: float = 0.0, error: Exception = None):
+    """Build a request that answers with the label (or raises) after the delay"""
+    calls = []
+
+    async def request():
+        calls.append(label)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return label
+
+    request.calls = calls
+    return request
+
+
+class TestCompleteWithFailover:
+    """Test cases for complete_with_failover"""
+
+    async def test_primary_answers(self):
+        """Test the failover model is not called when the primary answers"""
+        tracker = CompletionLatencyTracker()
+        failover = _answer("failover")
+
+        result, reason = await complete_with_failover(_answer("primary"), failover, "openai/gpt-4", tracker)
+
+        assert (result, reason) == ("primary", None)
+        assert failover.calls == []
+
+    async def test_fails_over_on_error(self):
+        """Test a failing primary is answered by the failover model"""
+        result, reason = await complete_with_failover(
+            _answer("primary", error=RuntimeError("down")), _answer("failover"), "openai/gpt-4",
+            CompletionLatencyTracker()
+        )
+
+        assert (result, reason) == ("failover", FailoverReason.ERROR)
+
+    async def test_fails_over_on_timeout(self):
+        """Test a primary slower than the timeout is answered by the failover model"""
+        result, reason = await complete_with_failover(
+            _answer("primary", delay=1.0), _answer("failover"), "openai/gpt-4",
+            CompletionLatencyTracker(), timeout_seconds=0.05
+        )
+
+        assert (result, reason) == ("failover", FailoverReason.TIMEOUT)
+
+    async def test_hedge_answered_by_failover(self):
+        """Test a slow primary is hedged and the faster failover answer wins"""
+        result, reason = await complete_with_failover(
+            _answer("primary", delay=1.0), _answer("failover", delay=0.01), "openai/gpt-4",
+            CompletionLatencyTracker(), hedge_after_seconds=0.02
+        )
+
+        assert (result, reason) == ("failover", FailoverReason.HEDGE)
+
+    async def test_hedge_answered_by_primary(self):
+        """Test the primary still wins a hedge when it answers first"""
+        result, reason = await complete_with_failover(
+            _answer("primary", delay=0.05), _answer("failover", delay=1.0), "openai/gpt-4",
+            CompletionLatencyTracker(), hedge_after_seconds=0.01
+        )
+
+        assert (result, reason) == ("primary", None)
+
+    async def test_hedge_survives_failing_primary(self):
+        """Test a hedged primary that fails leaves the failover answer"""
+        result, reason = await complete_with_failover(
+            _answer("primary", delay=0.03, error=RuntimeError("down")), _answer("failover", delay=0.06),
+            "openai/gpt-4", CompletionLatencyTracker(), hedge_after_seconds=0.01
+        )
+
+        assert (result, reason) == ("failover", FailoverReason.HEDGE)
+
+    async def test_both_failing_raises_failover_error(self):
+        """Test the failover model's error is raised when both models fail"""
+        with pytest.raises(ValueError):
+            await complete_with_failover(
+                _answer("primary", error=RuntimeError("down")), _answer("failover", error=ValueError("bad")),
+                "openai/gpt-4", CompletionLatencyTracker()
+            )
+
+
+    async def test_rate_limiter_queueing_is_not_primary_latency(self):
+        """Test time queued in the rate limiter neither times out, hedges nor counts as latency"""
+        from lib.rate_limit import ProviderRateLimiter
+
+        limiter = ProviderRateLimiter(max_concurrent=1)
+        tracker = CompletionLatencyTracker()
+        failover = _answer("failover")
+        release = asyncio.Event()
+
+        async def hold_slot():
+            async with limiter.acquire("openai", "gpt-4"):
+                await release.wait()
+
+        async def primary():
+            async with limiter.acquire("openai", "gpt-4"):
+                await asyncio.sleep(0.01)
+                return "primary"
+
+        holder = asyncio.create_task(hold_slot())
+        await asyncio.sleep(0)
+        asyncio.get_running_loop().call_later(0.2, release.set)
+        result, reason = await complete_with_failover(
+            primary, failover, "openai/gpt-4", tracker, timeout_seconds=0.1, hedge_after_seconds=0.05
+        )
+        await holder
+
+        assert (result, reason) == ("primary", None)
+        assert failover.calls == []
+        assert max(tracker._latencies["openai/gpt-4"]) < 0.1
+
+
+class TestCompletionLatencyTracker:
+    """Test cases for latency tracking and the hedge delay"""
+
+    def test_quantile_needs_samples(self):
+        """Test no quantile is reported before enough latencies are observed"""
+        tracker = CompletionLatencyTracker()
+        tracker.observe("openai/gpt-4", 1.0)
+
+        assert tracker.quantile("openai/gpt-4", 0.95) is None
+
+    def test_p95_hedge_delay(self):
+        """Test the hedge delay follows the observed p95 latency of the model"""
+        tracker = CompletionLatencyTracker()
+        for i in range(1, 101):
+            tracker.observe("openai/gpt-4", i / 10)
+
+        assert tracker.quantile("openai/gpt-4", 0.95) == pytest.approx(9.6)
+        with patch("services.llm.completion_failover.settings") as settings:
+            settings.completion_hedge_quantile = 0.95
+            settings.completion_hedge_default_delay_seconds = 10.0
+            settings.completion_hedge_min_delay_seconds = 0.5
+            assert hedge_delay_seconds(tracker, "openai/gpt-4") == pytest.approx(9.6)
+            assert hedge_delay_seconds(tracker, "openai/other") == 10.0
+
+
+class TestChatCompletionServiceFailover:
+    """Test cases for failover_model in ChatCompletionService"""
+
+    def setup_method(self):
+        """Setup before each test"""
+        self.config_service = Mock()
+        self.config_service.get_llm_configs.return_value = [
+            Mock(provider="openai", model="gpt-4", api_key="sk-openai", api_base_url=None),
+            Mock(provider="openai", model="gpt-4o-mini", api_key="sk-openai", api_base_url=None),
+            Mock(provider="anthropic", model="claude-3-haiku", api_key="sk-anthropic", api_base_url=None),
+        ]
+        self.service = ChatCompletionService(config_service=self.config_service)
+
+    def _prompt_meta(self, failover_model):
+        return PromptMeta(
+            prompt=PromptData(
+                prompt="You are helpful", provider="openai", model="gpt-4", failover_model=failover_model,
+                temperature=0.0, top_p=1.0
+            ),
+            repo_name="repo",
+            file_path="prompts/p.yaml"
+        )
+
+    def _mock_agents(self, mock_chat_agent, failing_models):
+        """Make ChatAgent.create return agents that fail for the given model identifiers"""
+        async def create(model_id, **kwargs):
+            trace = Mock(final_output=f"answer from {model_id}", tokens=None, cost=None)
+            trace.duration.total_seconds.return_value = 0.1
+            agent = Mock()
+            if model_id in failing_models:
+                agent.run = AsyncMock(side_effect=RuntimeError("provider down"))
+            else:
+                agent.run = AsyncMock(return_value=trace)
+            return agent
+
+        mock_chat_agent.create = AsyncMock(side_effect=create)
+
+    async def test_response_records_primary_model(self):
+        """Test a healthy primary answers and is recorded as the model"""
+        with patch("services.llm.chat_completion_service.ChatAgent") as mock_chat_agent:
+            self._mock_agents(mock_chat_agent, failing_models=set())
+            response = await self.service._execute_completion_from_prompt_meta(
+                self._prompt_meta("gpt-4o-mini"), "user-1", last_user_message="hi"
+            )
+
+        assert response.model == "openai/gpt-4"
+        assert response.failover_reason is None
+
+    async def test_failover_on_same_provider(self):
+        """Test a bare failover_model runs on the prompt's provider when the primary fails"""
+        with patch("services.llm.chat_completion_service.ChatAgent") as mock_chat_agent:
+            self._mock_agents(mock_chat_agent, failing_models={"openai/gpt-4"})
+            response = await self.service._execute_completion_from_prompt_meta(
+                self._prompt_meta("gpt-4o-mini"), "user-1", last_user_message="hi"
+            )
+
+        assert response.content == "answer from openai/gpt-4o-mini"
+        assert response.model == "openai/gpt-4o-mini"
+        assert response.failover_reason == "error"
+
+    async def test_failover_to_other_provider(self):
+        """Test a provider/model failover_model uses that provider's credentials"""
+        with patch("services.llm.chat_completion_service.ChatAgent") as mock_chat_agent:
+            self._mock_agents(mock_chat_agent, failing_models={"openai/gpt-4"})
+            response = await self.service._execute_completion_from_prompt_meta(
+                self._prompt_meta("anthropic/claude-3-haiku"), "user-1", last_user_message="hi"
+            )
+
+        assert response.model == "anthropic/claude-3-haiku"
+        assert mock_chat_agent.create.await_args.kwargs["api_key"] == "sk-anthropic"
+
+    async def test_without_failover_model_errors_surface(self):
+        """Test a failing primary without failover_model still raises ServiceUnavailableException"""
+        with patch("services.llm.chat_completion_service.ChatAgent") as mock_chat_agent:
+            self._mock_agents(mock_chat_agent, failing_models={"openai/gpt-4"})
+            with pytest.raises(ServiceUnavailableException):
+                await self.service._execute_completion_from_prompt_meta(
+                    self._prompt_meta(None), "user-1", last_user_message="hi"
+                )
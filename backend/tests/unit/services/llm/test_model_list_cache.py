@@ -0,0 +1,146 @@
+"""
+Unit tests for ModelListCache.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from services.config.config_service import ConfigService
+from services.llm.model_list_cache import ModelListCache, get_default_llm_provider_credentials
+from services.llm.model_provider_service import ModelProviderService, warm_up_model_lists
+from services.llm.models import ModelInfo
+
+
+MODELS = [ModelInfo(id="gpt-4", name="gpt-4")]
+
+
+class TestModelListCache:
+    """Test cases for ModelListCache"""
+
+    def test_key_separates_credentials_and_base_urls(self):
+        """Test keys differ per API key and API base but never contain the key"""
+        key_a = ModelListCache.make_key("openai", "sk-a", "")
+        key_b = ModelListCache.make_key("openai", "sk-b", "")
+        key_c = ModelListCache.make_key("openai", "sk-a", "https://proxy.example/")
+
+        assert len({key_a, key_b, key_c}) == 3
+        assert "sk-a" not in "".join(key_a)
+        assert ModelListCache.make_key("openai", "sk-a", "https://proxy.example") == key_c
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_skips_fetch(self):
+        """Test a fresh entry is served without calling the provider"""
+        cache = ModelListCache()
+        fetch = AsyncMock(return_value=MODELS)
+        key = cache.make_key("openai", "sk", "")
+
+        assert await cache.get(key, fetch) == MODELS
+        assert await cache.get(key, fetch) == MODELS
+        assert fetch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_fetches_are_coalesced(self):
+        """Test identical concurrent fetches share one provider call"""
+        cache = ModelListCache()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return MODELS
+
+        key = cache.make_key("openai", "sk", "")
+        results = await asyncio.gather(*(cache.get(key, fetch) for _ in range(10)))
+
+        assert all(result == MODELS for result in results)
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_fetch(self):
+        """Test cancelling the caller that started a fetch leaves it running for the others"""
+        cache = ModelListCache()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return MODELS
+
+        key = cache.make_key("openai", "sk", "")
+        leader = asyncio.create_task(cache.get(key, fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get(key, fetch))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await waiter == MODELS
+        assert leader.cancelled()
+        assert await cache.get(key, fetch) == MODELS
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_revalidating(self):
+        """Test a stale entry is returned immediately and refreshed in the background"""
+        cache = ModelListCache(ttl_seconds=0, stale_ttl_seconds=3600)
+        key = cache.make_key("openai", "sk", "")
+        new_models = [ModelInfo(id="gpt-5", name="gpt-5")]
+        await cache.get(key, AsyncMock(return_value=MODELS))
+
+        refresh = AsyncMock(return_value=new_models)
+        assert await cache.get(key, refresh) == MODELS
+        await asyncio.gather(*cache._background_tasks)
+
+        assert refresh.await_count == 1
+        assert cache._entries[key][1] == new_models
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        """Test a failed fetch is retried on the next call"""
+        cache = ModelListCache()
+        key = cache.make_key("openai", "sk", "")
+
+        with pytest.raises(RuntimeError):
+            await cache.get(key, AsyncMock(side_effect=RuntimeError("boom")))
+
+        assert await cache.get(key, AsyncMock(return_value=MODELS)) == MODELS
+
+
+class TestModelProviderServiceCaching:
+    """Test cases for cached model listing in ModelProviderService"""
+
+    @pytest.mark.asyncio
+    async def test_fetch_models_uses_cache_and_refresh(self):
+        """Test repeat fetches hit the cache unless a refresh is forced"""
+        service = ModelProviderService(Mock(spec=ConfigService), model_list_cache=ModelListCache())
+        raw_model = Mock(id="gpt-4", object="model")
+
+        with patch('services.llm.model_provider_service.alist_models', new=AsyncMock(return_value=[raw_model])) as mock_alist:
+            await service.fetch_models_by_provider("openai", "sk", "")
+            result = await service.fetch_models_by_provider("openai", "sk", "")
+            assert mock_alist.await_count == 1
+
+            await service.fetch_models_by_provider("openai", "sk", "", force_refresh=True)
+            assert mock_alist.await_count == 2
+
+        assert [model.id for model in result] == ["gpt-4"]
+
+    @pytest.mark.asyncio
+    async def test_warm_up_fills_cache_for_default_configs(self, monkeypatch):
+        """Test warm-up fetches each distinct DEFAULT_LLM_CONFIGS credential once"""
+        monkeypatch.setenv(
+            "DEFAULT_LLM_CONFIGS",
+            '[{"provider": "openai", "model": "gpt-4", "api_key": "sk"},'
+            ' {"provider": "openai", "model": "gpt-4o", "api_key": "sk"},'
+            ' {"provider": "anthropic", "model": "claude", "api_key": ""}]'
+        )
+        cache = ModelListCache()
+        raw_model = Mock(id="gpt-4", object="model")
+
+        assert get_default_llm_provider_credentials() == [("openai", "sk", "")]
+        with patch('services.llm.model_provider_service.alist_models', new=AsyncMock(return_value=[raw_model])) as mock_alist:
+            assert await warm_up_model_lists(cache) == 1
+            assert mock_alist.await_count == 1
+
+        assert cache.make_key("openai", "sk", "") in cache._entries
@@ -0,0 +1,111 @@
+"""
+Test suite for reading artifacts at a git ref
+Tests the (commit, path) artifact cache and LocalRepoService.load_artifact with a ref
+"""
+from unittest.mock import Mock, patch
+
+import git
+import pytest
+
+from middlewares.rest.exceptions import NotFoundException
+from schemas.artifact_type_enum import ArtifactType
+from services.local_repo.artifact_ref_cache import ArtifactRefCache
+from services.local_repo.local_repo_service import LocalRepoService
+
+
+class TestArtifactRefCache:
+    """Test cases for ArtifactRefCache"""
+
+    def test_store_and_lookup(self):
+        """Test stored artifacts and known-missing files are found"""
+        cache = ArtifactRefCache()
+        cache.store("a" * 40, "p.yaml", {"name": "p"})
+        cache.store("a" * 40, "missing.yaml", None)
+
+        assert cache.lookup("a" * 40, "p.yaml") == (True, {"name": "p"})
+        assert cache.lookup("a" * 40, "missing.yaml") == (True, None)
+        assert cache.lookup("b" * 40, "p.yaml") == (False, None)
+
+    def test_lookup_returns_copy(self):
+        """Test modifying a returned artifact does not change the cached one"""
+        cache = ArtifactRefCache()
+        cache.store("a" * 40, "p.yaml", {"tags": ["x"]})
+
+        _, artifact = cache.lookup("a" * 40, "p.yaml")
+        artifact["tags"].append("y")
+
+        assert cache.lookup("a" * 40, "p.yaml") == (True, {"tags": ["x"]})
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted when full"""
+        cache = ArtifactRefCache(max_entries=2)
+        cache.store("a" * 40, "1.yaml", {"n": 1})
+        cache.store("a" * 40, "2.yaml", {"n": 2})
+        cache.lookup("a" * 40, "1.yaml")
+        cache.store("a" * 40, "3.yaml", {"n": 3})
+
+        assert cache.lookup("a" * 40, "1.yaml")[0] is True
+        assert cache.lookup("a" * 40, "2.yaml")[0] is False
+        assert len(cache) == 2
+
+
+class TestLoadArtifactAtRef:
+    """Test cases for LocalRepoService.load_artifact with a ref"""
+
+    FILE_PATH = ".promptrepo/prompts/greet.prompt.yaml"
+
+    @pytest.fixture
+    def repo_path(self, tmp_path):
+        """Create a repository whose prompt changed between two commits and has local edits"""
+        repo = git.Repo.init(tmp_path)
+        prompt_file = tmp_path / self.FILE_PATH
+        prompt_file.parent.mkdir(parents=True)
+        prompt_file.write_text("name: greet\nprompt: Hello\n")
+        repo.index.add([self.FILE_PATH])
+        repo.index.commit("First")
+        repo.git.branch("-m", "main")
+        prompt_file.write_text("name: greet\nprompt: Hi there\n")
+        repo.index.add([self.FILE_PATH])
+        repo.index.commit("Second")
+        prompt_file.write_text("name: greet\nprompt: Unsaved edit\n")
+        repo.close()
+        return tmp_path
+
+    @pytest.fixture
+    def service(self, repo_path):
+        """Create a LocalRepoService pointing at the test repository and a fresh artifact cache"""
+        service = LocalRepoService(config_service=Mock())
+        with patch.object(service, "get_repo_path", return_value=repo_path), \
+             patch("services.local_repo.local_repo_service.get_artifact_ref_cache", return_value=ArtifactRefCache()):
+            yield service
+
+    def load(self, service, ref=None):
+        return service.load_artifact("user", "org/repo", self.FILE_PATH, ArtifactType.PROMPT, ref=ref)
+
+    def test_reads_each_ref_without_touching_working_tree(self, service, repo_path):
+        """Test refs read committed versions while the working tree keeps its edits"""
+        assert self.load(service, "main~1")["prompt"] == "Hello"
+        assert self.load(service, "main")["prompt"] == "Hi there"
+        assert self.load(service)["prompt"] == "Unsaved edit"
+        assert "Unsaved edit" in (repo_path / self.FILE_PATH).read_text()
+
+    def test_parsed_artifacts_are_cached_per_commit(self, service):
+        """Test a second read of the same commit and path does not read git again"""
+        first = self.load(service, "main")
+
+        with patch("services.local_repo.local_repo_service.GitService.read_file_at_commit") as read:
+            second = self.load(service, "main")
+
+        read.assert_not_called()
+        assert second == first
+
+    def test_missing_file_at_ref(self, service):
+        """Test a file missing at the ref loads as None"""
+        assert service.load_artifact(
+            "user", "org/repo", "missing.prompt.yaml", ArtifactType.PROMPT, ref="main"
+        ) is None
+
+    def test_unknown_ref_raises_not_found(self, service):
+        """Test a ref that names no commit is reported as not found"""
+        with pytest.raises(NotFoundException):
+            self.load(service, "no-such-branch")
@@ -393,6 +393,14 @@ class TestGitWorkflowWithArtifactType:
         service.create_pull_request_if_not_exists = AsyncMock(side_effect=mock_create_pr)
         return service
 
+    @pytest.fixture
+    def repo_dir(self, tmp_path):
+        """Create a repository directory holding the saved artifact files."""
+        for file_path in ["prompts/test-prompt.md", "prompts/test.md", "tools/test-tool.yaml", "tools/test.yaml"]:
+            (tmp_path / file_path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / file_path).write_text("name: test\n")
+        return tmp_path
+
     @pytest.fixture
     def local_repo_service(self, mock_config_service, mock_db, mock_remote_repo_service):
         """Create LocalRepoService instance with mocked dependencies."""
@@ -404,23 +412,22 @@ class TestGitWorkflowWithArtifactType:
     
     @pytest.mark.asyncio
     async def test_prompt_workflow_creates_correct_branch_name(
-        self, local_repo_service, mock_remote_repo_service
+        self, local_repo_service, repo_dir, mock_remote_repo_service
     ):
         """Test that prompt workflow creates branch with 'prompt' in name."""
         user_id = "test-user"
         repo_name = "org/repo"
         file_path = "prompts/test-prompt.md"
         
-        # Mock _get_repo_base_path to return a temp path
-        with patch.object(local_repo_service, '_get_repo_base_path', return_value=Path("/tmp/repos")), \
+        # Point the repository at a temp directory holding the saved files
+        with patch.object(local_repo_service, 'get_repo_path', return_value=repo_dir), \
              patch('services.local_repo.local_repo_service.GitService') as mock_git_service_class:
             
             # Setup GitService mock
             mock_git_service = Mock()
             mock_git_service.get_current_branch.return_value = "main"
-            mock_git_service.checkout_new_branch.return_value = Mock(success=True)
-            mock_git_service.add_files.return_value = Mock(success=True)
-            mock_git_service.commit_changes.return_value = Mock(success=True)
+            mock_git_service.commit_files.return_value = Mock(success=True)
+            mock_git_service.sync_head_to_branch.return_value = Mock(success=True)
             mock_git_service.push_branch.return_value = Mock(success=True)
             mock_git_service_class.return_value = mock_git_service
             
@@ -437,30 +444,29 @@ class TestGitWorkflowWithArtifactType:
             )
             
             # Verify branch name contains 'prompt'
-            mock_git_service.checkout_new_branch.assert_called_once()
-            branch_name = mock_git_service.checkout_new_branch.call_args[1]['branch_name']
+            mock_git_service.commit_files.assert_called_once()
+            branch_name = mock_git_service.commit_files.call_args[1]['branch_name']
             assert 'prompt' in branch_name.lower()
             assert 'test-prompt' in branch_name
     
     @pytest.mark.asyncio
     async def test_tool_workflow_creates_correct_branch_name(
-        self, local_repo_service, mock_remote_repo_service
+        self, local_repo_service, repo_dir, mock_remote_repo_service
     ):
         """Test that tool workflow creates branch with 'tool' in name."""
         user_id = "test-user"
         repo_name = "org/repo"
         file_path = "tools/test-tool.yaml"
         
-        # Mock _get_repo_base_path to return a temp path
-        with patch.object(local_repo_service, '_get_repo_base_path', return_value=Path("/tmp/repos")), \
+        # Point the repository at a temp directory holding the saved files
+        with patch.object(local_repo_service, 'get_repo_path', return_value=repo_dir), \
              patch('services.local_repo.local_repo_service.GitService') as mock_git_service_class:
             
             # Setup GitService mock
             mock_git_service = Mock()
             mock_git_service.get_current_branch.return_value = "main"
-            mock_git_service.checkout_new_branch.return_value = Mock(success=True)
-            mock_git_service.add_files.return_value = Mock(success=True)
-            mock_git_service.commit_changes.return_value = Mock(success=True)
+            mock_git_service.commit_files.return_value = Mock(success=True)
+            mock_git_service.sync_head_to_branch.return_value = Mock(success=True)
             mock_git_service.push_branch.return_value = Mock(success=True)
             mock_git_service_class.return_value = mock_git_service
             
@@ -477,29 +483,28 @@ class TestGitWorkflowWithArtifactType:
             )
             
             # Verify branch name contains 'tool'
-            mock_git_service.checkout_new_branch.assert_called_once()
-            branch_name = mock_git_service.checkout_new_branch.call_args[1]['branch_name']
+            mock_git_service.commit_files.assert_called_once()
+            branch_name = mock_git_service.commit_files.call_args[1]['branch_name']
             assert 'tool' in branch_name.lower()
             assert 'test-tool' in branch_name
     
     @pytest.mark.asyncio
     async def test_workflow_creates_correct_commit_message_by_type(
-        self, local_repo_service
+        self, local_repo_service, repo_dir
     ):
         """Test that workflow creates commit messages with correct artifact type."""
         user_id = "test-user"
         repo_name = "org/repo"
         
-        # Mock _get_repo_base_path to return a temp path
-        with patch.object(local_repo_service, '_get_repo_base_path', return_value=Path("/tmp/repos")), \
+        # Point the repository at a temp directory holding the saved files
+        with patch.object(local_repo_service, 'get_repo_path', return_value=repo_dir), \
              patch('services.local_repo.local_repo_service.GitService') as mock_git_service_class:
             
             # Setup GitService mock
             mock_git_service = Mock()
             mock_git_service.get_current_branch.return_value = "main"
-            mock_git_service.checkout_new_branch.return_value = Mock(success=True)
-            mock_git_service.add_files.return_value = Mock(success=True)
-            mock_git_service.commit_changes.return_value = Mock(success=True)
+            mock_git_service.commit_files.return_value = Mock(success=True)
+            mock_git_service.sync_head_to_branch.return_value = Mock(success=True)
             mock_git_service.push_branch.return_value = Mock(success=True)
             mock_git_service_class.return_value = mock_git_service
             
@@ -515,11 +520,11 @@ class TestGitWorkflowWithArtifactType:
                 user_session=Mock()
             )
             
-            commit_message = mock_git_service.commit_changes.call_args[1]['commit_message']
+            commit_message = mock_git_service.commit_files.call_args[1]['commit_message']
             assert 'prompt' in commit_message.lower()
             
             # Reset mocks
-            mock_git_service.commit_changes.reset_mock()
+            mock_git_service.commit_files.reset_mock()
             
             # Test with TOOL
             await local_repo_service.handle_git_workflow_after_save(
@@ -533,28 +538,27 @@ class TestGitWorkflowWithArtifactType:
                 user_session=Mock()
             )
             
-            commit_message = mock_git_service.commit_changes.call_args[1]['commit_message']
+            commit_message = mock_git_service.commit_files.call_args[1]['commit_message']
             assert 'tool' in commit_message.lower()
     
     @pytest.mark.asyncio
     async def test_workflow_returns_pr_info(
-        self, local_repo_service, mock_remote_repo_service
+        self, local_repo_service, repo_dir, mock_remote_repo_service
     ):
         """Test that workflow returns PR info after successful PR creation."""
         user_id = "test-user"
         repo_name = "org/repo"
         file_path = "tools/test-tool.yaml"
         
-        # Mock _get_repo_base_path to return a temp path
-        with patch.object(local_repo_service, '_get_repo_base_path', return_value=Path("/tmp/repos")), \
+        # Point the repository at a temp directory holding the saved files
+        with patch.object(local_repo_service, 'get_repo_path', return_value=repo_dir), \
              patch('services.local_repo.local_repo_service.GitService') as mock_git_service_class:
             
             # Setup GitService mock
             mock_git_service = Mock()
             mock_git_service.get_current_branch.return_value = "main"
-            mock_git_service.checkout_new_branch.return_value = Mock(success=True)
-            mock_git_service.add_files.return_value = Mock(success=True)
-            mock_git_service.commit_changes.return_value = Mock(success=True)
+            mock_git_service.commit_files.return_value = Mock(success=True)
+            mock_git_service.sync_head_to_branch.return_value = Mock(success=True)
             mock_git_service.push_branch.return_value = Mock(success=True)
             mock_git_service_class.return_value = mock_git_service
             
@@ -578,23 +582,22 @@ class TestGitWorkflowWithArtifactType:
     
     @pytest.mark.asyncio
     async def test_workflow_without_oauth_token_raises_exception(
-        self, local_repo_service
+        self, local_repo_service, repo_dir
     ):
         """Test that workflow raises exception when no OAuth token is provided."""
         user_id = "test-user"
         repo_name = "org/repo"
         file_path = "tools/test-tool.yaml"
         
-        # Mock _get_repo_base_path to return a temp path
-        with patch.object(local_repo_service, '_get_repo_base_path', return_value=Path("/tmp/repos")), \
+        # Point the repository at a temp directory holding the saved files
+        with patch.object(local_repo_service, 'get_repo_path', return_value=repo_dir), \
              patch('services.local_repo.local_repo_service.GitService') as mock_git_service_class:
             
             # Setup GitService mock
             mock_git_service = Mock()
             mock_git_service.get_current_branch.return_value = "main"
-            mock_git_service.checkout_new_branch.return_value = Mock(success=True)
-            mock_git_service.add_files.return_value = Mock(success=True)
-            mock_git_service.commit_changes.return_value = Mock(success=True)
+            mock_git_service.commit_files.return_value = Mock(success=True)
+            mock_git_service.sync_head_to_branch.return_value = Mock(success=True)
             mock_git_service_class.return_value = mock_git_service
             
             # Execute workflow without OAuth token - should return None (not raise exception)
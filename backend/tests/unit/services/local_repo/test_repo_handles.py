@@ -0,0 +1,168 @@
+"""
+Test suite for RepoHandleRegistry
+Tests handle reuse, exclusive leases, the open handle bound, idle expiry and eviction
+"""
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import git
+import pytest
+
+from services.local_repo.repo_handles import RepoHandleRegistry
+
+
+@pytest.fixture
+def fake_repos():
+    """Patch Repo creation, recording every created handle"""
+    created = []
+
+    def create(path):
+        repo = Mock(path=path)
+        created.append(repo)
+        return repo
+
+    with patch("services.local_repo.repo_handles.Repo", side_effect=create):
+        yield created
+
+
+class TestRepoHandleRegistry:
+    """Test cases for RepoHandleRegistry"""
+
+    def test_sequential_leases_reuse_handle(self, fake_repos, tmp_path):
+        """Test a released handle is reused instead of opening a new one"""
+        registry = RepoHandleRegistry()
+
+        with registry.lease(tmp_path) as first:
+            pass
+        with registry.lease(str(tmp_path)) as second:
+            pass
+
+        assert first is second
+        assert len(fake_repos) == 1
+        assert registry.open_handles == 1
+
+    def test_concurrent_leases_get_own_handles(self, fake_repos, tmp_path):
+        """Test callers holding a lease at the same time never share a handle"""
+        registry = RepoHandleRegistry()
+
+        with registry.lease(tmp_path) as first, registry.lease(tmp_path) as second:
+            assert first is not second
+
+        assert registry.open_handles == 2
+
+    def test_bound_closes_least_recently_used_idle_handle(self, fake_repos, tmp_path):
+        """Test opening past the bound closes the oldest idle handle"""
+        registry = RepoHandleRegistry(max_handles=2)
+        paths = [tmp_path / name for name in ("a", "b", "c")]
+
+        for path in paths:
+            with registry.lease(path):
+                pass
+
+        assert registry.open_handles == 2
+        fake_repos[0].close.assert_called_once()
+        fake_repos[1].close.assert_not_called()
+
+    def test_overflow_handle_closed_on_release(self, fake_repos, tmp_path):
+        """Test a handle opened while every handle is leased is not kept past the bound"""
+        registry = RepoHandleRegistry(max_handles=1)
+
+        with registry.lease(tmp_path):
+            with registry.lease(tmp_path) as overflow:
+                assert registry.open_handles == 2
+
+        overflow.close.assert_called_once()
+        assert registry.open_handles == 1
+
+    def test_idle_handles_expire(self, fake_repos, tmp_path):
+        """Test handles unused for longer than the timeout are closed without another lease"""
+        registry = RepoHandleRegistry(idle_timeout_seconds=0.05)
+
+        with registry.lease(tmp_path / "a"):
+            pass
+        with registry.lease(tmp_path / "b"):
+            pass
+        fake_repos[0].close.assert_not_called()
+
+        for _ in range(100):
+            if registry.open_handles == 0:
+                break
+            time.sleep(0.01)
+
+        fake_repos[0].close.assert_called_once()
+        fake_repos[1].close.assert_called_once()
+        assert registry.open_handles == 0
+        assert registry._sweeper is None
+
+    def test_evict_closes_idle_and_leased_handles(self, fake_repos, tmp_path):
+        """Test evicted handles are closed, leased ones once released"""
+        registry = RepoHandleRegistry()
+        with registry.lease(tmp_path):
+            pass
+
+        with registry.lease(tmp_path) as leased:
+            with registry.lease(tmp_path):
+                pass
+            registry.evict(tmp_path)
+            fake_repos[1].close.assert_called_once()
+            leased.close.assert_not_called()
+
+        leased.close.assert_called_once()
+        assert registry.open_handles == 0
+
+    def test_failed_open_is_not_counted(self, tmp_path):
+        """Test a path that is not a repository raises and leaves no open handle"""
+        registry = RepoHandleRegistry()
+
+        with pytest.raises(git.exc.InvalidGitRepositoryError):
+            with registry.lease(tmp_path):
+                pass
+
+        assert registry.open_handles == 0
+
+    def test_real_repo_reuses_cat_file_process(self, tmp_path):
+        """Test object reads through reused handles stay on one persistent cat-file process"""
+        repo = git.Repo.init(tmp_path)
+        (tmp_path / "README.md").write_text("# Test")
+        repo.index.add(["README.md"])
+        commit = repo.index.commit("Initial commit")
+        repo.close()
+
+        registry = RepoHandleRegistry()
+        processes = set()
+        try:
+            for _ in range(3):
+                with registry.lease(tmp_path) as handle:
+                    assert handle.commit(commit.hexsha).message == "Initial commit"
+                    processes.add(handle.git.cat_file_all.proc.pid)
+        finally:
+            registry.close()
+
+        assert len(processes) == 1
+
+    def test_thread_safety(self, fake_repos, tmp_path):
+        """Test concurrent leases keep the open handle count consistent"""
+        registry = RepoHandleRegistry(max_handles=4)
+        in_use = set()
+        errors = []
+        guard = threading.Lock()
+
+        def work():
+            for _ in range(50):
+                with registry.lease(tmp_path) as handle:
+                    with guard:
+                        if id(handle) in in_use:
+                            errors.append("shared handle")
+                        in_use.add(id(handle))
+                    with guard:
+                        in_use.discard(id(handle))
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert registry.open_handles <= 4
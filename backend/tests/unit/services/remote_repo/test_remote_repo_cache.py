@@ -0,0 +1,226 @@
+"""
+Test suite for RemoteRepoCache
+Tests TTL listing cache, ETag revalidation, concurrent pagination and service integration
+"""
+import asyncio
+import pytest
+import httpx
+from unittest.mock import Mock, AsyncMock, patch
+
+from database.models.user_sessions import UserSessions
+from database.models.user import User
+from schemas.oauth_provider_enum import OAuthProvider
+from services.remote_repo.remote_repo_cache import (
+    RemoteRepoCache,
+    ConditionalHttpClient,
+    fetch_remaining_pages,
+)
+from services.remote_repo.remote_repo_service import RemoteRepoService
+from services.remote_repo.providers import GitHubRepoLocator
+from services.remote_repo.models import RepositoryList, RepoInfo
+
+
+def _repo_json(repo_id: int) -> dict:
+    return {
+        "id": repo_id,
+        "name": f"repo-{repo_id}",
+        "full_name": f"testuser/repo-{repo_id}",
+        "clone_url": f"https://github.com/testuser/repo-{repo_id}.git",
+        "owner": {"login": "testuser"},
+    }
+
+
+class TestRemoteRepoCache:
+    """Test cases for RemoteRepoCache"""
+
+    def test_result_expires_after_ttl(self):
+        """Test listings are served until the TTL elapses"""
+        cache = RemoteRepoCache(result_ttl_seconds=60)
+        cache.set_result("user-1", "repositories", "value")
+
+        assert cache.get_result("user-1", "repositories") == "value"
+        assert cache.get_result("user-2", "repositories") is None
+
+        with patch("services.remote_repo.remote_repo_cache.time.monotonic", return_value=1e12):
+            assert cache.get_result("user-1", "repositories") is None
+
+    def test_invalidate_scope(self):
+        """Test invalidating a scope drops all of its listings only"""
+        cache = RemoteRepoCache()
+        cache.set_result("user-1", "repositories", 1)
+        cache.set_result("user-1", "branches:o/r", 2)
+        cache.set_result("user-2", "repositories", 3)
+
+        cache.invalidate("user-1")
+
+        assert cache.get_result("user-1", "repositories") is None
+        assert cache.get_result("user-1", "branches:o/r") is None
+        assert cache.get_result("user-2", "repositories") == 3
+
+    def test_results_are_bounded(self):
+        """Test least recently used listings are evicted"""
+        cache = RemoteRepoCache(max_results=2)
+        cache.set_result("u", "a", 1)
+        cache.set_result("u", "b", 2)
+        cache.get_result("u", "a")
+        cache.set_result("u", "c", 3)
+
+        assert cache.get_result("u", "b") is None
+        assert cache.get_result("u", "a") == 1
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_coalesces_concurrent_calls(self):
+        """Test concurrent callers for the same listing trigger one fetch"""
+        cache = RemoteRepoCache()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "listing"
+
+        results = await asyncio.gather(*(cache.get_or_fetch("u", "k", fetch) for _ in range(5)))
+
+        assert results == ["listing"] * 5
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_fetch_locks_are_released(self):
+        """Test fetch locks are dropped once no caller holds them, also after a failed fetch"""
+        cache = RemoteRepoCache()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return "listing"
+
+        async def failing_fetch():
+            raise RuntimeError("provider down")
+
+        await asyncio.gather(*(cache.get_or_fetch("u", f"k{i % 2}", fetch) for i in range(6)))
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch("u", "broken", failing_fetch)
+
+        assert cache._locks == {}
+
+
+class TestConditionalHttpClient:
+    """Test cases for ETag revalidation"""
+
+    @pytest.mark.asyncio
+    async def test_replays_cached_body_on_304(self):
+        """Test a 304 answer is turned into the cached 200 response"""
+        seen_if_none_match = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_if_none_match.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=[1, 2], headers={"ETag": '"v1"'})
+
+        cache = RemoteRepoCache()
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            client = ConditionalHttpClient(http_client, cache=cache, scope="u")
+            first = await client.get("https://example.test/items", params={"page": 1})
+            second = await client.get("https://example.test/items", params={"page": 1})
+
+        assert seen_if_none_match == [None, '"v1"']
+        assert first.json() == [1, 2]
+        assert second.status_code == 200
+        assert second.json() == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_etags_are_scoped(self):
+        """Test ETags stored for one scope are not sent for another"""
+        seen_if_none_match = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_if_none_match.append(request.headers.get("if-none-match"))
+            return httpx.Response(200, json=[], headers={"ETag": '"v1"'})
+
+        cache = RemoteRepoCache()
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            await ConditionalHttpClient(http_client, cache, "user-1").get("https://example.test/x")
+            await ConditionalHttpClient(http_client, cache, "user-2").get("https://example.test/x")
+
+        assert seen_if_none_match == [None, None]
+
+
+class TestPagination:
+    """Test cases for concurrent page fetching"""
+
+    @pytest.mark.asyncio
+    async def test_fetch_remaining_pages_keeps_order(self):
+        """Test pages fetched concurrently are returned in page order"""
+        async def fetch_page(page: int):
+            await asyncio.sleep(0.01 * (5 - page))
+            return [page]
+
+        assert await fetch_remaining_pages(fetch_page, 4) == [2, 3, 4]
+        assert await fetch_remaining_pages(fetch_page, 1) == []
+
+    @pytest.mark.asyncio
+    async def test_github_repositories_follow_link_header(self):
+        """Test GitHub repositories are collected from every page advertised in Link"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params["page"])
+            headers = {}
+            if page == 1:
+                headers["Link"] = (
+                    '<https://api.github.com/user/repos?per_page=100&page=2>; rel="next", '
+                    '<https://api.github.com/user/repos?per_page=100&page=3>; rel="last"'
+                )
+            return httpx.Response(200, json=[_repo_json(page)], headers=headers)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            async with GitHubRepoLocator("token", http_client=http_client) as locator:
+                result = await locator.get_repositories()
+            # A shared client passed in by the caller is not closed by the locator
+            assert not http_client.is_closed
+
+        assert [repo.id for repo in result.repositories] == ["1", "2", "3"]
+
+
+class TestRemoteRepoServiceCaching:
+    """Test cases for listing cache integration in RemoteRepoService"""
+
+    def setup_method(self):
+        """Setup before each test"""
+        self.cache = RemoteRepoCache()
+        self.service = RemoteRepoService(Mock(), cache=self.cache)
+        self.service.user_dao = Mock()
+        self.service.user_dao.get_user_by_id.return_value = User(
+            id="user-123",
+            oauth_provider=OAuthProvider.GITHUB,
+            oauth_username="testuser",
+            oauth_profile_url="https://github.com/testuser"
+        )
+        self.user_session = UserSessions(
+            id="session-123",
+            session_id="session-123",
+            user_id="user-123",
+            oauth_token="test-token"
+        )
+
+    @pytest.mark.asyncio
+    async def test_repositories_served_from_cache_until_refresh(self):
+        """Test repeat listings skip the provider unless a refresh is forced"""
+        repo_list = RepositoryList(repositories=[RepoInfo(
+            id="1", name="r", full_name="testuser/r", clone_url="https://x/r.git", owner="testuser"
+        )])
+
+        with patch('services.remote_repo.remote_repo_service.GitHubRepoLocator') as mock_github:
+            mock_locator = AsyncMock()
+            mock_locator.get_repositories = AsyncMock(return_value=repo_list)
+            mock_github.return_value = mock_locator
+            mock_locator.__aenter__ = AsyncMock(return_value=mock_locator)
+            mock_locator.__aexit__ = AsyncMock(return_value=None)
+
+            first = await self.service.get_repositories(self.user_session)
+            second = await self.service.get_repositories(self.user_session)
+            assert mock_locator.get_repositories.await_count == 1
+
+            await self.service.get_repositories(self.user_session, force_refresh=True)
+            assert mock_locator.get_repositories.await_count == 2
+
+        assert first is second
@@ -0,0 +1,115 @@
+"""
+Unit tests for the shared chat response cache.
+"""
+import json
+import pytest
+from datetime import datetime, UTC
+from unittest.mock import AsyncMock, Mock
+
+from services.shared_chat import SharedChatService, SharedChatCache
+from services.shared_chat.shared_chat_cache import compute_etag, etag_matches
+from database.daos.shared_chat import SharedChatDAO
+from database.models.shared_chats import SharedChats
+
+
+class TestSharedChatCache:
+    """Test cases for SharedChatCache."""
+
+    def test_put_then_get(self):
+        """Test stored bodies are returned with a strong ETag of their bytes."""
+        cache = SharedChatCache()
+        stored = cache.put("abc", b'{"data": 1}')
+
+        assert cache.get("abc") == stored
+        assert stored.etag == compute_etag(b'{"data": 1}')
+        assert stored.etag.startswith('"') and not stored.etag.startswith("W/")
+        assert cache.get("missing") is None
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache keeps at most max_entries, dropping the least recently read."""
+        cache = SharedChatCache(max_entries=2)
+        cache.put("a", b"a")
+        cache.put("b", b"b")
+        cache.get("a")
+        cache.put("c", b"c")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_entries_expire(self):
+        """Test entries older than the TTL are dropped."""
+        cache = SharedChatCache(ttl_seconds=0)
+        cache.put("a", b"a")
+
+        assert cache.get("a") is None
+
+    def test_invalidate(self):
+        """Test invalidate drops a single entry."""
+        cache = SharedChatCache()
+        cache.put("a", b"a")
+        cache.put("b", b"b")
+        cache.invalidate("a")
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+
+    @pytest.mark.parametrize("header,expected", [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ("*", True),
+        ('"xyz"', False),
+    ])
+    def test_etag_matches(self, header, expected):
+        """Test If-None-Match handling for lists, wildcards and weak validators."""
+        assert etag_matches(header, '"abc"') is expected
+
+
+class TestSharedChatServiceResponseCache:
+    """Test cases for cached public reads in SharedChatService."""
+
+    @pytest.fixture
+    def mock_dao(self):
+        """Create a mock DAO returning one shared chat."""
+        dao = Mock(spec=SharedChatDAO)
+        chat = Mock(spec=SharedChats)
+        chat.id = "chat_1"
+        chat.share_id = "abc"
+        chat.title = "Chat"
+        chat.messages = {"messages": [{
+            "id": "m1", "role": "user", "content": "hi", "timestamp": datetime.now(UTC).isoformat()
+        }]}
+        chat.model_config_data = {"provider": "openai", "model": "gpt-4"}
+        chat.prompt_meta = None
+        chat.total_tokens = 3
+        chat.total_cost = 0.0
+        chat.created_at = datetime.now(UTC)
+        dao.aget_by_share_id = AsyncMock(return_value=chat)
+        dao.delete.return_value = True
+        return dao
+
+    @pytest.fixture
+    def service(self, mock_dao):
+        """Create service instance with a private response cache."""
+        return SharedChatService(dao=mock_dao, response_cache=SharedChatCache())
+
+    @pytest.mark.asyncio
+    async def test_repeated_reads_hit_cache(self, service, mock_dao):
+        """Test the database is queried once and the same bytes are served after."""
+        first = await service.aget_shared_chat_cached("abc")
+        second = await service.aget_shared_chat_cached("abc")
+
+        assert first.body == second.body
+        assert first.etag == second.etag
+        assert json.loads(first.body)["data"]["share_id"] == "abc"
+        mock_dao.aget_by_share_id.assert_awaited_once_with("abc")
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates_cache(self, service, mock_dao):
+        """Test deleting a shared chat drops its cached response."""
+        await service.aget_shared_chat_cached("abc")
+        service.delete_shared_chat("abc", user_id="user_1")
+
+        assert service.response_cache.get("abc") is None
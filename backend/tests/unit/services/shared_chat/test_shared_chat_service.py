@@ -5,7 +5,7 @@ import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime, UTC
 
-from services.shared_chat import SharedChatService
+from services.shared_chat import SharedChatService, SharedChatCache
 from database.daos.shared_chat import SharedChatDAO
 from database.models.shared_chats import SharedChats
 from schemas.shared_chat import (
@@ -14,7 +14,7 @@ from schemas.shared_chat import (
     SharedChatModelConfig,
     SharedChatTokenUsage,
 )
-from middlewares.rest import NotFoundException
+from middlewares.rest import BadRequestException, NotFoundException
 
 
 class TestSharedChatService:
@@ -28,7 +28,11 @@ class TestSharedChatService:
     @pytest.fixture
     def service(self, mock_dao):
         """Create service instance with mock DAO."""
-        return SharedChatService(dao=mock_dao, base_url="https://example.com")
+        return SharedChatService(
+            dao=mock_dao,
+            base_url="https://example.com",
+            response_cache=SharedChatCache()
+        )
 
     @pytest.fixture
     def sample_messages(self):
@@ -121,6 +125,7 @@ class TestSharedChatService:
         assert created_arg.title == "Test Chat"
         assert created_arg.total_tokens == 18
         assert created_arg.total_cost == 0.001
+        assert created_arg.message_count == 2
         assert created_arg.created_by == "user_123"
 
     def test_create_shared_chat_without_user(self, service, mock_dao, sample_request):
@@ -175,43 +180,64 @@ class TestSharedChatService:
         assert "nonexistent" in str(exc_info.value.message)
 
     def test_list_user_shared_chats_success(self, service, mock_dao):
-        """Test listing user's shared chats."""
-        mock_chat1 = Mock(spec=SharedChats)
-        mock_chat1.id = "chat_1"
-        mock_chat1.share_id = "share_1"
-        mock_chat1.title = "Chat 1"
-        mock_chat1.total_tokens = 100
-        mock_chat1.total_cost = 0.01
-        mock_chat1.created_at = datetime.now(UTC)
-        mock_chat1.messages = {"messages": [{"id": "1"}, {"id": "2"}]}
-
-        mock_chat2 = Mock(spec=SharedChats)
-        mock_chat2.id = "chat_2"
-        mock_chat2.share_id = "share_2"
-        mock_chat2.title = "Chat 2"
-        mock_chat2.total_tokens = 200
-        mock_chat2.total_cost = 0.02
-        mock_chat2.created_at = datetime.now(UTC)
-        mock_chat2.messages = {"messages": [{"id": "3"}]}
-
-        mock_dao.get_by_user.return_value = [mock_chat1, mock_chat2]
+        """Test listing user's shared chats from summary rows."""
+        rows = [
+            Mock(
+                id=f"chat_{i}", share_id=f"share_{i}", title=f"Chat {i}",
+                total_tokens=100 * i, total_cost=0.01 * i, message_count=i,
+                created_at=datetime(2026, 1, 10 - i)
+            )
+            for i in (1, 2)
+        ]
+        mock_dao.get_summaries_by_user.return_value = rows
 
         result = service.list_user_shared_chats("user_123", limit=50, offset=0)
 
-        assert len(result) == 2
-        assert result[0].share_id == "share_1"
-        assert result[0].message_count == 2
-        assert result[1].share_id == "share_2"
-        assert result[1].message_count == 1
-        mock_dao.get_by_user.assert_called_once_with("user_123", 50, 0)
+        assert len(result.items) == 2
+        assert result.items[0].share_id == "share_1"
+        assert result.items[0].message_count == 1
+        assert result.items[1].share_id == "share_2"
+        assert result.items[1].message_count == 2
+        assert result.next_cursor is None
+        mock_dao.get_summaries_by_user.assert_called_once_with("user_123", 51, 0, None)
+
+    def test_list_user_shared_chats_next_cursor(self, service, mock_dao):
+        """Test a full page returns a cursor that decodes to its last row."""
+        rows = [
+            Mock(
+                id=f"chat_{i}", share_id=f"share_{i}", title=f"Chat {i}",
+                total_tokens=0, total_cost=0.0, message_count=0,
+                created_at=datetime(2026, 1, 10 - i)
+            )
+            for i in range(3)
+        ]
+        mock_dao.get_summaries_by_user.return_value = rows
+
+        page = service.list_user_shared_chats("user_123", limit=2)
+
+        assert [item.id for item in page.items] == ["chat_0", "chat_1"]
+        assert service.decode_cursor(page.next_cursor) == (datetime(2026, 1, 9), "chat_1")
+
+        service.list_user_shared_chats("user_123", limit=2, cursor=page.next_cursor)
+        mock_dao.get_summaries_by_user.assert_called_with(
+            "user_123", 3, 0, (datetime(2026, 1, 9), "chat_1")
+        )
+
+    def test_list_user_shared_chats_invalid_cursor(self, service, mock_dao):
+        """Test a malformed cursor is rejected as a bad request."""
+        with pytest.raises(BadRequestException):
+            service.list_user_shared_chats("user_123", cursor="not-a-cursor")
+
+        mock_dao.get_summaries_by_user.assert_not_called()
 
     def test_list_user_shared_chats_empty(self, service, mock_dao):
         """Test listing shared chats when user has none."""
-        mock_dao.get_by_user.return_value = []
+        mock_dao.get_summaries_by_user.return_value = []
 
         result = service.list_user_shared_chats("user_123")
 
-        assert result == []
+        assert result.items == []
+        assert result.next_cursor is None
 
     def test_delete_shared_chat_success(self, service, mock_dao):
         """Test successfully deleting a shared chat."""
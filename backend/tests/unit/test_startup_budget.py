@@ -0,0 +1,157 @@
+"""
+Test suite for application startup cost
+Tests that agent and evaluation libraries stay out of the import path of the
+app, that importing the app stays within a time budget, and the startup profiler
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from lib.deepeval.deepeval_adapter import DeepEvalAdapter, get_deepeval_adapter
+from lib.deepeval.models import MetricType
+from utils.startup import StartupProfiler
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+
+# Seconds importing the app may take on top of a bare interpreter start
+STARTUP_IMPORT_BUDGET_SECONDS = float(os.environ.get("STARTUP_IMPORT_BUDGET_SECONDS", "5"))
+
+_LOADED_HEAVY_MODULES = (
+    "import json, sys; "
+    "print(json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in ('deepeval', 'any_agent', 'langchain'))))"
+)
+
+
+def _run_python(code: str) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter from the backend root."""
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def _loaded_heavy_modules(setup: str) -> list:
+    """Return the agent/eval library modules loaded after running setup in a fresh interpreter."""
+    result = _run_python(f"{setup}; {_LOADED_HEAVY_MODULES}")
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestDeepEvalAdapterStartup:
+    """Test cases for lazy DeepEval loading"""
+
+    def test_adapter_is_a_singleton(self):
+        """Test the adapter getter returns one process-wide instance"""
+        assert get_deepeval_adapter() is get_deepeval_adapter()
+
+    def test_constructing_adapter_does_not_import_deepeval(self):
+        """Test creating the adapter leaves deepeval unimported"""
+        setup = "from lib.deepeval.deepeval_adapter import DeepEvalAdapter; DeepEvalAdapter()"
+
+        assert _loaded_heavy_modules(setup) == []
+
+    def test_metric_classes_resolve_on_first_use(self):
+        """Test metric classes are imported once, when a metric type is first requested"""
+        adapter = DeepEvalAdapter()
+        if not adapter.deepeval_available:
+            pytest.skip("deepeval is not installed")
+
+        assert adapter.metric_mapping == {}
+        metric_class = adapter.get_metric_class(MetricType.EXACT_MATCH)
+
+        assert metric_class.__name__ == "ExactMatchMetric"
+        assert adapter.get_metric_class(MetricType.EXACT_MATCH) is metric_class
+        assert list(adapter.metric_mapping) == [MetricType.EXACT_MATCH]
+
+    def test_resolving_one_metric_imports_only_its_module(self):
+        """Test resolving a custom metric leaves the other custom metric modules unimported"""
+        pytest.importorskip("deepeval")
+        setup = (
+            "from lib.deepeval.deepeval_adapter import DeepEvalAdapter; "
+            "from lib.deepeval.models import MetricType; "
+            "DeepEvalAdapter().get_metric_class(MetricType.EXACT_MATCH)"
+        )
+        result = _run_python(
+            f"{setup}; import json, sys; "
+            "print(json.dumps(sorted(m for m in sys.modules if m.startswith('lib.deepeval.custom_metrics.'))))"
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout.strip().splitlines()[-1]) == ["lib.deepeval.custom_metrics.exact_match_metric"]
+
+
+class TestAppStartupBudget:
+    """Test cases for the cost of importing the FastAPI app"""
+
+    def test_importing_agents_does_not_import_any_agent(self):
+        """Test the agent modules defer the any_agent stack until an agent is created"""
+        setup = "import agents.chat_agent.chat_agent, agents.promptimizer.promptimizer_agent"
+
+        assert _loaded_heavy_modules(setup) == []
+
+    def test_importing_app_does_not_import_heavy_stacks(self):
+        """Test agent and evaluation libraries are not loaded until first use"""
+        assert _loaded_heavy_modules("import main") == []
+
+    def test_importing_app_within_budget(self):
+        """Test importing the app stays within the startup budget"""
+        started = time.perf_counter()
+        baseline = _run_python("pass")
+        baseline_seconds = time.perf_counter() - started
+        assert baseline.returncode == 0
+
+        started = time.perf_counter()
+        result = _run_python("import main")
+        import_seconds = time.perf_counter() - started
+        assert result.returncode == 0, result.stderr
+
+        assert import_seconds - baseline_seconds < STARTUP_IMPORT_BUDGET_SECONDS
+
+
+class TestStartupProfiler:
+    """Test cases for StartupProfiler"""
+
+    def test_records_phases(self):
+        """Test marks record the duration of each phase in order"""
+        profiler = StartupProfiler()
+        profiler.mark("imports")
+        profiler.mark("app_setup")
+
+        report = profiler.report()
+
+        assert list(report.phases_ms) == ["imports", "app_setup"]
+        assert report.imports_profiled is False
+        assert report.modules == []
+
+    def test_profiles_module_imports(self, tmp_path, monkeypatch):
+        """Test modules imported while profiling are reported with self and cumulative times"""
+        (tmp_path / "startup_probe_outer.py").write_text(
+            "import time\nimport startup_probe_inner\ntime.sleep(0.02)\n"
+        )
+        (tmp_path / "startup_probe_inner.py").write_text("import time\ntime.sleep(0.05)\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        profiler = StartupProfiler(profile_imports=True)
+        try:
+            import startup_probe_outer  # noqa: F401
+        finally:
+            profiler.stop_import_profiling()
+            sys.modules.pop("startup_probe_outer", None)
+            sys.modules.pop("startup_probe_inner", None)
+
+        modules = {entry.module: entry for entry in profiler.report().modules}
+        outer = modules["startup_probe_outer"]
+        inner = modules["startup_probe_inner"]
+
+        assert inner.self_ms >= 50
+        assert outer.cumulative_ms >= inner.cumulative_ms + 20
+        assert outer.self_ms < outer.cumulative_ms - 40
+        assert profiler.report().modules[0].module == "startup_probe_inner"
@@ -0,0 +1,212 @@
+"""
+Startup instrumentation and warm-up helpers.
+
+StartupProfiler records how long each boot phase takes (importing the app,
+setting it up, running the lifespan startup). When STARTUP_PROFILE_IMPORTS=1
+is set it also installs an import hook that measures the import time of
+every module loaded while the app boots, so slow cold starts can be traced
+to the modules responsible. The profile is logged at the end of startup and
+served from GET /api/v0/info/startup.
+
+warm_up_heavy_stacks() loads the agent and evaluation libraries that are
+otherwise only imported on first use.
+"""
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+
+class ModuleImportTime(BaseModel):
+    """Import time of one module."""
+    module: str
+    self_ms: float = Field(description="Time spent executing the module body, excluding nested imports")
+    cumulative_ms: float = Field(description="Time spent importing the module, including nested imports")
+
+
+class StartupProfile(BaseModel):
+    """Boot phase durations and the slowest module imports."""
+    phases_ms: Dict[str, float] = Field(default_factory=dict)
+    imports_profiled: bool = False
+    modules: List[ModuleImportTime] = Field(default_factory=list)
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """Loader wrapper timing exec_module of the wrapped loader."""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        # Hand the module its real loader so code inspecting __loader__/__spec__ sees it
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        self._profiler._enter_module()
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit_module(module.__name__, time.perf_counter() - started)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Meta path finder wrapping the specs found by the other finders."""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """Collects boot phase timings and, optionally, per-module import times."""
+
+    def __init__(self, profile_imports: bool = False):
+        """
+        Initialize the profiler.
+
+        Args:
+            profile_imports: Whether to install the per-module import hook
+        """
+        self.profile_imports = profile_imports
+        self._phases: Dict[str, float] = {}
+        self._phase_started = time.perf_counter()
+        self._modules: Dict[str, ModuleImportTime] = {}
+        # Per-thread stack of nested import time, for self-time accounting
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._finder: Optional[_TimingFinder] = None
+        if profile_imports:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def mark(self, phase: str) -> None:
+        """
+        Record the time elapsed since the previous mark as the duration of phase.
+
+        Args:
+            phase: Name of the phase that just finished
+        """
+        now = time.perf_counter()
+        self._phases[phase] = round((now - self._phase_started) * 1000, 2)
+        self._phase_started = now
+
+    def stop_import_profiling(self) -> None:
+        """Remove the import hook; modules imported afterwards are not timed."""
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def report(self, top: int = 25) -> StartupProfile:
+        """
+        Build the startup profile.
+
+        Args:
+            top: Number of modules to include, slowest self time first
+
+        Returns:
+            StartupProfile with phase durations and the slowest imports
+        """
+        with self._lock:
+            modules = sorted(self._modules.values(), key=lambda m: m.self_ms, reverse=True)[:top]
+        return StartupProfile(
+            phases_ms=dict(self._phases),
+            imports_profiled=self.profile_imports,
+            modules=modules,
+        )
+
+    def log_report(self, top: int = 25) -> None:
+        """Log the startup profile."""
+        profile = self.report(top)
+        phases = ", ".join(f"{name}={ms:.0f}ms" for name, ms in profile.phases_ms.items())
+        logger.info(f"Startup phases: {phases}")
+        for entry in profile.modules:
+            logger.info(
+                f"Import {entry.module}: self={entry.self_ms:.1f}ms cumulative={entry.cumulative_ms:.1f}ms"
+            )
+
+    def _child_time(self) -> List[float]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter_module(self) -> None:
+        self._child_time().append(0.0)
+
+    def _exit_module(self, name: str, elapsed: float) -> None:
+        stack = self._child_time()
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        entry = ModuleImportTime(
+            module=name,
+            self_ms=round(max(0.0, elapsed - children) * 1000, 3),
+            cumulative_ms=round(elapsed * 1000, 3),
+        )
+        with self._lock:
+            self._modules[name] = entry
+
+
+_startup_profiler: Optional[StartupProfiler] = None
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """
+    Return the process-wide startup profiler.
+
+    The first call starts it; import profiling is enabled by STARTUP_PROFILE_IMPORTS=1.
+    """
+    global _startup_profiler
+    if _startup_profiler is None:
+        enabled = os.getenv("STARTUP_PROFILE_IMPORTS", "").lower() in ("1", "true", "yes")
+        _startup_profiler = StartupProfiler(profile_imports=enabled)
+    return _startup_profiler
+
+
+def warm_up_heavy_stacks() -> None:
+    """
+    Import the agent and evaluation stacks that are otherwise loaded on first use.
+
+    Meant to run in a worker thread after the app is ready, so the first chat
+    or eval request does not pay for the imports.
+    """
+    started = time.perf_counter()
+    try:
+        from agents.any_agent_loader import load_any_agent
+        load_any_agent()
+    except ImportError as e:
+        logger.warning(f"Agent stack warm-up failed: {e}")
+
+    try:
+        from lib.deepeval.deepeval_adapter import get_deepeval_adapter
+        get_deepeval_adapter().preload_metric_classes()
+    except ImportError as e:
+        logger.warning(f"Eval stack warm-up failed: {e}")
+
+    logger.info(f"Warmed up agent and eval stacks in {(time.perf_counter() - started) * 1000:.0f}ms")
@@ -45,15 +45,18 @@ export class SharedChatApi {
   /**
    * List all shared chats for the current user.
    * @param limit - Maximum number of results (default 50)
-   * @param offset - Pagination offset (default 0)
+   * @param offset - Pagination offset (default 0), ignored when cursor is set
+   * @param cursor - meta.next_cursor of the previous page
    * @returns OpenAPI response with list of shared chats
    */
   static async listSharedChats(
     limit: number = 50,
-    offset: number = 0
+    offset: number = 0,
+    cursor?: string
   ): Promise<OpenApiResponse<SharedChatListItem[]>> {
+    const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
     return await httpClient.get<SharedChatListItem[]>(
-      `/api/v0/shared-chats?limit=${limit}&offset=${offset}`
+      `/api/v0/shared-chats?limit=${limit}&offset=${offset}${cursorParam}`
     );
   }
 